@@ -0,0 +1,53 @@
+# distutils: language=c++
+
+from libc.stdint cimport int64_t
+
+from hummingbot.connector.exchange_base cimport ExchangeBase
+from hummingbot.core.data_type.composite_order_book cimport CompositeOrderBook
+
+
+cdef class BacktestOrder:
+    cdef:
+        readonly int64_t matching_engine_id
+        readonly str order_id
+        readonly bint is_buy
+        readonly str trading_pair
+        readonly object order_type
+        readonly object limit_price
+        readonly object quantity
+        readonly object executed_amount_base
+        readonly object executed_amount_quote
+        readonly object fee_paid
+
+
+cdef class BacktestMarket(ExchangeBase):
+    cdef:
+        str _name
+        double _latency
+        bint _queue_position
+        object _maker_fee
+        object _taker_fee
+        dict _trading_pairs
+        dict _order_books
+        dict _replays
+        dict _quantization
+        dict _orders
+        dict _matching_engine_orders
+        dict _on_hold_balances
+        list _failed_orders
+        int64_t _order_nonce
+        int64_t _fill_count
+
+    cdef str c_create_order(self,
+                            bint is_buy,
+                            str trading_pair,
+                            object amount,
+                            object order_type,
+                            object price)
+    cdef c_set_balance(self, str currency, object balance)
+    cdef c_add_on_hold_balance(self, str currency, object amount)
+    cdef c_settle_fills(self, CompositeOrderBook order_book)
+    cdef c_settle_fill(self, BacktestOrder order, object amount, object price, bint is_maker)
+    cdef c_complete_order(self, BacktestOrder order)
+    cdef c_release_order(self, BacktestOrder order)
+    cdef c_execute_market_order(self, BacktestOrder order, list fills, CompositeOrderBook order_book)
@@ -0,0 +1,534 @@
+# distutils: language=c++
+# distutils: sources=['hummingbot/core/cpp/OrderBookEntry.cpp', 'hummingbot/core/cpp/MatchingEngine.cpp']
+
+from decimal import Decimal
+import logging
+from typing import (
+    Dict,
+    List,
+)
+
+from libc.stdint cimport int64_t
+from libcpp.vector cimport vector
+import numpy as np
+
+from hummingbot.backtest.order_book_replay cimport OrderBookReplay
+from hummingbot.core.clock cimport Clock
+from hummingbot.core.data_type.cancellation_result import CancellationResult
+from hummingbot.core.data_type.limit_order import LimitOrder
+from hummingbot.core.data_type.MatchingEngine cimport MatchingEngineFill
+from hummingbot.core.data_type.order_book cimport OrderBook
+from hummingbot.core.event.events import (
+    BuyOrderCompletedEvent,
+    BuyOrderCreatedEvent,
+    MarketEvent,
+    MarketOrderFailureEvent,
+    OrderCancelledEvent,
+    OrderFilledEvent,
+    OrderType,
+    SellOrderCompletedEvent,
+    SellOrderCreatedEvent,
+    TradeFee,
+    TradeType,
+)
+from hummingbot.core.network_iterator import NetworkStatus
+from hummingbot.core.time_iterator cimport TimeIterator
+from hummingbot.logger import HummingbotLogger
+
+bm_logger = None
+s_decimal_0 = Decimal(0)
+s_decimal_NaN = Decimal("NaN")
+s_default_quantum = Decimal("1e-8")
+
+
+cdef class BacktestOrder:
+    def __init__(self,
+                 int64_t matching_engine_id,
+                 str order_id,
+                 str trading_pair,
+                 bint is_buy,
+                 object order_type,
+                 object price,
+                 object quantity):
+        self.matching_engine_id = matching_engine_id
+        self.order_id = order_id
+        self.is_buy = is_buy
+        self.trading_pair = trading_pair
+        self.order_type = order_type
+        self.limit_price = price
+        self.quantity = quantity
+        self.executed_amount_base = s_decimal_0
+        self.executed_amount_quote = s_decimal_0
+        self.fee_paid = s_decimal_0
+
+
+cdef class BacktestMarket(ExchangeBase):
+    """
+    An exchange replaying recorded market data, see market_data.py, for strategies run by a clock in backtest mode.
+
+    Each clock tick replays the market data of every trading pair up to the tick into its order book, whose matching
+    engine - the same one paper trading uses - matches the orders of the pair against it with the given latency and
+    queue position model. The fills and cancels are then settled on the balances and emit the market events, as a live
+    exchange would. Fees are paid in the quote asset.
+    """
+    MARKET_RECEIVED_ASSET_EVENT_TAG = MarketEvent.ReceivedAsset.value
+    MARKET_BUY_ORDER_COMPLETED_EVENT_TAG = MarketEvent.BuyOrderCompleted.value
+    MARKET_SELL_ORDER_COMPLETED_EVENT_TAG = MarketEvent.SellOrderCompleted.value
+    MARKET_ORDER_CANCELLED_EVENT_TAG = MarketEvent.OrderCancelled.value
+    MARKET_ORDER_FILLED_EVENT_TAG = MarketEvent.OrderFilled.value
+    MARKET_ORDER_FAILURE_EVENT_TAG = MarketEvent.OrderFailure.value
+    MARKET_BUY_ORDER_CREATED_EVENT_TAG = MarketEvent.BuyOrderCreated.value
+    MARKET_SELL_ORDER_CREATED_EVENT_TAG = MarketEvent.SellOrderCreated.value
+
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        global bm_logger
+        if bm_logger is None:
+            bm_logger = logging.getLogger(__name__)
+        return bm_logger
+
+    def __init__(self,
+                 name: str = "backtest",
+                 latency: float = 0.0,
+                 queue_position: bool = True,
+                 maker_fee_percent: Decimal = s_decimal_0,
+                 taker_fee_percent: Decimal = s_decimal_0):
+        """
+        :param latency: seconds for orders and cancels to reach the exchange
+        :param queue_position: whether limit orders queue behind the amount at their price level
+        :param maker_fee_percent: e.g. Decimal("0.001") for 0.1%
+        """
+        self._name = name
+        super().__init__()
+        self._latency = latency
+        self._queue_position = queue_position
+        self._maker_fee = maker_fee_percent
+        self._taker_fee = taker_fee_percent
+        self._trading_pairs = {}
+        self._order_books = {}
+        self._replays = {}
+        self._quantization = {}
+        self._orders = {}
+        self._matching_engine_orders = {}
+        self._on_hold_balances = {}
+        self._failed_orders = []
+        self._order_nonce = 0
+        self._fill_count = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def order_books(self) -> Dict[str, OrderBook]:
+        return self._order_books
+
+    @property
+    def status_dict(self) -> Dict[str, bool]:
+        return {"market_data_loaded": len(self._replays) > 0}
+
+    @property
+    def ready(self) -> bool:
+        return all(self.status_dict.values())
+
+    @property
+    def limit_orders(self) -> List[LimitOrder]:
+        cdef BacktestOrder order
+        retval = []
+        for order in self._orders.values():
+            if order.order_type.is_limit_type():
+                base_asset, quote_asset = self._trading_pairs[order.trading_pair]
+                retval.append(LimitOrder(order.order_id, order.trading_pair, order.is_buy, base_asset, quote_asset,
+                                         order.limit_price, order.quantity - order.executed_amount_base))
+        return retval
+
+    @property
+    def on_hold_balances(self) -> Dict[str, Decimal]:
+        return dict(self._on_hold_balances)
+
+    @property
+    def available_balances(self) -> Dict[str, Decimal]:
+        return {currency: self.c_get_available_balance(currency) for currency in self._account_balances}
+
+    @property
+    def start_timestamp(self) -> float:
+        return min((replay.start_timestamp for replay in self._replays.values()), default=float("nan"))
+
+    @property
+    def end_timestamp(self) -> float:
+        return max((replay.end_timestamp for replay in self._replays.values()), default=float("nan"))
+
+    @property
+    def events_replayed(self) -> int:
+        """
+        The number of market data rows, i.e. order book entries and trades, replayed so far.
+        """
+        return sum(replay.events_replayed for replay in self._replays.values())
+
+    @property
+    def fill_count(self) -> int:
+        return self._fill_count
+
+    def add_data(self,
+                 trading_pair: str,
+                 base_asset: str,
+                 quote_asset: str,
+                 data: np.ndarray,
+                 price_quantum: Decimal = s_default_quantum,
+                 size_quantum: Decimal = s_default_quantum):
+        """
+        :param data: market data of the trading pair, e.g. from load_market_data()
+        """
+        cdef CompositeOrderBook order_book = CompositeOrderBook()
+        order_book._matching_engine.setQueuePosition(self._queue_position)
+        self._trading_pairs[trading_pair] = (base_asset, quote_asset)
+        self._order_books[trading_pair] = order_book
+        self._replays[trading_pair] = OrderBookReplay(trading_pair, order_book, data)
+        self._quantization[trading_pair] = (price_quantum, size_quantum)
+
+    def split_trading_pair(self, trading_pair: str):
+        return self._trading_pairs[trading_pair]
+
+    cdef c_start(self, Clock clock, double timestamp):
+        cdef OrderBookReplay replay
+        # No network to check, the order books are up to date once the data before the start has been replayed.
+        TimeIterator.c_start(self, clock, timestamp)
+        for replay in self._replays.values():
+            replay.c_replay_until(timestamp)
+        self._network_status = NetworkStatus.CONNECTED
+
+    cdef c_stop(self, Clock clock):
+        TimeIterator.c_stop(self, clock)
+        self._network_status = NetworkStatus.STOPPED
+
+    cdef c_tick(self, double timestamp):
+        cdef:
+            OrderBookReplay replay
+            CompositeOrderBook order_book
+            list failed_orders = self._failed_orders
+
+        ExchangeBase.c_tick(self, timestamp)
+        if len(failed_orders) > 0:
+            self._failed_orders = []
+            for order_id, order_type in failed_orders:
+                self.c_trigger_event(self.MARKET_ORDER_FAILURE_EVENT_TAG,
+                                     MarketOrderFailureEvent(timestamp, order_id, order_type))
+
+        for replay in self._replays.values():
+            order_book = replay._order_book
+            replay.c_replay_until(timestamp)
+            order_book._matching_engine.advanceTo(timestamp)
+            self.c_settle_fills(order_book)
+
+    cdef c_set_balance(self, str currency, object balance):
+        self._account_balances[currency] = Decimal(balance)
+
+    cdef object c_get_balance(self, str currency):
+        return self._account_balances.get(currency, s_decimal_0)
+
+    cdef object c_get_available_balance(self, str currency):
+        return self._account_balances.get(currency, s_decimal_0) - self._on_hold_balances.get(currency, s_decimal_0)
+
+    cdef c_add_on_hold_balance(self, str currency, object amount):
+        self._on_hold_balances[currency] = self._on_hold_balances.get(currency, s_decimal_0) + amount
+
+    cdef str c_buy(self,
+                   str trading_pair,
+                   object amount,
+                   object order_type=OrderType.MARKET,
+                   object price=s_decimal_NaN,
+                   dict kwargs={}):
+        return self.c_create_order(True, trading_pair, amount, order_type, price)
+
+    cdef str c_sell(self,
+                    str trading_pair,
+                    object amount,
+                    object order_type=OrderType.MARKET,
+                    object price=s_decimal_NaN,
+                    dict kwargs={}):
+        return self.c_create_order(False, trading_pair, amount, order_type, price)
+
+    cdef str c_create_order(self,
+                            bint is_buy,
+                            str trading_pair,
+                            object amount,
+                            object order_type,
+                            object price):
+        if trading_pair not in self._trading_pairs:
+            raise ValueError(f"Trading pair '{trading_pair}' does not exist in the backtest data.")
+
+        cdef:
+            str base_asset = self._trading_pairs[trading_pair][0]
+            str quote_asset = self._trading_pairs[trading_pair][1]
+            str order_id
+            bint is_limit = order_type.is_limit_type()
+            object quantized_price = self.c_quantize_order_price(trading_pair, price) if is_limit else s_decimal_NaN
+            object quantized_amount = self.c_quantize_order_amount(trading_pair, amount)
+            str hold_asset = quote_asset if is_buy else base_asset
+            object hold_amount = s_decimal_0
+            double active_timestamp = self._current_timestamp + self._latency
+            CompositeOrderBook order_book = self._order_books[trading_pair]
+            BacktestOrder order
+
+        self._order_nonce += 1
+        order_id = f"{'buy' if is_buy else 'sell'}://{trading_pair}/{self._order_nonce:016x}"
+        if is_limit:
+            hold_amount = quantized_amount * quantized_price if is_buy else quantized_amount
+        if quantized_amount <= s_decimal_0 or hold_amount > self.c_get_available_balance(hold_asset):
+            self.logger().warning(f"Not enough {hold_asset} balance available for {order_type.name} "
+                                  f"{'buy' if is_buy else 'sell'} order of {quantized_amount} {base_asset}.")
+            # Reported on the next tick, once the strategy tracks the order.
+            self._failed_orders.append((order_id, order_type))
+            return order_id
+
+        order = BacktestOrder(self._order_nonce, order_id, trading_pair, is_buy, order_type, quantized_price,
+                              quantized_amount)
+        self._orders[order_id] = order
+        self._matching_engine_orders[order.matching_engine_id] = order
+        if is_limit:
+            self.c_add_on_hold_balance(hold_asset, hold_amount)
+            order_book._matching_engine.addLimitOrder(order.matching_engine_id, is_buy, float(quantized_price),
+                                                      float(quantized_amount), active_timestamp,
+                                                      order_type is OrderType.LIMIT_MAKER)
+        else:
+            order_book._matching_engine.addMarketOrder(order.matching_engine_id, is_buy, float(quantized_amount),
+                                                       active_timestamp)
+
+        if is_buy:
+            self.c_trigger_event(self.MARKET_BUY_ORDER_CREATED_EVENT_TAG,
+                                 BuyOrderCreatedEvent(self._current_timestamp, order_type, trading_pair,
+                                                      quantized_amount, quantized_price, order_id))
+        else:
+            self.c_trigger_event(self.MARKET_SELL_ORDER_CREATED_EVENT_TAG,
+                                 SellOrderCreatedEvent(self._current_timestamp, order_type, trading_pair,
+                                                       quantized_amount, quantized_price, order_id))
+        return order_id
+
+    cdef c_cancel(self, str trading_pair, str client_order_id):
+        cdef:
+            BacktestOrder order = self._orders.get(client_order_id)
+            CompositeOrderBook order_book
+        if order is None or not order.order_type.is_limit_type():
+            return
+        # The order can still fill until the cancel reaches the exchange.
+        order_book = self._order_books[order.trading_pair]
+        order_book._matching_engine.cancelOrderAt(order.matching_engine_id, self._current_timestamp + self._latency)
+
+    async def cancel_all(self, timeout_seconds: float) -> List[CancellationResult]:
+        cdef BacktestOrder order
+        results = []
+        for order in list(self._orders.values()):
+            if order.order_type.is_limit_type():
+                self.c_cancel(order.trading_pair, order.order_id)
+                results.append(CancellationResult(order.order_id, True))
+        return results
+
+    cdef c_settle_fills(self, CompositeOrderBook order_book):
+        cdef:
+            vector[MatchingEngineFill] fills
+            MatchingEngineFill fill
+            vector[int64_t] cancelled_orders
+            int64_t matching_engine_id
+            BacktestOrder order
+            list market_order_fills = []
+            object amount
+
+        if order_book._matching_engine.hasFills():
+            fills = order_book._matching_engine.popFills()
+            for fill in fills:
+                order = self._matching_engine_orders.get(fill.orderId)
+                if order is None:
+                    continue
+                if not order.order_type.is_limit_type():
+                    # The fills of a market order all come at once when it becomes active, and are executed together.
+                    if fill.amount > 0:
+                        market_order_fills.append((Decimal(f"{fill.amount:.12g}"), Decimal(f"{fill.price:.12g}")))
+                    if fill.isComplete:
+                        if fill.amount > 0:
+                            # Fully filled, the amounts add up to the order amount.
+                            amount, price = market_order_fills[-1]
+                            market_order_fills[-1] = (order.quantity - sum(a for a, _ in market_order_fills[:-1]),
+                                                      price)
+                        self.c_execute_market_order(order, market_order_fills, order_book)
+                        market_order_fills = []
+                    continue
+
+                # Partial fills are in whole size quanta, the rest of the order is settled with its last fill.
+                if fill.isComplete:
+                    amount = order.quantity - order.executed_amount_base
+                else:
+                    amount = min(self.c_quantize_order_amount(order.trading_pair, Decimal(f"{fill.amount:.12g}")),
+                                 order.quantity - order.executed_amount_base)
+                if amount > s_decimal_0:
+                    # Makers fill at their own price, takers at the prices of the book levels they take.
+                    self.c_settle_fill(order, amount,
+                                       order.limit_price if fill.isMaker else Decimal(f"{fill.price:.12g}"),
+                                       fill.isMaker)
+                if fill.isComplete:
+                    self.c_complete_order(order)
+
+        if order_book._matching_engine.hasCancelledOrders():
+            cancelled_orders = order_book._matching_engine.popCancelledOrders()
+            for matching_engine_id in cancelled_orders:
+                order = self._matching_engine_orders.pop(matching_engine_id, None)
+                if order is None:
+                    continue
+                self.c_release_order(order)
+                del self._orders[order.order_id]
+                self.c_trigger_event(self.MARKET_ORDER_CANCELLED_EVENT_TAG,
+                                     OrderCancelledEvent(self._current_timestamp, order.order_id))
+
+    cdef c_settle_fill(self, BacktestOrder order, object amount, object price, bint is_maker):
+        cdef:
+            str base_asset = self._trading_pairs[order.trading_pair][0]
+            str quote_asset = self._trading_pairs[order.trading_pair][1]
+            object fee_percent = self._maker_fee if is_maker else self._taker_fee
+            object quote_amount = amount * price
+            object fee_amount = quote_amount * fee_percent
+            bint is_limit = order.order_type.is_limit_type()
+
+        if order.is_buy:
+            self._account_balances[quote_asset] = self.c_get_balance(quote_asset) - quote_amount - fee_amount
+            self._account_balances[base_asset] = self.c_get_balance(base_asset) + amount
+            if is_limit:
+                self.c_add_on_hold_balance(quote_asset, -amount * order.limit_price)
+        else:
+            self._account_balances[base_asset] = self.c_get_balance(base_asset) - amount
+            self._account_balances[quote_asset] = self.c_get_balance(quote_asset) + quote_amount - fee_amount
+            if is_limit:
+                self.c_add_on_hold_balance(base_asset, -amount)
+        order.executed_amount_base += amount
+        order.executed_amount_quote += quote_amount
+        order.fee_paid += fee_amount
+
+        self._fill_count += 1
+        self.c_trigger_event(self.MARKET_ORDER_FILLED_EVENT_TAG,
+                             OrderFilledEvent(self._current_timestamp,
+                                              order.order_id,
+                                              order.trading_pair,
+                                              TradeType.BUY if order.is_buy else TradeType.SELL,
+                                              order.order_type,
+                                              price,
+                                              amount,
+                                              TradeFee(fee_percent),
+                                              exchange_trade_id=str(self._fill_count)))
+
+    cdef c_complete_order(self, BacktestOrder order):
+        cdef:
+            str base_asset = self._trading_pairs[order.trading_pair][0]
+            str quote_asset = self._trading_pairs[order.trading_pair][1]
+        self.c_release_order(order)
+        del self._orders[order.order_id]
+        del self._matching_engine_orders[order.matching_engine_id]
+        if order.is_buy:
+            self.c_trigger_event(self.MARKET_BUY_ORDER_COMPLETED_EVENT_TAG,
+                                 BuyOrderCompletedEvent(self._current_timestamp,
+                                                        order.order_id,
+                                                        base_asset,
+                                                        quote_asset,
+                                                        quote_asset,
+                                                        order.executed_amount_base,
+                                                        order.executed_amount_quote,
+                                                        order.fee_paid,
+                                                        order.order_type))
+        else:
+            self.c_trigger_event(self.MARKET_SELL_ORDER_COMPLETED_EVENT_TAG,
+                                 SellOrderCompletedEvent(self._current_timestamp,
+                                                         order.order_id,
+                                                         base_asset,
+                                                         quote_asset,
+                                                         quote_asset,
+                                                         order.executed_amount_base,
+                                                         order.executed_amount_quote,
+                                                         order.fee_paid,
+                                                         order.order_type))
+
+    cdef c_release_order(self, BacktestOrder order):
+        """
+        Releases the balance still on hold for the unfilled amount of a limit order.
+        """
+        cdef object remaining_amount = order.quantity - order.executed_amount_base
+        if not order.order_type.is_limit_type() or remaining_amount <= s_decimal_0:
+            return
+        if order.is_buy:
+            self.c_add_on_hold_balance(self._trading_pairs[order.trading_pair][1],
+                                       -remaining_amount * order.limit_price)
+        else:
+            self.c_add_on_hold_balance(self._trading_pairs[order.trading_pair][0], -remaining_amount)
+
+    cdef c_execute_market_order(self, BacktestOrder order, list fills, CompositeOrderBook order_book):
+        """
+        Settles the fills of a market order at the book prices it took, or fails it if there was no liquidity to take
+        or the balance doesn't cover them.
+        """
+        cdef:
+            str base_asset = self._trading_pairs[order.trading_pair][0]
+            str quote_asset = self._trading_pairs[order.trading_pair][1]
+
+        if (len(fills) == 0
+                or (order.is_buy and sum(a * p for a, p in fills) > self.c_get_available_balance(quote_asset))
+                or (not order.is_buy and sum(a for a, _ in fills) > self.c_get_available_balance(base_asset))):
+            self.logger().warning(f"Not enough balance or liquidity to fill market order {order.order_id}.")
+            del self._orders[order.order_id]
+            del self._matching_engine_orders[order.matching_engine_id]
+            self.c_trigger_event(self.MARKET_ORDER_FAILURE_EVENT_TAG,
+                                 MarketOrderFailureEvent(self._current_timestamp, order.order_id, order.order_type))
+            return
+
+        for amount, price in fills:
+            self.c_settle_fill(order, amount, price, False)
+            order_book.record_filled_order(OrderFilledEvent(self._current_timestamp, order.order_id,
+                                                            order.trading_pair,
+                                                            TradeType.BUY if order.is_buy else TradeType.SELL,
+                                                            order.order_type, float(price), float(amount),
+                                                            TradeFee(self._taker_fee)))
+        self.c_complete_order(order)
+
+    cdef object c_get_fee(self,
+                          str base_currency,
+                          str quote_currency,
+                          object order_type,
+                          object order_side,
+                          object amount,
+                          object price):
+        return TradeFee(self._maker_fee if order_type.is_limit_type() else self._taker_fee)
+
+    cdef OrderBook c_get_order_book(self, str trading_pair):
+        if trading_pair not in self._order_books:
+            raise ValueError(f"No order book exists for '{trading_pair}'.")
+        return self._order_books[trading_pair]
+
+    cdef object c_get_order_price_quantum(self, str trading_pair, object price):
+        return self._quantization.get(trading_pair, (s_default_quantum, s_default_quantum))[0]
+
+    cdef object c_get_order_size_quantum(self, str trading_pair, object order_size):
+        return self._quantization.get(trading_pair, (s_default_quantum, s_default_quantum))[1]
+
+    def set_balance(self, currency: str, balance: Decimal):
+        self.c_set_balance(currency, balance)
+
+    def get_available_balance(self, currency: str) -> Decimal:
+        return self.c_get_available_balance(currency)
+
+    def buy(self, trading_pair: str, amount: Decimal, order_type=OrderType.MARKET,
+            price: Decimal = s_decimal_NaN, **kwargs) -> str:
+        return self.c_buy(trading_pair, amount, order_type, price, kwargs)
+
+    def sell(self, trading_pair: str, amount: Decimal, order_type=OrderType.MARKET,
+             price: Decimal = s_decimal_NaN, **kwargs) -> str:
+        return self.c_sell(trading_pair, amount, order_type, price, kwargs)
+
+    def cancel(self, trading_pair: str, client_order_id: str):
+        return self.c_cancel(trading_pair, client_order_id)
+
+    def get_order_book(self, trading_pair: str) -> OrderBook:
+        return self.c_get_order_book(trading_pair)
+
+    def get_fee(self,
+                base_currency: str,
+                quote_currency: str,
+                order_type: OrderType,
+                order_side: TradeType,
+                amount: Decimal,
+                price: Decimal = s_decimal_NaN):
+        return self.c_get_fee(base_currency, quote_currency, order_type, order_side, amount, price)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+import logging
+import math
+import time
+from decimal import Decimal
+from typing import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from hummingbot.backtest.backtest_market import BacktestMarket
+from hummingbot.core.clock import (
+    Clock,
+    ClockMode,
+)
+from hummingbot.core.time_iterator import TimeIterator
+from hummingbot.logger import HummingbotLogger
+
+br_logger = None
+
+
+class BacktestResult(NamedTuple):
+    start_timestamp: float
+    end_timestamp: float
+    ticks: int
+    events_replayed: int
+    fill_count: int
+    wall_time: float
+    ticks_per_second: float
+    events_per_second: float
+    balances: Dict[str, Decimal]
+    balance_history: List[Tuple[float, Dict[str, Decimal]]]
+
+
+class BacktestRunner:
+    """
+    Runs a backtest market and the strategies trading on it with a clock in backtest mode, as fast as they tick
+    rather than in real time, and measures the throughput of the run.
+    """
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        global br_logger
+        if br_logger is None:
+            br_logger = logging.getLogger(__name__)
+        return br_logger
+
+    def __init__(self,
+                 market: BacktestMarket,
+                 strategies: List[TimeIterator],
+                 tick_size: float = 1.0,
+                 start_timestamp: Optional[float] = None,
+                 end_timestamp: Optional[float] = None,
+                 sample_interval: Optional[float] = None):
+        """
+        :param strategies: the strategies, or any other time iterators, to tick after the market
+        :param start_timestamp: defaults to the start of the market data
+        :param end_timestamp: defaults to the end of the market data
+        :param sample_interval: the interval in seconds of the balances in the balance history, no history if None
+        """
+        self._market: BacktestMarket = market
+        self._strategies: List[TimeIterator] = strategies
+        self._tick_size: float = tick_size
+        self._start_timestamp: float = market.start_timestamp if start_timestamp is None else start_timestamp
+        self._end_timestamp: float = market.end_timestamp if end_timestamp is None else end_timestamp
+        self._sample_interval: Optional[float] = sample_interval
+        self._clock: Clock = Clock(ClockMode.BACKTEST, tick_size, self._start_timestamp, self._end_timestamp)
+        # The market ticks first, so that strategies see the order books and fills up to their tick.
+        self._clock.add_iterator(market)
+        for strategy in strategies:
+            self._clock.add_iterator(strategy)
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock
+
+    @property
+    def market(self) -> BacktestMarket:
+        return self._market
+
+    def run(self) -> BacktestResult:
+        events_replayed: int = self._market.events_replayed
+        fill_count: int = self._market.fill_count
+        start_tick: float = self._clock.current_timestamp
+        balance_history: List[Tuple[float, Dict[str, Decimal]]] = []
+        start_time: float = time.perf_counter()
+        if self._sample_interval is None:
+            self._clock.backtest_til(self._end_timestamp)
+        else:
+            balance_history.append((start_tick, self._market.get_all_balances()))
+            while self._clock.current_timestamp < self._end_timestamp:
+                self._clock.backtest_til(min(self._clock.current_timestamp + self._sample_interval,
+                                             self._end_timestamp))
+                balance_history.append((self._clock.current_timestamp, self._market.get_all_balances()))
+        wall_time: float = time.perf_counter() - start_time
+
+        ticks: int = int(round((self._clock.current_timestamp - start_tick) / self._tick_size))
+        events_replayed = self._market.events_replayed - events_replayed
+        result: BacktestResult = BacktestResult(
+            start_timestamp=start_tick,
+            end_timestamp=self._clock.current_timestamp,
+            ticks=ticks,
+            events_replayed=events_replayed,
+            fill_count=self._market.fill_count - fill_count,
+            wall_time=wall_time,
+            ticks_per_second=ticks / wall_time if wall_time > 0 else math.inf,
+            events_per_second=events_replayed / wall_time if wall_time > 0 else math.inf,
+            balances=self._market.get_all_balances(),
+            balance_history=balance_history,
+        )
+        self.logger().info(f"Backtested {result.ticks} ticks and {result.events_replayed} market data events in "
+                           f"{result.wall_time:.2f}s: {result.ticks_per_second:,.0f} ticks/s, "
+                           f"{result.events_per_second:,.0f} events/s, {result.fill_count} fills.")
+        return result
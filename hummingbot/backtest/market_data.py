@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+from enum import IntEnum
+from typing import (
+    Iterable,
+    Union,
+)
+
+import numpy as np
+
+from hummingbot.core.event.events import TradeType
+
+
+class MarketDataType(IntEnum):
+    SNAPSHOT = 1
+    DIFF = 2
+    TRADE = 3
+
+
+# One row per order book entry or trade of a trading pair, in timestamp order. The side of order book entries is
+# TradeType.BUY for bids and TradeType.SELL for asks, the side of trades is the taker side.
+MARKET_DATA_DTYPE = np.dtype([
+    ("timestamp", np.float64),
+    ("update_id", np.int64),
+    ("price", np.float64),
+    ("amount", np.float64),
+    ("type", np.uint8),
+    ("side", np.uint8),
+], align=True)
+
+BID = TradeType.BUY.value
+ASK = TradeType.SELL.value
+
+
+def order_book_rows(data_type: MarketDataType,
+                    timestamp: float,
+                    update_id: int,
+                    bids: Union[np.ndarray, Iterable],
+                    asks: Union[np.ndarray, Iterable]) -> np.ndarray:
+    """
+    :param bids: [price, amount] rows of the bids
+    :param asks: [price, amount] rows of the asks
+    """
+    bids = np.asarray(bids, dtype=np.float64).reshape(-1, 2)
+    asks = np.asarray(asks, dtype=np.float64).reshape(-1, 2)
+    rows: np.ndarray = np.zeros(len(bids) + len(asks), dtype=MARKET_DATA_DTYPE)
+    rows["timestamp"] = timestamp
+    rows["update_id"] = update_id
+    rows["type"] = data_type
+    rows["price"][:len(bids)] = bids[:, 0]
+    rows["amount"][:len(bids)] = bids[:, 1]
+    rows["side"][:len(bids)] = BID
+    rows["price"][len(bids):] = asks[:, 0]
+    rows["amount"][len(bids):] = asks[:, 1]
+    rows["side"][len(bids):] = ASK
+    return rows
+
+
+def snapshot_rows(timestamp: float, update_id: int, bids, asks) -> np.ndarray:
+    return order_book_rows(MarketDataType.SNAPSHOT, timestamp, update_id, bids, asks)
+
+
+def diff_rows(timestamp: float, update_id: int, bids, asks) -> np.ndarray:
+    return order_book_rows(MarketDataType.DIFF, timestamp, update_id, bids, asks)
+
+
+def trade_rows(timestamps, trade_types, prices, amounts) -> np.ndarray:
+    """
+    :param trade_types: the taker side of each trade, as TradeType or its value
+    """
+    timestamps = np.atleast_1d(np.asarray(timestamps, dtype=np.float64))
+    trade_types = np.atleast_1d(np.asarray(trade_types))
+    if trade_types.dtype == object:
+        trade_types = np.array([t.value if isinstance(t, TradeType) else t for t in trade_types])
+    rows: np.ndarray = np.zeros(len(timestamps), dtype=MARKET_DATA_DTYPE)
+    rows["timestamp"] = timestamps
+    rows["type"] = MarketDataType.TRADE
+    rows["side"] = trade_types
+    rows["price"] = prices
+    rows["amount"] = amounts
+    return rows
+
+
+def merge_market_data(*arrays: np.ndarray) -> np.ndarray:
+    """
+    Merges market data arrays into one, in timestamp order. Rows with the same timestamp keep their order.
+    """
+    merged: np.ndarray = np.concatenate(arrays)
+    return merged[np.argsort(merged["timestamp"], kind="stable")]
+
+
+def save_market_data(path: str, data: np.ndarray):
+    np.save(path, np.ascontiguousarray(data, dtype=MARKET_DATA_DTYPE), allow_pickle=False)
+
+
+def load_market_data(path: str, mmap: bool = True) -> np.ndarray:
+    """
+    Loads market data saved by save_market_data, memory mapped read only by default so that processes replaying the
+    same file share its pages.
+    """
+    return np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+
+
+def generate_market_data(start_timestamp: float,
+                         end_timestamp: float,
+                         interval: float = 0.1,
+                         mid_price: float = 100.0,
+                         price_step: float = 0.01,
+                         depth: int = 20,
+                         level_amount: float = 10.0,
+                         move_probability: float = 0.2,
+                         trade_probability: float = 0.1,
+                         seed: int = 0) -> np.ndarray:
+    """
+    Generates a random walk of an order book, for tests and benchmarks. Every interval the best bid and ask move by
+    at most one price step, a random level is updated, and the levels crossed by a move are traded through.
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    num_intervals: int = int(round((end_timestamp - start_timestamp) / interval))
+    timestamps: np.ndarray = start_timestamp + interval * np.arange(1, num_intervals + 1)
+    update_ids: np.ndarray = np.arange(2, num_intervals + 2, dtype=np.int64)
+
+    # Prices are kept in whole price steps, and divided rather than multiplied back so that they equal the parsed
+    # decimal prices, e.g. 9999 / 100 == 99.99.
+    steps_per_unit: float = float(round(1 / price_step))
+    mid_steps: int = int(round(mid_price * steps_per_unit))
+    moves: np.ndarray = rng.choice([-1, 0, 1], size=num_intervals,
+                                   p=[move_probability / 2, 1 - move_probability, move_probability / 2])
+    best_bid_steps: np.ndarray = mid_steps - 1 + np.cumsum(moves)
+    previous_best_bid_steps: np.ndarray = np.concatenate([[mid_steps - 1], best_bid_steps[:-1]])
+    levels: np.ndarray = np.arange(depth)
+
+    snapshot: np.ndarray = snapshot_rows(
+        start_timestamp, 1,
+        np.column_stack([(mid_steps - 1 - levels) / steps_per_unit, np.full(depth, level_amount)]),
+        np.column_stack([(mid_steps + 1 + levels) / steps_per_unit, np.full(depth, level_amount)]))
+
+    # Per interval: the new best bid and ask, the clearing of the level a step inside of them, and a random level.
+    amounts: np.ndarray = rng.uniform(0.5, 1.5, size=(num_intervals, 3)) * level_amount
+    random_levels: np.ndarray = rng.integers(1, depth, size=num_intervals)
+    random_sides: np.ndarray = rng.choice([BID, ASK], size=num_intervals)
+    random_level_steps: np.ndarray = np.where(random_sides == BID,
+                                              best_bid_steps - random_levels,
+                                              best_bid_steps + 2 + random_levels)
+    diffs: np.ndarray = np.zeros((num_intervals, 5), dtype=MARKET_DATA_DTYPE)
+    diffs["timestamp"] = timestamps[:, None]
+    diffs["update_id"] = update_ids[:, None]
+    diffs["type"] = MarketDataType.DIFF
+    diffs["side"] = np.column_stack([np.full(num_intervals, BID), np.full(num_intervals, ASK),
+                                     np.full(num_intervals, BID), np.full(num_intervals, ASK), random_sides])
+    diffs["price"] = np.column_stack([best_bid_steps, best_bid_steps + 2, best_bid_steps + 1, best_bid_steps + 1,
+                                      random_level_steps]) / steps_per_unit
+    diffs["amount"] = np.column_stack([amounts[:, 0], amounts[:, 1], np.zeros(num_intervals),
+                                       np.zeros(num_intervals), amounts[:, 2]])
+
+    # Trades happen before the diffs of their interval, at the previous best prices: through the best level on a
+    # move, and at random otherwise.
+    random_trades: np.ndarray = (moves == 0) & (rng.random(num_intervals) < trade_probability)
+    is_trade: np.ndarray = (moves != 0) | random_trades
+    trade_sides: np.ndarray = np.where(moves > 0, TradeType.BUY.value,
+                                       np.where(moves < 0, TradeType.SELL.value,
+                                                rng.choice([TradeType.BUY.value, TradeType.SELL.value],
+                                                           size=num_intervals)))
+    trade_prices: np.ndarray = np.where(trade_sides == TradeType.BUY.value,
+                                        previous_best_bid_steps + 2,
+                                        previous_best_bid_steps) / steps_per_unit
+    trade_amounts: np.ndarray = np.where(moves != 0, level_amount * 1.5, rng.uniform(0.1, 0.5, num_intervals) *
+                                         level_amount)
+    trades: np.ndarray = trade_rows(timestamps[is_trade] - interval / 2, trade_sides[is_trade],
+                                    trade_prices[is_trade], trade_amounts[is_trade])
+
+    return merge_market_data(snapshot, trades, diffs.reshape(-1))
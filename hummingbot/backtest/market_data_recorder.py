@@ -0,0 +1,418 @@
+#!/usr/bin/env python
+
+import logging
+import os
+import time
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+from typing import (
+    BinaryIO,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from hummingbot.backtest.market_data import (
+    ASK,
+    BID,
+    MARKET_DATA_DTYPE,
+    MarketDataType,
+    order_book_rows,
+)
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import (
+    OrderBookMessage,
+    OrderBookMessageType,
+)
+from hummingbot.core.event.events import TradeType
+from hummingbot.logger import HummingbotLogger
+
+mdr_logger = None
+
+ROTATION_INTERVAL = 3600
+RECORDING_FILE_EXTENSION = ".bin"
+COMPRESSED_FILE_EXTENSION = ".npz"
+
+
+def market_data_file_name(timestamp: float) -> str:
+    return time.strftime("%Y%m%d-%H", time.gmtime(timestamp))
+
+
+def market_data_files(data_dir: str, trading_pair: str) -> List[str]:
+    """
+    Returns the recorded market data files of a trading pair, in time order.
+    """
+    pair_dir: str = os.path.join(data_dir, trading_pair)
+    if not os.path.isdir(pair_dir):
+        return []
+    return [os.path.join(pair_dir, file_name) for file_name in sorted(os.listdir(pair_dir))
+            if file_name.endswith(RECORDING_FILE_EXTENSION) or file_name.endswith(COMPRESSED_FILE_EXTENSION)]
+
+
+def load_market_data_file(path: str) -> np.ndarray:
+    """
+    Loads a recorded market data file. Recording files are memory mapped read only, leaving out a partially written
+    last row, and compressed files are decompressed into memory.
+    """
+    if path.endswith(COMPRESSED_FILE_EXTENSION):
+        with np.load(path, allow_pickle=False) as columns:
+            data: np.ndarray = np.empty(len(columns["timestamp"]), dtype=MARKET_DATA_DTYPE)
+            for name in MARKET_DATA_DTYPE.names:
+                data[name] = columns[name]
+        return data
+    num_rows: int = os.path.getsize(path) // MARKET_DATA_DTYPE.itemsize
+    if num_rows == 0:
+        return np.empty(0, dtype=MARKET_DATA_DTYPE)
+    return np.memmap(path, dtype=MARKET_DATA_DTYPE, mode="r", shape=(num_rows,))
+
+
+def load_recorded_market_data(data_dir: str,
+                              trading_pair: str,
+                              start_timestamp: Optional[float] = None,
+                              end_timestamp: Optional[float] = None) -> np.ndarray:
+    """
+    Loads the market data of a trading pair recorded by MarketDataRecorder, from the files of the hours between
+    start_timestamp and end_timestamp. Each file starts with a checkpoint, so the data can be replayed from any hour.
+    A single recording file is returned memory mapped.
+    """
+    first_file: str = market_data_file_name(start_timestamp) if start_timestamp is not None else ""
+    last_file: str = market_data_file_name(end_timestamp) if end_timestamp is not None else "~"
+    arrays: List[np.ndarray] = [load_market_data_file(path) for path in market_data_files(data_dir, trading_pair)
+                                if first_file <= os.path.basename(path).split(".")[0] <= last_file]
+    if len(arrays) == 0:
+        return np.empty(0, dtype=MARKET_DATA_DTYPE)
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.concatenate(arrays)
+
+
+def compress_market_data_file(path: str) -> str:
+    """
+    Compresses a recording file into a column by column compressed .npz file, and removes it.
+    """
+    data: np.ndarray = load_market_data_file(path)
+    compressed_path: str = path[:-len(RECORDING_FILE_EXTENSION)] + COMPRESSED_FILE_EXTENSION
+    with open(compressed_path + ".tmp", "wb") as fd:
+        np.savez_compressed(fd, **{name: data[name] for name in MARKET_DATA_DTYPE.names})
+    del data
+    os.replace(compressed_path + ".tmp", compressed_path)
+    os.remove(path)
+    return compressed_path
+
+
+def find_checkpoint(data: np.ndarray, timestamp: float) -> int:
+    """
+    Returns the index of the first row of the last snapshot at or before timestamp, or -1 if there is none.
+    """
+    end: int = int(np.searchsorted(data["timestamp"], timestamp, side="right"))
+    snapshot_indices: np.ndarray = np.flatnonzero(data["type"][:end] == MarketDataType.SNAPSHOT)
+    if len(snapshot_indices) == 0:
+        return -1
+    last: int = int(snapshot_indices[-1])
+    # The rows of a snapshot are written together, with the same timestamp and update id.
+    same_snapshot: np.ndarray = ((data["timestamp"][snapshot_indices] == data["timestamp"][last]) &
+                                 (data["update_id"][snapshot_indices] == data["update_id"][last]))
+    return int(snapshot_indices[np.argmax(same_snapshot)])
+
+
+def order_book_messages(trading_pair: str,
+                        data: np.ndarray,
+                        timestamp: float) -> Tuple[OrderBookMessage, List[OrderBookMessage]]:
+    """
+    Returns the last snapshot at or before timestamp and the diffs after it up to timestamp, as messages for
+    OrderBook.restore_from_snapshot_and_diffs().
+    """
+    start: int = find_checkpoint(data, timestamp)
+    if start < 0:
+        raise ValueError(f"No {trading_pair} order book snapshot at or before {timestamp}.")
+    end: int = int(np.searchsorted(data["timestamp"], timestamp, side="right"))
+    rows: np.ndarray = data[start:end]
+    # Batches of consecutive rows of the same type and update id.
+    boundaries: np.ndarray = np.flatnonzero((rows["type"][1:] != rows["type"][:-1]) |
+                                            (rows["update_id"][1:] != rows["update_id"][:-1])) + 1
+    batches: List[np.ndarray] = np.split(rows, boundaries)
+    messages: List[OrderBookMessage] = []
+    for index, batch in enumerate(batches):
+        if batch["type"][0] == MarketDataType.TRADE or (index > 0 and batch["type"][0] == MarketDataType.SNAPSHOT):
+            continue
+        entries: np.ndarray = np.column_stack([batch["price"], batch["amount"],
+                                               batch["update_id"].astype(np.float64)])
+        is_bid: np.ndarray = batch["side"] == TradeType.BUY.value
+        messages.append(OrderBookMessage(
+            OrderBookMessageType.SNAPSHOT if index == 0 else OrderBookMessageType.DIFF,
+            {
+                "trading_pair": trading_pair,
+                "update_id": int(batch["update_id"][0]),
+                "bids": np.ascontiguousarray(entries[is_bid]),
+                "asks": np.ascontiguousarray(entries[~is_bid]),
+            },
+            timestamp=float(batch["timestamp"][0])
+        ))
+    return messages[0], messages[1:]
+
+
+class MarketDataWriter:
+    """
+    Appends the market data rows of a trading pair to an hourly recording file, through a fixed size buffer. The
+    recording files are plain arrays of MARKET_DATA_DTYPE rows, so they can be memory mapped while being written.
+    """
+    def __init__(self, data_dir: str, trading_pair: str, buffer_size: int):
+        self._pair_dir: str = os.path.join(data_dir, trading_pair)
+        self._buffer: np.ndarray = np.empty(buffer_size, dtype=MARKET_DATA_DTYPE)
+        self._buffer_rows: int = 0
+        self._fd: Optional[BinaryIO] = None
+        self._path: Optional[str] = None
+        self._file_timestamp: float = float("nan")
+        self._rows_written: int = 0
+
+    @property
+    def path(self) -> Optional[str]:
+        return self._path
+
+    @property
+    def file_timestamp(self) -> float:
+        """
+        The start of the hour of the current file.
+        """
+        return self._file_timestamp
+
+    @property
+    def rows_written(self) -> int:
+        return self._rows_written + self._buffer_rows
+
+    def is_current(self, timestamp: float) -> bool:
+        return self._file_timestamp <= timestamp < self._file_timestamp + ROTATION_INTERVAL
+
+    def rotate(self, timestamp: float) -> Optional[str]:
+        """
+        Closes the current file and opens the file of the hour of timestamp. Returns the path of the closed file.
+        """
+        closed_path: Optional[str] = self.close()
+        self._file_timestamp = timestamp - timestamp % ROTATION_INTERVAL
+        self._path = os.path.join(self._pair_dir, market_data_file_name(timestamp) + RECORDING_FILE_EXTENSION)
+        os.makedirs(self._pair_dir, exist_ok=True)
+        self._fd = open(self._path, "ab")
+        # Drops a partially written last row, when appending to the file of an interrupted recording.
+        size: int = self._fd.tell()
+        if size % MARKET_DATA_DTYPE.itemsize != 0:
+            self._fd.truncate(size - size % MARKET_DATA_DTYPE.itemsize)
+        return closed_path
+
+    def write_order_book_rows(self,
+                              data_type: MarketDataType,
+                              timestamp: float,
+                              update_id: int,
+                              bids: np.ndarray,
+                              asks: np.ndarray):
+        """
+        Writes the rows of a snapshot or a diff in place into the buffer, see order_book_rows().
+
+        :param bids: [price, amount, ...] rows of the bids
+        :param asks: [price, amount, ...] rows of the asks
+        """
+        num_bids: int = len(bids)
+        num_rows: int = num_bids + len(asks)
+        if self._buffer_rows + num_rows > len(self._buffer):
+            self.flush()
+            if num_rows > len(self._buffer):
+                order_book_rows(data_type, timestamp, update_id, bids[:, :2], asks[:, :2]).tofile(self._fd)
+                self._rows_written += num_rows
+                return
+        rows: np.ndarray = self._buffer[self._buffer_rows:self._buffer_rows + num_rows]
+        rows["timestamp"] = timestamp
+        rows["update_id"] = update_id
+        rows["type"] = data_type
+        rows["price"][:num_bids] = bids[:, 0]
+        rows["amount"][:num_bids] = bids[:, 1]
+        rows["side"][:num_bids] = BID
+        rows["price"][num_bids:] = asks[:, 0]
+        rows["amount"][num_bids:] = asks[:, 1]
+        rows["side"][num_bids:] = ASK
+        self._buffer_rows += num_rows
+
+    def write_trade(self, timestamp: float, trade_type: TradeType, price: float, amount: float):
+        if self._buffer_rows == len(self._buffer):
+            self.flush()
+        self._buffer[self._buffer_rows] = (timestamp, 0, price, amount, MarketDataType.TRADE, trade_type.value)
+        self._buffer_rows += 1
+
+    def flush(self):
+        if self._fd is None:
+            return
+        if self._buffer_rows > 0:
+            self._buffer[:self._buffer_rows].tofile(self._fd)
+            self._rows_written += self._buffer_rows
+            self._buffer_rows = 0
+        self._fd.flush()
+
+    def close(self) -> Optional[str]:
+        if self._fd is None:
+            return None
+        self.flush()
+        self._fd.close()
+        self._fd = None
+        return self._path
+
+
+class MarketDataRecorder:
+    """
+    Records the order book snapshots, diffs and trades of trading pairs to files, per trading pair and per hour, in
+    the market data format replayed by backtests, see market_data.py. Set it as the recorder of an order book tracker
+    to record everything the tracker applies to its order books. With a ShardedOrderBookTracker, that is the top
+    price levels synced from the workers, as one diff per sync.
+
+    Rows are stamped with the local time they are recorded at, so that files are in timestamp order and backtests see
+    the data when a live strategy would have. Every file starts with a checkpoint, i.e. a snapshot of the order book,
+    and checkpoints are written at every multiple of checkpoint_interval seconds, so that replays can start from any
+    hour, and OrderBook.restore_from_snapshot_and_diffs() can restore an order book at any time, from at most
+    checkpoint_interval seconds of diffs.
+
+    Rows are buffered in memory and written every flush_interval seconds. Files of past hours are compressed in a
+    background thread if compress is set, recording files are kept as is so they can be memory mapped.
+    """
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        global mdr_logger
+        if mdr_logger is None:
+            mdr_logger = logging.getLogger(__name__)
+        return mdr_logger
+
+    def __init__(self,
+                 data_dir: str,
+                 checkpoint_interval: float = 60.0,
+                 checkpoint_depth: Optional[int] = None,
+                 flush_interval: float = 5.0,
+                 buffer_size: int = 65536,
+                 compress: bool = True):
+        """
+        :param checkpoint_depth: the number of price levels per side of checkpoints, the whole order book if None
+        """
+        self._data_dir: str = data_dir
+        self._checkpoint_interval: float = checkpoint_interval
+        self._checkpoint_depth: Optional[int] = checkpoint_depth
+        self._flush_interval: float = flush_interval
+        self._buffer_size: int = buffer_size
+        self._compress: bool = compress
+        self._writers: Dict[str, MarketDataWriter] = {}
+        self._order_books: Dict[str, OrderBook] = {}
+        self._last_checkpoints: Dict[str, float] = {}
+        self._last_flush: float = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._compressions: List[Future] = []
+
+    @property
+    def data_dir(self) -> str:
+        return self._data_dir
+
+    @property
+    def trading_pairs(self) -> List[str]:
+        return list(self._writers.keys())
+
+    @property
+    def rows_written(self) -> Dict[str, int]:
+        return {trading_pair: writer.rows_written for trading_pair, writer in self._writers.items()}
+
+    def record_order_book(self, trading_pair: str, order_book: OrderBook, timestamp: Optional[float] = None):
+        """
+        Writes a checkpoint of an order book, which is checkpointed from then on. Call it whenever the order book is
+        initialized or restored from a snapshot.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self._order_books[trading_pair] = order_book
+        writer: MarketDataWriter = self._get_writer(trading_pair, timestamp, checkpoint=False)
+        self._write_checkpoint(trading_pair, writer, timestamp)
+        self._check_flush(timestamp)
+
+    def record_diff(self,
+                    trading_pair: str,
+                    update_id: int,
+                    bids: np.ndarray,
+                    asks: np.ndarray,
+                    timestamp: Optional[float] = None):
+        """
+        Writes a diff before it is applied to the order book.
+
+        :param bids: [price, amount, ...] rows of the bids, e.g. OrderBookMessage.bids_array
+        :param asks: [price, amount, ...] rows of the asks
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        writer: MarketDataWriter = self._get_writer(trading_pair, timestamp)
+        writer.write_order_book_rows(MarketDataType.DIFF, timestamp, update_id, bids, asks)
+        self._check_flush(timestamp)
+
+    def record_trade(self,
+                     trading_pair: str,
+                     trade_type: TradeType,
+                     price: float,
+                     amount: float,
+                     timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        writer: MarketDataWriter = self._get_writer(trading_pair, timestamp)
+        writer.write_trade(timestamp, trade_type, price, amount)
+        self._check_flush(timestamp)
+
+    def flush(self):
+        for writer in self._writers.values():
+            writer.flush()
+
+    def close(self):
+        """
+        Closes the files, and waits for the compression of past files to finish.
+        """
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+        self._order_books.clear()
+        self._last_checkpoints.clear()
+        for future in self._compressions:
+            future.result()
+        self._compressions.clear()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_writer(self, trading_pair: str, timestamp: float, checkpoint: bool = True) -> MarketDataWriter:
+        writer: Optional[MarketDataWriter] = self._writers.get(trading_pair)
+        if writer is None:
+            writer = self._writers[trading_pair] = MarketDataWriter(self._data_dir, trading_pair, self._buffer_size)
+        if not writer.is_current(timestamp):
+            closed_path: Optional[str] = writer.rotate(timestamp)
+            if closed_path is not None and self._compress:
+                self._compress_file(closed_path)
+            if checkpoint:
+                self._write_checkpoint(trading_pair, writer, timestamp)
+        elif checkpoint and (timestamp // self._checkpoint_interval >
+                             self._last_checkpoints.get(trading_pair, timestamp) // self._checkpoint_interval):
+            self._write_checkpoint(trading_pair, writer, timestamp)
+        return writer
+
+    def _write_checkpoint(self, trading_pair: str, writer: MarketDataWriter, timestamp: float):
+        order_book: Optional[OrderBook] = self._order_books.get(trading_pair)
+        if order_book is None:
+            return
+        bids, asks = order_book.numpy_snapshot(self._checkpoint_depth)
+        writer.write_order_book_rows(MarketDataType.SNAPSHOT, timestamp,
+                                     max(order_book.snapshot_uid, order_book.last_diff_uid), bids, asks)
+        self._last_checkpoints[trading_pair] = timestamp
+
+    def _check_flush(self, timestamp: float):
+        if timestamp - self._last_flush >= self._flush_interval:
+            self.flush()
+            self._last_flush = timestamp
+
+    def _compress_file(self, path: str):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._compressions = [future for future in self._compressions if not future.done()]
+        future: Future = self._executor.submit(compress_market_data_file, path)
+        future.add_done_callback(self._compression_done)
+        self._compressions.append(future)
+
+    def _compression_done(self, future: Future):
+        if future.exception() is not None:
+            self.logger().error("Error compressing market data file.", exc_info=future.exception())
@@ -0,0 +1,36 @@
+# distutils: language=c++
+
+from libc.stdint cimport (
+    int64_t,
+    uint8_t,
+)
+from libcpp.vector cimport vector
+
+from hummingbot.core.data_type.composite_order_book cimport CompositeOrderBook
+from hummingbot.core.data_type.order_book cimport OrderBook
+from hummingbot.core.data_type.OrderBookEntry cimport OrderBookEntry
+
+
+cdef class OrderBookReplay:
+    cdef:
+        str _trading_pair
+        OrderBook _order_book
+        object _data
+        const double[:] _timestamps
+        const int64_t[:] _update_ids
+        const double[:] _prices
+        const double[:] _amounts
+        const uint8_t[:] _types
+        const uint8_t[:] _sides
+        Py_ssize_t _cursor
+        int64_t _events_replayed
+        object _trade_type_buy
+        object _trade_type_sell
+
+    cdef c_replay_until(self, double timestamp)
+    cdef c_apply_entries(self,
+                         uint8_t data_type,
+                         vector[OrderBookEntry] &bids,
+                         vector[OrderBookEntry] &asks,
+                         int64_t update_id)
+    cdef c_apply_trade(self, Py_ssize_t index)
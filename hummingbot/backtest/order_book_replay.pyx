@@ -0,0 +1,140 @@
+# distutils: language=c++
+# distutils: sources=['hummingbot/core/cpp/OrderBookEntry.cpp', 'hummingbot/core/cpp/MatchingEngine.cpp']
+
+import numpy as np
+
+from hummingbot.backtest.market_data import (
+    MARKET_DATA_DTYPE,
+    MarketDataType,
+)
+from hummingbot.core.event.events import (
+    OrderBookTradeEvent,
+    TradeType,
+)
+
+cdef uint8_t SNAPSHOT = MarketDataType.SNAPSHOT
+cdef uint8_t DIFF = MarketDataType.DIFF
+cdef uint8_t TRADE = MarketDataType.TRADE
+cdef uint8_t BUY = TradeType.BUY.value
+
+
+cdef class OrderBookReplay:
+    """
+    Replays the market data of a trading pair, see market_data.py, into an order book in timestamp order. The rows of
+    a snapshot or a diff, i.e. consecutive rows of the same type and update id, are applied at once.
+
+    When replayed into a composite order book, its matching engine sees every trade and order book update in turn, and
+    its orders and cancels take effect between the rows, at their own timestamps.
+    """
+    def __init__(self, str trading_pair, OrderBook order_book, object data):
+        if data.dtype != MARKET_DATA_DTYPE:
+            raise ValueError(f"Market data of {trading_pair} is not of the market data dtype.")
+        self._trading_pair = trading_pair
+        self._order_book = order_book
+        # Field views of the structured array, kept alive by _data. Read only memory maps are replayed in place.
+        self._data = data
+        self._timestamps = data["timestamp"]
+        self._update_ids = data["update_id"]
+        self._prices = data["price"]
+        self._amounts = data["amount"]
+        self._types = data["type"]
+        self._sides = data["side"]
+        self._cursor = 0
+        self._events_replayed = 0
+        self._trade_type_buy = TradeType.BUY
+        self._trade_type_sell = TradeType.SELL
+
+    @property
+    def trading_pair(self) -> str:
+        return self._trading_pair
+
+    @property
+    def order_book(self) -> OrderBook:
+        return self._order_book
+
+    @property
+    def events_replayed(self) -> int:
+        return self._events_replayed
+
+    @property
+    def start_timestamp(self) -> float:
+        return self._timestamps[0] if len(self._data) > 0 else float("nan")
+
+    @property
+    def end_timestamp(self) -> float:
+        return self._timestamps[len(self._data) - 1] if len(self._data) > 0 else float("nan")
+
+    @property
+    def done(self) -> bool:
+        return self._cursor >= len(self._data)
+
+    cdef c_replay_until(self, double timestamp):
+        cdef:
+            Py_ssize_t index = self._cursor
+            Py_ssize_t size = self._timestamps.shape[0]
+            vector[OrderBookEntry] bids
+            vector[OrderBookEntry] asks
+            uint8_t batch_type = 0
+            int64_t batch_update_id = 0
+            uint8_t data_type
+            double row_timestamp
+            double next_pending_timestamp = float("inf")
+            CompositeOrderBook composite_order_book = None
+
+        if isinstance(self._order_book, CompositeOrderBook):
+            composite_order_book = self._order_book
+            next_pending_timestamp = composite_order_book._matching_engine.getNextPendingTimestamp()
+
+        while index < size and self._timestamps[index] <= timestamp:
+            row_timestamp = self._timestamps[index]
+            data_type = self._types[index]
+            if batch_type != 0 and (data_type != batch_type or self._update_ids[index] != batch_update_id):
+                self.c_apply_entries(batch_type, bids, asks, batch_update_id)
+                batch_type = 0
+            if next_pending_timestamp <= row_timestamp:
+                if batch_type != 0:
+                    self.c_apply_entries(batch_type, bids, asks, batch_update_id)
+                    batch_type = 0
+                composite_order_book._matching_engine.advanceTo(row_timestamp)
+                next_pending_timestamp = composite_order_book._matching_engine.getNextPendingTimestamp()
+
+            if data_type == TRADE:
+                self.c_apply_trade(index)
+            else:
+                batch_type = data_type
+                batch_update_id = self._update_ids[index]
+                if self._sides[index] == BUY:
+                    bids.push_back(OrderBookEntry(self._prices[index], self._amounts[index], batch_update_id))
+                else:
+                    asks.push_back(OrderBookEntry(self._prices[index], self._amounts[index], batch_update_id))
+            index += 1
+
+        if batch_type != 0:
+            self.c_apply_entries(batch_type, bids, asks, batch_update_id)
+        self._events_replayed += index - self._cursor
+        self._cursor = index
+
+    cdef c_apply_entries(self,
+                         uint8_t data_type,
+                         vector[OrderBookEntry] &bids,
+                         vector[OrderBookEntry] &asks,
+                         int64_t update_id):
+        if data_type == SNAPSHOT:
+            self._order_book.c_apply_snapshot(bids, asks, update_id)
+        else:
+            self._order_book.c_apply_diffs(bids, asks, update_id)
+        bids.clear()
+        asks.clear()
+
+    cdef c_apply_trade(self, Py_ssize_t index):
+        cdef bint is_taker_buy = self._sides[index] == BUY
+        self._order_book.c_apply_trade(OrderBookTradeEvent(
+            trading_pair=self._trading_pair,
+            timestamp=self._timestamps[index],
+            type=self._trade_type_buy if is_taker_buy else self._trade_type_sell,
+            price=self._prices[index],
+            amount=self._amounts[index]
+        ))
+
+    def replay_until(self, timestamp: float):
+        self.c_replay_until(timestamp)
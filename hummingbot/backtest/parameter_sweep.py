@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+
+import asyncio
+import itertools
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+import numpy as np
+import pandas as pd
+import ruamel.yaml
+
+from hummingbot.backtest.backtest_market import BacktestMarket
+from hummingbot.backtest.backtest_runner import (
+    BacktestResult,
+    BacktestRunner,
+)
+from hummingbot.backtest.market_data import (
+    load_market_data,
+    save_market_data,
+)
+from hummingbot.backtest.market_data_recorder import load_recorded_market_data
+from hummingbot.client.config.config_helpers import (
+    get_strategy_config_map,
+    parse_cvar_value,
+)
+from hummingbot.client.config.config_var import ConfigVar
+from hummingbot.client.performance import (
+    PerformanceMetrics,
+    calculate_performance_metrics,
+)
+from hummingbot.core.data_type.trade import Trade
+from hummingbot.core.event.event_forwarder import EventForwarder
+from hummingbot.core.event.events import (
+    MarketEvent,
+    OrderFilledEvent,
+)
+from hummingbot.logger import HummingbotLogger
+from hummingbot.strategy.avellaneda_market_making import AvellanedaMarketMakingStrategy
+from hummingbot.strategy.avellaneda_market_making.start import (
+    strategy_parameters as avellaneda_market_making_parameters,
+)
+from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
+from hummingbot.strategy.pure_market_making import PureMarketMakingStrategy
+from hummingbot.strategy.pure_market_making.start import strategy_parameters as pure_market_making_parameters
+from hummingbot.strategy.strategy_base import StrategyBase
+
+ps_logger = None
+
+# Memory mapped market data of the sweep worker processes, by path.
+_market_data: Dict[str, np.ndarray] = {}
+
+
+def load_strategy_config(yml_path: str) -> Dict[str, Any]:
+    """
+    Reads the values of a strategy config file, e.g. one created from a template by the `create` command, parsed by
+    the strategy's config map, without setting them on the config map. Missing values are the config defaults.
+    """
+    with open(yml_path) as fd:
+        data: Dict[str, Any] = ruamel.yaml.YAML().load(fd) or {}
+    strategy: Optional[str] = data.get("strategy")
+    config_map: Optional[Dict[str, ConfigVar]] = get_strategy_config_map(strategy) if strategy else None
+    if config_map is None:
+        raise ValueError(f"{yml_path} is not a strategy config file.")
+    config: Dict[str, Any] = {}
+    for key, cvar in config_map.items():
+        value: Any = data.get(key)
+        config[key] = cvar.default if value is None or value == "" else parse_cvar_value(cvar, value)
+    return config
+
+
+def build_pure_market_making(market_info: MarketTradingPairTuple, config: Dict[str, Any]) -> StrategyBase:
+    if config["price_source"] != "current_market" or config["price_type"] == "inventory_cost":
+        raise ValueError("Backtests only support prices from the current market.")
+    return PureMarketMakingStrategy(market_info=market_info,
+                                    logging_options=0,
+                                    **pure_market_making_parameters(config))
+
+
+def build_avellaneda_market_making(market_info: MarketTradingPairTuple, config: Dict[str, Any]) -> StrategyBase:
+    return AvellanedaMarketMakingStrategy(market_info=market_info,
+                                          logging_options=0,
+                                          is_debug=False,
+                                          **avellaneda_market_making_parameters(config))
+
+
+# Builds a strategy from the values of its config map, with the arguments of the strategy's start.py.
+STRATEGY_BUILDERS: Dict[str, Callable[[MarketTradingPairTuple, Dict[str, Any]], StrategyBase]] = {
+    "pure_market_making": build_pure_market_making,
+    "avellaneda_market_making": build_avellaneda_market_making,
+}
+
+
+class SweepTask(NamedTuple):
+    data_path: str
+    strategy_config: Dict[str, Any]
+    parameters: Dict[str, Any]
+    balances: Dict[str, Decimal]
+    market_options: Dict[str, Any]
+    price_quantum: Decimal
+    size_quantum: Decimal
+    tick_size: float
+    inventory_interval: Optional[float]
+
+
+def run_sweep_task(task: SweepTask) -> Dict[str, Any]:
+    """
+    Runs the backtest of one parameter combination, and returns its row of the sweep results.
+    """
+    data: Optional[np.ndarray] = _market_data.get(task.data_path)
+    if data is None:
+        data = _market_data[task.data_path] = load_market_data(task.data_path)
+    config: Dict[str, Any] = {**task.strategy_config, **task.parameters}
+    trading_pair: str = config["market"]
+    base, quote = trading_pair.split("-")
+
+    market: BacktestMarket = BacktestMarket(**task.market_options)
+    market.add_data(trading_pair, base, quote, data, task.price_quantum, task.size_quantum)
+    for asset, balance in task.balances.items():
+        market.set_balance(asset, balance)
+    trades: List[Trade] = []
+
+    def record_fill(event: OrderFilledEvent):
+        trades.append(Trade(trading_pair=event.trading_pair,
+                            side=event.trade_type,
+                            price=event.price,
+                            amount=event.amount,
+                            order_type=event.order_type,
+                            market=market.name,
+                            timestamp=event.timestamp,
+                            trade_fee=event.trade_fee))
+
+    fill_forwarder: EventForwarder = EventForwarder(record_fill)
+    market.add_listener(MarketEvent.OrderFilled, fill_forwarder)
+    strategy: StrategyBase = STRATEGY_BUILDERS[config["strategy"]](
+        MarketTradingPairTuple(market, trading_pair, base, quote), config
+    )
+    result: BacktestResult = BacktestRunner(market, [strategy], tick_size=task.tick_size,
+                                            sample_interval=task.inventory_interval).run()
+
+    row: Dict[str, Any] = dict(task.parameters)
+    row.update(ticks=result.ticks,
+               fill_count=result.fill_count,
+               wall_time=result.wall_time,
+               ticks_per_second=result.ticks_per_second)
+    perf: PerformanceMetrics = PerformanceMetrics()
+    if len(trades) > 0:
+        perf = asyncio.get_event_loop().run_until_complete(
+            calculate_performance_metrics(market.name, trading_pair, trades, result.balances)
+        )
+    row.update(num_buys=perf.num_buys,
+               num_sells=perf.num_sells,
+               b_vol_base=perf.b_vol_base,
+               s_vol_base=perf.s_vol_base,
+               fee_in_quote=perf.fee_in_quote,
+               trade_pnl=perf.trade_pnl,
+               total_pnl=perf.total_pnl,
+               return_pct=perf.return_pct,
+               base_balance=result.balances.get(base, Decimal("0")),
+               quote_balance=result.balances.get(quote, Decimal("0")),
+               inventory=np.array([(timestamp, float(balances.get(base, 0)))
+                                   for timestamp, balances in result.balance_history]).reshape(-1, 2))
+    return row
+
+
+class ParameterSweep:
+    """
+    Backtests a strategy config with every combination of values of some of its parameters, one backtest per process
+    of a process pool. The market data is saved once and memory mapped read only by every process, so that they share
+    its pages instead of copying it, and the backtests are independent, so a sweep scales with the number of cores.
+
+    Parameters are config map keys, with values as entered in the config, e.g. bid_spread in percent.
+    """
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        global ps_logger
+        if ps_logger is None:
+            ps_logger = logging.getLogger(__name__)
+        return ps_logger
+
+    def __init__(self,
+                 strategy_config: Dict[str, Any],
+                 data_path: str,
+                 parameters: Dict[str, List[Any]],
+                 balances: Dict[str, Decimal],
+                 tick_size: float = 1.0,
+                 latency: float = 0.0,
+                 queue_position: bool = True,
+                 maker_fee_percent: Decimal = Decimal("0"),
+                 taker_fee_percent: Decimal = Decimal("0"),
+                 price_quantum: Decimal = Decimal("1e-8"),
+                 size_quantum: Decimal = Decimal("1e-8"),
+                 inventory_interval: Optional[float] = 60.0,
+                 max_workers: Optional[int] = None):
+        """
+        :param strategy_config: the values of the strategy config map, see load_strategy_config()
+        :param data_path: market data saved by save_market_data(), or a directory recorded by MarketDataRecorder
+        :param parameters: the values of each swept config map key, parsed by the config map
+        :param balances: the starting balances of every backtest
+        :param price_quantum: the price increment of the market, e.g. its tick size, which order prices are rounded to
+        :param size_quantum: the order amount increment of the market
+        :param inventory_interval: the interval in seconds of the inventory path samples, none if None
+        :param max_workers: the number of processes, the number of cores if None, or in process if 1
+        """
+        strategy: str = strategy_config.get("strategy")
+        if strategy not in STRATEGY_BUILDERS:
+            raise ValueError(f"Backtests of the {strategy} strategy are not supported.")
+        config_map: Dict[str, ConfigVar] = get_strategy_config_map(strategy)
+        unknown_parameters: List[str] = [key for key in parameters if key not in config_map]
+        if len(unknown_parameters) > 0:
+            raise ValueError(f"{', '.join(unknown_parameters)} are not {strategy} config keys.")
+        empty_parameters: List[str] = [key for key, values in parameters.items() if len(values) == 0]
+        if len(empty_parameters) > 0:
+            raise ValueError(f"{', '.join(empty_parameters)} have no values to sweep.")
+        # Parsed like the values of a config file, e.g. bid_spread values entered as floats or strings are Decimals.
+        parameters = {key: [parse_cvar_value(config_map[key], value) for value in values]
+                      for key, values in parameters.items()}
+        self._strategy_config: Dict[str, Any] = strategy_config
+        self._data_path: str = data_path
+        self._parameters: Dict[str, List[Any]] = parameters
+        self._balances: Dict[str, Decimal] = balances
+        self._tick_size: float = tick_size
+        self._market_options: Dict[str, Any] = dict(latency=latency,
+                                                    queue_position=queue_position,
+                                                    maker_fee_percent=maker_fee_percent,
+                                                    taker_fee_percent=taker_fee_percent)
+        self._price_quantum: Decimal = price_quantum
+        self._size_quantum: Decimal = size_quantum
+        self._inventory_interval: Optional[float] = inventory_interval
+        self._max_workers: int = max_workers if max_workers is not None else (os.cpu_count() or 1)
+
+    @classmethod
+    def from_config_file(cls, yml_path: str, data_path: str, parameters: Dict[str, List[Any]], **kwargs):
+        return cls(load_strategy_config(yml_path), data_path, parameters, **kwargs)
+
+    @property
+    def combinations(self) -> List[Dict[str, Any]]:
+        keys: List[str] = list(self._parameters.keys())
+        return [dict(zip(keys, values)) for values in itertools.product(*self._parameters.values())]
+
+    def run(self) -> pd.DataFrame:
+        """
+        Returns a table of the parameters and results of each backtest, in the order of combinations.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            data_path: str = self._data_path
+            if os.path.isdir(data_path):
+                # Recordings are saved as a single file once, to be memory mapped by every process.
+                data_path = os.path.join(temp_dir, "market_data.npy")
+                save_market_data(data_path, load_recorded_market_data(self._data_path,
+                                                                      self._strategy_config["market"]))
+            tasks: List[SweepTask] = [SweepTask(data_path=data_path,
+                                                strategy_config=self._strategy_config,
+                                                parameters=parameters,
+                                                balances=self._balances,
+                                                market_options=self._market_options,
+                                                price_quantum=self._price_quantum,
+                                                size_quantum=self._size_quantum,
+                                                tick_size=self._tick_size,
+                                                inventory_interval=self._inventory_interval)
+                                      for parameters in self.combinations]
+            start_time: float = time.perf_counter()
+            if self._max_workers == 1:
+                rows: List[Dict[str, Any]] = [run_sweep_task(task) for task in tasks]
+                _market_data.pop(data_path, None)
+            else:
+                with ProcessPoolExecutor(max_workers=min(self._max_workers, len(tasks))) as executor:
+                    rows = list(executor.map(run_sweep_task, tasks))
+            wall_time: float = time.perf_counter() - start_time
+
+        self.logger().info(f"Ran {len(tasks)} backtests in {wall_time:.2f}s with {self._max_workers} processes.")
+        return pd.DataFrame(rows)
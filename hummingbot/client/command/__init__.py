@@ -14,6 +14,7 @@ from .import_command import ImportCommand
 from .export_command import ExportCommand
 from .silly_commands import SillyCommands
 from .order_book_command import OrderBookCommand
+from .order_book_stats_command import OrderBookStatsCommand
 from .ticker_command import TickerCommand
 from .generate_certs_command import GenerateCertsCommand
 from .open_orders_command import OpenOrdersCommand
@@ -39,6 +40,7 @@ __all__ = [
     ExportCommand,
     SillyCommands,
     OrderBookCommand,
+    OrderBookStatsCommand,
     TickerCommand,
     GenerateCertsCommand,
     OpenOrdersCommand,
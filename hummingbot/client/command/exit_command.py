@@ -27,6 +27,11 @@ class ExitCommand:
             # Freeze screen 1 second for better UI
             await asyncio.sleep(1)
 
+        if self.markets_recorder is not None:
+            # Commits the records still queued in write behind mode.
+            self.markets_recorder.stop()
+        self._stop_market_data_recorders()
+
         self._notify("Winding down notifiers...")
         for notifier in self.notifiers:
             notifier.stop()
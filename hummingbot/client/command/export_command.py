@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, Optional
 import os
-from typing import List
+from typing import List, Sequence
 import pandas as pd
 from sqlalchemy.orm import (
     Session,
@@ -10,6 +10,11 @@ from hummingbot.model.trade_fill import TradeFill
 from hummingbot.client.config.security import Security
 from hummingbot.core.utils.async_utils import safe_ensure_future
 from hummingbot.client.settings import DEFAULT_LOG_FILE_PATH
+from hummingbot.client.trade_fill_export import (
+    TRADE_FILL_PARTITION_COLUMNS,
+    export_trade_fills,
+    get_export_format,
+)
 from hummingbot.client.config.global_config_map import global_config_map
 if TYPE_CHECKING:
     from hummingbot.client.hummingbot_application import HummingbotApplication
@@ -17,14 +22,20 @@ if TYPE_CHECKING:
 
 class ExportCommand:
     def export(self,  # type: HummingbotApplication
-               option):
+               option,
+               partition_cols: Sequence[str] = ()):
         if option is None or option not in ("keys", "trades"):
             self._notify("Invalid export option.")
             return
         elif option == "keys":
             safe_ensure_future(self.export_keys())
         elif option == "trades":
-            safe_ensure_future(self.export_trades())
+            invalid_cols: List[str] = [col for col in partition_cols if col not in TRADE_FILL_PARTITION_COLUMNS]
+            if len(invalid_cols) > 0:
+                self._notify(f"Invalid partition columns: {', '.join(invalid_cols)}. "
+                             f"Valid columns are {', '.join(TRADE_FILL_PARTITION_COLUMNS)}.")
+                return
+            safe_ensure_future(self.export_trades(partition_cols))
 
     async def export_keys(self,  # type: HummingbotApplication
                           ):
@@ -52,7 +63,7 @@ class ExportCommand:
 
     async def prompt_new_export_file_name(self,  # type: HummingbotApplication
                                           path):
-        input = await self.app.prompt(prompt="Enter a new csv file name >>> ")
+        input = await self.app.prompt(prompt="Enter a new file name (.csv, .parquet or .arrow) >>> ")
         if input is None or input == "":
             self._notify("Value is required.")
             return await self.prompt_new_export_file_name(path)
@@ -66,9 +77,14 @@ class ExportCommand:
             return input
 
     async def export_trades(self,  # type: HummingbotApplication
-                            ):
-        trades: List[TradeFill] = self._get_trades_from_session(int(self.init_time * 1e3))
-        if len(trades) == 0:
+                            partition_cols: Sequence[str] = ()):
+        """
+        Exports the trades of the session. CSV files without partitions list the trades as the history command does,
+        other exports write the typed trade fill columns, read without creating TradeFill objects. With partition
+        columns, the file name is the directory the partitions are written to.
+        """
+        start_timestamp: int = int(self.init_time * 1e3)
+        if not self._has_trades_from_session(start_timestamp):
             self._notify("No past trades to export.")
             return
         self.placeholder_mode = True
@@ -79,8 +95,18 @@ class ExportCommand:
         file_name = await self.prompt_new_export_file_name(path)
         file_path = os.path.join(path, file_name)
         try:
-            df: pd.DataFrame = TradeFill.to_pandas(trades)
-            df.to_csv(file_path, header=True)
+            file_format: str = get_export_format(file_name) or "csv"
+            if file_format == "csv" and len(partition_cols) == 0:
+                trades: List[TradeFill] = self._get_trades_from_session(start_timestamp)
+                df: pd.DataFrame = TradeFill.to_pandas(trades)
+                df.to_csv(file_path, header=True)
+            else:
+                session: Session = self.trade_fill_db.create_read_only_session()
+                try:
+                    df: pd.DataFrame = TradeFill.get_trades_columns(session, start_time=start_timestamp)
+                finally:
+                    session.close()
+                export_trade_fills(df, file_path, file_format, partition_cols)
             self._notify(f"Successfully exported trades to {file_path}")
         except Exception as e:
             self._notify(f"Error exporting trades to {path}: {e}")
@@ -88,22 +114,34 @@ class ExportCommand:
         self.placeholder_mode = False
         self.app.hide_input = False
 
+    def _has_trades_from_session(self,  # type: HummingbotApplication
+                                 start_timestamp: int) -> bool:
+        session: Session = self.trade_fill_db.create_read_only_session()
+        try:
+            return session.query(TradeFill.id).filter(TradeFill.timestamp >= start_timestamp).first() is not None
+        finally:
+            session.close()
+
     def _get_trades_from_session(self,  # type: HummingbotApplication
                                  start_timestamp: int,
                                  number_of_rows: Optional[int] = None,
                                  config_file_path: str = None) -> List[TradeFill]:
-        session: Session = self.trade_fill_db.get_shared_session()
-        filters = [TradeFill.timestamp >= start_timestamp]
-        if config_file_path is not None:
-            filters.append(TradeFill.config_file_path.like(f"%{config_file_path}%"))
-        query: Query = (session
-                        .query(TradeFill)
-                        .filter(*filters)
-                        .order_by(TradeFill.timestamp.desc()))
-        if number_of_rows is None:
-            result: List[TradeFill] = query.all() or []
-        else:
-            result: List[TradeFill] = query.limit(number_of_rows).all() or []
+        session: Session = self.trade_fill_db.create_read_only_session()
+        try:
+            filters = [TradeFill.timestamp >= start_timestamp]
+            if config_file_path is not None:
+                filters.append(TradeFill.config_file_path == config_file_path)
+            query: Query = (session
+                            .query(TradeFill)
+                            .filter(*filters)
+                            .order_by(TradeFill.timestamp.desc()))
+            if number_of_rows is None:
+                result: List[TradeFill] = query.all() or []
+            else:
+                result: List[TradeFill] = query.limit(number_of_rows).all() or []
+        finally:
+            # The trades are detached from the session, with their columns loaded.
+            session.close()
 
         # Get the latest 100 trades in ascending timestamp order
         result.reverse()
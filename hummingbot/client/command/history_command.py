@@ -4,6 +4,7 @@ import threading
 import time
 from typing import (
     Set,
+    Dict,
     Tuple,
     TYPE_CHECKING,
     List,
@@ -17,10 +18,16 @@ from hummingbot.client.settings import (
     ConnectorType,
     DERIVATIVES
 )
+from hummingbot.client.trade_fill_tracker import TradeFillTracker
 from hummingbot.model.trade_fill import TradeFill
 from hummingbot.user.user_balances import UserBalances
 from hummingbot.core.utils.async_utils import safe_ensure_future
-from hummingbot.client.performance import PerformanceMetrics, calculate_performance_metrics, smart_round
+from hummingbot.client.performance import (
+    PerformanceMetrics,
+    PerformanceMetricsAccumulator,
+    calculate_performance_metrics,
+    smart_round,
+)
 
 s_float_0 = float(0)
 s_decimal_0 = Decimal("0")
@@ -49,30 +56,42 @@ class HistoryCommand:
             return
         if global_config_map.get("paper_trade_enabled").value:
             self._notify("\n  Paper Trading ON: All orders are simulated, and no real orders are placed.")
-        start_time = get_timestamp(days) if days > 0 else self.init_time
-        trades: List[TradeFill] = self._get_trades_from_session(int(start_time * 1e3),
-                                                                config_file_path=self.strategy_file_name)
+        accumulators: Optional[Dict[Tuple[str, str], PerformanceMetricsAccumulator]] = None
+        if days > 0:
+            start_time = get_timestamp(days)
+            trades: List[TradeFill] = self._get_trades_from_session(int(start_time * 1e3),
+                                                                    config_file_path=self.strategy_file_name)
+        else:
+            start_time = self.init_time
+            tracker: TradeFillTracker = self.get_trade_fill_tracker()
+            trades: List[TradeFill] = list(tracker.trades)
+            accumulators = dict(tracker.performance_accumulators)
         if not trades:
             self._notify("\n  No past trades to report.")
             return
         if verbose:
             self.list_trades(start_time)
         if self.strategy_name != "celo_arb":
-            safe_ensure_future(self.history_report(start_time, trades, precision))
+            safe_ensure_future(self.history_report(start_time, trades, precision, accumulators=accumulators))
 
     async def history_report(self,  # type: HummingbotApplication
                              start_time: float,
                              trades: List[TradeFill],
                              precision: Optional[int] = None,
-                             display_report: bool = True) -> Decimal:
+                             display_report: bool = True,
+                             accumulators: Optional[Dict[Tuple[str, str], PerformanceMetricsAccumulator]] = None
+                             ) -> Decimal:
         market_info: Set[Tuple[str, str]] = set((t.market, t.symbol) for t in trades)
         if display_report:
             self.report_header(start_time)
         return_pcts = []
         for market, symbol in market_info:
-            cur_trades = [t for t in trades if t.market == market and t.symbol == symbol]
             cur_balances = await self.get_current_balances(market)
-            perf = await calculate_performance_metrics(market, symbol, cur_trades, cur_balances)
+            if accumulators is not None:
+                perf = await accumulators[(market, symbol)].calculate(cur_balances)
+            else:
+                cur_trades = [t for t in trades if t.market == market and t.symbol == symbol]
+                perf = await calculate_performance_metrics(market, symbol, cur_trades, cur_balances)
             if display_report:
                 self.report_performance_by_market(market, symbol, perf, precision)
             return_pcts.append(perf.return_pct)
@@ -197,11 +216,28 @@ class HistoryCommand:
             return s_decimal_0
 
         start_time = self.init_time
-        trades: List[TradeFill] = self._get_trades_from_session(int(start_time * 1e3),
-                                                                config_file_path=self.strategy_file_name)
-        avg_return = await self.history_report(start_time, trades, display_report=False)
+        tracker: TradeFillTracker = self.get_trade_fill_tracker()
+        avg_return = await self.history_report(start_time, list(tracker.trades), display_report=False,
+                                               accumulators=tracker.performance_accumulators)
         return avg_return
 
+    def get_trade_fill_tracker(self,  # type: HummingbotApplication
+                               ) -> Optional[TradeFillTracker]:
+        """
+        Returns the trade fills of the current strategy config file since the bot was started, updated with the ones
+        recorded since the last call.
+        """
+        if self.trade_fill_db is None or self.strategy_file_name is None:
+            return None
+        start_timestamp: int = int(self.init_time * 1e3)
+        tracker: Optional[TradeFillTracker] = self._trade_fill_tracker
+        if tracker is None or tracker.sql is not self.trade_fill_db or \
+                tracker.config_file_path != self.strategy_file_name or tracker.start_timestamp != start_timestamp:
+            tracker = TradeFillTracker(self.trade_fill_db, self.strategy_file_name, start_timestamp)
+            self._trade_fill_tracker = tracker
+        tracker.update()
+        return tracker
+
     def list_trades(self,  # type: HummingbotApplication
                     start_time: float):
         if threading.current_thread() != threading.main_thread():
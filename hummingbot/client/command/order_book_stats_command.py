@@ -0,0 +1,117 @@
+import json
+import os
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    TYPE_CHECKING,
+)
+
+import pandas as pd
+
+from hummingbot.client.config.global_config_map import global_config_map
+from hummingbot.client.settings import DEFAULT_LOG_FILE_PATH
+from hummingbot.core.utils.async_utils import safe_ensure_future
+
+if TYPE_CHECKING:
+    from hummingbot.client.hummingbot_application import HummingbotApplication
+
+
+class OrderBookStatsCommand:
+    def order_book_stats(self,  # type: HummingbotApplication
+                         exchange: str = None,
+                         market: str = None,
+                         live: bool = False,
+                         export: bool = False):
+        safe_ensure_future(self.show_order_book_stats(exchange, market, live, export))
+
+    def get_order_book_stats(self,  # type: HummingbotApplication
+                             exchange: str = None,
+                             market: str = None) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Returns the order book tracker metrics of the running connectors, by connector name and trading pair. The
+        metrics are None for connectors whose order book trackers do not record them, i.e. that have no tracker or
+        apply updates with their own tracking loops.
+        """
+        stats: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        for name, market_connector in self.markets.items():
+            if exchange is not None and name != exchange:
+                continue
+            order_book_tracker = getattr(market_connector, "order_book_tracker", None)
+            if order_book_tracker is None or not hasattr(order_book_tracker, "get_metrics"):
+                trading_pairs: List[str] = self.market_trading_pairs_map.get(name, [])
+                stats[name] = {trading_pair: None for trading_pair in trading_pairs
+                               if market is None or trading_pair == market}
+                continue
+            stats[name] = {
+                trading_pair: metrics if not metrics["initialized"] or metrics["seconds_since_update"] is not None
+                else None
+                for trading_pair, metrics in order_book_tracker.get_metrics().items()
+                if market is None or trading_pair == market
+            }
+        return stats
+
+    async def show_order_book_stats(self,  # type: HummingbotApplication
+                                    exchange: str = None,
+                                    market: str = None,
+                                    live: bool = False,
+                                    export: bool = False):
+        if len(self.markets.keys()) == 0:
+            self._notify("There is currently no active market.")
+            return
+        if exchange is not None and exchange not in self.markets:
+            self._notify("Invalid exchange")
+            return
+        if market is not None:
+            market = market.upper()
+
+        def get_stats_table() -> str:
+            stats: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = self.get_order_book_stats(exchange, market)
+            if all(metrics is None for pairs in stats.values() for metrics in pairs.values()):
+                return "  No order book tracker metrics available for the active markets."
+            columns = ["Exchange", "Market", "Queue", "Diffs/s", "Coalesced", "Resyncs",
+                       "Latency p50 (ms)", "Latency p99 (ms)", "Last update (s)"]
+            data = []
+            for name, pairs in stats.items():
+                for trading_pair, metrics in pairs.items():
+                    if metrics is None:
+                        data.append([name, trading_pair] + ["n/a"] * (len(columns) - 2))
+                        continue
+                    latency: Dict[str, Any] = metrics["latency"]
+                    data.append([
+                        name,
+                        trading_pair,
+                        metrics["queue_depth"],
+                        round(metrics["diffs_per_second"], 1),
+                        metrics["diff_messages_coalesced"],
+                        metrics["snapshot_resyncs"],
+                        round(latency["p50"] * 1e3, 1) if latency["p50"] is not None else "-",
+                        round(latency["p99"] * 1e3, 1) if latency["p99"] is not None else "-",
+                        round(metrics["seconds_since_update"], 1) if metrics["seconds_since_update"] is not None
+                        else "-",
+                    ])
+            df: pd.DataFrame = pd.DataFrame(data=data, columns=columns)
+            return "\n".join("    " + line for line in df.to_string(index=False).split("\n"))
+
+        if export:
+            path = global_config_map["log_file_path"].value
+            if path is None:
+                path = DEFAULT_LOG_FILE_PATH
+            file_path = os.path.join(path, f"order_book_stats_{int(time.time())}.json")
+            try:
+                with open(file_path, "w") as f:
+                    json.dump({"timestamp": time.time(), "connectors": self.get_order_book_stats(exchange, market)},
+                              f, indent=2)
+                self._notify(f"Successfully exported order book stats to {file_path}")
+            except Exception as e:
+                self._notify(f"Error exporting order book stats to {path}: {e}")
+        elif live:
+            await self.stop_live_update()
+            self.app.live_updates = True
+            while self.app.live_updates:
+                await self.cls_display_delay(get_stats_table() + "\n\n Press escape key to stop update.", 1)
+            self._notify("Stopped live order book stats display update.")
+        else:
+            self._notify(get_stats_table())
@@ -186,9 +186,12 @@ class StatusCommand:
             else:
                 self._notify("  - ETH wallet check: ETH wallet is not connected.")
 
+        # A connector is loading until one of its trading pairs is ready - strategies trade a trading pair as soon as
+        # its order book is initialized, without waiting for the other ones.
         loading_markets: List[ConnectorBase] = []
-        for market in self.markets.values():
-            if not market.ready:
+        for market_name, market in self.markets.items():
+            trading_pairs: List[str] = self.market_trading_pairs_map.get(market_name, [])
+            if not market.ready and not any(market.trading_pair_ready(trading_pair) for trading_pair in trading_pairs):
                 loading_markets.append(market)
 
         if len(loading_markets) > 0:
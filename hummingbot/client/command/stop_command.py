@@ -51,6 +51,8 @@ class StopCommand:
         if self.markets_recorder is not None:
             self.markets_recorder.stop()
 
+        self._stop_market_data_recorders()
+
         if self.kill_switch is not None:
             self.kill_switch.stop()
 
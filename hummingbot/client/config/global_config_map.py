@@ -266,6 +266,50 @@ main_config_map = {
                   type_str="str",
                   required_if=lambda: global_config_map.get("db_engine").value != "sqlite",
                   default="dbname"),
+    "db_write_behind":
+        ConfigVar(key="db_write_behind",
+                  prompt="Would you like to write order and trade records to the database in batches from a "
+                         "background thread? (Yes/No) >>> ",
+                  type_str="bool",
+                  required_if=lambda: False,
+                  validator=validate_bool,
+                  default=False),
+    "db_tuned":
+        ConfigVar(key="db_tuned",
+                  prompt="Would you like to use the tuned database settings (WAL journal for SQLite, connection pool "
+                         "for other databases)? (Yes/No) >>> ",
+                  type_str="bool",
+                  required_if=lambda: False,
+                  validator=validate_bool,
+                  default=False),
+    "db_sqlite_mmap_size":
+        ConfigVar(key="db_sqlite_mmap_size",
+                  prompt="How many bytes of the SQLite database file would you like to memory map? >>> ",
+                  type_str="int",
+                  required_if=lambda: False,
+                  validator=lambda v: validate_int(v, min_value=0),
+                  default=268435456),
+    "db_sqlite_cache_size":
+        ConfigVar(key="db_sqlite_cache_size",
+                  prompt="How many KiB would you like to use for the SQLite page cache? >>> ",
+                  type_str="int",
+                  required_if=lambda: False,
+                  validator=lambda v: validate_int(v, min_value=1),
+                  default=65536),
+    "db_pool_size":
+        ConfigVar(key="db_pool_size",
+                  prompt="How many database connections would you like to keep in the pool? >>> ",
+                  type_str="int",
+                  required_if=lambda: False,
+                  validator=lambda v: validate_int(v, min_value=1),
+                  default=5),
+    "db_max_overflow":
+        ConfigVar(key="db_max_overflow",
+                  prompt="How many database connections would you like to allow above the pool size? >>> ",
+                  type_str="int",
+                  required_if=lambda: False,
+                  validator=lambda v: validate_int(v, min_value=0),
+                  default=10),
     "0x_active_cancels":
         ConfigVar(key="0x_active_cancels",
                   prompt="Enable active order cancellations for 0x exchanges (warning: this costs gas)?  >>> ",
@@ -355,6 +399,36 @@ main_config_map = {
                   required_if=lambda: False,
                   on_validated=global_token_symbol_on_validated,
                   default="$"),
+    "order_book_tracker_shards":
+        ConfigVar(key="order_book_tracker_shards",
+                  prompt="How many worker processes do you want to maintain order books in (0 to maintain them in "
+                         "the main process)? >>> ",
+                  type_str="int",
+                  required_if=lambda: False,
+                  validator=lambda v: validate_int(v, min_value=0, inclusive=True),
+                  default=0),
+    "order_book_tracker_shard_depth":
+        ConfigVar(key="order_book_tracker_shard_depth",
+                  prompt="How many price levels per side do you want to keep in the main process order books when "
+                         "they are maintained in worker processes? >>> ",
+                  type_str="int",
+                  required_if=lambda: False,
+                  validator=lambda v: validate_int(v, min_value=1, inclusive=True),
+                  default=200),
+    "market_data_recorder_enabled":
+        ConfigVar(key="market_data_recorder_enabled",
+                  prompt="Would you like to record the order book snapshots, diffs and trades of the markets you "
+                         "trade, for backtesting? (Yes/No) >>> ",
+                  type_str="bool",
+                  required_if=lambda: False,
+                  validator=validate_bool,
+                  default=False),
+    "market_data_recorder_dir":
+        ConfigVar(key="market_data_recorder_dir",
+                  prompt="Which directory do you want to record market data to? >>> ",
+                  type_str="str",
+                  required_if=lambda: False,
+                  default=None),
 }
 
 global_config_map = {**key_config_map, **main_config_map}
@@ -3,9 +3,12 @@
 import asyncio
 from collections import deque
 import logging
+import os
 import time
 from typing import List, Dict, Optional, Tuple, Set, Deque
 
+from hummingbot import data_path
+from hummingbot.backtest.market_data_recorder import MarketDataRecorder
 from hummingbot.client.command import __all__ as commands
 from hummingbot.core.clock import Clock
 from hummingbot.logger import HummingbotLogger
@@ -34,8 +37,11 @@ from hummingbot.notifier.notifier_base import NotifierBase
 from hummingbot.notifier.telegram_notifier import TelegramNotifier
 from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
 from hummingbot.connector.markets_recorder import MarketsRecorder
+from hummingbot.client.trade_fill_tracker import TradeFillTracker
 from hummingbot.client.config.security import Security
 from hummingbot.connector.exchange_base import ExchangeBase
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.data_type.sharded_order_book_tracker import ShardedOrderBookTracker
 from hummingbot.client.settings import CONNECTOR_SETTINGS, ConnectorType
 s_logger = None
 
@@ -96,6 +102,8 @@ class HummingbotApplication(*commands):
 
         self.trade_fill_db: Optional[SQLConnectionManager] = None
         self.markets_recorder: Optional[MarketsRecorder] = None
+        self._recorded_order_book_trackers: Dict[str, OrderBookTracker] = {}
+        self._trade_fill_tracker: Optional[TradeFillTracker] = None
         self._script_iterator = None
         self._binance_connector = None
 
@@ -242,6 +250,12 @@ class HummingbotApplication(*commands):
                         if key in conn_setting.config_keys}
                 init_params = conn_setting.conn_init_parameters(keys)
                 init_params.update(trading_pairs=trading_pairs, trading_required=self._trading_required)
+                if conn_setting.use_sharded_order_book_tracker:
+                    init_params.update(
+                        order_book_tracker_shards=global_config_map.get("order_book_tracker_shards").value or 0,
+                        order_book_tracker_shard_depth=global_config_map.get("order_book_tracker_shard_depth").value
+                        or ShardedOrderBookTracker.DEFAULT_DEPTH
+                    )
                 if conn_setting.use_ethereum_wallet:
                     ethereum_rpc_url = global_config_map.get("ethereum_rpc_url").value
                     # Todo: Hard coded this execption for now until we figure out how to handle all ethereum connectors.
@@ -260,8 +274,35 @@ class HummingbotApplication(*commands):
             list(self.markets.values()),
             self.strategy_file_name,
             self.strategy_name,
+            write_behind=global_config_map.get("db_write_behind").value,
         )
         self.markets_recorder.start()
+        self._start_market_data_recorders()
+
+    def _start_market_data_recorders(self):
+        """
+        Records the order books of the markets that have an order book tracker, in a directory per connector, if
+        market_data_recorder_enabled is set.
+        """
+        if not global_config_map.get("market_data_recorder_enabled").value:
+            return
+        data_dir: Optional[str] = global_config_map.get("market_data_recorder_dir").value
+        if data_dir is None:
+            data_dir = os.path.join(data_path(), "market_data")
+        for connector_name, connector in self.markets.items():
+            order_book_tracker: Optional[OrderBookTracker] = getattr(connector, "order_book_tracker", None)
+            if order_book_tracker is None or connector_name in self._recorded_order_book_trackers:
+                continue
+            order_book_tracker.recorder = MarketDataRecorder(os.path.join(data_dir, connector_name))
+            self._recorded_order_book_trackers[connector_name] = order_book_tracker
+
+    def _stop_market_data_recorders(self):
+        for order_book_tracker in self._recorded_order_book_trackers.values():
+            recorder: Optional[MarketDataRecorder] = order_book_tracker.recorder
+            order_book_tracker.recorder = None
+            if recorder is not None:
+                recorder.close()
+        self._recorded_order_book_trackers.clear()
 
     def _initialize_notifiers(self):
         if global_config_map.get("telegram_enabled").value:
@@ -7,6 +7,8 @@ from typing import (
     Any
 )
 from hummingbot.model.trade_fill import TradeFill
+from hummingbot.core.data_type.trade import Trade
+from hummingbot.core.event.events import OrderFilledEvent
 from hummingbot.core.utils.market_price import get_last_price
 
 s_decimal_0 = Decimal("0")
@@ -115,6 +117,261 @@ def derivative_pnl(long: list, short: list):
     return pnls
 
 
+def add_trade_fees(fees: Dict[str, Decimal], trade: Any, base: str, quote: str):
+    """
+    Adds the fees paid on a trade to `fees`, a dictionary of token and total fee amount paid in that token.
+    :param trade: a TradeFill or Trade object
+    """
+    if type(trade) is TradeFill:
+        if trade.trade_fee.get("percent") is not None and trade.trade_fee["percent"] > 0:
+            asset = base if trade.trade_type.upper() == "BUY" else quote
+
+            if asset not in fees:
+                fees[asset] = s_decimal_0
+
+            if asset == base:
+                fees[base] += Decimal(trade.amount) * Decimal(trade.trade_fee["percent"])
+            else:
+                fees[quote] += Decimal(trade.price) * Decimal(trade.amount) * Decimal(trade.trade_fee["percent"])
+
+        for flat_fee in trade.trade_fee.get("flat_fees", []):
+            if flat_fee["asset"] not in fees:
+                fees[flat_fee["asset"]] = s_decimal_0
+
+            fees[flat_fee["asset"]] += Decimal(flat_fee["amount"])
+    else:  # assume this is Trade object
+        if trade.trade_fee.percent > 0:
+            asset = "base" if trade.trade_type.upper() == "BUY" else "quote"
+
+            if asset not in fees:
+                fees[asset] = s_decimal_0
+
+            if asset == base:
+                fees[base] += Decimal(trade.amount) * Decimal(trade.trade_fee.percent)
+            else:
+                fees[quote] += Decimal(trade.price) * Decimal(trade.amount) * Decimal(trade.trade_fee.percent)
+
+        for flat_fee in trade.trade_fee.flat_fees:
+            if flat_fee[0] not in fees:
+                fees[flat_fee[0]] = s_decimal_0
+
+            fees[flat_fee[0]] += flat_fee[1]
+
+
+class AggregatedPositionOrder:
+    """
+    The fills of one derivative order, with the average fill price and the total amount, as aggregated by
+    aggregate_position_order().
+    """
+
+    def __init__(self, order_id: str, position: str):
+        self.order_id: str = order_id
+        # The position of the first fill.
+        self.position: str = position
+        self.num_fills: int = 0
+        self.price_sum: Any = 0
+        self.amount: Any = 0
+
+    @property
+    def price(self) -> Any:
+        return self.price_sum / self.num_fills
+
+    def add_fill(self, price: Any, amount: Any):
+        # Text columns of trade fills loaded from the database.
+        self.price_sum += Decimal(price) if isinstance(price, str) else price
+        self.amount += Decimal(amount) if isinstance(amount, str) else amount
+        self.num_fills += 1
+
+
+class PerformanceMetricsAccumulator:
+    """
+    Calculates the performance metrics of a market from its trades, taken one at a time in the order they happened,
+    e.g. as they are recorded or from OrderFilledEvents. Adding a trade updates the trade counts, volumes, fees and the
+    pairing of derivative open and close position orders in constant time, and calculate() gives the same
+    PerformanceMetrics as calculate_performance_metrics() does for all the trades added so far.
+    """
+
+    def __init__(self, exchange: str, trading_pair: str):
+        self._exchange: str = exchange
+        self._trading_pair: str = trading_pair
+        self._base, self._quote = trading_pair.split("-")
+        self._first_trade: Optional[Any] = None
+        self._last_trade: Optional[Any] = None
+        self._derivative_trades: bool = False
+        self._has_nill_position: bool = False
+        self._num_buys: int = 0
+        self._num_sells: int = 0
+        # Running sums, in trade order and with the same types as the sums of calculate_performance_metrics().
+        self._b_vol_base: Any = 0
+        self._s_vol_base: Any = 0
+        self._b_vol_quote: Any = 0
+        self._s_vol_quote: Any = 0
+        self._fees: Dict[str, Decimal] = {}
+        # Derivative orders by side and order ID, and the open and close position orders of each side, in order of
+        # first fill. The n-th open long position (buy) order is closed by the n-th close position sell order, and
+        # the other way around for short positions.
+        self._buy_orders: Dict[str, AggregatedPositionOrder] = {}
+        self._sell_orders: Dict[str, AggregatedPositionOrder] = {}
+        self._open_buys: List[AggregatedPositionOrder] = []
+        self._close_sells: List[AggregatedPositionOrder] = []
+        self._open_sells: List[AggregatedPositionOrder] = []
+        self._close_buys: List[AggregatedPositionOrder] = []
+
+    @property
+    def exchange(self) -> str:
+        return self._exchange
+
+    @property
+    def trading_pair(self) -> str:
+        return self._trading_pair
+
+    @property
+    def num_trades(self) -> int:
+        return self._num_buys + self._num_sells
+
+    def add_trade(self, trade: Any):
+        """
+        :param trade: a TradeFill or Trade object
+        """
+        if self._first_trade is None:
+            self._first_trade = trade
+            self._derivative_trades = type(trade) is TradeFill
+        self._last_trade = trade
+        position: Optional[str] = getattr(trade, "position", None)
+        if position == "NILL":
+            self._has_nill_position = True
+
+        trade_type: str = trade.trade_type.upper()
+        if trade_type == "BUY":
+            self._num_buys += 1
+            self._b_vol_base += Decimal(trade.amount)
+            self._b_vol_quote += Decimal(trade.amount) * Decimal(trade.price)
+            if self._derivative_trades:
+                self._add_position_fill(trade, position, self._buy_orders, self._open_buys, self._close_buys)
+        elif trade_type == "SELL":
+            self._num_sells += 1
+            self._s_vol_base += Decimal(trade.amount)
+            self._s_vol_quote += Decimal(trade.amount) * Decimal(trade.price)
+            if self._derivative_trades:
+                self._add_position_fill(trade, position, self._sell_orders, self._open_sells, self._close_sells)
+
+        add_trade_fees(self._fees, trade, self._base, self._quote)
+
+    def add_trades(self, trades: List[Any]):
+        for trade in trades:
+            self.add_trade(trade)
+
+    def add_fill_event(self, event: OrderFilledEvent, timestamp: Optional[float] = None):
+        self.add_trade(Trade(trading_pair=event.trading_pair,
+                             side=event.trade_type,
+                             price=event.price,
+                             amount=event.amount,
+                             order_type=event.order_type,
+                             market=self._exchange,
+                             timestamp=timestamp if timestamp is not None else event.timestamp,
+                             trade_fee=event.trade_fee))
+
+    @staticmethod
+    def _add_position_fill(trade: TradeFill,
+                           position: str,
+                           orders: Dict[str, AggregatedPositionOrder],
+                           open_orders: List[AggregatedPositionOrder],
+                           close_orders: List[AggregatedPositionOrder]):
+        order: Optional[AggregatedPositionOrder] = orders.get(trade.order_id)
+        if order is None:
+            order = AggregatedPositionOrder(trade.order_id, position)
+            orders[trade.order_id] = order
+            if position == "OPEN":
+                open_orders.append(order)
+            elif position == "CLOSE":
+                close_orders.append(order)
+        order.add_fill(trade.price, trade.amount)
+
+    async def calculate(self, current_balances: Dict[str, Decimal]) -> PerformanceMetrics:
+        """
+        Calculates PnL, fees, Return % and etc... for the trades added so far
+        :param current_balances: current user account balance
+        :return: A PerformanceMetrics object
+        """
+
+        def divide(value, divisor):
+            value = Decimal(str(value))
+            divisor = Decimal(str(divisor))
+            if divisor == s_decimal_0:
+                return s_decimal_0
+            return value / divisor
+
+        base, quote = self._base, self._quote
+        exchange: str = self._exchange
+        perf = PerformanceMetrics()
+
+        # Amount of trades
+        perf.num_buys = self._num_buys
+        perf.num_sells = self._num_sells
+        perf.num_trades = perf.num_buys + perf.num_sells
+
+        # Trade volumes
+        perf.b_vol_base = Decimal(str(self._b_vol_base))
+        perf.s_vol_base = Decimal(str(self._s_vol_base)) * Decimal("-1")
+        perf.tot_vol_base = perf.b_vol_base + perf.s_vol_base
+
+        perf.b_vol_quote = Decimal(str(self._b_vol_quote * Decimal("-1")))
+        perf.s_vol_quote = Decimal(str(self._s_vol_quote))
+        perf.tot_vol_quote = perf.b_vol_quote + perf.s_vol_quote
+
+        # Average prices
+        perf.avg_b_price = divide(perf.b_vol_quote, perf.b_vol_base)
+        perf.avg_s_price = divide(perf.s_vol_quote, perf.s_vol_base)
+        perf.avg_tot_price = divide(abs(perf.b_vol_quote) + abs(perf.s_vol_quote),
+                                    abs(perf.b_vol_base) + abs(perf.s_vol_base))
+        perf.avg_b_price = abs(perf.avg_b_price)
+        perf.avg_s_price = abs(perf.avg_s_price)
+
+        # Fees
+        perf.fees = dict(self._fees)
+        for fee_token, fee_amount in perf.fees.items():
+            if fee_token == quote:
+                perf.fee_in_quote += fee_amount
+                perf.fee_amount_quote += fee_amount
+            else:
+                if fee_token == base:
+                    perf.fee_amount_base += fee_amount
+                last_price = await get_last_price(exchange, f"{fee_token}-{quote}")
+                if last_price is not None:
+                    perf.fee_in_quote += fee_amount * last_price
+
+        # Start and current balances
+        perf.cur_base_bal = current_balances.get(base, Decimal("0"))
+        perf.cur_quote_bal = current_balances.get(quote, Decimal("0"))
+        perf.start_base_bal = perf.cur_base_bal - perf.tot_vol_base + perf.fee_amount_base
+        perf.start_quote_bal = perf.cur_quote_bal - perf.tot_vol_quote + perf.fee_amount_quote
+
+        # Ratio
+        perf.start_price = Decimal(self._first_trade.price)
+        perf.cur_price = await get_last_price(exchange.replace("_PaperTrade", ""), self._trading_pair)
+        if perf.cur_price is None:
+            perf.cur_price = Decimal(self._last_trade.price)
+        perf.start_base_ratio_pct = divide(perf.start_base_bal * perf.start_price,
+                                           (perf.start_base_bal * perf.start_price) + perf.start_quote_bal)
+        perf.cur_base_ratio_pct = divide(perf.cur_base_bal * perf.cur_price,
+                                         (perf.cur_base_bal * perf.cur_price) + perf.cur_quote_bal)
+
+        # Total
+        perf.hold_value = (perf.start_base_bal * perf.cur_price) + perf.start_quote_bal
+        perf.cur_value = (perf.cur_base_bal * perf.cur_price) + perf.cur_quote_bal
+        perf.total_pnl = perf.cur_value - perf.hold_value
+        perf.trade_pnl = perf.total_pnl + perf.fee_in_quote
+        perf.return_pct = divide(perf.cur_value, perf.hold_value) - 1
+
+        # Handle trade_pnl differently for derivatives
+        if self._derivative_trades and not self._has_nill_position:
+            long = list(zip(self._open_buys, self._close_sells))
+            short = list(zip(self._open_sells, self._close_buys))
+            perf.trade_pnl = Decimal(str(sum(derivative_pnl(long, short))))
+
+        return perf
+
+
 async def calculate_performance_metrics(exchange: str,
                                         trading_pair: str,
                                         trades: List[Any],
@@ -127,138 +384,9 @@ async def calculate_performance_metrics(exchange: str,
     :param current_balances: current user account balance
     :return: A PerformanceMetrics object
     """
-
-    def divide(value, divisor):
-        value = Decimal(str(value))
-        divisor = Decimal(str(divisor))
-        if divisor == s_decimal_0:
-            return s_decimal_0
-        return value / divisor
-
-    base, quote = trading_pair.split("-")
-    perf = PerformanceMetrics()
-
-    derivative = False
-    if trades and type(trades[0]) == TradeFill and "NILL" not in [t.position for t in trades]:
-        derivative = True
-
-    # Seperate buy an sell trades
-    buys = [t for t in trades if t.trade_type.upper() == "BUY"]
-    sells = [t for t in trades if t.trade_type.upper() == "SELL"]
-
-    # Amount of trades
-    perf.num_buys = len(buys)
-    perf.num_sells = len(sells)
-    perf.num_trades = perf.num_buys + perf.num_sells
-
-    # Trade volumes
-    perf.b_vol_base = Decimal(str(sum(Decimal(b.amount) for b in buys)))
-    perf.s_vol_base = Decimal(str(sum(Decimal(s.amount) for s in sells))) * Decimal("-1")
-    perf.tot_vol_base = perf.b_vol_base + perf.s_vol_base
-
-    perf.b_vol_quote = Decimal(str(sum(Decimal(b.amount) * Decimal(b.price) for b in buys) * Decimal("-1")))
-    perf.s_vol_quote = Decimal(str(sum(Decimal(s.amount) * Decimal(s.price) for s in sells)))
-    perf.tot_vol_quote = perf.b_vol_quote + perf.s_vol_quote
-
-    # Average prices
-    perf.avg_b_price = divide(perf.b_vol_quote, perf.b_vol_base)
-    perf.avg_s_price = divide(perf.s_vol_quote, perf.s_vol_base)
-    perf.avg_tot_price = divide(abs(perf.b_vol_quote) + abs(perf.s_vol_quote),
-                                abs(perf.b_vol_base) + abs(perf.s_vol_base))
-    perf.avg_b_price = abs(perf.avg_b_price)
-    perf.avg_s_price = abs(perf.avg_s_price)
-
-    # Fees
-    for trade in trades:
-        if type(trade) is TradeFill:
-            if trade.trade_fee.get("percent") is not None and trade.trade_fee["percent"] > 0:
-                asset = base if trade.trade_type.upper() == "BUY" else quote
-
-                if asset not in perf.fees:
-                    perf.fees[asset] = s_decimal_0
-
-                if asset == base:
-                    perf.fees[base] += Decimal(trade.amount) * Decimal(trade.trade_fee["percent"])
-                else:
-                    perf.fees[quote] += Decimal(trade.price) * Decimal(trade.amount) * Decimal(trade.trade_fee["percent"])
-
-            for flat_fee in trade.trade_fee.get("flat_fees", []):
-                if flat_fee["asset"] not in perf.fees:
-                    perf.fees[flat_fee["asset"]] = s_decimal_0
-
-                perf.fees[flat_fee["asset"]] += Decimal(flat_fee["amount"])
-        else:  # assume this is Trade object
-            if trade.trade_fee.percent > 0:
-                asset = "base" if trade.trade_type.upper() == "BUY" else "quote"
-
-                if asset not in perf.fees:
-                    perf.fees[asset] = s_decimal_0
-
-                if asset == base:
-                    perf.fees[base] += Decimal(trade.amount) * Decimal(trade.trade_fee.percent)
-                else:
-                    perf.fees[quote] += Decimal(trade.price) * Decimal(trade.amount) * Decimal(trade.trade_fee.percent)
-
-            for flat_fee in trade.trade_fee.flat_fees:
-                if flat_fee[0] not in perf.fees:
-                    perf.fees[flat_fee[0]] = s_decimal_0
-
-                perf.fees[flat_fee[0]] += flat_fee[1]
-
-    for fee_token, fee_amount in perf.fees.items():
-        if fee_token == quote:
-            perf.fee_in_quote += fee_amount
-            perf.fee_amount_quote += fee_amount
-        else:
-            if fee_token == base:
-                perf.fee_amount_base += fee_amount
-            last_price = await get_last_price(exchange, f"{fee_token}-{quote}")
-            if last_price is not None:
-                perf.fee_in_quote += fee_amount * last_price
-
-    # Start and current balances
-    perf.cur_base_bal = current_balances.get(base, Decimal("0"))
-    perf.cur_quote_bal = current_balances.get(quote, Decimal("0"))
-    perf.start_base_bal = perf.cur_base_bal - perf.tot_vol_base + perf.fee_amount_base
-    perf.start_quote_bal = perf.cur_quote_bal - perf.tot_vol_quote + perf.fee_amount_quote
-
-    # Ratio
-    perf.start_price = Decimal(trades[0].price)
-    perf.cur_price = await get_last_price(exchange.replace("_PaperTrade", ""), trading_pair)
-    if perf.cur_price is None:
-        perf.cur_price = Decimal(trades[-1].price)
-    perf.start_base_ratio_pct = divide(perf.start_base_bal * perf.start_price,
-                                       (perf.start_base_bal * perf.start_price) + perf.start_quote_bal)
-    perf.cur_base_ratio_pct = divide(perf.cur_base_bal * perf.cur_price,
-                                     (perf.cur_base_bal * perf.cur_price) + perf.cur_quote_bal)
-
-    # Total
-    perf.hold_value = (perf.start_base_bal * perf.cur_price) + perf.start_quote_bal
-    perf.cur_value = (perf.cur_base_bal * perf.cur_price) + perf.cur_quote_bal
-    perf.total_pnl = perf.cur_value - perf.hold_value
-    perf.trade_pnl = perf.total_pnl + perf.fee_in_quote
-    perf.return_pct = divide(perf.cur_value, perf.hold_value) - 1
-
-    # Handle trade_pnl differently for derivatives
-    if derivative:
-        buys_copy, sells_copy = aggregate_position_order(buys.copy(), sells.copy())
-        long = []
-        short = []
-
-        while True:
-            lng = position_order(buys_copy, sells_copy)
-            if lng is not None:
-                long.append(lng)
-
-            sht = position_order(sells_copy, buys_copy)
-            if sht is not None:
-                short.append(sht)
-            if lng is None and sht is None:
-                break
-
-        perf.trade_pnl = Decimal(str(sum(derivative_pnl(long, short))))
-
-    return perf
+    accumulator: PerformanceMetricsAccumulator = PerformanceMetricsAccumulator(exchange, trading_pair)
+    accumulator.add_trades(trades)
+    return await accumulator.calculate(current_balances)
 
 
 def smart_round(value: Decimal, precision: Optional[int] = None) -> Decimal:
@@ -62,6 +62,7 @@ class ConnectorSetting(NamedTuple):
     parent_name: str
     domain_parameter: str
     use_eth_gas_lookup: bool
+    use_sharded_order_book_tracker: bool
 
     def module_name(self) -> str:
         # returns connector module name, e.g. binance_exchange
@@ -132,7 +133,8 @@ def _create_connector_settings() -> Dict[str, ConnectorSetting]:
                 is_sub_domain=False,
                 parent_name=None,
                 domain_parameter=None,
-                use_eth_gas_lookup=getattr(util_module, "USE_ETH_GAS_LOOKUP", False)
+                use_eth_gas_lookup=getattr(util_module, "USE_ETH_GAS_LOOKUP", False),
+                use_sharded_order_book_tracker=getattr(util_module, "USE_SHARDED_ORDER_BOOK_TRACKER", False)
             )
             other_domains = getattr(util_module, "OTHER_DOMAINS", [])
             for domain in other_domains:
@@ -150,7 +152,8 @@ def _create_connector_settings() -> Dict[str, ConnectorSetting]:
                     is_sub_domain=True,
                     parent_name=parent.name,
                     domain_parameter=getattr(util_module, "OTHER_DOMAINS_PARAMETER")[domain],
-                    use_eth_gas_lookup=parent.use_eth_gas_lookup
+                    use_eth_gas_lookup=parent.use_eth_gas_lookup,
+                    use_sharded_order_book_tracker=parent.use_sharded_order_book_tracker
                 )
     return connector_settings
 
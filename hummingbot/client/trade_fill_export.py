@@ -0,0 +1,72 @@
+import os
+from typing import (
+    List,
+    Optional,
+    Sequence,
+)
+
+import pandas as pd
+
+TRADE_FILL_EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+# The columns trade fills can be partitioned by: the UTC date of the trades, and the trade fill columns with few
+# distinct values.
+TRADE_FILL_PARTITION_COLUMNS = ("date", "config_file_path", "strategy", "market", "symbol", "base_asset",
+                                "quote_asset", "order_type", "trade_type", "position")
+
+
+def get_export_format(path: str) -> Optional[str]:
+    """
+    Returns the export format of a file name by its extension, or None if it is not supported.
+    """
+    return TRADE_FILL_EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def write_trade_fills(df: pd.DataFrame, path: str, file_format: str):
+    """
+    Writes trade fill columns to a single file. Parquet and Arrow IPC (Feather v2) files require pyarrow.
+    """
+    if file_format == "parquet":
+        df.to_parquet(path, index=False)
+    elif file_format == "arrow":
+        df.reset_index(drop=True).to_feather(path)
+    elif file_format == "csv":
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unsupported export format: {file_format}.")
+
+
+def export_trade_fills(df: pd.DataFrame,
+                       path: str,
+                       file_format: str = "parquet",
+                       partition_cols: Sequence[str] = ()) -> List[str]:
+    """
+    Exports trade fill columns, as read by TradeFill.get_trades_columns, to `path`.
+    Without partition columns, `path` is the file written. Otherwise `path` is a directory, and the trades are
+    written to one file per partition in a Hive style layout, e.g. date=2021-05-01/market=binance/trades.parquet,
+    which Arrow, Spark and DuckDB read as a single data set. "date" is the UTC date of the trades, other partition
+    columns are trade fill columns.
+    :return: the paths of the files written
+    """
+    if len(partition_cols) == 0:
+        write_trade_fills(df, path, file_format)
+        return [path]
+
+    if "date" in partition_cols:
+        df = df.assign(date=pd.to_datetime(df["timestamp"], unit="ms", utc=True).dt.strftime("%Y-%m-%d"))
+    extension: str = next(ext for ext, fmt in TRADE_FILL_EXPORT_FORMATS.items() if fmt == file_format)
+    file_paths: List[str] = []
+    for keys, partition in df.groupby(list(partition_cols), observed=True, sort=True):
+        if not isinstance(keys, tuple):
+            keys = (keys,)
+        partition_dir: str = os.path.join(path, *(f"{col}={key}" for col, key in zip(partition_cols, keys)))
+        os.makedirs(partition_dir, exist_ok=True)
+        file_path: str = os.path.join(partition_dir, f"trades{extension}")
+        write_trade_fills(partition.drop(columns=list(partition_cols)), file_path, file_format)
+        file_paths.append(file_path)
+    return file_paths
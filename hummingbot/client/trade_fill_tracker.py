@@ -0,0 +1,89 @@
+from collections import defaultdict
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from sqlalchemy.orm import Session
+
+from hummingbot.client.performance import PerformanceMetricsAccumulator
+from hummingbot.model.sql_connection_manager import SQLConnectionManager
+from hummingbot.model.trade_fill import TradeFill
+
+
+class TradeFillTracker:
+    """
+    Keeps the trade fills of a config file recorded since a start time, fetching only the ones recorded since the last
+    update, so that the cost of an update does not grow with the trade history.
+
+    The trade fills are detached from the session once loaded, so that commits on the shared session do not expire
+    them and trigger a reload of each one on the next access.
+    """
+
+    def __init__(self, sql: SQLConnectionManager, config_file_path: str, start_timestamp: int):
+        self._sql: SQLConnectionManager = sql
+        self._config_file_path: str = config_file_path
+        self._start_timestamp: int = start_timestamp
+        self._last_trade_id: int = 0
+        self._trades: List[TradeFill] = []
+        self._trades_by_market: Dict[Tuple[str, str], List[TradeFill]] = defaultdict(list)
+        self._performance_accumulators: Dict[Tuple[str, str], PerformanceMetricsAccumulator] = {}
+
+    @property
+    def sql(self) -> SQLConnectionManager:
+        return self._sql
+
+    @property
+    def config_file_path(self) -> str:
+        return self._config_file_path
+
+    @property
+    def start_timestamp(self) -> int:
+        return self._start_timestamp
+
+    @property
+    def last_trade_id(self) -> int:
+        return self._last_trade_id
+
+    @property
+    def trades(self) -> List[TradeFill]:
+        return self._trades
+
+    @property
+    def trades_by_market(self) -> Dict[Tuple[str, str], List[TradeFill]]:
+        """
+        The trade fills by (market, trading pair).
+        """
+        return self._trades_by_market
+
+    @property
+    def performance_accumulators(self) -> Dict[Tuple[str, str], PerformanceMetricsAccumulator]:
+        """
+        The performance metrics accumulators of the trade fills by (market, trading pair).
+        """
+        return self._performance_accumulators
+
+    def update(self) -> List[TradeFill]:
+        """
+        Fetches the trade fills recorded since the last update, and returns them.
+        """
+        session: Session = self._sql.get_shared_session()
+        new_trades: List[TradeFill] = TradeFill.get_new_trades(session,
+                                                               self._config_file_path,
+                                                               self._last_trade_id,
+                                                               self._start_timestamp)
+        for trade in new_trades:
+            session.expunge(trade)
+            self._trades.append(trade)
+            self._trades_by_market[(trade.market, trade.symbol)].append(trade)
+            accumulator: Optional[PerformanceMetricsAccumulator] = \
+                self._performance_accumulators.get((trade.market, trade.symbol))
+            if accumulator is None:
+                accumulator = PerformanceMetricsAccumulator(trade.market, trade.symbol)
+                self._performance_accumulators[(trade.market, trade.symbol)] = accumulator
+            accumulator.add_trade(trade)
+        if len(new_trades) > 0:
+            self._last_trade_id = new_trades[-1].id
+        return new_trades
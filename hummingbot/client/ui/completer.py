@@ -49,6 +49,8 @@ class HummingbotCompleter(Completer):
         self._export_completer = WordCompleter(["keys", "trades"], ignore_case=True)
         self._balance_completer = WordCompleter(["limit", "paper"], ignore_case=True)
         self._history_completer = WordCompleter(["--days", "--verbose", "--precision"], ignore_case=True)
+        self._order_book_stats_completer = WordCompleter(["--exchange", "--market", "--live", "--export"],
+                                                         ignore_case=True)
         self._strategy_completer = WordCompleter(STRATEGIES, ignore_case=True)
         self._py_file_completer = WordCompleter(file_name_list(SCRIPTS_PATH, "py"))
         self._rate_oracle_completer = WordCompleter([r.name for r in RateOracleSource], ignore_case=True)
@@ -134,6 +136,10 @@ class HummingbotCompleter(Completer):
         text_before_cursor: str = document.text_before_cursor
         return text_before_cursor.startswith("history ")
 
+    def _complete_order_book_stats_arguments(self, document: Document) -> bool:
+        text_before_cursor: str = document.text_before_cursor
+        return text_before_cursor.startswith("order_book_stats ")
+
     def _complete_trading_pairs(self, document: Document) -> bool:
         return "trading pair" in self.prompt_text
 
@@ -196,6 +202,10 @@ class HummingbotCompleter(Completer):
             for c in self._connect_option_completer.get_completions(document, complete_event):
                 yield c
 
+        elif self._complete_order_book_stats_arguments(document):
+            for c in self._order_book_stats_completer.get_completions(document, complete_event):
+                yield c
+
         elif self._complete_export_options(document):
             for c in self._export_completer.get_completions(document, complete_event):
                 yield c
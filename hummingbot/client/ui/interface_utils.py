@@ -1,14 +1,15 @@
 from decimal import Decimal
 from typing import (
+    Dict,
+    Optional,
     Set,
     Tuple,
-    List
 )
 import psutil
 import datetime
 import asyncio
-from hummingbot.model.trade_fill import TradeFill
-from hummingbot.client.performance import calculate_performance_metrics, smart_round
+from hummingbot.client.trade_fill_tracker import TradeFillTracker
+from hummingbot.client.performance import PerformanceMetrics, smart_round
 
 
 s_decimal_0 = Decimal("0")
@@ -49,28 +50,29 @@ async def start_trade_monitor(trade_monitor):
     hb = HummingbotApplication.main_application()
     trade_monitor.log("Trades: 0, Total P&L: 0.00, Return %: 0.00%")
     total_trades = 0
-    return_pcts = []
-    pnls = []
     quote_asset = ""
+    tracker: Optional[TradeFillTracker] = None
+    # Only the performance of the markets with new trades is recalculated.
+    perfs: Dict[Tuple[str, str], PerformanceMetrics] = {}
 
     while True:
         if hb.strategy_task is not None and not hb.strategy_task.done():
             if all(market.ready for market in hb.markets.values()):
-                trades: List[TradeFill] = hb._get_trades_from_session(int(hb.init_time * 1e3),
-                                                                      config_file_path=hb.strategy_file_name)
-                if len(trades) > total_trades:
-                    total_trades = len(trades)
-                    market_info: Set[Tuple[str, str]] = set((t.market, t.symbol) for t in trades)
+                trade_fill_tracker: Optional[TradeFillTracker] = hb.get_trade_fill_tracker()
+                if trade_fill_tracker is not tracker:
+                    tracker = trade_fill_tracker
+                    total_trades = 0
+                    perfs.clear()
+                if tracker is not None and len(tracker.trades) > total_trades:
+                    market_info: Set[Tuple[str, str]] = set((t.market, t.symbol) for t in tracker.trades[total_trades:])
+                    total_trades = len(tracker.trades)
                     for market, symbol in market_info:
                         quote_asset = symbol.split("-")[1]  # Note that the qiote asset of the last pair is assumed to be the quote asset of P&L for simplicity
-                        cur_trades = [t for t in trades if t.market == market and t.symbol == symbol]
                         cur_balances = await hb.get_current_balances(market)
-                        perf = await calculate_performance_metrics(market, symbol, cur_trades, cur_balances)
-                        return_pcts.append(perf.return_pct)
-                        pnls.append(perf.total_pnl)
+                        perfs[(market, symbol)] = \
+                            await tracker.performance_accumulators[(market, symbol)].calculate(cur_balances)
+                    return_pcts = [perf.return_pct for perf in perfs.values()]
                     avg_return = sum(return_pcts) / len(return_pcts) if len(return_pcts) > 0 else s_decimal_0
-                    total_pnls = sum(pnls)  # Note that this sum doesn't handles cases with different multiple pairs for simplisity
+                    total_pnls = sum(perf.total_pnl for perf in perfs.values())  # Note that this sum doesn't handles cases with different multiple pairs for simplisity
                     trade_monitor.log(f"Trades: {total_trades}, Total P&L: {smart_round(total_pnls)} {quote_asset}, Return %: {avg_return:.2%}")
-                    return_pcts.clear()
-                    pnls.clear()
         await asyncio.sleep(2)  # sleeping for longer to manage resources
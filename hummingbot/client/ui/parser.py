@@ -124,6 +124,8 @@ def load_parser(hummingbot) -> ThrowingArgumentParser:
 
     export_parser = subparsers.add_parser("export", help="Export secure information")
     export_parser.add_argument("option", nargs="?", choices=("keys", "trades"), help="Export choices")
+    export_parser.add_argument("--partition-by", nargs="*", default=[], dest="partition_cols",
+                               help="Columns to partition exported trades by, e.g. date market")
     export_parser.set_defaults(func=hummingbot.export)
 
     order_book_parser = subparsers.add_parser("order_book", help="Display current order book")
@@ -133,6 +135,16 @@ def load_parser(hummingbot) -> ThrowingArgumentParser:
     order_book_parser.add_argument("--live", default=False, action="store_true", dest="live", help="Show order book updates")
     order_book_parser.set_defaults(func=hummingbot.order_book)
 
+    order_book_stats_parser = subparsers.add_parser("order_book_stats",
+                                                    help="Display order book update latency and staleness")
+    order_book_stats_parser.add_argument("--exchange", type=str, dest="exchange", help="The exchange of the markets")
+    order_book_stats_parser.add_argument("--market", type=str, dest="market", help="The market (trading pair) to show")
+    order_book_stats_parser.add_argument("--live", default=False, action="store_true", dest="live",
+                                         help="Show order book stats updates")
+    order_book_stats_parser.add_argument("--export", default=False, action="store_true", dest="export",
+                                         help="Export order book stats to a JSON file in the logs folder")
+    order_book_stats_parser.set_defaults(func=hummingbot.order_book_stats)
+
     ticker_parser = subparsers.add_parser("ticker", help="Show market ticker of current order book")
     ticker_parser.add_argument("--live", default=False, action="store_true", dest="live", help="Show ticker updates")
     ticker_parser.add_argument("--exchange", type=str, dest="exchange", help="The exchange of the market")
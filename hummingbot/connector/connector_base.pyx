@@ -185,6 +185,12 @@ cdef class ConnectorBase(NetworkIterator):
         """
         raise NotImplementedError
 
+    def trading_pair_ready(self, trading_pair: str) -> bool:
+        """
+        Indicates whether the connector is ready to be used for the trading pair.
+        """
+        return self.ready
+
     @property
     def in_flight_orders(self) -> Dict[str, InFlightOrderBase]:
         raise NotImplementedError
@@ -3,7 +3,6 @@
 import asyncio
 import aiohttp
 import logging
-import pandas as pd
 from typing import (
     Any,
     AsyncIterable,
@@ -38,6 +37,9 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
 
     MESSAGE_TIMEOUT = 30.0
     PING_TIMEOUT = 10.0
+    # Full snapshot refreshes of all order books are only a safety net, since gaps in the diff stream are detected from
+    # the diff update IDs and resync the gapped order book alone. None turns them off.
+    SNAPSHOT_REFRESH_INTERVAL: Optional[float] = 6 * 60 * 60.0
 
     _baobds_logger: Optional[HummingbotLogger] = None
 
@@ -123,18 +125,21 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
 
             return data
 
-    async def get_new_order_book(self, trading_pair: str) -> OrderBook:
+    async def get_order_book_snapshot_message(self, trading_pair: str) -> OrderBookMessage:
         async with aiohttp.ClientSession() as client:
             snapshot: Dict[str, Any] = await self.get_snapshot(client, trading_pair, 1000, self._domain)
             snapshot_timestamp: float = time.time()
-            snapshot_msg: OrderBookMessage = BinanceOrderBook.snapshot_message_from_exchange(
+            return BinanceOrderBook.snapshot_message_from_exchange(
                 snapshot,
                 snapshot_timestamp,
                 metadata={"trading_pair": trading_pair}
             )
-            order_book = self.order_book_create_function()
-            order_book.apply_snapshot(snapshot_msg.bids, snapshot_msg.asks, snapshot_msg.update_id)
-            return order_book
+
+    async def get_new_order_book(self, trading_pair: str) -> OrderBook:
+        snapshot_msg: OrderBookMessage = await self.get_order_book_snapshot_message(trading_pair)
+        order_book = self.order_book_create_function()
+        order_book.apply_numpy_snapshot(snapshot_msg.bids_array, snapshot_msg.asks_array, snapshot_msg.update_id)
+        return order_book
 
     async def _inner_messages(self,
                               ws: websockets.WebSocketClientProtocol) -> AsyncIterable[str]:
@@ -191,8 +196,9 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
                     ws: websockets.WebSocketClientProtocol = ws
                     async for raw_msg in self._inner_messages(ws):
                         msg = ujson.loads(raw_msg)
+                        # Timestamped with the exchange event time, so order book latency can be measured.
                         order_book_message: OrderBookMessage = BinanceOrderBook.diff_message_from_exchange(
-                            msg, time.time())
+                            msg, msg["E"] * 1e-3)
                         output.put_nowait(order_book_message)
             except asyncio.CancelledError:
                 raise
@@ -202,8 +208,12 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
                 await asyncio.sleep(30.0)
 
     async def listen_for_order_book_snapshots(self, ev_loop: asyncio.BaseEventLoop, output: asyncio.Queue):
+        if self.SNAPSHOT_REFRESH_INTERVAL is None:
+            return
         while True:
             try:
+                # The order books have just been initialized from snapshots.
+                await asyncio.sleep(self.SNAPSHOT_REFRESH_INTERVAL)
                 async with aiohttp.ClientSession() as client:
                     for trading_pair in self._trading_pairs:
                         try:
@@ -224,10 +234,6 @@ class BinanceAPIOrderBookDataSource(OrderBookTrackerDataSource):
                         except Exception:
                             self.logger().error("Unexpected error.", exc_info=True)
                             await asyncio.sleep(5.0)
-                    this_hour: pd.Timestamp = pd.Timestamp.utcnow().replace(minute=0, second=0, microsecond=0)
-                    next_hour: pd.Timestamp = this_hour + pd.Timedelta(hours=1)
-                    delta: float = next_hour.timestamp() - time.time()
-                    await asyncio.sleep(delta)
             except asyncio.CancelledError:
                 raise
             except Exception:
@@ -54,6 +54,7 @@ from hummingbot.core.event.events import (
 from hummingbot.connector.exchange_base import ExchangeBase
 from hummingbot.core.network_iterator import NetworkStatus
 from hummingbot.core.data_type.order_book cimport OrderBook
+from hummingbot.core.data_type.sharded_order_book_tracker import ShardedOrderBookTracker
 from hummingbot.core.data_type.cancellation_result import CancellationResult
 from hummingbot.core.data_type.transaction_tracker import TransactionTracker
 from hummingbot.connector.trading_rule cimport TradingRule
@@ -128,13 +129,28 @@ cdef class BinanceExchange(ExchangeBase):
                  binance_api_secret: str,
                  trading_pairs: Optional[List[str]] = None,
                  trading_required: bool = True,
-                 domain="com"
+                 domain="com",
+                 order_book_tracker_shards: int = 0,
+                 order_book_tracker_shard_depth: int = ShardedOrderBookTracker.DEFAULT_DEPTH
                  ):
+        """
+        :param order_book_tracker_shards: The number of worker processes to track the order books in, 0 to track them
+        in the main process.
+        :param order_book_tracker_shard_depth: The number of price levels per side the main process order books hold
+        when they are tracked in worker processes.
+        """
         self._domain = domain
         self.monkey_patch_binance_time()
         super().__init__()
         self._trading_required = trading_required
-        self._order_book_tracker = BinanceOrderBookTracker(trading_pairs=trading_pairs, domain=domain)
+        if order_book_tracker_shards > 0:
+            self._order_book_tracker = ShardedOrderBookTracker(tracker_class=BinanceOrderBookTracker,
+                                                               trading_pairs=trading_pairs,
+                                                               num_shards=order_book_tracker_shards,
+                                                               tracker_kwargs={"domain": domain},
+                                                               depth=order_book_tracker_shard_depth)
+        else:
+            self._order_book_tracker = BinanceOrderBookTracker(trading_pairs=trading_pairs, domain=domain)
         self._binance_client = BinanceClient(binance_api_key, binance_api_secret, tld=domain)
         self._user_stream_tracker = BinanceUserStreamTracker(binance_client=self._binance_client, domain=domain)
         self._ev_loop = asyncio.get_event_loop()
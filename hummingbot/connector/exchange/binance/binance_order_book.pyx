@@ -14,7 +14,8 @@ from hummingbot.core.event.events import TradeType
 from hummingbot.core.data_type.order_book cimport OrderBook
 from hummingbot.core.data_type.order_book_message import (
     OrderBookMessage,
-    OrderBookMessageType
+    OrderBookMessageType,
+    entries_to_numpy,
 )
 from . import binance_utils
 
@@ -39,8 +40,8 @@ cdef class BinanceOrderBook(OrderBook):
         return OrderBookMessage(OrderBookMessageType.SNAPSHOT, {
             "trading_pair": msg["trading_pair"],
             "update_id": msg["lastUpdateId"],
-            "bids": msg["bids"],
-            "asks": msg["asks"]
+            "bids": entries_to_numpy(msg["bids"], msg["lastUpdateId"]),
+            "asks": entries_to_numpy(msg["asks"], msg["lastUpdateId"])
         }, timestamp=timestamp)
 
     @classmethod
@@ -54,8 +55,8 @@ cdef class BinanceOrderBook(OrderBook):
             "trading_pair": binance_utils.convert_from_exchange_trading_pair(msg["s"]),
             "first_update_id": msg["U"],
             "update_id": msg["u"],
-            "bids": msg["b"],
-            "asks": msg["a"]
+            "bids": entries_to_numpy(msg["b"], msg["u"]),
+            "asks": entries_to_numpy(msg["a"], msg["u"])
         }, timestamp=timestamp)
 
     @classmethod
@@ -140,5 +141,5 @@ cdef class BinanceOrderBook(OrderBook):
     @classmethod
     def from_snapshot(cls, msg: OrderBookMessage) -> "OrderBook":
         retval = BinanceOrderBook()
-        retval.apply_snapshot(msg.bids, msg.asks, msg.update_id)
+        retval.apply_numpy_snapshot(msg.bids_array, msg.asks_array, msg.update_id)
         return retval
@@ -8,7 +8,8 @@ from typing import (
     Deque,
     Dict,
     List,
-    Optional
+    Optional,
+    Tuple,
 )
 
 from hummingbot.logger import HummingbotLogger
@@ -19,6 +20,11 @@ from hummingbot.core.data_type.order_book_message import OrderBookMessage, Order
 
 
 class BinanceOrderBookTracker(OrderBookTracker):
+    # 1200 request weight per minute, of which a 1000 level depth snapshot weighs 10. Up to 90 snapshots a minute
+    # during initialization leaves room for the exchange's own requests.
+    REST_RATE_LIMIT: Tuple[float, float] = (1200, 60.0)
+    SNAPSHOT_REQUEST_WEIGHT: float = 10
+    INIT_ORDER_BOOKS_RATE_LIMIT_SHARE: float = 0.75
     _bobt_logger: Optional[HummingbotLogger] = None
 
     @classmethod
@@ -105,6 +111,8 @@ class BinanceOrderBookTracker(OrderBookTracker):
         order_book: OrderBook = self._order_books[trading_pair]
         last_message_timestamp: float = time.time()
         diff_messages_accepted: int = 0
+        diff_messages_coalesced: int = 0
+        pending_message: Optional[OrderBookMessage] = None
 
         while True:
             try:
@@ -114,25 +122,32 @@ class BinanceOrderBookTracker(OrderBookTracker):
                 # Process saved messages first if there are any
                 if len(saved_messages) > 0:
                     message = saved_messages.popleft()
+                elif pending_message is not None:
+                    message, pending_message = pending_message, None
                 else:
                     message = await message_queue.get()
 
                 if message.type is OrderBookMessageType.DIFF:
-                    order_book.apply_diffs(message.bids, message.asks, message.update_id)
-                    past_diffs_window.append(message)
-                    while len(past_diffs_window) > self.PAST_DIFF_WINDOW_SIZE:
-                        past_diffs_window.popleft()
-                    diff_messages_accepted += 1
+                    if len(saved_messages) > 0:
+                        diff_messages: List[OrderBookMessage] = [message]
+                        while len(saved_messages) > 0 and saved_messages[0].type is OrderBookMessageType.DIFF:
+                            diff_messages.append(saved_messages.popleft())
+                    else:
+                        diff_messages, pending_message = self._drain_diff_messages(message_queue, message)
+                    self._process_diff_messages(trading_pair, order_book, diff_messages, past_diffs_window)
+                    diff_messages_accepted += len(diff_messages)
+                    diff_messages_coalesced += len(diff_messages) - 1
 
                     # Output some statistics periodically.
                     now: float = time.time()
                     if int(now / 60.0) > int(last_message_timestamp / 60.0):
-                        self.logger().debug(f"Processed {diff_messages_accepted} order book diffs for {trading_pair}.")
+                        self.logger().debug(f"Processed {diff_messages_accepted} order book diffs for {trading_pair}, "
+                                            f"{diff_messages_coalesced} of them coalesced.")
                         diff_messages_accepted = 0
+                        diff_messages_coalesced = 0
                     last_message_timestamp = now
                 elif message.type is OrderBookMessageType.SNAPSHOT:
-                    past_diffs: List[OrderBookMessage] = list(past_diffs_window)
-                    order_book.restore_from_snapshot_and_diffs(message, past_diffs)
+                    self._process_snapshot_message(trading_pair, order_book, message, past_diffs_window)
                     self.logger().debug(f"Processed order book snapshot for {trading_pair}.")
             except asyncio.CancelledError:
                 raise
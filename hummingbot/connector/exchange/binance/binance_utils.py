@@ -10,6 +10,8 @@ from hummingbot.client.config.config_methods import using_exchange
 CENTRALIZED = True
 EXAMPLE_PAIR = "ZRX-ETH"
 DEFAULT_FEES = [0.1, 0.1]
+# The connector accepts the order_book_tracker_shards and order_book_tracker_shard_depth parameters.
+USE_SHARDED_ORDER_BOOK_TRACKER = True
 
 RE_4_LETTERS_QUOTE = re.compile(r"^(\w{3,})(USDT|USDC|USDS|TUSD|BUSD|IDRT|BKRW|BIDR|BVND)$")
 RE_3_LETTERS_QUOTE = re.compile(r"^(\w+)(\w{3})$")
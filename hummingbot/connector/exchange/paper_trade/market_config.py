@@ -13,11 +13,14 @@ class AssetType(Enum):
 class MarketConfig(namedtuple("_MarketConfig", "buy_fees_asset,"
                                                "buy_fees_amount,"
                                                "sell_fees_asset,"
-                                               "sell_fees_amount,")):
+                                               "sell_fees_amount,"
+                                               "order_latency", defaults=(0.0,))):
     buy_fees_asset: AssetType
     buy_fees_amount: Decimal
     sell_fees_asset: AssetType
     sell_fees_amount: Decimal
+    # Seconds from the creation of an order until it can be filled.
+    order_latency: float
 
     @classmethod
     def default_config(cls) -> "MarketConfig":
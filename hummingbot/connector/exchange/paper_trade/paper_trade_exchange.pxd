@@ -1,3 +1,4 @@
+from libc.stdint cimport int64_t
 from libcpp.set cimport set as cpp_set
 from libcpp.string cimport string
 from libcpp.unordered_map cimport unordered_map
@@ -24,6 +25,25 @@ ctypedef cpp_set[CPPOrderExpirationEntry] LimitOrderExpirationSet
 ctypedef cpp_set[CPPOrderExpirationEntry].iterator LimitOrderExpirationSetIterator
 
 
+cdef class QueuedOrder:
+    cdef:
+        double create_timestamp
+        str _order_id
+        bint _is_buy
+        str _trading_pair
+        object _amount
+
+
+cdef class PaperTradeOrder(QueuedOrder):
+    cdef:
+        int64_t matching_engine_id
+        object _order_type
+        object _price
+        object executed_amount_base
+        object executed_amount_quote
+        object fee_amount
+
+
 cdef class PaperTradeExchange(ExchangeBase):
     cdef:
         LimitOrders _bid_limit_orders
@@ -31,17 +51,20 @@ cdef class PaperTradeExchange(ExchangeBase):
         bint _paper_trade_market_initialized
         dict _trading_pairs
         object _config
-        object _queued_orders
+        dict _matching_engine_orders
+        dict _matching_engine_order_ids
+        int64_t _matching_engine_owner_id
         dict _quantization_params
         object _order_book_trade_listener
         object _market_order_filled_listener
         LimitOrderExpirationSet _limit_order_expiration_set
         object _target_market
+        dict _on_hold_balances
 
-    cdef c_execute_buy(self, str order_id, str trading_pair, object amount)
-    cdef c_execute_sell(self, str order_id, str trading_pair, object amount)
-    cdef c_process_market_orders(self)
+    cdef c_execute_buy(self, str order_id, str trading_pair, list buy_entries)
+    cdef c_execute_sell(self, str order_id, str trading_pair, list sell_entries)
     cdef c_set_balance(self, str currency, object amount)
+    cdef c_add_on_hold_balance(self, str currency, object amount)
     cdef object c_get_fee(self,
                           str base_asset,
                           str quote_asset,
@@ -53,24 +76,23 @@ cdef class PaperTradeExchange(ExchangeBase):
                               LimitOrders *limit_orders_map_ptr,
                               LimitOrdersIterator *map_it_ptr,
                               const SingleTradingPairLimitOrdersIterator orders_it)
-    cdef c_process_limit_order(self,
-                               bint is_buy,
-                               LimitOrders *limit_orders_map_ptr,
-                               LimitOrdersIterator *map_it_ptr,
-                               SingleTradingPairLimitOrdersIterator orders_it)
-    cdef c_process_limit_bid_order(self,
-                                   LimitOrders *limit_orders_map_ptr,
-                                   LimitOrdersIterator *map_it_ptr,
-                                   SingleTradingPairLimitOrdersIterator orders_it)
-    cdef c_process_limit_ask_order(self,
-                                   LimitOrders *limit_orders_map_ptr,
-                                   LimitOrdersIterator *map_it_ptr,
-                                   SingleTradingPairLimitOrdersIterator orders_it)
-    cdef c_process_crossed_limit_orders_for_trading_pair(self,
-                                                         bint is_buy,
-                                                         LimitOrders *limit_orders_map_ptr,
-                                                         LimitOrdersIterator *map_it_ptr)
-    cdef c_process_crossed_limit_orders(self)
+    cdef c_submit_order(self,
+                        str order_id,
+                        str trading_pair_str,
+                        bint is_buy,
+                        object order_type,
+                        object price,
+                        object amount)
+    cdef c_remove_matching_engine_order(self, str order_id)
+    cdef c_insert_limit_order(self, bint is_buy, str trading_pair_str, str order_id, object price, object quantity)
+    cdef c_update_limit_order(self, PaperTradeOrder order, object quantity)
+    cdef c_fill_limit_order(self,
+                            PaperTradeOrder order,
+                            double price,
+                            double amount,
+                            bint is_maker,
+                            bint is_complete)
+    cdef c_process_fills(self)
     cdef c_match_trade_to_limit_orders(self, object order_book_trade_event)
     cdef object c_cancel_order_from_orders_map(self,
                                                LimitOrders *orders_map,
@@ -1,16 +1,16 @@
-# distutils: sources=['hummingbot/core/cpp/Utils.cpp', 'hummingbot/core/cpp/LimitOrder.cpp', 'hummingbot/core/cpp/OrderExpirationEntry.cpp']
+# distutils: sources=['hummingbot/core/cpp/Utils.cpp', 'hummingbot/core/cpp/LimitOrder.cpp', 'hummingbot/core/cpp/OrderExpirationEntry.cpp', 'hummingbot/core/cpp/OrderBookEntry.cpp', 'hummingbot/core/cpp/MatchingEngine.cpp']
 
 import asyncio
-from collections import (
-    deque, defaultdict
-)
+from collections import defaultdict
 from cpython cimport PyObject
 from decimal import Decimal
+from libc.stdint cimport int64_t
 from libcpp cimport bool as cppbool
 from libcpp.vector cimport vector
 import math
 import pandas as pd
 import random
+import weakref
 from typing import (
     Dict,
     List,
@@ -36,7 +36,9 @@ from hummingbot.core.data_type.composite_order_book import CompositeOrderBook
 from hummingbot.core.data_type.composite_order_book cimport CompositeOrderBook
 from hummingbot.core.data_type.limit_order cimport c_create_limit_order_from_cpp_limit_order
 from hummingbot.core.data_type.limit_order import LimitOrder
+from hummingbot.core.data_type.MatchingEngine cimport MatchingEngineFill
 from hummingbot.core.data_type.order_book cimport OrderBook
+from hummingbot.core.data_type.order_book_row import OrderBookRow
 from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
 from hummingbot.core.event.events import (
     MarketEvent,
@@ -93,13 +95,6 @@ cdef class QuantizationParams:
 
 
 cdef class QueuedOrder:
-    cdef:
-        double create_timestamp
-        str _order_id
-        bint _is_buy
-        str _trading_pair
-        object _amount
-
     def __init__(self, create_timestamp: float, order_id: str, is_buy: bool, trading_pair: str, amount: Decimal):
         self.create_timestamp = create_timestamp
         self._order_id = order_id
@@ -132,44 +127,95 @@ cdef class QueuedOrder:
                 f"{self.amount})")
 
 
+cdef class PaperTradeOrder(QueuedOrder):
+    def __init__(self,
+                 matching_engine_id: int,
+                 create_timestamp: float,
+                 order_id: str,
+                 is_buy: bool,
+                 trading_pair: str,
+                 order_type: OrderType,
+                 price: Decimal,
+                 amount: Decimal):
+        super().__init__(create_timestamp, order_id, is_buy, trading_pair, amount)
+        self.matching_engine_id = matching_engine_id
+        self._order_type = order_type
+        self._price = price
+        self.executed_amount_base = s_decimal_0
+        self.executed_amount_quote = s_decimal_0
+        self.fee_amount = s_decimal_0
+
+    @property
+    def order_type(self) -> OrderType:
+        return self._order_type
+
+    @property
+    def price(self) -> Decimal:
+        return self._price
+
+    def __repr__(self) -> str:
+        return (f"PaperTradeOrder({self.create_timestamp}, '{self.order_id}', {self.is_buy}, '{self.trading_pair}', "
+                f"{self.order_type}, {self.price}, {self.amount})")
+
+
 cdef class OrderBookTradeListener(EventListener):
+    # The market is referenced weakly, so that the order books it listens to don't keep it alive.
     cdef:
-        ExchangeBase _market
+        object _market_ref
 
     def __init__(self, market: ExchangeBase):
         super().__init__()
-        self._market = market
+        self._market_ref = weakref.ref(market)
 
     cdef c_call(self, object event_object):
+        market = self._market_ref()
+        if market is None:
+            return
         try:
-            self._market.match_trade_to_limit_orders(event_object)
+            market.match_trade_to_limit_orders(event_object)
         except Exception as e:
             self.logger().error("Error call trade listener.", exc_info=True)
 
 cdef class OrderBookMarketOrderFillListener(EventListener):
     cdef:
-        ExchangeBase _market
+        object _market_ref
 
     def __init__(self, market: ExchangeBase):
         super().__init__()
-        self._market = market
+        self._market_ref = weakref.ref(market)
 
     cdef c_call(self, object event_object):
-
-        if event_object.trading_pair not in self._market.order_books or event_object.order_type != OrderType.MARKET:
+        market = self._market_ref()
+        if market is None:
             return
-        order_book = self._market.order_books[event_object.trading_pair]
+        if event_object.trading_pair not in market.order_books or event_object.order_type != OrderType.MARKET:
+            return
+        order_book = market.order_books[event_object.trading_pair]
         order_book.record_filled_order(event_object)
 
 cdef dict PaperTradeExchange_account_balances
 
+# Paper trade exchanges can share order books, and with them the matching engines. Order ids are unique across the
+# exchanges, and each exchange pops the fills of its own orders by its owner id.
+cdef int64_t PaperTradeExchange_last_matching_engine_order_id = 0
+cdef int64_t PaperTradeExchange_last_matching_engine_owner_id = 0
+
 cdef c_reset_paper_trade_account_balance():
     global PaperTradeExchange_account_balances
     PaperTradeExchange_account_balances = {}
 
+cdef int64_t c_next_matching_engine_order_id():
+    global PaperTradeExchange_last_matching_engine_order_id
+    PaperTradeExchange_last_matching_engine_order_id += 1
+    return PaperTradeExchange_last_matching_engine_order_id
+
+cdef int64_t c_next_matching_engine_owner_id():
+    global PaperTradeExchange_last_matching_engine_owner_id
+    PaperTradeExchange_last_matching_engine_owner_id += 1
+    return PaperTradeExchange_last_matching_engine_owner_id
+
 
 cdef class PaperTradeExchange(ExchangeBase):
-    TRADE_EXECUTION_DELAY = 5.0
     ORDER_FILLED_EVENT_TAG = MarketEvent.OrderFilled.value
     SELL_ORDER_COMPLETED_EVENT_TAG = MarketEvent.SellOrderCompleted.value
     BUY_ORDER_COMPLETED_EVENT_TAG = MarketEvent.BuyOrderCompleted.value
@@ -202,10 +248,13 @@ cdef class PaperTradeExchange(ExchangeBase):
         self._paper_trade_market_initialized = False
         self._trading_pairs = {}
         self._config = config
-        self._queued_orders = deque()
+        self._matching_engine_orders = {}
+        self._matching_engine_order_ids = {}
+        self._matching_engine_owner_id = c_next_matching_engine_owner_id()
         self._quantization_params = {}
         self._order_book_trade_listener = OrderBookTradeListener(self)
         self._target_market = target_market
+        self._on_hold_balances = {}
         self._market_order_filled_listener = OrderBookMarketOrderFillListener(self)
         self.c_add_listener(self.ORDER_FILLED_EVENT_TAG, self._market_order_filled_listener)
 
@@ -264,7 +313,7 @@ cdef class PaperTradeExchange(ExchangeBase):
 
     @property
     def queued_orders(self) -> List[QueuedOrder]:
-        return self._queued_orders
+        return [order for order in self._matching_engine_orders.values() if order.order_type is OrderType.MARKET]
 
     @property
     def limit_orders(self) -> List[LimitOrder]:
@@ -300,25 +349,46 @@ cdef class PaperTradeExchange(ExchangeBase):
 
     @property
     def on_hold_balances(self) -> Dict[str, Decimal]:
-        _on_hold_balances = defaultdict(Decimal)
-        for limit_order in self.limit_orders:
-            if limit_order.is_buy:
-                _on_hold_balances[limit_order.quote_currency] += limit_order.quantity * limit_order.price
-            else:
-                _on_hold_balances[limit_order.base_currency] += limit_order.quantity
-        return _on_hold_balances
+        return defaultdict(Decimal, self._on_hold_balances)
 
     @property
     def available_balances(self) -> Dict[str, Decimal]:
         _available_balances = self._account_balances.copy()
-        for trading_pair_str, balance in _available_balances.items():
-            _available_balances[trading_pair_str] -= self.on_hold_balances[trading_pair_str]
+        for currency, on_hold_balance in self._on_hold_balances.items():
+            if currency in _available_balances:
+                _available_balances[currency] -= on_hold_balance
         return _available_balances
 
     # </editor-fold>
 
+    def __dealloc__(self):
+        # The orders left on the shared matching engines would otherwise stay there, and queue fills nobody pops.
+        cdef:
+            PaperTradeOrder order
+        if self._matching_engine_orders is None or self._order_book_tracker is None:
+            return
+        for order in self._matching_engine_orders.values():
+            order_book = self._order_book_tracker.order_books.get(order.trading_pair)
+            if order_book is not None:
+                (<CompositeOrderBook>order_book)._matching_engine.cancelOrder(order.matching_engine_id)
+
     cdef c_start(self, Clock clock, double timestamp):
         ExchangeBase.c_start(self, clock, timestamp)
+        for trading_pair in self._trading_pairs.values():
+            (<CompositeOrderBook>self._order_book_tracker.order_books[trading_pair.trading_pair]).c_add_listener(
+                self.ORDER_BOOK_TRADE_EVENT_TAG,
+                self._order_book_trade_listener
+            )
+
+    cdef c_stop(self, Clock clock):
+        # A stopped market stops listening to the order book trades. Its orders stay on the matching engines, and the
+        # fills queued for them meanwhile are processed once it's restarted.
+        ExchangeBase.c_stop(self, clock)
+        for trading_pair in self._trading_pairs.values():
+            (<CompositeOrderBook>self._order_book_tracker.order_books[trading_pair.trading_pair]).c_remove_listener(
+                self.ORDER_BOOK_TRADE_EVENT_TAG,
+                self._order_book_trade_listener
+            )
 
     async def start_network(self):
         await self.stop_network()
@@ -333,6 +403,15 @@ cdef class PaperTradeExchange(ExchangeBase):
     cdef c_set_balance(self, str currency, object balance):
         self._account_balances[currency.upper()] = Decimal(balance)
 
+    cdef c_add_on_hold_balance(self, str currency, object amount):
+        # The balances held by open limit orders are kept up to date as orders are created and deleted, so that
+        # available balance queries don't have to go through every open limit order.
+        on_hold_balance = self._on_hold_balances.get(currency, s_decimal_0) + amount
+        if on_hold_balance == s_decimal_0:
+            self._on_hold_balances.pop(currency, None)
+        else:
+            self._on_hold_balances[currency] = on_hold_balance
+
     cdef object c_get_balance(self, str currency):
         if currency.upper() not in self._account_balances:
             self.logger().warning(f"Account balance does not have asset {currency.upper()}.")
@@ -340,9 +419,13 @@ cdef class PaperTradeExchange(ExchangeBase):
         return self._account_balances[currency.upper()]
 
     cdef c_tick(self, double timestamp):
+        cdef:
+            CompositeOrderBook order_book
         ExchangeBase.c_tick(self, timestamp)
-        self.c_process_market_orders()
-        self.c_process_crossed_limit_orders()
+        for trading_pair in self._trading_pairs.values():
+            order_book = self._order_book_tracker.order_books[trading_pair.trading_pair]
+            order_book._matching_engine.advanceTo(timestamp)
+        self.c_process_fills()
 
     cdef str c_buy(self,
                    str trading_pair_str,
@@ -355,40 +438,12 @@ cdef class PaperTradeExchange(ExchangeBase):
 
         cdef:
             str order_id = self.random_order_id("buy", trading_pair_str)
-            str quote_asset = self._trading_pairs[trading_pair_str].quote_asset
-            string cpp_order_id = order_id.encode("utf8")
-            string cpp_trading_pair_str = trading_pair_str.encode("utf8")
-            string cpp_base_asset = self._trading_pairs[trading_pair_str].base_asset.encode("utf8")
-            string cpp_quote_asset = quote_asset.encode("utf8")
-            LimitOrdersIterator map_it
-            SingleTradingPairLimitOrders *limit_orders_collection_ptr = NULL
-            pair[LimitOrders.iterator, cppbool] insert_result
 
         quantized_price = (self.c_quantize_order_price(trading_pair_str, price)
                            if order_type is OrderType.LIMIT
                            else s_decimal_0)
         quantized_amount = self.c_quantize_order_amount(trading_pair_str, amount)
-        if order_type is OrderType.MARKET:
-            self._queued_orders.append(QueuedOrder(self._current_timestamp, order_id, True, trading_pair_str,
-                                                   quantized_amount))
-        elif order_type is OrderType.LIMIT:
-
-            map_it = self._bid_limit_orders.find(cpp_trading_pair_str)
-
-            if map_it == self._bid_limit_orders.end():
-                insert_result = self._bid_limit_orders.insert(LimitOrdersPair(cpp_trading_pair_str,
-                                                                              SingleTradingPairLimitOrders()))
-                map_it = insert_result.first
-            limit_orders_collection_ptr = address(deref(map_it).second)
-            limit_orders_collection_ptr.insert(CPPLimitOrder(
-                cpp_order_id,
-                cpp_trading_pair_str,
-                True,
-                cpp_base_asset,
-                cpp_quote_asset,
-                <PyObject *> quantized_price,
-                <PyObject *> quantized_amount
-            ))
+        self.c_submit_order(order_id, trading_pair_str, True, order_type, quantized_price, quantized_amount)
         safe_ensure_future(self.trigger_event_async(
             self.MARKET_BUY_ORDER_CREATED_EVENT_TAG,
             BuyOrderCreatedEvent(self._current_timestamp,
@@ -410,39 +465,12 @@ cdef class PaperTradeExchange(ExchangeBase):
             raise ValueError(f"Trading pair '{trading_pair_str}' does not existing in current data set.")
         cdef:
             str order_id = self.random_order_id("sell", trading_pair_str)
-            str base_asset = self._trading_pairs[trading_pair_str].base_asset
-            string cpp_order_id = order_id.encode("utf8")
-            string cpp_trading_pair_str = trading_pair_str.encode("utf8")
-            string cpp_base_asset = base_asset.encode("utf8")
-            string cpp_quote_asset = self._trading_pairs[trading_pair_str].quote_asset.encode("utf8")
-            LimitOrdersIterator map_it
-            SingleTradingPairLimitOrders *limit_orders_collection_ptr = NULL
-            pair[LimitOrders.iterator, cppbool] insert_result
 
         quantized_price = (self.c_quantize_order_price(trading_pair_str, price)
                            if order_type is OrderType.LIMIT
                            else s_decimal_0)
         quantized_amount = self.c_quantize_order_amount(trading_pair_str, amount)
-        if order_type is OrderType.MARKET:
-            self._queued_orders.append(QueuedOrder(self._current_timestamp, order_id, False, trading_pair_str,
-                                                   quantized_amount))
-        elif order_type is OrderType.LIMIT:
-            map_it = self._ask_limit_orders.find(cpp_trading_pair_str)
-
-            if map_it == self._ask_limit_orders.end():
-                insert_result = self._ask_limit_orders.insert(LimitOrdersPair(cpp_trading_pair_str,
-                                                                              SingleTradingPairLimitOrders()))
-                map_it = insert_result.first
-            limit_orders_collection_ptr = address(deref(map_it).second)
-            limit_orders_collection_ptr.insert(CPPLimitOrder(
-                cpp_order_id,
-                cpp_trading_pair_str,
-                False,
-                cpp_base_asset,
-                cpp_quote_asset,
-                <PyObject *> quantized_price,
-                <PyObject *> quantized_amount
-            ))
+        self.c_submit_order(order_id, trading_pair_str, False, order_type, quantized_price, quantized_amount)
         safe_ensure_future(self.trigger_event_async(
             self.MARKET_SELL_ORDER_CREATED_EVENT_TAG,
             SellOrderCreatedEvent(self._current_timestamp,
@@ -453,7 +481,108 @@ cdef class PaperTradeExchange(ExchangeBase):
                                   order_id)))
         return order_id
 
-    cdef c_execute_buy(self, str order_id, str trading_pair, object amount):
+    cdef c_submit_order(self,
+                        str order_id,
+                        str trading_pair_str,
+                        bint is_buy,
+                        object order_type,
+                        object price,
+                        object amount):
+        """
+        Submits an order to the matching engine of its order book, where it becomes active after the order latency.
+        """
+        cdef:
+            CompositeOrderBook order_book = self.c_get_order_book(trading_pair_str)
+            double active_timestamp = self._current_timestamp + self._config.order_latency
+            PaperTradeOrder order
+
+        if order_type is not OrderType.MARKET and order_type is not OrderType.LIMIT:
+            return
+        order = PaperTradeOrder(c_next_matching_engine_order_id(), self._current_timestamp, order_id, is_buy,
+                                trading_pair_str, order_type, price, amount)
+        self._matching_engine_orders[order.matching_engine_id] = order
+        self._matching_engine_order_ids[order_id] = order.matching_engine_id
+        if order_type is OrderType.MARKET:
+            order_book._matching_engine.addMarketOrder(order.matching_engine_id, is_buy, float(amount),
+                                                       active_timestamp, self._matching_engine_owner_id)
+        else:
+            self.c_insert_limit_order(is_buy, trading_pair_str, order_id, price, amount)
+            order_book._matching_engine.addLimitOrder(order.matching_engine_id, is_buy, float(price), float(amount),
+                                                      active_timestamp, False, self._matching_engine_owner_id)
+
+    cdef c_remove_matching_engine_order(self, str order_id):
+        cdef:
+            CompositeOrderBook order_book
+            PaperTradeOrder order
+
+        matching_engine_id = self._matching_engine_order_ids.pop(order_id, None)
+        if matching_engine_id is None:
+            return
+        order = self._matching_engine_orders.pop(matching_engine_id)
+        order_book = self.c_get_order_book(order.trading_pair)
+        order_book._matching_engine.cancelOrder(matching_engine_id)
+
+    cdef c_insert_limit_order(self, bint is_buy, str trading_pair_str, str order_id, object price, object quantity):
+        cdef:
+            object trading_pair = self._trading_pairs[trading_pair_str]
+            string cpp_trading_pair_str = trading_pair_str.encode("utf8")
+            LimitOrders *limit_orders_map_ptr = (address(self._bid_limit_orders)
+                                                 if is_buy
+                                                 else address(self._ask_limit_orders))
+            LimitOrdersIterator map_it = limit_orders_map_ptr.find(cpp_trading_pair_str)
+            SingleTradingPairLimitOrders *limit_orders_collection_ptr = NULL
+            pair[LimitOrders.iterator, cppbool] insert_result
+
+        if map_it == limit_orders_map_ptr.end():
+            insert_result = limit_orders_map_ptr.insert(LimitOrdersPair(cpp_trading_pair_str,
+                                                                        SingleTradingPairLimitOrders()))
+            map_it = insert_result.first
+        limit_orders_collection_ptr = address(deref(map_it).second)
+        limit_orders_collection_ptr.insert(CPPLimitOrder(
+            order_id.encode("utf8"),
+            cpp_trading_pair_str,
+            is_buy,
+            trading_pair.base_asset.encode("utf8"),
+            trading_pair.quote_asset.encode("utf8"),
+            <PyObject *> price,
+            <PyObject *> quantity
+        ))
+        if is_buy:
+            self.c_add_on_hold_balance(trading_pair.quote_asset, quantity * price)
+        else:
+            self.c_add_on_hold_balance(trading_pair.base_asset, quantity)
+
+    cdef c_update_limit_order(self, PaperTradeOrder order, object quantity):
+        """
+        Replaces the quantity of a limit order, or deletes the limit order if the quantity is 0.
+        """
+        cdef:
+            LimitOrders *limit_orders_map_ptr = (address(self._bid_limit_orders)
+                                                 if order.is_buy
+                                                 else address(self._ask_limit_orders))
+            LimitOrdersIterator map_it = limit_orders_map_ptr.find(order.trading_pair.encode("utf8"))
+            SingleTradingPairLimitOrders *limit_orders_collection_ptr = NULL
+            SingleTradingPairLimitOrdersIterator orders_it
+
+        if map_it == limit_orders_map_ptr.end():
+            return
+        limit_orders_collection_ptr = address(deref(map_it).second)
+        orders_it = limit_orders_collection_ptr.find(CPPLimitOrder(
+            order.order_id.encode("utf8"),
+            order.trading_pair.encode("utf8"),
+            order.is_buy,
+            b"",
+            b"",
+            <PyObject *> order.price,
+            <PyObject *> quantity
+        ))
+        if orders_it == limit_orders_collection_ptr.end():
+            return
+        self.c_delete_limit_order(limit_orders_map_ptr, address(map_it), orders_it)
+        if quantity > s_decimal_0:
+            self.c_insert_limit_order(order.is_buy, order.trading_pair, order.order_id, order.price, quantity)
+
+    cdef c_execute_buy(self, str order_id, str trading_pair, list buy_entries):
         cdef:
             str quote_asset = self._trading_pairs[trading_pair].quote_asset
             str base_asset = self._trading_pairs[trading_pair].base_asset
@@ -461,8 +590,6 @@ cdef class PaperTradeExchange(ExchangeBase):
             object base_balance = self.c_get_balance(base_asset)
 
         config = self._config
-        order_book = self.order_books[trading_pair]
-        buy_entries = order_book.simulate_buy(amount)
 
         # Calculate the quote currency needed
         total_quote_needed = Decimal(sum(row.price * row.amount for row in buy_entries))
@@ -520,7 +647,7 @@ cdef class PaperTradeExchange(ExchangeBase):
                                    total_base_fees if config.buy_fees_asset is AssetType.BASE_CURRENCY else total_quote_fees,
                                    OrderType.MARKET))
 
-    cdef c_execute_sell(self, str order_id, str trading_pair_str, object amount):
+    cdef c_execute_sell(self, str order_id, str trading_pair_str, list sell_entries):
         cdef:
             object quote_asset_amount
             object base_asset_amount
@@ -530,14 +657,12 @@ cdef class PaperTradeExchange(ExchangeBase):
         base_asset = self._trading_pairs[trading_pair_str].base_asset
         base_asset_amount = self.c_get_balance(base_asset)
 
-        order_book = self.order_books[trading_pair_str]
-        sell_entries = order_book.simulate_sell(amount)
         total_base_needed = Decimal(sum(row.amount for row in sell_entries))
 
         if total_base_needed > base_asset_amount:
             self.logger().warning(f"Insufficient {base_asset} balance available for sell order. "
                                   f"{base_asset_amount} {base_asset} available vs. "
-                                  f"{amount} {base_asset} required for the order.")
+                                  f"{total_base_needed} {base_asset} required for the order.")
             self.c_trigger_event(
                 self.MARKET_ORDER_FAILURE_EVENT_TAG,
                 MarketOrderFailureEvent(self._current_timestamp, order_id, OrderType.MARKET)
@@ -587,31 +712,22 @@ cdef class PaperTradeExchange(ExchangeBase):
                                     total_base_fees if config.sell_fees_asset is AssetType.BASE_CURRENCY else total_quote_fees,
                                     OrderType.MARKET))
 
-    cdef c_process_market_orders(self):
-        cdef:
-            QueuedOrder front_order = None
-        while len(self._queued_orders) > 0:
-            front_order = self._queued_orders[0]
-            if front_order.create_timestamp <= self._current_timestamp - self.TRADE_EXECUTION_DELAY:
-                self._queued_orders.popleft()
-                try:
-                    if front_order.is_buy:
-                        self.c_execute_buy(front_order.order_id, front_order.trading_pair, front_order.amount)
-                    else:
-                        self.c_execute_sell(front_order.order_id, front_order.trading_pair, front_order.amount)
-                except Exception as e:
-                    self.logger().error("Error executing queued order.", exc_info=True)
-            else:
-                return
-
     cdef c_delete_limit_order(self,
                               LimitOrders *limit_orders_map_ptr,
                               LimitOrdersIterator *map_it_ptr,
                               const SingleTradingPairLimitOrdersIterator orders_it):
         cdef:
             SingleTradingPairLimitOrders *orders_collection_ptr = address(deref(deref(map_it_ptr)).second)
+            const CPPLimitOrder *cpp_limit_order_ptr = address(deref(orders_it))
         try:
+            if cpp_limit_order_ptr.getIsBuy():
+                on_hold_currency = cpp_limit_order_ptr.getQuoteCurrency().decode("utf8")
+                on_hold_amount = <object> cpp_limit_order_ptr.getQuantity() * <object> cpp_limit_order_ptr.getPrice()
+            else:
+                on_hold_currency = cpp_limit_order_ptr.getBaseCurrency().decode("utf8")
+                on_hold_amount = <object> cpp_limit_order_ptr.getQuantity()
             orders_collection_ptr.erase(orders_it)
+            self.c_add_on_hold_balance(on_hold_currency, -on_hold_amount)
             if orders_collection_ptr.empty():
                 map_it_ptr[0] = limit_orders_map_ptr.erase(deref(map_it_ptr))
             return True
@@ -619,40 +735,48 @@ cdef class PaperTradeExchange(ExchangeBase):
             self.logger().error("Error deleting limit order.", exc_info=True)
             return False
 
-    cdef c_process_limit_bid_order(self,
-                                   LimitOrders *limit_orders_map_ptr,
-                                   LimitOrdersIterator *map_it_ptr,
-                                   SingleTradingPairLimitOrdersIterator orders_it):
+
+    cdef c_fill_limit_order(self,
+                            PaperTradeOrder order,
+                            double price,
+                            double amount,
+                            bint is_maker,
+                            bint is_complete):
         cdef:
-            const CPPLimitOrder *cpp_limit_order_ptr = address(deref(orders_it))
-            str trading_pair = cpp_limit_order_ptr.getTradingPair().decode("utf8")
-            str quote_asset = cpp_limit_order_ptr.getQuoteCurrency().decode("utf8")
-            str base_asset = cpp_limit_order_ptr.getBaseCurrency().decode("utf8")
-            str order_id = cpp_limit_order_ptr.getClientOrderID().decode("utf8")
-            object quote_asset_balance = self.c_get_balance(quote_asset)
-            object quote_asset_traded = <object> cpp_limit_order_ptr.getPrice() * \
-                                        <object> cpp_limit_order_ptr.getQuantity()
-            object base_asset_traded = <object> cpp_limit_order_ptr.getQuantity()
-
-        # Check if there's enough balance to satisfy the order. If not, remove the limit order without doing anything.
-        if quote_asset_balance < quote_asset_traded:
-            self.logger().warning(f"Not enough {quote_asset} balance to fill limit buy order on {trading_pair}. "
-                                  f"{quote_asset_traded:.8g} {quote_asset} needed vs. "
-                                  f"{quote_asset_balance:.8g} {quote_asset} available.")
-
-            self.c_delete_limit_order(limit_orders_map_ptr, map_it_ptr, orders_it)
+            object trading_pair = self._trading_pairs[order.trading_pair]
+            str base_asset = trading_pair.base_asset
+            str quote_asset = trading_pair.quote_asset
+            object remaining_amount = order.amount - order.executed_amount_base
+            object fill_price = order.price if is_maker else Decimal(str(price))
+            object fill_amount = remaining_amount
+            object fees_asset_type = self._config.buy_fees_asset if order.is_buy else self._config.sell_fees_asset
+
+        if not is_complete:
+            fill_amount = min(self.c_quantize_order_amount(order.trading_pair, Decimal(amount)), remaining_amount)
+            if fill_amount <= s_decimal_0:
+                return
+        base_asset_traded = fill_amount
+        quote_asset_traded = fill_price * fill_amount
+
+        # Check if there's enough balance to fill the order. If not, remove the limit order without doing anything.
+        if ((order.is_buy and self.c_get_balance(quote_asset) < quote_asset_traded) or
+                (not order.is_buy and self.c_get_balance(base_asset) < base_asset_traded)):
+            asset, asset_needed = ((quote_asset, quote_asset_traded) if order.is_buy
+                                   else (base_asset, base_asset_traded))
+            self.logger().warning(f"Not enough {asset} balance to fill limit {'buy' if order.is_buy else 'sell'} "
+                                  f"order on {order.trading_pair}. {asset_needed:.8g} {asset} needed vs. "
+                                  f"{self.c_get_balance(asset):.8g} {asset} available.")
+            self.c_update_limit_order(order, s_decimal_0)
+            self.c_remove_matching_engine_order(order.order_id)
             self.c_trigger_event(self.MARKET_ORDER_CANCELLED_EVENT_TAG,
-                                 OrderCancelledEvent(self._current_timestamp,
-                                                     order_id)
-                                 )
+                                 OrderCancelledEvent(self._current_timestamp, order.order_id))
             return
 
-        config = self._config
         total_base_fees = Decimal("0")
         total_quote_fees = Decimal("0")
-        trade_fee: TradeFee = estimate_fee(self.name, False)
+        trade_fee: TradeFee = estimate_fee(self.name, is_maker)
 
-        if config.buy_fees_asset is AssetType.BASE_CURRENCY:
+        if fees_asset_type is AssetType.BASE_CURRENCY:
             total_base_fees = base_asset_traded * trade_fee.percent
 
             for flat_fee in trade_fee.flat_fees:
@@ -666,238 +790,136 @@ cdef class PaperTradeExchange(ExchangeBase):
                     total_quote_fees += Decimal(flat_fee[1])
 
         # Adjust the market balances according to the trade done.
-        self.c_set_balance(quote_asset, self.c_get_balance(quote_asset) - quote_asset_traded - total_quote_fees)
-        self.c_set_balance(base_asset, self.c_get_balance(base_asset) + base_asset_traded - total_base_fees)
+        if order.is_buy:
+            self.c_set_balance(quote_asset, self.c_get_balance(quote_asset) - quote_asset_traded - total_quote_fees)
+            self.c_set_balance(base_asset, self.c_get_balance(base_asset) + base_asset_traded - total_base_fees)
+        else:
+            self.c_set_balance(quote_asset, self.c_get_balance(quote_asset) + quote_asset_traded - total_quote_fees)
+            self.c_set_balance(base_asset, self.c_get_balance(base_asset) - base_asset_traded - total_base_fees)
+        order.executed_amount_base += base_asset_traded
+        order.executed_amount_quote += quote_asset_traded
+        order.fee_amount += (total_base_fees if fees_asset_type is AssetType.BASE_CURRENCY else total_quote_fees)
+        self.c_update_limit_order(order, order.amount - order.executed_amount_base)
 
         # Emit the trade and order completed events.
         self.c_trigger_event(
             self.ORDER_FILLED_EVENT_TAG,
             OrderFilledEvent(
                 self._current_timestamp,
-                order_id,
-                trading_pair,
-                TradeType.BUY,
+                order.order_id,
+                order.trading_pair,
+                TradeType.BUY if order.is_buy else TradeType.SELL,
                 OrderType.LIMIT,
-                <object> cpp_limit_order_ptr.getPrice(),
-                <object> cpp_limit_order_ptr.getQuantity(),
+                fill_price,
+                fill_amount,
                 trade_fee
             ))
-
-        self.c_trigger_event(
-            self.BUY_ORDER_COMPLETED_EVENT_TAG,
-            BuyOrderCompletedEvent(
-                self._current_timestamp,
-                order_id,
-                base_asset,
-                quote_asset,
-                base_asset if config.buy_fees_asset is AssetType.BASE_CURRENCY else quote_asset,
-                base_asset_traded,
-                quote_asset_traded,
-                total_base_fees if config.buy_fees_asset is AssetType.BASE_CURRENCY else total_quote_fees,
-                OrderType.LIMIT
-            ))
-        self.c_delete_limit_order(limit_orders_map_ptr, map_it_ptr, orders_it)
-
-    cdef c_process_limit_ask_order(self,
-                                   LimitOrders *limit_orders_map_ptr,
-                                   LimitOrdersIterator *map_it_ptr,
-                                   SingleTradingPairLimitOrdersIterator orders_it):
-        cdef:
-            const CPPLimitOrder *cpp_limit_order_ptr = address(deref(orders_it))
-            str trading_pair_str = cpp_limit_order_ptr.getTradingPair().decode("utf8")
-            str quote_asset = cpp_limit_order_ptr.getQuoteCurrency().decode("utf8")
-            str base_asset = cpp_limit_order_ptr.getBaseCurrency().decode("utf8")
-            str order_id = cpp_limit_order_ptr.getClientOrderID().decode("utf8")
-            object base_asset_balance = self.c_get_balance(base_asset)
-            object quote_asset_traded = <object> cpp_limit_order_ptr.getPrice() * \
-                                        <object> cpp_limit_order_ptr.getQuantity()
-            object base_asset_traded = <object> cpp_limit_order_ptr.getQuantity()
-
-        # Check if there's enough balance to satisfy the order. If not, remove the limit order without doing anything.
-        if base_asset_balance < base_asset_traded:
-            self.logger().warning(f"Not enough {base_asset} balance to fill limit sell order on {trading_pair_str}. "
-                                  f"{base_asset_traded:.8g} {base_asset} needed vs. "
-                                  f"{base_asset_balance:.8g} {base_asset} available.")
-            self.c_delete_limit_order(limit_orders_map_ptr, map_it_ptr, orders_it)
-            self.c_trigger_event(self.MARKET_ORDER_CANCELLED_EVENT_TAG,
-                                 OrderCancelledEvent(self._current_timestamp,
-                                                     order_id)
-                                 )
+        if not is_complete:
             return
 
-        config = self._config
-        total_base_fees = Decimal("0")
-        total_quote_fees = Decimal("0")
-        trade_fee: TradeFee = estimate_fee(self.name, False)
-
-        if config.sell_fees_asset is AssetType.BASE_CURRENCY:
-            total_base_fees = base_asset_traded * trade_fee.percent
-
-            for flat_fee in trade_fee.flat_fees:
-                if flat_fee[0] == base_asset:
-                    total_base_fees += Decimal(flat_fee[1])
+        self.c_remove_matching_engine_order(order.order_id)
+        if order.is_buy:
+            self.c_trigger_event(
+                self.BUY_ORDER_COMPLETED_EVENT_TAG,
+                BuyOrderCompletedEvent(
+                    self._current_timestamp,
+                    order.order_id,
+                    base_asset,
+                    quote_asset,
+                    base_asset if fees_asset_type is AssetType.BASE_CURRENCY else quote_asset,
+                    order.executed_amount_base,
+                    order.executed_amount_quote,
+                    order.fee_amount,
+                    OrderType.LIMIT
+                ))
         else:
-            total_quote_fees = quote_asset_traded * trade_fee.percent
-
-            for flat_fee in trade_fee.flat_fees:
-                if flat_fee[0] == quote_asset:
-                    total_quote_fees += Decimal(flat_fee[1])
-
-        # Adjust the market balances according to the trade done.
-        self.c_set_balance(quote_asset, self.c_get_balance(quote_asset) + quote_asset_traded - total_quote_fees)
-        self.c_set_balance(base_asset, self.c_get_balance(base_asset) - base_asset_traded - total_base_fees)
-
-        # Emit the trade and order completed events.
-        self.c_trigger_event(
-            self.ORDER_FILLED_EVENT_TAG,
-            OrderFilledEvent(
-                self._current_timestamp,
-                order_id,
-                trading_pair_str,
-                TradeType.SELL,
-                OrderType.LIMIT,
-                <object> cpp_limit_order_ptr.getPrice(),
-                <object> cpp_limit_order_ptr.getQuantity(),
-                trade_fee
-            ))
-
-        self.c_trigger_event(
-            self.SELL_ORDER_COMPLETED_EVENT_TAG,
-            SellOrderCompletedEvent(
-                self._current_timestamp,
-                order_id,
-                base_asset,
-                quote_asset,
-                base_asset if config.sell_fees_asset is AssetType.BASE_CURRENCY else quote_asset,
-                base_asset_traded,
-                quote_asset_traded,
-                total_base_fees if config.sell_fees_asset is AssetType.BASE_CURRENCY else total_quote_fees,
-                OrderType.LIMIT
-            ))
-        self.c_delete_limit_order(limit_orders_map_ptr, map_it_ptr, orders_it)
-
-    cdef c_process_limit_order(self,
-                               bint is_buy,
-                               LimitOrders *limit_orders_map_ptr,
-                               LimitOrdersIterator *map_it_ptr,
-                               SingleTradingPairLimitOrdersIterator orders_it):
-        try:
-            if is_buy:
-                self.c_process_limit_bid_order(limit_orders_map_ptr, map_it_ptr, orders_it)
-            else:
-                self.c_process_limit_ask_order(limit_orders_map_ptr, map_it_ptr, orders_it)
-        except Exception as e:
-            self.logger().error(f"Error processing limit order.", exc_info=True)
-
-    cdef c_process_crossed_limit_orders_for_trading_pair(self,
-                                                         bint is_buy,
-                                                         LimitOrders *limit_orders_map_ptr,
-                                                         LimitOrdersIterator *map_it_ptr):
+            self.c_trigger_event(
+                self.SELL_ORDER_COMPLETED_EVENT_TAG,
+                SellOrderCompletedEvent(
+                    self._current_timestamp,
+                    order.order_id,
+                    base_asset,
+                    quote_asset,
+                    base_asset if fees_asset_type is AssetType.BASE_CURRENCY else quote_asset,
+                    order.executed_amount_base,
+                    order.executed_amount_quote,
+                    order.fee_amount,
+                    OrderType.LIMIT
+                ))
+
+    cdef c_process_fills(self):
         """
-        Trigger limit orders when the opposite side of the order book has crossed the limit order's price.
-        This implies someone was ready to fill the limit order, if that limit order was on the market.
-
-        :param is_buy: are the limit orders on the bid side?
-        :param limit_orders_map_ptr: pointer to the limit orders map
-        :param map_it_ptr: limit orders map iterator, which implies the trading pair being processed
+        Processes the fills simulated by the matching engines of the order books since the last call. The fills of a
+        market order all come together when it becomes active, and are executed at once.
         """
         cdef:
-            str trading_pair = deref(deref(map_it_ptr)).first.decode("utf8")
-            object opposite_order_book_price = self.c_get_price(trading_pair, is_buy)
-            SingleTradingPairLimitOrders *orders_collection_ptr = address(deref(deref(map_it_ptr)).second)
-            SingleTradingPairLimitOrdersIterator orders_it = orders_collection_ptr.begin()
-            SingleTradingPairLimitOrdersRIterator orders_rit = orders_collection_ptr.rbegin()
-            vector[SingleTradingPairLimitOrdersIterator] process_order_its
-            const CPPLimitOrder *cpp_limit_order_ptr = NULL
-
-        if is_buy:
-            while orders_rit != orders_collection_ptr.rend():
-                cpp_limit_order_ptr = address(deref(orders_rit))
-                if opposite_order_book_price > <object>cpp_limit_order_ptr.getPrice():
-                    break
-                process_order_its.push_back(getIteratorFromReverseIterator(
-                    <reverse_iterator[SingleTradingPairLimitOrdersIterator]>orders_rit))
-                inc(orders_rit)
-        else:
-            while orders_it != orders_collection_ptr.end():
-                cpp_limit_order_ptr = address(deref(orders_it))
-                if opposite_order_book_price < <object>cpp_limit_order_ptr.getPrice():
-                    break
-                process_order_its.push_back(orders_it)
-                inc(orders_it)
-
-        for orders_it in process_order_its:
-            self.c_process_limit_order(is_buy, limit_orders_map_ptr, map_it_ptr, orders_it)
-
-    cdef c_process_crossed_limit_orders(self):
-        cdef:
-            LimitOrders *limit_orders_ptr = address(self._bid_limit_orders)
-            LimitOrdersIterator map_it = limit_orders_ptr.begin()
-
-        while map_it != limit_orders_ptr.end():
-            self.c_process_crossed_limit_orders_for_trading_pair(True, limit_orders_ptr, address(map_it))
-            if map_it != limit_orders_ptr.end():
-                inc(map_it)
-
-        limit_orders_ptr = address(self._ask_limit_orders)
-        map_it = limit_orders_ptr.begin()
-
-        while map_it != limit_orders_ptr.end():
-            self.c_process_crossed_limit_orders_for_trading_pair(False, limit_orders_ptr, address(map_it))
-            if map_it != limit_orders_ptr.end():
-                inc(map_it)
+            CompositeOrderBook order_book
+            vector[MatchingEngineFill] fills
+            MatchingEngineFill fill
+            PaperTradeOrder order
+            list market_order_entries = []
+
+        for trading_pair in self._trading_pairs.values():
+            order_book = self._order_book_tracker.order_books[trading_pair.trading_pair]
+            if not order_book._matching_engine.hasFills(self._matching_engine_owner_id):
+                continue
+            fills = order_book._matching_engine.popFills(self._matching_engine_owner_id)
+            for fill in fills:
+                order = self._matching_engine_orders.get(fill.orderId)
+                if order is None:
+                    continue
+                try:
+                    if order.order_type is OrderType.LIMIT:
+                        self.c_fill_limit_order(order, fill.price, fill.amount, fill.isMaker, fill.isComplete)
+                        continue
+
+                    if fill.amount > 0:
+                        market_order_entries.append(OrderBookRow(
+                            Decimal(str(fill.price)),
+                            self.c_quantize_order_amount(order.trading_pair, Decimal(fill.amount)),
+                            order_book.last_diff_uid
+                        ))
+                    if not fill.isComplete:
+                        continue
+                    if fill.amount > 0:
+                        # Fully filled, the amounts add up to the order amount.
+                        market_order_entries[-1] = market_order_entries[-1]._replace(
+                            amount=order.amount - sum(row.amount for row in market_order_entries[:-1]))
+                    self.c_remove_matching_engine_order(order.order_id)
+                    if len(market_order_entries) == 0:
+                        self.logger().warning(f"No liquidity to fill market order {order.order_id} on "
+                                              f"{order.trading_pair}.")
+                        self.c_trigger_event(
+                            self.MARKET_ORDER_FAILURE_EVENT_TAG,
+                            MarketOrderFailureEvent(self._current_timestamp, order.order_id, OrderType.MARKET)
+                        )
+                    elif order.is_buy:
+                        self.c_execute_buy(order.order_id, order.trading_pair, market_order_entries)
+                    else:
+                        self.c_execute_sell(order.order_id, order.trading_pair, market_order_entries)
+                    market_order_entries = []
+                except Exception:
+                    market_order_entries = []
+                    self.logger().error("Error processing order fill.", exc_info=True)
 
     # <editor-fold desc="Event listener functions">
     cdef c_match_trade_to_limit_orders(self, object order_book_trade_event):
         """
-        Trigger limit orders when incoming market orders have crossed the limit order's price.
+        Processes the fills of limit orders reached by a trade. The order book has already matched the trade to the
+        limit orders, when applying it.
 
         :param order_book_trade_event: trade event from order book
         """
-        cdef:
-            string cpp_trading_pair = order_book_trade_event.trading_pair.encode("utf8")
-            bint is_maker_buy = order_book_trade_event.type is TradeType.SELL
-            object trade_price = order_book_trade_event.price
-            object trade_quantity = order_book_trade_event.amount
-            LimitOrders *limit_orders_map_ptr = (address(self._bid_limit_orders)
-                                                 if is_maker_buy
-                                                 else address(self._ask_limit_orders))
-            LimitOrdersIterator map_it = limit_orders_map_ptr.find(cpp_trading_pair)
-            SingleTradingPairLimitOrders *orders_collection_ptr = NULL
-            SingleTradingPairLimitOrdersIterator orders_it
-            SingleTradingPairLimitOrdersRIterator orders_rit
-            vector[SingleTradingPairLimitOrdersIterator] process_order_its
-            const CPPLimitOrder *cpp_limit_order_ptr = NULL
-
-        if map_it == limit_orders_map_ptr.end():
-            return
-
-        orders_collection_ptr = address(deref(map_it).second)
-        if is_maker_buy:
-            orders_rit = orders_collection_ptr.rbegin()
-            while orders_rit != orders_collection_ptr.rend():
-                cpp_limit_order_ptr = address(deref(orders_rit))
-                if <object>cpp_limit_order_ptr.getPrice() <= trade_price:
-                    break
-                process_order_its.push_back(getIteratorFromReverseIterator(
-                    <reverse_iterator[SingleTradingPairLimitOrdersIterator]>orders_rit))
-                inc(orders_rit)
-        else:
-            orders_it = orders_collection_ptr.begin()
-            while orders_it != orders_collection_ptr.end():
-                cpp_limit_order_ptr = address(deref(orders_it))
-                if <object>cpp_limit_order_ptr.getPrice() >= trade_price:
-                    break
-                process_order_its.push_back(orders_it)
-                inc(orders_it)
-
-        for orders_it in process_order_its:
-            self.c_process_limit_order(is_maker_buy, limit_orders_map_ptr, address(map_it), orders_it)
+        self.c_process_fills()
 
     # </editor-fold>
 
+
     cdef object c_get_available_balance(self, str currency):
-        return self.available_balances.get(currency.upper(), s_decimal_0)
+        currency = currency.upper()
+        if currency not in self._account_balances:
+            return s_decimal_0
+        return self._account_balances[currency] - self._on_hold_balances.get(currency, s_decimal_0)
 
     async def get_active_exchange_markets(self) -> pd.DataFrame:
         return await self._order_book_tracker.data_source.get_active_exchange_markets()
@@ -948,6 +970,7 @@ cdef class PaperTradeExchange(ExchangeBase):
                 limit_order_ptr = address(deref(orders_it))
                 limit_order_cid = limit_order_ptr.getClientOrderID().decode("utf8")
                 delete_success = self.c_delete_limit_order(orders_map, address(map_it), orders_it)
+                self.c_remove_matching_engine_order(limit_order_cid)
                 cancellation_results.append(CancellationResult(limit_order_cid,
                                                                delete_success))
                 self.c_trigger_event(self.MARKET_ORDER_CANCELLED_EVENT_TAG,
@@ -30,6 +30,14 @@ s_decimal_NaN = Decimal("nan")
 s_decimal_0 = Decimal(0)
 
 
+cdef inline OrderBook c_indexed_order_book(OrderBook order_book):
+    # Books that strategies query for depth keep a cumulative depth index, so that the volume queries on every tick
+    # are O(log depth) lookups instead of scans. Books that are never queried don't pay for the index updates.
+    if not order_book._depth_index_enabled:
+        order_book.depth_index_enabled = True
+    return order_book
+
+
 cdef class ExchangeBase(ConnectorBase):
     """
     ExchangeBase provides common exchange (for both centralized and decentralized) connector functionality and
@@ -52,6 +60,22 @@ cdef class ExchangeBase(ConnectorBase):
     def order_books(self) -> Dict[str, OrderBook]:
         raise NotImplementedError
 
+    @property
+    def order_book_tracker(self):
+        return self._order_book_tracker
+
+    def trading_pair_ready(self, trading_pair: str) -> bool:
+        """
+        Indicates whether the connector is ready to be used for the trading pair: its order book is initialized, and so
+        are the other components of the connector, without waiting for the order books of the other trading pairs.
+        """
+        if self.ready:
+            return True
+        order_book_tracker = self.order_book_tracker
+        if order_book_tracker is None or not order_book_tracker.order_book_ready(trading_pair):
+            return False
+        return all(status for name, status in self.status_dict.items() if name != "order_books_initialized")
+
     @property
     def limit_orders(self) -> List[LimitOrder]:
         raise NotImplementedError
@@ -109,7 +133,7 @@ cdef class ExchangeBase(ConnectorBase):
 
     cdef ClientOrderBookQueryResult c_get_vwap_for_volume(self, str trading_pair, bint is_buy, object volume):
         cdef:
-            OrderBook order_book = self.c_get_order_book(trading_pair)
+            OrderBook order_book = c_indexed_order_book(self.c_get_order_book(trading_pair))
             OrderBookQueryResult result = order_book.c_get_vwap_for_volume(is_buy, float(volume))
             object query_volume = self.c_quantize_order_amount(trading_pair, Decimal(result.query_volume))
             object result_price = self.c_quantize_order_price(trading_pair, Decimal(result.result_price))
@@ -121,7 +145,7 @@ cdef class ExchangeBase(ConnectorBase):
 
     cdef ClientOrderBookQueryResult c_get_price_for_volume(self, str trading_pair, bint is_buy, object volume):
         cdef:
-            OrderBook order_book = self.c_get_order_book(trading_pair)
+            OrderBook order_book = c_indexed_order_book(self.c_get_order_book(trading_pair))
             OrderBookQueryResult result = order_book.c_get_price_for_volume(is_buy, float(volume))
             object query_volume = self.c_quantize_order_amount(trading_pair, Decimal(result.query_volume))
             object result_price = self.c_quantize_order_price(trading_pair, Decimal(result.result_price))
@@ -134,7 +158,7 @@ cdef class ExchangeBase(ConnectorBase):
     cdef ClientOrderBookQueryResult c_get_quote_volume_for_base_amount(self, str trading_pair, bint is_buy,
                                                                        object base_amount):
         cdef:
-            OrderBook order_book = self.c_get_order_book(trading_pair)
+            OrderBook order_book = c_indexed_order_book(self.c_get_order_book(trading_pair))
             OrderBookQueryResult result = order_book.c_get_quote_volume_for_base_amount(is_buy, float(base_amount))
             object query_volume = self.c_quantize_order_amount(trading_pair, Decimal(result.query_volume))
             object result_volume = self.c_quantize_order_amount(trading_pair, Decimal(result.result_volume))
@@ -145,7 +169,7 @@ cdef class ExchangeBase(ConnectorBase):
 
     cdef ClientOrderBookQueryResult c_get_volume_for_price(self, str trading_pair, bint is_buy, object price):
         cdef:
-            OrderBook order_book = self.c_get_order_book(trading_pair)
+            OrderBook order_book = c_indexed_order_book(self.c_get_order_book(trading_pair))
             OrderBookQueryResult result = order_book.c_get_volume_for_price(is_buy, float(price))
             object query_price = self.c_quantize_order_price(trading_pair, Decimal(result.query_price))
             object result_price = self.c_quantize_order_price(trading_pair, Decimal(result.result_price))
@@ -157,7 +181,7 @@ cdef class ExchangeBase(ConnectorBase):
 
     cdef ClientOrderBookQueryResult c_get_quote_volume_for_price(self, str trading_pair, bint is_buy, object price):
         cdef:
-            OrderBook order_book = self.c_get_order_book(trading_pair)
+            OrderBook order_book = c_indexed_order_book(self.c_get_order_book(trading_pair))
             OrderBookQueryResult result = order_book.c_get_volume_for_price(is_buy, float(price))
             object query_price = self.c_quantize_order_price(trading_pair, Decimal(result.query_price))
             object result_price = self.c_quantize_order_price(trading_pair, Decimal(result.result_price))
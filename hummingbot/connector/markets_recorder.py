@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 import os.path
-import pandas as pd
-from shutil import move
 import asyncio
+import logging
+import queue
 from sqlalchemy.orm import (
     Session,
     Query
@@ -10,9 +10,13 @@ from sqlalchemy.orm import (
 import time
 import threading
 from typing import (
+    Any,
+    Callable,
     Dict,
     List,
+    NamedTuple,
     Optional,
+    Set,
     Tuple,
     Union,
 )
@@ -33,6 +37,7 @@ from hummingbot.core.event.events import (
 )
 from hummingbot.core.event.event_forwarder import SourceInfoEventForwarder
 from hummingbot.connector.connector_base import ConnectorBase
+from hummingbot.connector.trade_fill_csv_writer import TradeFillCsvWriter
 from hummingbot.connector.utils import TradeFillOrderDetails
 from hummingbot.model.market_state import MarketState
 from hummingbot.model.order import Order
@@ -40,19 +45,61 @@ from hummingbot.model.order_status import OrderStatus
 from hummingbot.model.sql_connection_manager import SQLConnectionManager
 from hummingbot.model.trade_fill import TradeFill
 from hummingbot.model.funding_payment import FundingPayment
+from hummingbot.logger import HummingbotLogger
+
+
+class PendingWrite(NamedTuple):
+    # Returns whether it changed anything, i.e. whether the market states should be saved along with it.
+    write: Callable[[Session], bool]
+    market: ConnectorBase
+    save_market_states: bool
+    trade_fill: Optional[TradeFill]
+
+
+class WriteBatch(NamedTuple):
+    writes: List[PendingWrite]
+    # Tracking states of the markets written to, taken once per batch, by market display name.
+    market_states: Dict[str, Any]
+    timestamp: int
 
 
 class MarketsRecorder:
+    WRITE_BEHIND_FLUSH_INTERVAL: float = 1.0
+    WRITE_BEHIND_MAX_BATCH_SIZE: int = 100
+    WRITE_BEHIND_RETRY_INTERVAL: float = 1.0
+    WRITE_BEHIND_MAX_RETRY_INTERVAL: float = 60.0
+    WRITE_BEHIND_STOP_RETRIES: int = 3
+    _mr_logger: Optional[HummingbotLogger] = None
+
     market_event_tag_map: Dict[int, MarketEvent] = {
         event_obj.value: event_obj
         for event_obj in MarketEvent.__members__.values()
     }
 
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        if cls._mr_logger is None:
+            cls._mr_logger = logging.getLogger(__name__)
+        return cls._mr_logger
+
     def __init__(self,
                  sql: SQLConnectionManager,
                  markets: List[ConnectorBase],
                  config_file_path: str,
-                 strategy_name: str):
+                 strategy_name: str,
+                 write_behind: bool = False,
+                 flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_batch_size: int = WRITE_BEHIND_MAX_BATCH_SIZE,
+                 retry_interval: float = WRITE_BEHIND_RETRY_INTERVAL):
+        """
+        With `write_behind`, the records of market events are queued and written in batches from a background thread,
+        every `flush_interval` seconds or once `max_batch_size` records are queued, with one market states snapshot
+        per market and batch. Otherwise each event is committed as it comes.
+
+        A batch that fails to be written is kept and retried, every `retry_interval` seconds doubling up to
+        WRITE_BEHIND_MAX_RETRY_INTERVAL, with the batches queued after it waiting in order. Once stopping, it is only
+        retried WRITE_BEHIND_STOP_RETRIES more times before being given up on.
+        """
         if threading.current_thread() != threading.main_thread():
             raise EnvironmentError("MarketsRecorded can only be initialized from the main thread.")
 
@@ -61,6 +108,16 @@ class MarketsRecorder:
         self._markets: List[ConnectorBase] = markets
         self._config_file_path: str = config_file_path
         self._strategy_name: str = strategy_name
+        self._write_behind: bool = write_behind
+        self._flush_interval: float = flush_interval
+        self._max_batch_size: int = max_batch_size
+        self._retry_interval: float = retry_interval
+        self._stopping: threading.Event = threading.Event()
+        self._pending_writes: List[PendingWrite] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._write_queue: "queue.Queue[Optional[WriteBatch]]" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._csv_writers: Dict[str, TradeFillCsvWriter] = {}
         # Internal collection of trade fills in connector will be used for remote/local history reconciliation
         for market in self._markets:
             trade_fills = self.get_trades_for_config(self._config_file_path, 2000)
@@ -111,15 +168,134 @@ class MarketsRecorder:
     def db_timestamp(self) -> int:
         return int(time.time() * 1e3)
 
+    @property
+    def write_behind(self) -> bool:
+        return self._write_behind
+
     def start(self):
         for market in self._markets:
             for event_pair in self._event_pairs:
                 market.add_listener(event_pair[0], event_pair[1])
+        if self._write_behind and self._writer_thread is None:
+            self._stopping.clear()
+            self._writer_thread = threading.Thread(target=self._write_loop, name="MarketsRecorder-writer", daemon=True)
+            self._writer_thread.start()
 
     def stop(self):
         for market in self._markets:
             for event_pair in self._event_pairs:
                 market.remove_listener(event_pair[0], event_pair[1])
+        if self._writer_thread is not None:
+            # Everything recorded so far is committed before returning.
+            self.flush()
+            self._write_queue.put(None)
+            self._stopping.set()
+            self._writer_thread.join()
+            self._writer_thread = None
+        for csv_writer in self._csv_writers.values():
+            csv_writer.close()
+        self._csv_writers.clear()
+
+    def flush(self):
+        """
+        Hands the queued records over to the background writer, along with the current tracking states of the markets
+        they belong to.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if len(self._pending_writes) == 0:
+            return
+        markets: Dict[str, ConnectorBase] = {pending_write.market.display_name: pending_write.market
+                                             for pending_write in self._pending_writes
+                                             if pending_write.save_market_states}
+        batch: WriteBatch = WriteBatch(writes=self._pending_writes,
+                                       market_states={name: market.tracking_states for name, market in markets.items()},
+                                       timestamp=self.db_timestamp)
+        self._pending_writes = []
+        self._write_queue.put(batch)
+
+    def _record(self,
+                write: Callable[[Session], bool],
+                market: ConnectorBase,
+                save_market_states: bool = True,
+                trade_fill: Optional[TradeFill] = None):
+        """
+        Writes the records of a market event, then saves the market states and exports the trade fill if any, unless
+        `write` reports that there was nothing to record. In write behind mode, this is queued for the next batch.
+        """
+        pending_write: PendingWrite = PendingWrite(write, market, save_market_states, trade_fill)
+        if self._writer_thread is not None:
+            self._pending_writes.append(pending_write)
+            if len(self._pending_writes) >= self._max_batch_size:
+                self.flush()
+            elif self._flush_handle is None:
+                self._flush_handle = self._ev_loop.call_later(self._flush_interval, self.flush)
+            return
+
+        session: Session = self.session
+        if write(session):
+            if save_market_states:
+                self.save_market_states(self._config_file_path, market, no_commit=True)
+            session.commit()
+            if trade_fill is not None:
+                self.append_to_csv(trade_fill)
+        else:
+            session.rollback()
+
+    def _write_batch(self, batch: WriteBatch):
+        session: Session = self._sql.create_session(expire_on_commit=False)
+        try:
+            changed_markets: Set[str] = set()
+            for pending_write in batch.writes:
+                if pending_write.write(session) and pending_write.save_market_states:
+                    changed_markets.add(pending_write.market.display_name)
+            for market_name in changed_markets:
+                self._save_market_state(session,
+                                        self._config_file_path,
+                                        market_name,
+                                        batch.market_states[market_name],
+                                        batch.timestamp)
+            session.commit()
+            # Exported once committed, with their IDs.
+            for pending_write in batch.writes:
+                if pending_write.trade_fill is not None:
+                    self.append_to_csv(pending_write.trade_fill)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _write_loop(self):
+        while True:
+            batch: Optional[WriteBatch] = self._write_queue.get()
+            if batch is None:
+                return
+            self._write_batch_until_committed(batch)
+
+    def _write_batch_until_committed(self, batch: WriteBatch):
+        retry_interval: float = self._retry_interval
+        stop_retries: int = 0
+        while True:
+            try:
+                self._write_batch(batch)
+                return
+            except Exception:
+                if self._stopping.is_set():
+                    if stop_retries >= self.WRITE_BEHIND_STOP_RETRIES:
+                        self.logger().error(f"Failed to write {len(batch.writes)} market event records to the database "
+                                            f"before stopping. They are lost.", exc_info=True)
+                        return
+                    stop_retries += 1
+                self.logger().error(f"Error writing {len(batch.writes)} market event records to the database. "
+                                    f"Retrying in {retry_interval:.1f} seconds.", exc_info=True)
+            if self._stopping.is_set():
+                time.sleep(self._retry_interval)
+            else:
+                # Woken up early by stop().
+                self._stopping.wait(retry_interval)
+                retry_interval = min(retry_interval * 2, self.WRITE_BEHIND_MAX_RETRY_INTERVAL)
 
     def get_orders_for_config_and_market(self, config_file_path: str, market: ConnectorBase,
                                          with_exchange_order_id_present: Optional[bool] = False,
@@ -151,22 +327,32 @@ class MarketsRecorder:
 
     def save_market_states(self, config_file_path: str, market: ConnectorBase, no_commit: bool = False):
         session: Session = self.session
-        market_states: Optional[MarketState] = self.get_market_states(config_file_path, market)
-        timestamp: int = self.db_timestamp
+        self._save_market_state(session, config_file_path, market.display_name, market.tracking_states,
+                                self.db_timestamp)
+        if not no_commit:
+            session.commit()
 
+    @staticmethod
+    def _save_market_state(session: Session,
+                           config_file_path: str,
+                           market_name: str,
+                           saved_state: Dict[str, Any],
+                           timestamp: int):
+        market_states: Optional[MarketState] = (session
+                                                .query(MarketState)
+                                                .filter(MarketState.config_file_path == config_file_path,
+                                                        MarketState.market == market_name)
+                                                .one_or_none())
         if market_states is not None:
-            market_states.saved_state = market.tracking_states
+            market_states.saved_state = saved_state
             market_states.timestamp = timestamp
         else:
             market_states = MarketState(config_file_path=config_file_path,
-                                        market=market.display_name,
+                                        market=market_name,
                                         timestamp=timestamp,
-                                        saved_state=market.tracking_states)
+                                        saved_state=saved_state)
             session.add(market_states)
 
-        if not no_commit:
-            session.commit()
-
     def restore_market_states(self, config_file_path: str, market: ConnectorBase):
         market_states: Optional[MarketState] = self.get_market_states(config_file_path, market)
 
@@ -190,7 +376,6 @@ class MarketsRecorder:
             self._ev_loop.call_soon_threadsafe(self._did_create_order, event_tag, market, evt)
             return
 
-        session: Session = self.session
         base_asset, quote_asset = evt.trading_pair.split("-")
         timestamp: int = self.db_timestamp
         event_type: MarketEvent = self.market_event_tag_map[event_tag]
@@ -213,11 +398,13 @@ class MarketsRecorder:
         order_status: OrderStatus = OrderStatus(order=order_record,
                                                 timestamp=timestamp,
                                                 status=event_type.name)
-        session.add(order_record)
-        session.add(order_status)
         market.add_exchange_order_ids_from_market_recorder({evt.exchange_order_id: evt.order_id})
-        self.save_market_states(self._config_file_path, market, no_commit=True)
-        session.commit()
+
+        def write(session: Session) -> bool:
+            session.add(order_record)
+            session.add(order_status)
+            return True
+        self._record(write, market)
 
     def _did_fill_order(self,
                         event_tag: int,
@@ -227,18 +414,11 @@ class MarketsRecorder:
             self._ev_loop.call_soon_threadsafe(self._did_fill_order, event_tag, market, evt)
             return
 
-        session: Session = self.session
         base_asset, quote_asset = evt.trading_pair.split("-")
         timestamp: int = self.db_timestamp
         event_type: MarketEvent = self.market_event_tag_map[event_tag]
         order_id: str = evt.order_id
 
-        # Try to find the order record, and update it if necessary.
-        order_record: Optional[Order] = session.query(Order).filter(Order.id == order_id).one_or_none()
-        if order_record is not None:
-            order_record.last_status = event_type.name
-            order_record.last_update_timestamp = timestamp
-
         # Order status and trade fill record should be added even if the order record is not found, because it's
         # possible for fill event to come in before the order created event for market orders.
         order_status: OrderStatus = OrderStatus(order_id=order_id,
@@ -260,12 +440,18 @@ class MarketsRecorder:
                                                  trade_fee=TradeFee.to_json(evt.trade_fee),
                                                  exchange_trade_id=evt.exchange_trade_id,
                                                  position=evt.position if evt.position else "NILL",)
-        session.add(order_status)
-        session.add(trade_fill_record)
-        self.save_market_states(self._config_file_path, market, no_commit=True)
-        session.commit()
         market.add_trade_fills_from_market_recorder({TradeFillOrderDetails(trade_fill_record.market, trade_fill_record.exchange_trade_id, trade_fill_record.symbol)})
-        self.append_to_csv(trade_fill_record)
+
+        def write(session: Session) -> bool:
+            # Try to find the order record, and update it if necessary.
+            order_record: Optional[Order] = session.query(Order).filter(Order.id == order_id).one_or_none()
+            if order_record is not None:
+                order_record.last_status = event_type.name
+                order_record.last_update_timestamp = timestamp
+            session.add(order_status)
+            session.add(trade_fill_record)
+            return True
+        self._record(write, market, trade_fill=trade_fill_record)
 
     def _did_complete_funding_payment(self,
                                       event_tag: int,
@@ -275,60 +461,30 @@ class MarketsRecorder:
             self._ev_loop.call_soon_threadsafe(self._did_complete_funding_payment, event_tag, market, evt)
             return
 
-        session: Session = self.session
         timestamp: float = evt.timestamp
 
-        # Try to find the funding payment has been recorded already.
-        payment_record: Optional[FundingPayment] = session.query(FundingPayment).filter(FundingPayment.timestamp == timestamp).one_or_none()
-        if payment_record is None:
-            funding_payment_record: FundingPayment = FundingPayment(timestamp=timestamp,
-                                                                    config_file_path=self.config_file_path,
-                                                                    market=market.display_name,
-                                                                    rate=evt.funding_rate,
-                                                                    symbol=evt.trading_pair,
-                                                                    amount=float(evt.amount))
-            session.add(funding_payment_record)
-            session.commit()
-            # self.append_to_csv(funding_payment_record)
-
-    @staticmethod
-    def _is_primitive_type(obj: object) -> bool:
-        return not hasattr(obj, '__dict__')
-
-    @staticmethod
-    def _is_protected_method(method_name: str) -> bool:
-        return method_name.startswith('_')
-
-    @staticmethod
-    def _csv_matches_header(file_path: str, header: tuple) -> bool:
-        df = pd.read_csv(file_path, header=None)
-        return tuple(df.iloc[0].values) == header
+        def write(session: Session) -> bool:
+            # Try to find the funding payment has been recorded already.
+            payment_record: Optional[FundingPayment] = session.query(FundingPayment).filter(FundingPayment.timestamp == timestamp).one_or_none()
+            if payment_record is None:
+                funding_payment_record: FundingPayment = FundingPayment(timestamp=timestamp,
+                                                                        config_file_path=self.config_file_path,
+                                                                        market=market.display_name,
+                                                                        rate=evt.funding_rate,
+                                                                        symbol=evt.trading_pair,
+                                                                        amount=float(evt.amount))
+                session.add(funding_payment_record)
+                # self.append_to_csv(funding_payment_record)
+                return True
+            return False
+        self._record(write, market, save_market_states=False)
 
     def append_to_csv(self, trade: TradeFill):
         csv_filename = "trades_" + trade.config_file_path[:-4] + ".csv"
         csv_path = os.path.join(data_path(), csv_filename)
-
-        field_names = ("id",)   # id field should be first
-        field_names += tuple(attr for attr in dir(trade) if (not self._is_protected_method(attr) and
-                                                             self._is_primitive_type(getattr(trade, attr)) and
-                                                             (attr not in field_names)))
-        field_data = tuple(getattr(trade, attr) for attr in field_names)
-
-        # adding extra field "age"
-        # // indicates order is a paper order so 'n/a'. For real orders, calculate age.
-        age = pd.Timestamp(int(trade.timestamp / 1e3 - int(trade.order_id[-16:]) / 1e6), unit='s').strftime(
-            '%H:%M:%S') if "//" not in trade.order_id else "n/a"
-        field_names += ("age",)
-        field_data += (age,)
-
-        if(os.path.exists(csv_path) and (not self._csv_matches_header(csv_path, field_names))):
-            move(csv_path, csv_path[:-4] + '_old_' + pd.Timestamp.utcnow().strftime("%Y%m%d-%H%M%S") + ".csv")
-
-        if not os.path.exists(csv_path):
-            df_header = pd.DataFrame([field_names])
-            df_header.to_csv(csv_path, mode='a', header=False, index=False)
-        df = pd.DataFrame([field_data])
-        df.to_csv(csv_path, mode='a', header=False, index=False)
+        if csv_path not in self._csv_writers:
+            self._csv_writers[csv_path] = TradeFillCsvWriter(csv_path)
+        self._csv_writers[csv_path].append(trade)
 
     def _update_order_status(self,
                              event_tag: int,
@@ -342,23 +498,22 @@ class MarketsRecorder:
             self._ev_loop.call_soon_threadsafe(self._update_order_status, event_tag, market, evt)
             return
 
-        session: Session = self.session
         timestamp: int = self.db_timestamp
         event_type: MarketEvent = self.market_event_tag_map[event_tag]
         order_id: str = evt.order_id
-        order_record: Optional[Order] = session.query(Order).filter(Order.id == order_id).one_or_none()
 
-        if order_record is not None:
+        def write(session: Session) -> bool:
+            order_record: Optional[Order] = session.query(Order).filter(Order.id == order_id).one_or_none()
+            if order_record is None:
+                return False
             order_record.last_status = event_type.name
             order_record.last_update_timestamp = timestamp
             order_status: OrderStatus = OrderStatus(order_id=order_id,
                                                     timestamp=timestamp,
                                                     status=event_type.name)
             session.add(order_status)
-            self.save_market_states(self._config_file_path, market, no_commit=True)
-            session.commit()
-        else:
-            session.rollback()
+            return True
+        self._record(write, market)
 
     def _did_cancel_order(self,
                           event_tag: int,
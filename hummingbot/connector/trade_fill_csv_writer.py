@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+import csv
+import datetime
+import logging
+import os
+from shutil import move
+import threading
+from typing import (
+    Any,
+    IO,
+    List,
+    Optional,
+    Tuple,
+)
+
+import pandas as pd
+
+from hummingbot.logger import HummingbotLogger
+from hummingbot.model.trade_fill import TradeFill
+
+
+class TradeFillCsvWriter:
+    """
+    Appends trade fills to a CSV file, keeping the file open and writing the buffered rows from a background thread
+    every `flush_interval` seconds.
+
+    The header of an existing file is checked once, when it is opened, and a file with a different header is moved
+    aside. The file is rotated once it grows over `max_file_size` bytes, or at the first row of a new UTC day if
+    `rotate_daily` is set. Rotated files are renamed with the date and time of the rotation, e.g.
+    trades_conf_pure_mm_1_20210501-000000.csv, and the rows keep being written to the original path.
+    """
+    DEFAULT_FLUSH_INTERVAL: float = 1.0
+    DEFAULT_MAX_FILE_SIZE: int = 100 * 1024 * 1024
+    _tfcw_logger: Optional[HummingbotLogger] = None
+
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        if cls._tfcw_logger is None:
+            cls._tfcw_logger = logging.getLogger(__name__)
+        return cls._tfcw_logger
+
+    def __init__(self,
+                 csv_path: str,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+                 rotate_daily: bool = True):
+        self._csv_path: str = csv_path
+        self._flush_interval: float = flush_interval
+        self._max_file_size: Optional[int] = max_file_size
+        self._rotate_daily: bool = rotate_daily
+        self._field_names: Tuple[str, ...] = self.get_field_names()
+        self._file: Optional[IO] = None
+        self._writer: Optional[Any] = None
+        self._file_date: Optional[datetime.date] = None
+        self._rows: List[Tuple[datetime.date, Tuple[Any, ...]]] = []
+        self._rows_lock: threading.Lock = threading.Lock()
+        # Serializes the file operations of the flush thread and of close().
+        self._file_lock: threading.Lock = threading.Lock()
+        self._closed: threading.Event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+
+    @property
+    def csv_path(self) -> str:
+        return self._csv_path
+
+    @property
+    def field_names(self) -> Tuple[str, ...]:
+        return self._field_names
+
+    @staticmethod
+    def get_field_names() -> Tuple[str, ...]:
+        """
+        The trade fill columns, id first and the others in alphabetical order, followed by the order age.
+        """
+        return ("id",) + tuple(sorted(column.key for column in TradeFill.__table__.columns if column.key != "id")) + \
+            ("age",)
+
+    @staticmethod
+    def get_age(trade: TradeFill) -> str:
+        # // indicates order is a paper order so 'n/a'. For real orders, calculate age.
+        if "//" in trade.order_id:
+            return "n/a"
+        return pd.Timestamp(int(trade.timestamp / 1e3 - int(trade.order_id[-16:]) / 1e6), unit='s').strftime(
+            '%H:%M:%S')
+
+    def append(self, trade: TradeFill):
+        """
+        Buffers a trade fill row, to be written on the next flush.
+        """
+        row: Tuple[Any, ...] = tuple(getattr(trade, attr) for attr in self._field_names[:-1]) + (self.get_age(trade),)
+        with self._rows_lock:
+            self._rows.append((datetime.datetime.utcnow().date(), row))
+        if self._flush_thread is None and not self._closed.is_set():
+            self._flush_thread = threading.Thread(target=self._flush_loop,
+                                                  name=f"TradeFillCsvWriter-{os.path.basename(self._csv_path)}",
+                                                  daemon=True)
+            self._flush_thread.start()
+
+    def flush(self):
+        with self._rows_lock:
+            rows, self._rows = self._rows, []
+        if len(rows) == 0:
+            return
+        with self._file_lock:
+            for row_date, row in rows:
+                if self._file is None:
+                    self._open()
+                elif self._needs_rotation(row_date):
+                    self._rotate()
+                if self._file_date is None:
+                    self._file_date = row_date
+                self._writer.writerow(row)
+            self._file.flush()
+
+    def close(self):
+        """
+        Writes the buffered rows and closes the file.
+        """
+        self._closed.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+            self._flush_thread = None
+        self.flush()
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._writer = None
+
+    def _flush_loop(self):
+        while not self._closed.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                self.logger().error(f"Error writing trades to {self._csv_path}.", exc_info=True)
+
+    def _header_matches(self) -> bool:
+        with open(self._csv_path, newline="") as csv_file:
+            header: Optional[List[str]] = next(csv.reader(csv_file), None)
+        return header is not None and tuple(header) == self._field_names
+
+    def _open(self):
+        if os.path.exists(self._csv_path):
+            if self._header_matches():
+                self._file_date = datetime.datetime.utcfromtimestamp(os.path.getmtime(self._csv_path)).date()
+            else:
+                move(self._csv_path,
+                     self._csv_path[:-4] + '_old_' + pd.Timestamp.utcnow().strftime("%Y%m%d-%H%M%S") + ".csv")
+        self._file = open(self._csv_path, "a", newline="")
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(self._field_names)
+            self._file_date = None
+
+    def _needs_rotation(self, row_date: datetime.date) -> bool:
+        if self._max_file_size is not None and self._file.tell() >= self._max_file_size:
+            return True
+        return self._rotate_daily and self._file_date is not None and row_date != self._file_date
+
+    def _rotate(self):
+        self._file.close()
+        rotated_name: str = self._csv_path[:-4] + "_" + pd.Timestamp.utcnow().strftime("%Y%m%d-%H%M%S")
+        rotated_path: str = rotated_name + ".csv"
+        index: int = 1
+        while os.path.exists(rotated_path):
+            rotated_path = f"{rotated_name}_{index}.csv"
+            index += 1
+        move(self._csv_path, rotated_path)
+        self._file = None
+        self._open()
@@ -0,0 +1,478 @@
+#include "MatchingEngine.h"
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+// Orders with less than this fraction of their amount left are filled completely, so that floating point residue
+// doesn't leave dust orders behind.
+static const double DUST_FRACTION = 1e-9;
+
+MatchingEngine::MatchingEngine() : MatchingEngine(NULL, NULL) {
+}
+
+MatchingEngine::MatchingEngine(const std::set<OrderBookEntry> *bidBook, const std::set<OrderBookEntry> *askBook) {
+    this->bidBook = bidBook;
+    this->askBook = askBook;
+    this->queuePosition = true;
+}
+
+MatchingEngine::MatchingEngine(const MatchingEngine &other) {
+    *this = other;
+}
+
+MatchingEngine &MatchingEngine::operator=(const MatchingEngine &other) {
+    this->bidBook = other.bidBook;
+    this->askBook = other.askBook;
+    this->queuePosition = other.queuePosition;
+    this->orders = other.orders;
+    this->pendingOrders = other.pendingOrders;
+    this->pendingCancels = other.pendingCancels;
+    this->bidLevels = other.bidLevels;
+    this->askLevels = other.askLevels;
+    this->takenBids = other.takenBids;
+    this->takenAsks = other.takenAsks;
+    this->fills = other.fills;
+    this->cancelledOrders = other.cancelledOrders;
+    return *this;
+}
+
+void MatchingEngine::setQueuePosition(bool queuePosition) {
+    this->queuePosition = queuePosition;
+}
+
+void MatchingEngine::addLimitOrder(int64_t orderId, bool isBuy, double price, double amount, double activeTimestamp,
+                                   bool isPostOnly, int64_t ownerId) {
+    // Orders created before there's a timestamp become active when the engine is first advanced.
+    if (std::isnan(activeTimestamp)) {
+        activeTimestamp = -std::numeric_limits<double>::infinity();
+    }
+    Order order = {orderId, ownerId, isBuy, false, isPostOnly, false, price, amount, amount, activeTimestamp,
+                   std::numeric_limits<double>::quiet_NaN(), 0.0};
+    this->orders[orderId] = order;
+    this->pendingOrders.insert(std::make_pair(activeTimestamp, orderId));
+}
+
+void MatchingEngine::addMarketOrder(int64_t orderId, bool isBuy, double amount, double activeTimestamp,
+                                    int64_t ownerId) {
+    if (std::isnan(activeTimestamp)) {
+        activeTimestamp = -std::numeric_limits<double>::infinity();
+    }
+    Order order = {orderId, ownerId, isBuy, true, false, false, std::numeric_limits<double>::quiet_NaN(), amount, amount,
+                   activeTimestamp, std::numeric_limits<double>::quiet_NaN(), 0.0};
+    this->orders[orderId] = order;
+    this->pendingOrders.insert(std::make_pair(activeTimestamp, orderId));
+}
+
+bool MatchingEngine::cancelOrder(int64_t orderId) {
+    std::unordered_map<int64_t, Order>::iterator it = this->orders.find(orderId);
+    if (it == this->orders.end()) {
+        return false;
+    }
+    this->removeOrder(it);
+    return true;
+}
+
+bool MatchingEngine::cancelOrderAt(int64_t orderId, double cancelTimestamp) {
+    // The order can still fill until the cancel takes effect, in which case the cancel does nothing.
+    std::unordered_map<int64_t, Order>::iterator it = this->orders.find(orderId);
+    if (it == this->orders.end() || !std::isnan(it->second.cancelTimestamp)) {
+        return false;
+    }
+    if (std::isnan(cancelTimestamp)) {
+        cancelTimestamp = -std::numeric_limits<double>::infinity();
+    }
+    it->second.cancelTimestamp = cancelTimestamp;
+    this->pendingCancels.insert(std::make_pair(cancelTimestamp, orderId));
+    return true;
+}
+
+double MatchingEngine::getNextPendingTimestamp() const {
+    double retval = std::numeric_limits<double>::infinity();
+    if (!this->pendingOrders.empty()) {
+        retval = this->pendingOrders.begin()->first;
+    }
+    if (!this->pendingCancels.empty()) {
+        retval = std::min(retval, this->pendingCancels.begin()->first);
+    }
+    return retval;
+}
+
+void MatchingEngine::advanceTo(double timestamp) {
+    // Orders and cancels take effect in timestamp order, orders first on ties.
+    while (true) {
+        bool hasOrder = !this->pendingOrders.empty() && this->pendingOrders.begin()->first <= timestamp;
+        bool hasCancel = !this->pendingCancels.empty() && this->pendingCancels.begin()->first <= timestamp;
+        if (hasOrder && (!hasCancel || this->pendingOrders.begin()->first <= this->pendingCancels.begin()->first)) {
+            int64_t orderId = this->pendingOrders.begin()->second;
+            this->pendingOrders.erase(this->pendingOrders.begin());
+            this->activateOrder(this->orders[orderId]);
+        } else if (hasCancel) {
+            int64_t orderId = this->pendingCancels.begin()->second;
+            this->pendingCancels.erase(this->pendingCancels.begin());
+            std::unordered_map<int64_t, Order>::iterator it = this->orders.find(orderId);
+            if (it != this->orders.end()) {
+                this->cancelledOrder(it->second);
+                this->removeOrder(it);
+            }
+        } else {
+            break;
+        }
+    }
+}
+
+void MatchingEngine::applyDiffs(const std::vector<OrderBookEntry> &bids, const std::vector<OrderBookEntry> &asks) {
+    for (std::vector<OrderBookEntry>::const_iterator it = bids.begin(); it != bids.end(); ++it) {
+        this->takenBids.erase(it->getPrice());
+        this->clampQueues(this->bidLevels, it->getPrice(), it->getAmount());
+    }
+    for (std::vector<OrderBookEntry>::const_iterator it = asks.begin(); it != asks.end(); ++it) {
+        this->takenAsks.erase(it->getPrice());
+        this->clampQueues(this->askLevels, it->getPrice(), it->getAmount());
+    }
+    this->fillCrossedOrders();
+}
+
+void MatchingEngine::applySnapshot() {
+    this->takenBids.clear();
+    this->takenAsks.clear();
+    for (PriceLevels::iterator it = this->bidLevels.begin(); it != this->bidLevels.end(); ++it) {
+        this->clampQueues(this->bidLevels, it->first, this->getLevelAmount(true, it->first));
+    }
+    for (PriceLevels::iterator it = this->askLevels.begin(); it != this->askLevels.end(); ++it) {
+        this->clampQueues(this->askLevels, it->first, this->getLevelAmount(false, it->first));
+    }
+    this->fillCrossedOrders();
+}
+
+void MatchingEngine::applyTrade(bool isTakerBuy, double price, double amount) {
+    std::vector<double> emptyLevels;
+    double volume = amount;
+
+    // Taker buys trade through the asks up to the trade price, and taker sells through the bids down to it.
+    if (isTakerBuy) {
+        for (PriceLevels::iterator it = this->askLevels.begin();
+             it != this->askLevels.end() && it->first <= price && volume > 0; ++it) {
+            if (it->first < price) {
+                volume = this->fillThroughPriceLevel(it->second, volume);
+            } else {
+                this->fillPriceLevel(it->second, volume);
+            }
+            if (it->second.empty()) {
+                emptyLevels.push_back(it->first);
+            }
+        }
+        for (std::vector<double>::iterator it = emptyLevels.begin(); it != emptyLevels.end(); ++it) {
+            this->askLevels.erase(*it);
+        }
+    } else {
+        for (PriceLevels::reverse_iterator it = this->bidLevels.rbegin();
+             it != this->bidLevels.rend() && it->first >= price && volume > 0; ++it) {
+            if (it->first > price) {
+                volume = this->fillThroughPriceLevel(it->second, volume);
+            } else {
+                this->fillPriceLevel(it->second, volume);
+            }
+            if (it->second.empty()) {
+                emptyLevels.push_back(it->first);
+            }
+        }
+        for (std::vector<double>::iterator it = emptyLevels.begin(); it != emptyLevels.end(); ++it) {
+            this->bidLevels.erase(*it);
+        }
+    }
+}
+
+bool MatchingEngine::hasFills(int64_t ownerId) const {
+    std::unordered_map<int64_t, std::vector<MatchingEngineFill>>::const_iterator it = this->fills.find(ownerId);
+    return it != this->fills.end() && !it->second.empty();
+}
+
+std::vector<MatchingEngineFill> MatchingEngine::popFills(int64_t ownerId) {
+    std::vector<MatchingEngineFill> retval;
+    std::unordered_map<int64_t, std::vector<MatchingEngineFill>>::iterator it = this->fills.find(ownerId);
+    if (it != this->fills.end()) {
+        retval.swap(it->second);
+        this->fills.erase(it);
+    }
+    return retval;
+}
+
+bool MatchingEngine::hasCancelledOrders(int64_t ownerId) const {
+    std::unordered_map<int64_t, std::vector<int64_t>>::const_iterator it = this->cancelledOrders.find(ownerId);
+    return it != this->cancelledOrders.end() && !it->second.empty();
+}
+
+std::vector<int64_t> MatchingEngine::popCancelledOrders(int64_t ownerId) {
+    std::vector<int64_t> retval;
+    std::unordered_map<int64_t, std::vector<int64_t>>::iterator it = this->cancelledOrders.find(ownerId);
+    if (it != this->cancelledOrders.end()) {
+        retval.swap(it->second);
+        this->cancelledOrders.erase(it);
+    }
+    return retval;
+}
+
+size_t MatchingEngine::getNumOrders() const {
+    return this->orders.size();
+}
+
+bool MatchingEngine::hasOrder(int64_t orderId) const {
+    return this->orders.find(orderId) != this->orders.end();
+}
+
+bool MatchingEngine::isActive(int64_t orderId) const {
+    std::unordered_map<int64_t, Order>::const_iterator it = this->orders.find(orderId);
+    return it != this->orders.end() && it->second.isActive;
+}
+
+double MatchingEngine::getRemainingAmount(int64_t orderId) const {
+    std::unordered_map<int64_t, Order>::const_iterator it = this->orders.find(orderId);
+    return it != this->orders.end() ? it->second.remainingAmount : 0.0;
+}
+
+double MatchingEngine::getQueueAhead(int64_t orderId) const {
+    std::unordered_map<int64_t, Order>::const_iterator it = this->orders.find(orderId);
+    return it != this->orders.end() ? it->second.queueAhead : std::numeric_limits<double>::quiet_NaN();
+}
+
+double MatchingEngine::getAvailableAmount(const std::map<double, double> &taken, const OrderBookEntry &entry) const {
+    std::map<double, double>::const_iterator it = taken.find(entry.getPrice());
+    return it != taken.end() ? entry.getAmount() - it->second : entry.getAmount();
+}
+
+double MatchingEngine::getBestAvailablePrice(bool isBid) const {
+    if (isBid && this->bidBook != NULL) {
+        for (std::set<OrderBookEntry>::const_reverse_iterator it = this->bidBook->rbegin();
+             it != this->bidBook->rend(); ++it) {
+            if (this->getAvailableAmount(this->takenBids, *it) > 0) {
+                return it->getPrice();
+            }
+        }
+    } else if (!isBid && this->askBook != NULL) {
+        for (std::set<OrderBookEntry>::const_iterator it = this->askBook->begin(); it != this->askBook->end(); ++it) {
+            if (this->getAvailableAmount(this->takenAsks, *it) > 0) {
+                return it->getPrice();
+            }
+        }
+    }
+    return std::numeric_limits<double>::quiet_NaN();
+}
+
+double MatchingEngine::getLevelAmount(bool isBid, double price) const {
+    const std::set<OrderBookEntry> *book = isBid ? this->bidBook : this->askBook;
+    if (book == NULL) {
+        return 0.0;
+    }
+    std::set<OrderBookEntry>::const_iterator it = book->find(OrderBookEntry(price, 0, 0));
+    if (it == book->end()) {
+        return 0.0;
+    }
+    return std::max(this->getAvailableAmount(isBid ? this->takenBids : this->takenAsks, *it), 0.0);
+}
+
+void MatchingEngine::activateOrder(Order &order) {
+    int64_t orderId = order.orderId;
+
+    if (order.isPostOnly) {
+        double bestPrice = this->getBestAvailablePrice(!order.isBuy);
+        if (order.isBuy ? order.price >= bestPrice : order.price <= bestPrice) {
+            this->cancelledOrder(order);
+            this->orders.erase(orderId);
+            return;
+        }
+    }
+
+    order.isActive = true;
+    if (order.remainingAmount > 0) {
+        this->takeLiquidity(order, false);
+    }
+
+    // The rest of a limit order joins the back of the queue at its price level.
+    if (order.remainingAmount > 0 && !order.isMarket) {
+        order.queueAhead = this->queuePosition ? this->getLevelAmount(order.isBuy, order.price) : 0.0;
+        (order.isBuy ? this->bidLevels : this->askLevels)[order.price].push_back(orderId);
+        return;
+    }
+
+    // Market orders are immediate or cancel.
+    if (order.remainingAmount > 0 || order.amount <= 0) {
+        MatchingEngineFill fill = {orderId, 0.0, 0.0, false, true};
+        this->fills[order.ownerId].push_back(fill);
+    }
+    this->orders.erase(orderId);
+}
+
+void MatchingEngine::takeLiquidity(Order &order, bool isMaker) {
+    double amount;
+
+    if (order.isBuy && this->askBook != NULL) {
+        for (std::set<OrderBookEntry>::const_iterator it = this->askBook->begin();
+             it != this->askBook->end() && order.remainingAmount > 0; ++it) {
+            if (!order.isMarket && it->getPrice() > order.price) {
+                break;
+            }
+            amount = std::min(this->getAvailableAmount(this->takenAsks, *it), order.remainingAmount);
+            if (amount > 0) {
+                this->takenAsks[it->getPrice()] += amount;
+                this->fillOrder(order, isMaker ? order.price : it->getPrice(), amount, isMaker);
+            }
+        }
+    } else if (!order.isBuy && this->bidBook != NULL) {
+        for (std::set<OrderBookEntry>::const_reverse_iterator it = this->bidBook->rbegin();
+             it != this->bidBook->rend() && order.remainingAmount > 0; ++it) {
+            if (!order.isMarket && it->getPrice() < order.price) {
+                break;
+            }
+            amount = std::min(this->getAvailableAmount(this->takenBids, *it), order.remainingAmount);
+            if (amount > 0) {
+                this->takenBids[it->getPrice()] += amount;
+                this->fillOrder(order, isMaker ? order.price : it->getPrice(), amount, isMaker);
+            }
+        }
+    }
+}
+
+void MatchingEngine::fillOrder(Order &order, double price, double amount, bool isMaker) {
+    double remainingAmount = order.remainingAmount - amount;
+    bool isComplete = remainingAmount <= order.amount * DUST_FRACTION;
+
+    if (isComplete) {
+        amount = order.remainingAmount;
+        remainingAmount = 0.0;
+    }
+    order.remainingAmount = remainingAmount;
+    MatchingEngineFill fill = {order.orderId, price, amount, isMaker, isComplete};
+    this->fills[order.ownerId].push_back(fill);
+}
+
+void MatchingEngine::fillPriceLevel(std::deque<int64_t> &level, double volume) {
+    double previousQueueAhead = 0.0;
+    double consumedQueue = 0.0;
+    double amount;
+
+    // The traded volume goes to the market volume and our orders of the price level in queue order. The market volume
+    // between our orders is the difference of their queue ahead.
+    for (std::deque<int64_t>::iterator it = level.begin(); it != level.end(); ++it) {
+        Order &order = this->orders[*it];
+        double segment = std::max(order.queueAhead - previousQueueAhead, 0.0);
+        double consumed = std::min(volume, segment);
+
+        previousQueueAhead = std::max(order.queueAhead, previousQueueAhead);
+        volume -= consumed;
+        consumedQueue += consumed;
+        order.queueAhead = std::max(order.queueAhead - consumedQueue, 0.0);
+        if (volume > 0 && order.queueAhead <= 0) {
+            amount = std::min(volume, order.remainingAmount);
+            volume -= amount;
+            this->fillOrder(order, order.price, amount, true);
+        }
+    }
+    this->removeFilledOrders(level);
+}
+
+double MatchingEngine::fillThroughPriceLevel(std::deque<int64_t> &level, double volume) {
+    // The market volume of a price level the trade went through was taken before it, so our orders there fill first.
+    double amount;
+    for (std::deque<int64_t>::iterator it = level.begin(); it != level.end() && volume > 0; ++it) {
+        Order &order = this->orders[*it];
+        amount = std::min(volume, order.remainingAmount);
+        volume -= amount;
+        this->fillOrder(order, order.price, amount, true);
+    }
+    this->removeFilledOrders(level);
+    return volume;
+}
+
+void MatchingEngine::fillCrossedOrders() {
+    std::vector<double> emptyLevels;
+    double bestPrice;
+
+    // Resting bids at or above the best available ask, and asks at or below the best available bid.
+    for (PriceLevels::reverse_iterator it = this->bidLevels.rbegin(); it != this->bidLevels.rend(); ++it) {
+        bestPrice = this->getBestAvailablePrice(false);
+        if (!(it->first >= bestPrice)) {
+            break;
+        }
+        for (std::deque<int64_t>::iterator orderIt = it->second.begin(); orderIt != it->second.end(); ++orderIt) {
+            this->takeLiquidity(this->orders[*orderIt], true);
+        }
+        this->removeFilledOrders(it->second);
+        if (it->second.empty()) {
+            emptyLevels.push_back(it->first);
+        }
+    }
+    for (std::vector<double>::iterator it = emptyLevels.begin(); it != emptyLevels.end(); ++it) {
+        this->bidLevels.erase(*it);
+    }
+
+    emptyLevels.clear();
+    for (PriceLevels::iterator it = this->askLevels.begin(); it != this->askLevels.end(); ++it) {
+        bestPrice = this->getBestAvailablePrice(true);
+        if (!(it->first <= bestPrice)) {
+            break;
+        }
+        for (std::deque<int64_t>::iterator orderIt = it->second.begin(); orderIt != it->second.end(); ++orderIt) {
+            this->takeLiquidity(this->orders[*orderIt], true);
+        }
+        this->removeFilledOrders(it->second);
+        if (it->second.empty()) {
+            emptyLevels.push_back(it->first);
+        }
+    }
+    for (std::vector<double>::iterator it = emptyLevels.begin(); it != emptyLevels.end(); ++it) {
+        this->askLevels.erase(*it);
+    }
+}
+
+void MatchingEngine::clampQueues(PriceLevels &levels, double price, double amount) {
+    PriceLevels::iterator levelIt = levels.find(price);
+    if (levelIt == levels.end()) {
+        return;
+    }
+    for (std::deque<int64_t>::iterator it = levelIt->second.begin(); it != levelIt->second.end(); ++it) {
+        Order &order = this->orders[*it];
+        order.queueAhead = std::min(order.queueAhead, std::max(amount, 0.0));
+    }
+}
+
+void MatchingEngine::removeOrder(std::unordered_map<int64_t, Order>::iterator it) {
+    const Order &order = it->second;
+    if (!order.isActive) {
+        std::pair<std::multimap<double, int64_t>::iterator, std::multimap<double, int64_t>::iterator> range =
+            this->pendingOrders.equal_range(order.activeTimestamp);
+        for (std::multimap<double, int64_t>::iterator pendingIt = range.first; pendingIt != range.second; ++pendingIt) {
+            if (pendingIt->second == order.orderId) {
+                this->pendingOrders.erase(pendingIt);
+                break;
+            }
+        }
+    } else {
+        PriceLevels &levels = order.isBuy ? this->bidLevels : this->askLevels;
+        PriceLevels::iterator levelIt = levels.find(order.price);
+        if (levelIt != levels.end()) {
+            std::deque<int64_t> &level = levelIt->second;
+            level.erase(std::remove(level.begin(), level.end(), order.orderId), level.end());
+            if (level.empty()) {
+                levels.erase(levelIt);
+            }
+        }
+    }
+    this->orders.erase(it);
+}
+
+void MatchingEngine::cancelledOrder(const Order &order) {
+    this->cancelledOrders[order.ownerId].push_back(order.orderId);
+}
+
+void MatchingEngine::removeFilledOrders(std::deque<int64_t> &level) {
+    std::deque<int64_t>::iterator out = level.begin();
+    for (std::deque<int64_t>::iterator it = level.begin(); it != level.end(); ++it) {
+        if (this->orders[*it].remainingAmount > 0) {
+            *out = *it;
+            ++out;
+        } else {
+            this->orders.erase(*it);
+        }
+    }
+    level.erase(out, level.end());
+}
@@ -0,0 +1,116 @@
+#ifndef _MATCHING_ENGINE_H
+#define _MATCHING_ENGINE_H
+
+#include <stdint.h>
+#include <deque>
+#include <map>
+#include <set>
+#include <unordered_map>
+#include <vector>
+#include "OrderBookEntry.h"
+
+// A fill of a simulated order. The last fill of an order is complete - a market order that can't be filled fully
+// ends with a complete fill of 0 amount.
+struct MatchingEngineFill {
+    int64_t orderId;
+    double price;
+    double amount;
+    bool isMaker;
+    bool isComplete;
+};
+
+// Simulated matching of orders against one order book, driven incrementally by the diffs, snapshots and trades applied
+// to the order book - so that its cost doesn't grow with the number of resting orders. Paper trading and backtests both
+// match their orders with it.
+//
+// Orders become active, and cancels scheduled with cancelOrderAt() take effect, after their own latency. On activation,
+// an order takes the liquidity of the opposite side of the order book up to its limit price at the book prices (market
+// orders are immediate or cancel, post only orders that would take liquidity are cancelled instead), and the rest of a
+// limit order joins the back of the queue at its price level. The volume ahead in the queue is reduced by trades at
+// the price level, and clamped to the price level amount when the order book shrinks it - i.e. cancels are assumed to
+// come from behind, unless there isn't enough volume behind. Without queue position, orders are at the front of their
+// price level. A trade fills the orders at better prices than the trade, then those it reaches in the queue at its
+// price, up to the trade volume. Resting orders crossed by the opposite side of the order book are filled at their
+// price, by the crossing liquidity.
+//
+// Liquidity taken by orders is remembered per price level until the order book updates the price level.
+//
+// Several owners (e.g. paper trade exchanges sharing an order book) can place orders on the same engine. Order ids
+// must be unique across owners, and the fills and cancels of an owner's orders are queued separately, so that each
+// owner only pops its own.
+class MatchingEngine {
+    struct Order {
+        int64_t orderId;
+        int64_t ownerId;
+        bool isBuy;
+        bool isMarket;
+        bool isPostOnly;
+        bool isActive;
+        double price;
+        double amount;
+        double remainingAmount;
+        double activeTimestamp;
+        double cancelTimestamp;
+        double queueAhead;
+    };
+    typedef std::map<double, std::deque<int64_t>> PriceLevels;
+
+    const std::set<OrderBookEntry> *bidBook;
+    const std::set<OrderBookEntry> *askBook;
+    std::unordered_map<int64_t, Order> orders;
+    bool queuePosition;
+    std::multimap<double, int64_t> pendingOrders;
+    std::multimap<double, int64_t> pendingCancels;
+    PriceLevels bidLevels;
+    PriceLevels askLevels;
+    std::map<double, double> takenBids;
+    std::map<double, double> takenAsks;
+    std::unordered_map<int64_t, std::vector<MatchingEngineFill>> fills;
+    std::unordered_map<int64_t, std::vector<int64_t>> cancelledOrders;
+
+    double getAvailableAmount(const std::map<double, double> &taken, const OrderBookEntry &entry) const;
+    double getBestAvailablePrice(bool isBid) const;
+    double getLevelAmount(bool isBid, double price) const;
+    void activateOrder(Order &order);
+    void takeLiquidity(Order &order, bool isMaker);
+    void fillOrder(Order &order, double price, double amount, bool isMaker);
+    void fillPriceLevel(std::deque<int64_t> &level, double volume);
+    double fillThroughPriceLevel(std::deque<int64_t> &level, double volume);
+    void fillCrossedOrders();
+    void clampQueues(PriceLevels &levels, double price, double amount);
+    void cancelledOrder(const Order &order);
+    void removeFilledOrders(std::deque<int64_t> &level);
+    void removeOrder(std::unordered_map<int64_t, Order>::iterator it);
+
+    public:
+        MatchingEngine();
+        MatchingEngine(const std::set<OrderBookEntry> *bidBook, const std::set<OrderBookEntry> *askBook);
+        MatchingEngine(const MatchingEngine &other);
+        MatchingEngine &operator=(const MatchingEngine &other);
+
+        void setQueuePosition(bool queuePosition);
+        void addLimitOrder(int64_t orderId, bool isBuy, double price, double amount, double activeTimestamp,
+                           bool isPostOnly, int64_t ownerId = 0);
+        void addMarketOrder(int64_t orderId, bool isBuy, double amount, double activeTimestamp, int64_t ownerId = 0);
+        bool cancelOrder(int64_t orderId);
+        bool cancelOrderAt(int64_t orderId, double cancelTimestamp);
+        double getNextPendingTimestamp() const;
+        void advanceTo(double timestamp);
+
+        void applyDiffs(const std::vector<OrderBookEntry> &bids, const std::vector<OrderBookEntry> &asks);
+        void applySnapshot();
+        void applyTrade(bool isTakerBuy, double price, double amount);
+
+        bool hasFills(int64_t ownerId = 0) const;
+        std::vector<MatchingEngineFill> popFills(int64_t ownerId = 0);
+        bool hasCancelledOrders(int64_t ownerId = 0) const;
+        std::vector<int64_t> popCancelledOrders(int64_t ownerId = 0);
+
+        size_t getNumOrders() const;
+        bool hasOrder(int64_t orderId) const;
+        bool isActive(int64_t orderId) const;
+        double getRemainingAmount(int64_t orderId) const;
+        double getQueueAhead(int64_t orderId) const;
+};
+
+#endif
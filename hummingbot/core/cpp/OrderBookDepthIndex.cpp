@@ -0,0 +1,355 @@
+#include "OrderBookDepthIndex.h"
+
+static const int32_t NIL = -1;
+
+OrderBookDepthIndex::OrderBookDepthIndex() : OrderBookDepthIndex(false) {
+}
+
+OrderBookDepthIndex::OrderBookDepthIndex(bool descending) {
+    this->descending = descending;
+    this->dirty = true;
+    this->root = NIL;
+    this->randomState = 2463534242u;
+}
+
+OrderBookDepthIndex::OrderBookDepthIndex(const OrderBookDepthIndex &other) {
+    *this = other;
+}
+
+OrderBookDepthIndex &OrderBookDepthIndex::operator=(const OrderBookDepthIndex &other) {
+    this->descending = other.descending;
+    this->dirty = other.dirty;
+    this->root = other.root;
+    this->randomState = other.randomState;
+    this->nodes = other.nodes;
+    this->freeNodes = other.freeNodes;
+    return *this;
+}
+
+void OrderBookDepthIndex::rebuild(const std::set<OrderBookEntry> &book) {
+    std::vector<int32_t> spine;
+
+    this->nodes.clear();
+    this->freeNodes.clear();
+    this->nodes.reserve(book.size());
+    this->root = NIL;
+
+    // Linear time treap construction from the price levels in rank order: each new level goes down the right spine
+    // of the tree, below the last node with a higher priority.
+    if (this->descending) {
+        for (std::set<OrderBookEntry>::reverse_iterator it = book.rbegin(); it != book.rend(); ++it) {
+            int32_t node = this->newNode(it->getPrice(), it->getAmount());
+            int32_t last = NIL;
+            while (!spine.empty() && this->nodes[spine.back()].priority < this->nodes[node].priority) {
+                last = spine.back();
+                spine.pop_back();
+            }
+            this->nodes[node].left = last;
+            if (!spine.empty()) {
+                this->nodes[spine.back()].right = node;
+            }
+            spine.push_back(node);
+        }
+    } else {
+        for (std::set<OrderBookEntry>::iterator it = book.begin(); it != book.end(); ++it) {
+            int32_t node = this->newNode(it->getPrice(), it->getAmount());
+            int32_t last = NIL;
+            while (!spine.empty() && this->nodes[spine.back()].priority < this->nodes[node].priority) {
+                last = spine.back();
+                spine.pop_back();
+            }
+            this->nodes[node].left = last;
+            if (!spine.empty()) {
+                this->nodes[spine.back()].right = node;
+            }
+            spine.push_back(node);
+        }
+    }
+    if (!spine.empty()) {
+        this->root = spine.front();
+        this->updateSubtree(this->root);
+    }
+    this->dirty = false;
+}
+
+void OrderBookDepthIndex::applyEntry(double price, double amount) {
+    if (this->dirty) {
+        return;
+    }
+    if (!(amount > 0)) {
+        this->erase(price);
+        return;
+    }
+
+    double key = this->toKey(price);
+    int32_t node = this->root;
+    this->path.clear();
+    while (node != NIL) {
+        this->path.push_back(node);
+        if (this->nodes[node].key == key) {
+            // A known price level - update it, and the sums on the path down to it.
+            this->nodes[node].amount = amount;
+            for (std::vector<int32_t>::reverse_iterator it = this->path.rbegin(); it != this->path.rend(); ++it) {
+                this->update(*it);
+            }
+            return;
+        }
+        node = key < this->nodes[node].key ? this->nodes[node].left : this->nodes[node].right;
+    }
+
+    int32_t left;
+    int32_t right;
+    int32_t added = this->newNode(price, amount);
+    this->update(added);
+    this->split(this->root, key, false, left, right);
+    this->root = this->merge(this->merge(left, added), right);
+}
+
+void OrderBookDepthIndex::sync(const std::set<OrderBookEntry> &book) {
+    // Entries removed outside of applyEntry(), i.e. by truncateOverlapEntries(), are the best price levels of a side.
+    if (this->dirty) {
+        return;
+    }
+    while (this->size() > book.size()) {
+        double price = this->nodes[this->select(0)].price;
+        if (book.find(OrderBookEntry(price, 0, 0)) != book.end()) {
+            break;
+        }
+        this->erase(price);
+    }
+    if (this->size() != book.size()) {
+        this->dirty = true;
+    }
+}
+
+void OrderBookDepthIndex::markDirty() {
+    this->dirty = true;
+}
+
+bool OrderBookDepthIndex::isDirty() const {
+    return this->dirty;
+}
+
+size_t OrderBookDepthIndex::size() const {
+    return this->root != NIL ? this->nodes[this->root].size : 0;
+}
+
+double OrderBookDepthIndex::getPrice(size_t rank) const {
+    return this->nodes[this->select(rank)].price;
+}
+
+double OrderBookDepthIndex::getAmount(size_t rank) const {
+    return this->nodes[this->select(rank)].amount;
+}
+
+double OrderBookDepthIndex::getCumulativeVolume(size_t count) const {
+    return this->prefixSum(count, false);
+}
+
+double OrderBookDepthIndex::getCumulativeNotional(size_t count) const {
+    return this->prefixSum(count, true);
+}
+
+size_t OrderBookDepthIndex::getRankForVolume(double volume) const {
+    return this->lowerBound(volume, false);
+}
+
+size_t OrderBookDepthIndex::getRankForNotional(double notional) const {
+    return this->lowerBound(notional, true);
+}
+
+size_t OrderBookDepthIndex::getCountForPrice(double price) const {
+    // The number of price levels at the price or better.
+    double key = this->toKey(price);
+    int32_t node = this->root;
+    size_t count = 0;
+    while (node != NIL) {
+        const Node &current = this->nodes[node];
+        if (current.key <= key) {
+            count += (current.left != NIL ? this->nodes[current.left].size : 0) + 1;
+            node = current.right;
+        } else {
+            node = current.left;
+        }
+    }
+    return count;
+}
+
+double OrderBookDepthIndex::toKey(double price) const {
+    return this->descending ? -price : price;
+}
+
+uint32_t OrderBookDepthIndex::nextPriority() {
+    // xorshift32
+    this->randomState ^= this->randomState << 13;
+    this->randomState ^= this->randomState >> 17;
+    this->randomState ^= this->randomState << 5;
+    return this->randomState;
+}
+
+int32_t OrderBookDepthIndex::newNode(double price, double amount) {
+    Node node = {this->toKey(price), price, amount, amount, amount * price, 1, this->nextPriority(), NIL, NIL};
+    if (!this->freeNodes.empty()) {
+        int32_t retval = this->freeNodes.back();
+        this->freeNodes.pop_back();
+        this->nodes[retval] = node;
+        return retval;
+    }
+    this->nodes.push_back(node);
+    return static_cast<int32_t>(this->nodes.size() - 1);
+}
+
+void OrderBookDepthIndex::update(int32_t node) {
+    Node &current = this->nodes[node];
+    current.size = 1;
+    current.volume = current.amount;
+    current.notional = current.amount * current.price;
+    if (current.left != NIL) {
+        const Node &left = this->nodes[current.left];
+        current.size += left.size;
+        current.volume += left.volume;
+        current.notional += left.notional;
+    }
+    if (current.right != NIL) {
+        const Node &right = this->nodes[current.right];
+        current.size += right.size;
+        current.volume += right.volume;
+        current.notional += right.notional;
+    }
+}
+
+void OrderBookDepthIndex::updateSubtree(int32_t node) {
+    if (this->nodes[node].left != NIL) {
+        this->updateSubtree(this->nodes[node].left);
+    }
+    if (this->nodes[node].right != NIL) {
+        this->updateSubtree(this->nodes[node].right);
+    }
+    this->update(node);
+}
+
+void OrderBookDepthIndex::split(int32_t node, double key, bool inclusive, int32_t &left, int32_t &right) {
+    // Splits the subtree into the keys before key (or up to key, if inclusive) and the rest.
+    if (node == NIL) {
+        left = right = NIL;
+        return;
+    }
+    Node &current = this->nodes[node];
+    if (current.key < key || (inclusive && current.key == key)) {
+        this->split(current.right, key, inclusive, current.right, right);
+        left = node;
+    } else {
+        this->split(current.left, key, inclusive, left, current.left);
+        right = node;
+    }
+    this->update(node);
+}
+
+int32_t OrderBookDepthIndex::merge(int32_t left, int32_t right) {
+    if (left == NIL) {
+        return right;
+    }
+    if (right == NIL) {
+        return left;
+    }
+    if (this->nodes[left].priority > this->nodes[right].priority) {
+        int32_t merged = this->merge(this->nodes[left].right, right);
+        this->nodes[left].right = merged;
+        this->update(left);
+        return left;
+    }
+    int32_t merged = this->merge(left, this->nodes[right].left);
+    this->nodes[right].left = merged;
+    this->update(right);
+    return right;
+}
+
+int32_t OrderBookDepthIndex::select(size_t rank) const {
+    int32_t node = this->root;
+    while (node != NIL) {
+        const Node &current = this->nodes[node];
+        size_t leftSize = current.left != NIL ? this->nodes[current.left].size : 0;
+        if (rank < leftSize) {
+            node = current.left;
+        } else if (rank == leftSize) {
+            return node;
+        } else {
+            rank -= leftSize + 1;
+            node = current.right;
+        }
+    }
+    return node;
+}
+
+double OrderBookDepthIndex::prefixSum(size_t count, bool notional) const {
+    double retval = 0;
+    int32_t node = this->root;
+    while (node != NIL && count > 0) {
+        const Node &current = this->nodes[node];
+        size_t leftSize = 0;
+        if (current.left != NIL) {
+            leftSize = this->nodes[current.left].size;
+        }
+        if (count <= leftSize) {
+            node = current.left;
+            continue;
+        }
+        if (current.left != NIL) {
+            retval += notional ? this->nodes[current.left].notional : this->nodes[current.left].volume;
+        }
+        retval += notional ? current.amount * current.price : current.amount;
+        count -= leftSize + 1;
+        node = current.right;
+    }
+    return retval;
+}
+
+size_t OrderBookDepthIndex::lowerBound(double target, bool notional) const {
+    // Returns the rank of the first price level whose cumulative sum reaches target, or size() if the side does not
+    // have enough depth.
+    int32_t node = this->root;
+    size_t rank = 0;
+    double remaining = target;
+    while (node != NIL) {
+        const Node &current = this->nodes[node];
+        double leftSum = 0;
+        size_t leftSize = 0;
+        if (current.left != NIL) {
+            const Node &left = this->nodes[current.left];
+            leftSum = notional ? left.notional : left.volume;
+            leftSize = left.size;
+            if (leftSum >= remaining) {
+                node = current.left;
+                continue;
+            }
+        }
+        double value = notional ? current.amount * current.price : current.amount;
+        remaining -= leftSum;
+        if (value >= remaining) {
+            return rank + leftSize;
+        }
+        remaining -= value;
+        rank += leftSize + 1;
+        node = current.right;
+    }
+    return rank;
+}
+
+void OrderBookDepthIndex::erase(double price) {
+    double key = this->toKey(price);
+    int32_t node = this->root;
+    int32_t left;
+    int32_t middle;
+    int32_t right;
+
+    while (node != NIL && this->nodes[node].key != key) {
+        node = key < this->nodes[node].key ? this->nodes[node].left : this->nodes[node].right;
+    }
+    if (node == NIL) {
+        return;
+    }
+    this->split(this->root, key, false, left, right);
+    this->split(right, key, true, middle, right);
+    this->freeNodes.push_back(middle);
+    this->root = this->merge(left, right);
+}
@@ -0,0 +1,71 @@
+#ifndef _ORDER_BOOK_DEPTH_INDEX_H
+#define _ORDER_BOOK_DEPTH_INDEX_H
+
+#include <stddef.h>
+#include <stdint.h>
+#include <set>
+#include <vector>
+#include "OrderBookEntry.h"
+
+// Cumulative volume / notional index over one side of an order book.
+//
+// Price levels are ranked from the best price outwards, in an order statistic tree (a treap) whose nodes hold the
+// subtree level count, base amount and notional (price * amount). Amount changes, new price levels and removed price
+// levels are all O(log n) expected, as are the rank, cumulative sum and price queries. Subtree sums are recomputed
+// from the children on every update, rather than adjusted by deltas, so floating point drift doesn't accumulate.
+class OrderBookDepthIndex {
+    struct Node {
+        double key;
+        double price;
+        double amount;
+        double volume;
+        double notional;
+        size_t size;
+        uint32_t priority;
+        int32_t left;
+        int32_t right;
+    };
+
+    bool descending;
+    bool dirty;
+    int32_t root;
+    uint32_t randomState;
+    std::vector<Node> nodes;
+    std::vector<int32_t> freeNodes;
+    std::vector<int32_t> path;
+
+    double toKey(double price) const;
+    uint32_t nextPriority();
+    int32_t newNode(double price, double amount);
+    void update(int32_t node);
+    void updateSubtree(int32_t node);
+    void split(int32_t node, double key, bool inclusive, int32_t &left, int32_t &right);
+    int32_t merge(int32_t left, int32_t right);
+    int32_t select(size_t rank) const;
+    double prefixSum(size_t count, bool notional) const;
+    size_t lowerBound(double target, bool notional) const;
+    void erase(double price);
+
+    public:
+        OrderBookDepthIndex();
+        OrderBookDepthIndex(bool descending);
+        OrderBookDepthIndex(const OrderBookDepthIndex &other);
+        OrderBookDepthIndex &operator=(const OrderBookDepthIndex &other);
+
+        void rebuild(const std::set<OrderBookEntry> &book);
+        void applyEntry(double price, double amount);
+        void sync(const std::set<OrderBookEntry> &book);
+        void markDirty();
+        bool isDirty() const;
+
+        size_t size() const;
+        double getPrice(size_t rank) const;
+        double getAmount(size_t rank) const;
+        double getCumulativeVolume(size_t count) const;
+        double getCumulativeNotional(size_t count) const;
+        size_t getRankForVolume(double volume) const;
+        size_t getRankForNotional(double notional) const;
+        size_t getCountForPrice(double price) const;
+};
+
+#endif
@@ -0,0 +1,48 @@
+# distutils: language=c++
+
+from libc.stdint cimport int64_t
+from libcpp cimport bool
+from libcpp.set cimport set
+from libcpp.vector cimport vector
+from hummingbot.core.data_type.OrderBookEntry cimport OrderBookEntry
+
+cdef extern from "../cpp/MatchingEngine.h":
+    cdef struct MatchingEngineFill:
+        int64_t orderId
+        double price
+        double amount
+        bool isMaker
+        bool isComplete
+
+    cdef cppclass MatchingEngine:
+        MatchingEngine()
+        MatchingEngine(const set[OrderBookEntry] *bidBook, const set[OrderBookEntry] *askBook)
+        MatchingEngine(const MatchingEngine &other)
+        MatchingEngine &operator=(const MatchingEngine &other)
+        void setQueuePosition(bool queuePosition)
+        void addLimitOrder(int64_t orderId, bool isBuy, double price, double amount, double activeTimestamp,
+                           bool isPostOnly)
+        void addLimitOrder(int64_t orderId, bool isBuy, double price, double amount, double activeTimestamp,
+                           bool isPostOnly, int64_t ownerId)
+        void addMarketOrder(int64_t orderId, bool isBuy, double amount, double activeTimestamp)
+        void addMarketOrder(int64_t orderId, bool isBuy, double amount, double activeTimestamp, int64_t ownerId)
+        bool cancelOrder(int64_t orderId)
+        bool cancelOrderAt(int64_t orderId, double cancelTimestamp)
+        double getNextPendingTimestamp() const
+        void advanceTo(double timestamp)
+        void applyDiffs(const vector[OrderBookEntry] &bids, const vector[OrderBookEntry] &asks)
+        void applySnapshot()
+        void applyTrade(bool isTakerBuy, double price, double amount)
+        bool hasFills() const
+        bool hasFills(int64_t ownerId) const
+        vector[MatchingEngineFill] popFills()
+        vector[MatchingEngineFill] popFills(int64_t ownerId)
+        bool hasCancelledOrders() const
+        bool hasCancelledOrders(int64_t ownerId) const
+        vector[int64_t] popCancelledOrders()
+        vector[int64_t] popCancelledOrders(int64_t ownerId)
+        size_t getNumOrders() const
+        bool hasOrder(int64_t orderId) const
+        bool isActive(int64_t orderId) const
+        double getRemainingAmount(int64_t orderId) const
+        double getQueueAhead(int64_t orderId) const
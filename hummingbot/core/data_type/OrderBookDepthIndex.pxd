@@ -0,0 +1,25 @@
+# distutils: language=c++
+
+from libcpp cimport bool
+from libcpp.set cimport set
+from hummingbot.core.data_type.OrderBookEntry cimport OrderBookEntry
+
+cdef extern from "../cpp/OrderBookDepthIndex.h":
+    cdef cppclass OrderBookDepthIndex:
+        OrderBookDepthIndex()
+        OrderBookDepthIndex(bool descending)
+        OrderBookDepthIndex(const OrderBookDepthIndex &other)
+        OrderBookDepthIndex &operator=(const OrderBookDepthIndex &other)
+        void rebuild(const set[OrderBookEntry] &book)
+        void applyEntry(double price, double amount)
+        void sync(const set[OrderBookEntry] &book)
+        void markDirty()
+        bool isDirty() const
+        size_t size() const
+        double getPrice(size_t rank) const
+        double getAmount(size_t rank) const
+        double getCumulativeVolume(size_t count) const
+        double getCumulativeNotional(size_t count) const
+        size_t getRankForVolume(double volume) const
+        size_t getRankForNotional(double notional) const
+        size_t getCountForPrice(double price) const
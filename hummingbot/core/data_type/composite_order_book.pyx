@@ -1,7 +1,8 @@
 # distutils: language=c++
-# distutils: sources=hummingbot/core/cpp/OrderBookEntry.cpp
+# distutils: sources=['hummingbot/core/cpp/OrderBookEntry.cpp', 'hummingbot/core/cpp/MatchingEngine.cpp']
 
 from typing import Iterator
+from libc.stdint cimport int64_t
 from libcpp.set cimport set
 from cython.operator cimport(
     postincrement as inc,
@@ -12,6 +13,7 @@ from libcpp.vector cimport vector
 
 from hummingbot.core.event.events import TradeType
 from hummingbot.core.data_type.order_book_row import OrderBookRow
+from hummingbot.core.data_type.MatchingEngine cimport MatchingEngine
 from hummingbot.core.data_type.OrderBookEntry cimport OrderBookEntry
 
 
@@ -20,7 +22,13 @@ cdef class CompositeOrderBook(OrderBook):
     Record orders that are bought during back testing and used to simulate order book consumption without modifying
     the actual order book.
     Override the order book bid_entries, ask_entries methods to return the composite order book entries
+
+    The diffs, snapshots and trades applied to the order book also drive its matching engine, which simulates the
+    fills of paper trade and backtest orders.
     """
+    def __cinit__(self, *args, **kwargs):
+        self._matching_engine = MatchingEngine(ref(self._bid_book), ref(self._ask_book))
+
     def __init__(self, order_book: OrderBook = None):
         super().__init__()
         self._traded_order_book = OrderBook()
@@ -76,6 +84,18 @@ cdef class CompositeOrderBook(OrderBook):
 
         self._traded_order_book.c_apply_diffs(cpp_bids, cpp_asks, timestamp)
 
+    cdef c_apply_diffs(self, vector[OrderBookEntry] bids, vector[OrderBookEntry] asks, int64_t update_id):
+        OrderBook.c_apply_diffs(self, bids, asks, update_id)
+        self._matching_engine.applyDiffs(bids, asks)
+
+    cdef c_apply_snapshot(self, vector[OrderBookEntry] bids, vector[OrderBookEntry] asks, int64_t update_id):
+        OrderBook.c_apply_snapshot(self, bids, asks, update_id)
+        self._matching_engine.applySnapshot()
+
+    cdef c_apply_trade(self, object trade_event):
+        self._matching_engine.applyTrade(trade_event.type is TradeType.BUY, trade_event.price, trade_event.amount)
+        OrderBook.c_apply_trade(self, trade_event)
+
     def original_bid_entries(self) -> Iterator[OrderBookRow]:
         return super().bid_entries()
 
@@ -1,5 +1,5 @@
 # distutils: language=c++
-# distutils: sources=hummingbot/core/cpp/OrderBookEntry.cpp
+# distutils: sources=['hummingbot/core/cpp/OrderBookEntry.cpp', 'hummingbot/core/cpp/OrderBookDepthIndex.cpp']
 from cython.operator cimport(
     postincrement as inc,
     dereference as deref,
@@ -22,7 +22,10 @@ from aiokafka import ConsumerRecord
 import pandas as pd
 import numpy as np
 import time
-from .order_book_message import OrderBookMessage
+from .order_book_message import (
+    OrderBookMessage,
+    merge_numpy_diffs,
+)
 from .order_book_row import OrderBookRow
 from .order_book_query_result import OrderBookQueryResult
 from sqlalchemy.engine import RowProxy
@@ -33,6 +36,24 @@ ob_logger = None
 NaN = float("nan")
 
 
+cdef int64_t c_numpy_to_entries(np.ndarray[np.float64_t, ndim=2] entries_array,
+                                vector[OrderBookEntry] &entries,
+                                int64_t last_update_id):
+    """
+    Appends the [price, amount, update_id] rows of entries_array to entries, and returns the largest update_id seen.
+    """
+    cdef:
+        Py_ssize_t i
+        int64_t row_update_id
+    entries.reserve(entries.size() + entries_array.shape[0])
+    for i in range(entries_array.shape[0]):
+        row_update_id = <int64_t>entries_array[i, 2]
+        entries.push_back(OrderBookEntry(entries_array[i, 0], entries_array[i, 1], row_update_id))
+        if row_update_id > last_update_id:
+            last_update_id = row_update_id
+    return last_update_id
+
+
 cdef class OrderBook(PubSub):
     ORDER_BOOK_TRADE_EVENT_TAG = OrderBookEvent.TradeEvent.value
 
@@ -43,7 +64,7 @@ cdef class OrderBook(PubSub):
             ob_logger = logging.getLogger(__name__)
         return ob_logger
 
-    def __init__(self, dex=False):
+    def __init__(self, dex=False, depth_index=False):
         super().__init__()
         self._snapshot_uid = 0
         self._last_diff_uid = 0
@@ -52,6 +73,9 @@ cdef class OrderBook(PubSub):
         self._last_applied_trade = -1000.0
         self._last_trade_price_rest_updated = -1000
         self._dex = dex
+        self._bid_depth_index = OrderBookDepthIndex(True)
+        self._ask_depth_index = OrderBookDepthIndex(False)
+        self._depth_index_enabled = depth_index
 
     cdef c_apply_diffs(self, vector[OrderBookEntry] bids, vector[OrderBookEntry] asks, int64_t update_id):
         cdef:
@@ -70,16 +94,25 @@ cdef class OrderBook(PubSub):
                 self._bid_book.erase(result)
             if bid.getAmount() > 0:
                 self._bid_book.insert(bid)
+            if self._depth_index_enabled:
+                self._bid_depth_index.applyEntry(bid.getPrice(), bid.getAmount())
         for ask in asks:
             result = self._ask_book.find(ask)
             if result != ask_book_end:
                 self._ask_book.erase(result)
             if ask.getAmount() > 0:
                 self._ask_book.insert(ask)
+            if self._depth_index_enabled:
+                self._ask_depth_index.applyEntry(ask.getPrice(), ask.getAmount())
 
         # If any overlapping entries between the bid and ask books, centralised: newer entries win, dex: see OrderBookEntry.cpp
         truncateOverlapEntries(self._bid_book, self._ask_book, self._dex)
 
+        # Entries removed by the truncation above are not known to the depth indices - resync them.
+        if self._depth_index_enabled:
+            self._bid_depth_index.sync(self._bid_book)
+            self._ask_depth_index.sync(self._ask_book)
+
         # Record the current best prices, for faster c_get_price() calls.
         bid_iterator = self._bid_book.rbegin()
         ask_iterator = self._ask_book.begin()
@@ -130,6 +163,10 @@ cdef class OrderBook(PubSub):
         self._best_bid = best_bid_price
         self._best_ask = best_ask_price
 
+        if self._depth_index_enabled:
+            self._bid_depth_index.rebuild(self._bid_book)
+            self._ask_depth_index.rebuild(self._ask_book)
+
         # Remember the last snapshot update ID.
         self._snapshot_uid = update_id
 
@@ -158,6 +195,20 @@ cdef class OrderBook(PubSub):
     def last_trade_price_rest_updated(self, value: float):
         self._last_trade_price_rest_updated = value
 
+    @property
+    def depth_index_enabled(self) -> bool:
+        return self._depth_index_enabled
+
+    @depth_index_enabled.setter
+    def depth_index_enabled(self, value: bool):
+        """
+        Enables the cumulative depth indices, which turn the depth queries (e.g. get_vwap_for_volume()) from O(depth)
+        scans into O(log depth) lookups, at the cost of an O(log depth) index update per diff entry.
+        """
+        self._depth_index_enabled = value
+        self._bid_depth_index.markDirty()
+        self._ask_depth_index.markDirty()
+
     @property
     def snapshot_uid(self) -> int:
         return self._snapshot_uid
@@ -168,12 +219,54 @@ cdef class OrderBook(PubSub):
 
     @property
     def snapshot(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        bids_rows = list(self.bid_entries())
-        asks_rows = list(self.ask_entries())
-        bids_df = pd.DataFrame(data=bids_rows, columns=OrderBookRow._fields, dtype="float64")
-        asks_df = pd.DataFrame(data=asks_rows, columns=OrderBookRow._fields, dtype="float64")
+        bids_array, asks_array = self.numpy_snapshot()
+        bids_df = pd.DataFrame(data=bids_array, columns=OrderBookRow._fields, copy=False)
+        asks_df = pd.DataFrame(data=asks_array, columns=OrderBookRow._fields, copy=False)
         return bids_df, asks_df
 
+    def numpy_snapshot(self, max_depth: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exports the bid and ask sides as contiguous (n, 3) float64 arrays of [price, amount, update_id] rows, best
+        price first. This is the same layout accepted by apply_numpy_snapshot().
+
+        :param max_depth: only export the top max_depth price levels of each side, the whole side if None
+        """
+        depth = -1 if max_depth is None else max_depth
+        return self.c_get_numpy_entries(False, depth), self.c_get_numpy_entries(True, depth)
+
+    cdef np.ndarray c_get_numpy_entries(self, bint is_buy, int64_t max_depth):
+        cdef:
+            set[OrderBookEntry] *book = ref(self._ask_book) if is_buy else ref(self._bid_book)
+            int64_t num_rows = <int64_t>deref(book).size()
+            int64_t row = 0
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            np.ndarray[np.float64_t, ndim=2] retval
+            double[:, ::1] rows
+
+        if 0 <= max_depth < num_rows:
+            num_rows = max_depth
+        retval = np.empty((num_rows, 3), dtype=np.float64)
+        rows = retval
+
+        if is_buy:
+            ask_it = self._ask_book.begin()
+            while row < num_rows:
+                rows[row, 0] = deref(ask_it).getPrice()
+                rows[row, 1] = deref(ask_it).getAmount()
+                rows[row, 2] = deref(ask_it).getUpdateId()
+                row += 1
+                inc(ask_it)
+        else:
+            bid_it = self._bid_book.rbegin()
+            while row < num_rows:
+                rows[row, 0] = deref(bid_it).getPrice()
+                rows[row, 1] = deref(bid_it).getAmount()
+                rows[row, 2] = deref(bid_it).getUpdateId()
+                row += 1
+                inc(bid_it)
+        return retval
+
     def apply_diffs(self, bids: List[OrderBookRow], asks: List[OrderBookRow], update_id: int):
         cdef:
             vector[OrderBookEntry] cpp_bids
@@ -205,16 +298,19 @@ cdef class OrderBook(PubSub):
         """
         self.apply_numpy_diffs(bids_df.values, asks_df.values)
 
-    def apply_numpy_diffs(self, bids_array: np.ndarray, asks_array: np.ndarray):
+    def apply_numpy_diffs(self, bids_array: np.ndarray, asks_array: np.ndarray, update_id: int = -1):
         """
         The diffs data frame must have 3 columns, [price, amount, update_id].
         All columns are of double type.
+
+        If update_id is not given, the largest update_id among the rows is used.
         """
-        self.c_apply_numpy_diffs(bids_array, asks_array)
+        self.c_apply_numpy_diffs(bids_array, asks_array, update_id)
 
     cdef c_apply_numpy_diffs(self,
                              np.ndarray[np.float64_t, ndim=2] bids_array,
-                             np.ndarray[np.float64_t, ndim=2] asks_array):
+                             np.ndarray[np.float64_t, ndim=2] asks_array,
+                             int64_t update_id=-1):
         """
         The diffs data frame must have 3 columns, [price, amount, update_id].
         All columns are of double type.
@@ -224,24 +320,23 @@ cdef class OrderBook(PubSub):
             vector[OrderBookEntry] cpp_asks
             int64_t last_update_id = 0
 
-        for row in bids_array:
-            cpp_bids.push_back(OrderBookEntry(row[0], row[1], <int64_t>(row[2])))
-            last_update_id = max(last_update_id, <int64_t>row[2])
-        for row in asks_array:
-            cpp_asks.push_back(OrderBookEntry(row[0], row[1], <int64_t>(row[2])))
-            last_update_id = max(last_update_id, <int64_t>row[2])
-        self.c_apply_diffs(cpp_bids, cpp_asks, last_update_id)
+        last_update_id = c_numpy_to_entries(bids_array, cpp_bids, last_update_id)
+        last_update_id = c_numpy_to_entries(asks_array, cpp_asks, last_update_id)
+        self.c_apply_diffs(cpp_bids, cpp_asks, last_update_id if update_id < 0 else update_id)
 
-    def apply_numpy_snapshot(self, bids_array: np.ndarray, asks_array: np.ndarray):
+    def apply_numpy_snapshot(self, bids_array: np.ndarray, asks_array: np.ndarray, update_id: int = -1):
         """
         The diffs data frame must have 3 columns, [price, amount, update_id].
         All columns are of double type.
+
+        If update_id is not given, the largest update_id among the rows is used.
         """
-        self.c_apply_numpy_snapshot(bids_array, asks_array)
+        self.c_apply_numpy_snapshot(bids_array, asks_array, update_id)
 
     cdef c_apply_numpy_snapshot(self,
                                 np.ndarray[np.float64_t, ndim=2] bids_array,
-                                np.ndarray[np.float64_t, ndim=2] asks_array):
+                                np.ndarray[np.float64_t, ndim=2] asks_array,
+                                int64_t update_id=-1):
         """
         The diffs data frame must have 3 columns, [price, amount, update_id].
         All columns are of double type.
@@ -251,13 +346,9 @@ cdef class OrderBook(PubSub):
             vector[OrderBookEntry] cpp_asks
             int64_t last_update_id = 0
 
-        for row in bids_array:
-            cpp_bids.push_back(OrderBookEntry(row[0], row[1], <int64_t>(row[2])))
-            last_update_id = max(last_update_id, <int64_t>row[2])
-        for row in asks_array:
-            cpp_asks.push_back(OrderBookEntry(row[0], row[1], <int64_t>(row[2])))
-            last_update_id = max(last_update_id, <int64_t>row[2])
-        self.c_apply_snapshot(cpp_bids, cpp_asks, last_update_id)
+        last_update_id = c_numpy_to_entries(bids_array, cpp_bids, last_update_id)
+        last_update_id = c_numpy_to_entries(asks_array, cpp_asks, last_update_id)
+        self.c_apply_snapshot(cpp_bids, cpp_asks, last_update_id if update_id < 0 else update_id)
 
     def bid_entries(self) -> Iterator[OrderBookRow]:
         cdef:
@@ -305,6 +396,13 @@ cdef class OrderBook(PubSub):
                 break
         return retval
 
+    cdef OrderBookDepthIndex *c_get_depth_index(self, bint is_buy):
+        cdef:
+            OrderBookDepthIndex *depth_index = ref(self._ask_depth_index) if is_buy else ref(self._bid_depth_index)
+        if depth_index.isDirty():
+            depth_index.rebuild(self._ask_book if is_buy else self._bid_book)
+        return depth_index
+
     cdef double c_get_price(self, bint is_buy) except? -1:
         cdef:
             set[OrderBookEntry] *book = ref(self._ask_book) if is_buy else ref(self._bid_book)
@@ -319,19 +417,35 @@ cdef class OrderBook(PubSub):
         cdef:
             double cumulative_volume = 0
             double result_price = NaN
-
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                cumulative_volume += order_book_row.amount
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookDepthIndex *depth_index
+            size_t rank
+
+        if self._depth_index_enabled:
+            depth_index = self.c_get_depth_index(is_buy)
+            rank = depth_index.getRankForVolume(volume)
+            if rank < depth_index.size():
+                result_price = depth_index.getPrice(rank)
+                cumulative_volume = depth_index.getCumulativeVolume(rank + 1)
+            else:
+                cumulative_volume = depth_index.getCumulativeVolume(depth_index.size())
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                cumulative_volume += deref(ask_it).getAmount()
                 if cumulative_volume >= volume:
-                    result_price = order_book_row.price
+                    result_price = deref(ask_it).getPrice()
                     break
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                cumulative_volume += order_book_row.amount
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                cumulative_volume += deref(bid_it).getAmount()
                 if cumulative_volume >= volume:
-                    result_price = order_book_row.price
+                    result_price = deref(bid_it).getPrice()
                     break
+                inc(bid_it)
 
         return OrderBookQueryResult(NaN, volume, result_price, min(cumulative_volume, volume))
 
@@ -340,30 +454,52 @@ cdef class OrderBook(PubSub):
             double total_cost = 0
             double total_volume = 0
             double result_vwap = NaN
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                total_cost += order_book_row.amount * order_book_row.price
-                total_volume += order_book_row.amount
-                if total_volume >= volume:
-                    total_cost -= order_book_row.amount * order_book_row.price
-                    total_volume -= order_book_row.amount
-                    incremental_amount = volume - total_volume
-                    total_cost += incremental_amount * order_book_row.price
-                    total_volume += incremental_amount
+            double price
+            double amount
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookDepthIndex *depth_index
+            size_t rank
+
+        if self._depth_index_enabled:
+            depth_index = self.c_get_depth_index(is_buy)
+            rank = depth_index.getRankForVolume(volume)
+            if rank < depth_index.size():
+                total_volume = depth_index.getCumulativeVolume(rank)
+                total_cost = depth_index.getCumulativeNotional(rank) + \
+                    (volume - total_volume) * depth_index.getPrice(rank)
+                total_volume = volume
+                result_vwap = total_cost / total_volume
+            else:
+                total_volume = depth_index.getCumulativeVolume(depth_index.size())
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                price = deref(ask_it).getPrice()
+                amount = deref(ask_it).getAmount()
+                if total_volume + amount >= volume:
+                    # Only take the remaining amount from the last level.
+                    total_cost += (volume - total_volume) * price
+                    total_volume = volume
                     result_vwap = total_cost / total_volume
                     break
+                total_cost += amount * price
+                total_volume += amount
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                total_cost += order_book_row.amount * order_book_row.price
-                total_volume += order_book_row.amount
-                if total_volume >= volume:
-                    total_cost -= order_book_row.amount * order_book_row.price
-                    total_volume -= order_book_row.amount
-                    incremental_amount = volume - total_volume
-                    total_cost += incremental_amount * order_book_row.price
-                    total_volume += incremental_amount
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                price = deref(bid_it).getPrice()
+                amount = deref(bid_it).getAmount()
+                if total_volume + amount >= volume:
+                    # Only take the remaining amount from the last level.
+                    total_cost += (volume - total_volume) * price
+                    total_volume = volume
                     result_vwap = total_cost / total_volume
                     break
+                total_cost += amount * price
+                total_volume += amount
+                inc(bid_it)
 
         return OrderBookQueryResult(NaN, volume, result_vwap, min(total_volume, volume))
 
@@ -371,19 +507,35 @@ cdef class OrderBook(PubSub):
         cdef:
             double cumulative_volume = 0
             double result_price = NaN
-
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                cumulative_volume += order_book_row.amount * order_book_row.price
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookDepthIndex *depth_index
+            size_t rank
+
+        if self._depth_index_enabled:
+            depth_index = self.c_get_depth_index(is_buy)
+            rank = depth_index.getRankForNotional(quote_volume)
+            if rank < depth_index.size():
+                result_price = depth_index.getPrice(rank)
+                cumulative_volume = depth_index.getCumulativeNotional(rank + 1)
+            else:
+                cumulative_volume = depth_index.getCumulativeNotional(depth_index.size())
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                cumulative_volume += deref(ask_it).getAmount() * deref(ask_it).getPrice()
                 if cumulative_volume >= quote_volume:
-                    result_price = order_book_row.price
+                    result_price = deref(ask_it).getPrice()
                     break
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                cumulative_volume += order_book_row.amount * order_book_row.price
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                cumulative_volume += deref(bid_it).getAmount() * deref(bid_it).getPrice()
                 if cumulative_volume >= quote_volume:
-                    result_price = order_book_row.price
+                    result_price = deref(bid_it).getPrice()
                     break
+                inc(bid_it)
 
         return OrderBookQueryResult(NaN, quote_volume, result_price, min(cumulative_volume, quote_volume))
 
@@ -392,25 +544,42 @@ cdef class OrderBook(PubSub):
             double cumulative_volume = 0
             double cumulative_base_amount = 0
             double row_amount = 0
-
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                row_amount = order_book_row.amount
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookDepthIndex *depth_index
+            size_t rank
+
+        if self._depth_index_enabled:
+            depth_index = self.c_get_depth_index(is_buy)
+            rank = depth_index.getRankForVolume(base_amount)
+            if rank < depth_index.size():
+                cumulative_base_amount = depth_index.getCumulativeVolume(rank)
+                cumulative_volume = depth_index.getCumulativeNotional(rank) + \
+                    (base_amount - cumulative_base_amount) * depth_index.getPrice(rank)
+            else:
+                cumulative_volume = depth_index.getCumulativeNotional(depth_index.size())
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                row_amount = deref(ask_it).getAmount()
                 if row_amount + cumulative_base_amount >= base_amount:
                     row_amount = base_amount - cumulative_base_amount
                 cumulative_base_amount += row_amount
-                cumulative_volume += row_amount * order_book_row.price
+                cumulative_volume += row_amount * deref(ask_it).getPrice()
                 if cumulative_base_amount >= base_amount:
                     break
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                row_amount = order_book_row.amount
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                row_amount = deref(bid_it).getAmount()
                 if row_amount + cumulative_base_amount >= base_amount:
                     row_amount = base_amount - cumulative_base_amount
                 cumulative_base_amount += row_amount
-                cumulative_volume += row_amount * order_book_row.price
+                cumulative_volume += row_amount * deref(bid_it).getPrice()
                 if cumulative_base_amount >= base_amount:
                     break
+                inc(bid_it)
 
         return OrderBookQueryResult(NaN, base_amount, NaN, cumulative_volume)
 
@@ -418,19 +587,33 @@ cdef class OrderBook(PubSub):
         cdef:
             double cumulative_volume = 0
             double result_price = NaN
-
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                if order_book_row.price > price:
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookDepthIndex *depth_index
+            size_t count
+
+        if self._depth_index_enabled:
+            depth_index = self.c_get_depth_index(is_buy)
+            count = depth_index.getCountForPrice(price)
+            cumulative_volume = depth_index.getCumulativeVolume(count)
+            if count > 0:
+                result_price = depth_index.getPrice(count - 1)
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                if deref(ask_it).getPrice() > price:
                     break
-                cumulative_volume += order_book_row.amount
-                result_price = order_book_row.price
+                cumulative_volume += deref(ask_it).getAmount()
+                result_price = deref(ask_it).getPrice()
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                if order_book_row.price < price:
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                if deref(bid_it).getPrice() < price:
                     break
-                cumulative_volume += order_book_row.amount
-                result_price = order_book_row.price
+                cumulative_volume += deref(bid_it).getAmount()
+                result_price = deref(bid_it).getPrice()
+                inc(bid_it)
 
         return OrderBookQueryResult(price, NaN, result_price, cumulative_volume)
 
@@ -438,19 +621,33 @@ cdef class OrderBook(PubSub):
         cdef:
             double cumulative_volume = 0
             double result_price = NaN
-
-        if is_buy:
-            for order_book_row in self.ask_entries():
-                if order_book_row.price > price:
+            set[OrderBookEntry].iterator ask_it
+            set[OrderBookEntry].reverse_iterator bid_it
+            OrderBookDepthIndex *depth_index
+            size_t count
+
+        if self._depth_index_enabled:
+            depth_index = self.c_get_depth_index(is_buy)
+            count = depth_index.getCountForPrice(price)
+            cumulative_volume = depth_index.getCumulativeNotional(count)
+            if count > 0:
+                result_price = depth_index.getPrice(count - 1)
+        elif is_buy:
+            ask_it = self._ask_book.begin()
+            while ask_it != self._ask_book.end():
+                if deref(ask_it).getPrice() > price:
                     break
-                cumulative_volume += order_book_row.amount * order_book_row.price
-                result_price = order_book_row.price
+                cumulative_volume += deref(ask_it).getAmount() * deref(ask_it).getPrice()
+                result_price = deref(ask_it).getPrice()
+                inc(ask_it)
         else:
-            for order_book_row in self.bid_entries():
-                if order_book_row.price < price:
+            bid_it = self._bid_book.rbegin()
+            while bid_it != self._bid_book.rend():
+                if deref(bid_it).getPrice() < price:
                     break
-                cumulative_volume += order_book_row.amount * order_book_row.price
-                result_price = order_book_row.price
+                cumulative_volume += deref(bid_it).getAmount() * deref(bid_it).getPrice()
+                result_price = deref(bid_it).getPrice()
+                inc(bid_it)
 
         return OrderBookQueryResult(price, NaN, result_price, cumulative_volume)
 
@@ -495,6 +692,8 @@ cdef class OrderBook(PubSub):
     def restore_from_snapshot_and_diffs(self, snapshot: OrderBookMessage, diffs: List[OrderBookMessage]):
         replay_position = bisect.bisect_right(diffs, snapshot)
         replay_diffs = diffs[replay_position:]
-        self.apply_snapshot(snapshot.bids, snapshot.asks, snapshot.update_id)
-        for diff in replay_diffs:
-            self.apply_diffs(diff.bids, diff.asks, diff.update_id)
+        self.apply_numpy_snapshot(snapshot.bids_array, snapshot.asks_array, snapshot.update_id)
+        if len(replay_diffs) > 0:
+            self.apply_numpy_diffs(merge_numpy_diffs([diff.bids_array for diff in replay_diffs]),
+                                   merge_numpy_diffs([diff.asks_array for diff in replay_diffs]),
+                                   max(diff.update_id for diff in replay_diffs))
@@ -4,14 +4,60 @@ from collections import namedtuple
 from enum import Enum
 from functools import total_ordering
 from typing import (
+    Any,
     Dict,
     List,
     Optional,
 )
 
+import numpy as np
+
 from hummingbot.core.data_type.order_book_row import OrderBookRow
 
 
+def entries_to_numpy(entries: Any, update_id: int) -> np.ndarray:
+    """
+    Parses order book entries from an exchange message, i.e. [price, amount, ...] rows of numbers or numeric strings,
+    into an (n, 3) float64 array of [price, amount, update_id] rows, as accepted by OrderBook.apply_numpy_diffs().
+    Arrays that are already in that layout are returned as is.
+    """
+    if isinstance(entries, np.ndarray) and entries.ndim == 2 and entries.shape[1] == 3:
+        return entries
+    retval: np.ndarray = np.empty((len(entries), 3), dtype=np.float64)
+    if len(retval) > 0:
+        try:
+            parsed: np.ndarray = np.array(entries, dtype=np.float64)
+            if parsed.ndim != 2 or parsed.shape[1] < 2:
+                raise ValueError(f"Unexpected order book entries shape {parsed.shape}.")
+        except (TypeError, ValueError):
+            # Ragged rows, or non-numeric trailing fields.
+            parsed = np.array([(price, amount) for price, amount, *trash in entries], dtype=np.float64)
+        retval[:, :2] = parsed[:, :2]
+    retval[:, 2] = update_id
+    return retval
+
+
+def rows_to_numpy(rows: List[OrderBookRow]) -> np.ndarray:
+    return np.array(rows, dtype=np.float64).reshape((len(rows), 3))
+
+
+def merge_numpy_diffs(arrays: List[np.ndarray]) -> np.ndarray:
+    """
+    Merges the [price, amount, update_id] diff arrays of consecutive diff messages into one diff, keeping the entry
+    with the highest update ID for each price level (the latest one, on ties). Applying the merged diff leaves the
+    order book levels in the same state as applying the diffs one by one.
+    """
+    if len(arrays) == 1:
+        return arrays[0]
+    stacked: np.ndarray = np.concatenate(arrays)
+    if len(stacked) < 2:
+        return stacked
+    stacked = stacked[np.argsort(stacked[:, 2], kind="stable")]
+    # np.unique() returns the first occurrence of each price, so look for them from the end.
+    _, last_indices = np.unique(stacked[::-1, 0], return_index=True)
+    return stacked[len(stacked) - 1 - last_indices]
+
+
 class OrderBookMessageType(Enum):
     SNAPSHOT = 1
     DIFF = 2
@@ -48,6 +94,13 @@ class OrderBookMessage(namedtuple("_OrderBookMessage", "type, content, timestamp
         else:
             return -1
 
+    @property
+    def has_first_update_id(self) -> bool:
+        """
+        Whether the diff carries the update ID range it covers, so the continuity of the diff stream can be checked.
+        """
+        return self.type is OrderBookMessageType.DIFF and "first_update_id" in self.content
+
     @property
     def trade_id(self) -> int:
         if self.type is OrderBookMessageType.TRADE:
@@ -70,6 +123,26 @@ class OrderBookMessage(namedtuple("_OrderBookMessage", "type, content, timestamp
             OrderBookRow(float(price), float(amount), self.update_id) for price, amount, *trash in self.content["bids"]
         ]
 
+    @property
+    def asks_array(self) -> np.ndarray:
+        """
+        The asks as an (n, 3) float64 array of [price, amount, update_id], for OrderBook.apply_numpy_diffs(). This is
+        free if the message was created with pre-parsed arrays, see entries_to_numpy().
+        """
+        if type(self).asks is not OrderBookMessage.asks:
+            # Exchange specific message content, parsed by the subclass.
+            return rows_to_numpy(self.asks)
+        return entries_to_numpy(self.content["asks"], self.update_id)
+
+    @property
+    def bids_array(self) -> np.ndarray:
+        """
+        The bids as an (n, 3) float64 array of [price, amount, update_id], for OrderBook.apply_numpy_diffs().
+        """
+        if type(self).bids is not OrderBookMessage.bids:
+            return rows_to_numpy(self.bids)
+        return entries_to_numpy(self.content["bids"], self.update_id)
+
     @property
     def has_update_id(self) -> bool:
         return self.type in {OrderBookMessageType.DIFF, OrderBookMessageType.SNAPSHOT}
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+from multiprocessing import shared_memory
+from typing import (
+    NamedTuple,
+    Optional,
+)
+
+import numpy as np
+
+# Slot header fields, stored as float64 in front of the bids and asks of each slot.
+SEQUENCE = 0
+UPDATE_ID = 1
+TIMESTAMP = 2
+NUM_BIDS = 3
+NUM_ASKS = 4
+LAST_TRADE_PRICE = 5
+HEADER_SIZE = 8
+
+
+class OrderBookSlotContent(NamedTuple):
+    sequence: int
+    update_id: int
+    timestamp: float
+    last_trade_price: float
+    bids: np.ndarray
+    asks: np.ndarray
+
+
+class OrderBookSharedMemory:
+    """
+    Fixed size slots in shared memory, each holding the top `depth` price levels of one order book side by side, in
+    the [price, amount, update_id] layout of OrderBook.numpy_snapshot().
+
+    Every slot has a single writer process. Writes are guarded by a sequence counter (seqlock): the writer makes the
+    counter odd while it is writing, and even once done, so readers can detect and skip torn reads without locking.
+    """
+
+    def __init__(self, num_slots: int, depth: int, name: Optional[str] = None, create: bool = False):
+        self._num_slots: int = num_slots
+        self._depth: int = depth
+        self._slot_size: int = HEADER_SIZE + depth * 3 * 2
+        size: int = max(1, num_slots * self._slot_size * np.dtype(np.float64).itemsize)
+        self._shm: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self._owner: bool = create
+        self._slots: np.ndarray = np.ndarray((num_slots, self._slot_size), dtype=np.float64, buffer=self._shm.buf)
+        if create:
+            self._slots.fill(0)
+            self._slots[:, LAST_TRADE_PRICE] = np.nan
+
+    @classmethod
+    def create(cls, num_slots: int, depth: int) -> "OrderBookSharedMemory":
+        return cls(num_slots, depth, create=True)
+
+    @classmethod
+    def attach(cls, name: str, num_slots: int, depth: int) -> "OrderBookSharedMemory":
+        return cls(num_slots, depth, name=name)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def num_slots(self) -> int:
+        return self._num_slots
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def sequence(self, slot: int) -> int:
+        return int(self._slots[slot, SEQUENCE])
+
+    def write(self,
+              slot: int,
+              bids: np.ndarray,
+              asks: np.ndarray,
+              update_id: int,
+              timestamp: float,
+              last_trade_price: float):
+        row: np.ndarray = self._slots[slot]
+        num_bids: int = min(len(bids), self._depth)
+        num_asks: int = min(len(asks), self._depth)
+        bids_start: int = HEADER_SIZE
+        asks_start: int = HEADER_SIZE + self._depth * 3
+
+        # The sequence is forced odd rather than incremented, so that a writer that died mid-write (leaving it odd)
+        # doesn't invert the parity for the worker that takes over the slot.
+        sequence: int = int(row[SEQUENCE]) | 1
+        row[SEQUENCE] = sequence
+        row[bids_start:bids_start + num_bids * 3] = bids[:num_bids].ravel()
+        row[asks_start:asks_start + num_asks * 3] = asks[:num_asks].ravel()
+        row[UPDATE_ID] = update_id
+        row[TIMESTAMP] = timestamp
+        row[NUM_BIDS] = num_bids
+        row[NUM_ASKS] = num_asks
+        row[LAST_TRADE_PRICE] = last_trade_price
+        row[SEQUENCE] = sequence + 1
+
+    def read(self, slot: int) -> Optional[OrderBookSlotContent]:
+        """
+        Returns a copy of the slot content, or None if the slot has never been written or is being written to.
+        """
+        row: np.ndarray = self._slots[slot]
+        sequence: int = int(row[SEQUENCE])
+        if sequence == 0 or sequence % 2 == 1:
+            return None
+        header: np.ndarray = row[:HEADER_SIZE].copy()
+        num_bids: int = int(header[NUM_BIDS])
+        num_asks: int = int(header[NUM_ASKS])
+        bids_start: int = HEADER_SIZE
+        asks_start: int = HEADER_SIZE + self._depth * 3
+        bids: np.ndarray = row[bids_start:bids_start + num_bids * 3].reshape((num_bids, 3)).copy()
+        asks: np.ndarray = row[asks_start:asks_start + num_asks * 3].reshape((num_asks, 3)).copy()
+        if int(row[SEQUENCE]) != sequence:
+            return None
+        return OrderBookSlotContent(sequence,
+                                    int(header[UPDATE_ID]),
+                                    float(header[TIMESTAMP]),
+                                    float(header[LAST_TRADE_PRICE]),
+                                    bids,
+                                    asks)
+
+    def close(self):
+        # Drop the numpy view first, or the shared memory buffer cannot be released.
+        self._slots = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
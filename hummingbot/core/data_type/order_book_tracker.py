@@ -1,27 +1,35 @@
 #!/usr/bin/env python
 import asyncio
 from abc import ABC
-from collections import deque
+import bisect
+from collections import defaultdict, deque
 from enum import Enum
 import logging
+import numpy as np
 import pandas as pd
 import re
 from typing import (
+    Any,
     Dict,
     Deque,
     Optional,
     Tuple,
-    List)
+    List,
+    TYPE_CHECKING)
 import time
 from hummingbot.core.event.events import OrderBookTradeEvent, TradeType
 from hummingbot.logger import HummingbotLogger
 from hummingbot.core.data_type.order_book import OrderBook
 from hummingbot.core.utils.async_utils import safe_ensure_future
+from .order_book_tracker_metrics import OrderBookPairMetrics
 from .order_book_message import (
     OrderBookMessageType,
     OrderBookMessage,
+    merge_numpy_diffs,
 )
 from hummingbot.core.data_type.order_book_tracker_data_source import OrderBookTrackerDataSource
+if TYPE_CHECKING:
+    from hummingbot.backtest.market_data_recorder import MarketDataRecorder
 
 TRADING_PAIR_FILTER = re.compile(r"(BTC|ETH|USDT)$")
 
@@ -34,6 +42,18 @@ class OrderBookTrackerDataSourceType(Enum):
 
 class OrderBookTracker(ABC):
     PAST_DIFF_WINDOW_SIZE: int = 32
+    # Diff messages buffered while a snapshot is fetched, beyond which they are dropped and a new snapshot fetched.
+    MAX_PAST_DIFFS_DURING_RESYNC: int = 10000
+    MAX_DIFF_BATCH_SIZE: int = 1000
+    # Order book snapshots fetched at the same time during initialization.
+    INIT_ORDER_BOOKS_CONCURRENCY: int = 5
+    # The exchange's REST rate limit as (request weight, period in seconds), the weight of an order book snapshot
+    # request, and the share of the rate limit the initial snapshots may use - the rest is left to the other requests
+    # of the connector. Override with the exchange's rate limits.
+    REST_RATE_LIMIT: Tuple[float, float] = (1.0, 1.0)
+    SNAPSHOT_REQUEST_WEIGHT: float = 1.0
+    INIT_ORDER_BOOKS_RATE_LIMIT_SHARE: float = 1.0
+    MAX_SAVED_MESSAGES: int = 1000
     _obt_logger: Optional[HummingbotLogger] = None
 
     @classmethod
@@ -42,11 +62,23 @@ class OrderBookTracker(ABC):
             cls._obt_logger = logging.getLogger(__name__)
         return cls._obt_logger
 
-    def __init__(self, data_source: OrderBookTrackerDataSource, trading_pairs: List[str], domain: Optional[str] = None):
+    def __init__(self,
+                 data_source: Optional[OrderBookTrackerDataSource],
+                 trading_pairs: List[str],
+                 domain: Optional[str] = None):
+        """
+        :param data_source: The exchange data source. Trackers that maintain their order books by other means pass None,
+        in which case no snapshots, diffs, trades or last trade prices are fetched from the exchange.
+        """
         self._domain: Optional[str] = domain
-        self._data_source: OrderBookTrackerDataSource = data_source
+        self._data_source: Optional[OrderBookTrackerDataSource] = data_source
         self._trading_pairs: List[str] = trading_pairs
         self._order_books_initialized: asyncio.Event = asyncio.Event()
+        self._order_book_ready_events: Dict[str, asyncio.Event] = defaultdict(asyncio.Event)
+        # Messages routed to order books that are not initialized yet.
+        self._saved_messages: Dict[str, Deque[OrderBookMessage]] = defaultdict(
+            lambda: deque(maxlen=self.MAX_SAVED_MESSAGES)
+        )
         self._tracking_tasks: Dict[str, asyncio.Task] = {}
         self._order_books: Dict[str, OrderBook] = {}
         self._tracking_message_queues: Dict[str, asyncio.Queue] = {}
@@ -54,6 +86,11 @@ class OrderBookTracker(ABC):
         self._order_book_diff_stream: asyncio.Queue = asyncio.Queue()
         self._order_book_snapshot_stream: asyncio.Queue = asyncio.Queue()
         self._order_book_trade_stream: asyncio.Queue = asyncio.Queue()
+        self._diff_messages_coalesced: Dict[str, int] = defaultdict(int)
+        self._diff_batches_applied: Dict[str, int] = defaultdict(int)
+        self._metrics: Dict[str, OrderBookPairMetrics] = defaultdict(OrderBookPairMetrics)
+        self._resync_tasks: Dict[str, asyncio.Task] = {}
+        self._recorder: Optional["MarketDataRecorder"] = None
         self._ev_loop: asyncio.BaseEventLoop = asyncio.get_event_loop()
 
         self._emit_trade_event_task: Optional[asyncio.Task] = None
@@ -66,7 +103,7 @@ class OrderBookTracker(ABC):
         self._update_last_trade_prices_task: Optional[asyncio.Task] = None
 
     @property
-    def data_source(self) -> OrderBookTrackerDataSource:
+    def data_source(self) -> Optional[OrderBookTrackerDataSource]:
         return self._data_source
 
     @property
@@ -77,6 +114,81 @@ class OrderBookTracker(ABC):
     def ready(self) -> bool:
         return self._order_books_initialized.is_set()
 
+    @property
+    def ready_trading_pairs(self) -> List[str]:
+        """
+        The trading pairs whose order books are initialized, which is all of them once `ready`.
+        """
+        return [trading_pair for trading_pair in self._trading_pairs if self.order_book_ready(trading_pair)]
+
+    def order_book_ready(self, trading_pair: str) -> bool:
+        return trading_pair in self._order_book_ready_events and self._order_book_ready_events[trading_pair].is_set()
+
+    async def wait_for_order_book(self, trading_pair: str):
+        await self._order_book_ready_events[trading_pair].wait()
+
+    @property
+    def init_order_books_budget(self) -> Tuple[int, float]:
+        """
+        The number of snapshot requests that may start within a period during initialization, and the period.
+        """
+        weight, period = self.REST_RATE_LIMIT
+        return max(1, int(weight * self.INIT_ORDER_BOOKS_RATE_LIMIT_SHARE / self.SNAPSHOT_REQUEST_WEIGHT)), period
+
+    @property
+    def diff_messages_applied(self) -> Dict[str, int]:
+        """
+        Number of diff messages applied per trading pair, on their own or as part of a batch.
+        """
+        return {trading_pair: metrics.diff_messages for trading_pair, metrics in self._metrics.items()}
+
+    @property
+    def diff_messages_coalesced(self) -> Dict[str, int]:
+        """
+        Number of diff messages per trading pair that were merged into a batch instead of being applied on their own.
+        """
+        return self._diff_messages_coalesced
+
+    @property
+    def diff_batches_applied(self) -> Dict[str, int]:
+        return self._diff_batches_applied
+
+    @property
+    def metrics(self) -> Dict[str, OrderBookPairMetrics]:
+        return self._metrics
+
+    @property
+    def recorder(self) -> Optional["MarketDataRecorder"]:
+        """
+        Records the snapshots, diffs and trades applied to the order books, if set.
+        """
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, recorder: Optional["MarketDataRecorder"]):
+        self._recorder = recorder
+        if recorder is not None:
+            for trading_pair, order_book in self._order_books.items():
+                recorder.record_order_book(trading_pair, order_book)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the update statistics of each order book as JSON serializable dictionaries.
+        """
+        now: float = time.time()
+        retval: Dict[str, Dict[str, Any]] = {}
+        for trading_pair in self._trading_pairs:
+            message_queue: Optional[asyncio.Queue] = self._tracking_message_queues.get(trading_pair)
+            retval[trading_pair] = {
+                "initialized": trading_pair in self._order_books,
+                "queue_depth": message_queue.qsize() if message_queue is not None else 0,
+                "diff_messages_coalesced": self._diff_messages_coalesced[trading_pair],
+                "diff_batches_applied": self._diff_batches_applied[trading_pair],
+                "resyncing": trading_pair in self._resync_tasks,
+                **self._metrics[trading_pair].to_dict(now),
+            }
+        return retval
+
     @property
     def snapshot(self) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]:
         return {
@@ -86,12 +198,20 @@ class OrderBookTracker(ABC):
 
     def start(self):
         self.stop()
-        self._init_order_books_task = safe_ensure_future(
-            self._init_order_books()
-        )
         self._emit_trade_event_task = safe_ensure_future(
             self._emit_trade_event_loop()
         )
+        self._order_book_diff_router_task = safe_ensure_future(
+            self._order_book_diff_router()
+        )
+        self._order_book_snapshot_router_task = safe_ensure_future(
+            self._order_book_snapshot_router()
+        )
+        if self._data_source is None:
+            return
+        self._init_order_books_task = safe_ensure_future(
+            self._init_order_books()
+        )
         self._order_book_diff_listener_task = safe_ensure_future(
             self._data_source.listen_for_order_book_diffs(self._ev_loop, self._order_book_diff_stream)
         )
@@ -101,12 +221,6 @@ class OrderBookTracker(ABC):
         self._order_book_snapshot_listener_task = safe_ensure_future(
             self._data_source.listen_for_order_book_snapshots(self._ev_loop, self._order_book_snapshot_stream)
         )
-        self._order_book_diff_router_task = safe_ensure_future(
-            self._order_book_diff_router()
-        )
-        self._order_book_snapshot_router_task = safe_ensure_future(
-            self._order_book_snapshot_router()
-        )
         self._update_last_trade_prices_task = safe_ensure_future(
             self._update_last_trade_prices_loop()
         )
@@ -141,14 +255,24 @@ class OrderBookTracker(ABC):
             for _, task in self._tracking_tasks.items():
                 task.cancel()
             self._tracking_tasks.clear()
+        if len(self._resync_tasks) > 0:
+            for _, task in self._resync_tasks.items():
+                task.cancel()
+            self._resync_tasks.clear()
         self._order_books_initialized.clear()
+        for event in self._order_book_ready_events.values():
+            event.clear()
+        self._saved_messages.clear()
+        if self._recorder is not None:
+            self._recorder.flush()
 
     async def _update_last_trade_prices_loop(self):
         '''
         Updates last trade price for all order books through REST API, it is to initiate last_trade_price and as
         fall-back mechanism for when the web socket update channel fails.
         '''
-        await self._order_books_initialized.wait()
+        if self._data_source is None:
+            return
         while True:
             try:
                 outdateds = [t_pair for t_pair, o_book in self._order_books.items()
@@ -172,17 +296,66 @@ class OrderBookTracker(ABC):
 
     async def _init_order_books(self):
         """
-        Initialize order books
+        Initialize order books, fetching up to INIT_ORDER_BOOKS_CONCURRENCY snapshots at a time, within the share of the
+        exchange's rate limit given by init_order_books_budget: the requests of a period start as soon as they can, and
+        the next ones wait for the oldest to leave the period. Each order book is tracked and marked as ready as soon as
+        its snapshot arrives.
         """
-        for index, trading_pair in enumerate(self._trading_pairs):
-            self._order_books[trading_pair] = await self._data_source.get_new_order_book(trading_pair)
-            self._tracking_message_queues[trading_pair] = asyncio.Queue()
+        if self._data_source is None:
+            return
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.INIT_ORDER_BOOKS_CONCURRENCY)
+        max_requests, period = self.init_order_books_budget
+        request_times: Deque[float] = deque()
+        completed: int = 0
+
+        async def init_order_book(trading_pair: str):
+            nonlocal completed
+            async with semaphore:
+                while True:
+                    now: float = time.time()
+                    while len(request_times) >= max_requests:
+                        await asyncio.sleep(request_times[0] + period - now)
+                        now = time.time()
+                        while len(request_times) > 0 and request_times[0] + period <= now:
+                            request_times.popleft()
+                    request_times.append(now)
+                    try:
+                        order_book: OrderBook = await self._data_source.get_new_order_book(trading_pair)
+                        break
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        self.logger().network(
+                            f"Unexpected error initializing order book for {trading_pair}.",
+                            exc_info=True,
+                            app_warning_msg="Unexpected error initializing order book. Retrying after 5 seconds."
+                        )
+                        await asyncio.sleep(5.0)
+            self._order_books[trading_pair] = order_book
+            self._metrics[trading_pair].record_snapshot(None, resync=False)
+            if self._recorder is not None:
+                self._recorder.record_order_book(trading_pair, order_book)
+            self._tracking_message_queues[trading_pair] = self._pop_saved_messages(trading_pair, order_book.snapshot_uid)
             self._tracking_tasks[trading_pair] = safe_ensure_future(self._track_single_book(trading_pair))
+            self._order_book_ready_events[trading_pair].set()
+            completed += 1
             self.logger().info(f"Initialized order book for {trading_pair}. "
-                               f"{index + 1}/{len(self._trading_pairs)} completed.")
-            await asyncio.sleep(1)
+                               f"{completed}/{len(self._trading_pairs)} completed.")
+
+        await asyncio.gather(*[init_order_book(trading_pair) for trading_pair in self._trading_pairs])
         self._order_books_initialized.set()
 
+    def _pop_saved_messages(self, trading_pair: str, update_id: int) -> asyncio.Queue:
+        """
+        Returns a tracking message queue holding the messages saved while the order book was initialized, leaving out
+        the ones already covered by its snapshot at `update_id`.
+        """
+        message_queue: asyncio.Queue = asyncio.Queue()
+        for message in self._saved_messages.pop(trading_pair, []):
+            if message.update_id > update_id:
+                message_queue.put_nowait(message)
+        return message_queue
+
     async def _order_book_diff_router(self):
         """
         Route the real-time order book diff messages to the correct order book.
@@ -190,14 +363,17 @@ class OrderBookTracker(ABC):
         last_message_timestamp: float = time.time()
         messages_accepted: int = 0
         messages_rejected: int = 0
-        await self._order_books_initialized.wait()
         while True:
             try:
                 ob_message: OrderBookMessage = await self._order_book_diff_stream.get()
                 trading_pair: str = ob_message.trading_pair
 
                 if trading_pair not in self._tracking_message_queues:
-                    messages_rejected += 1
+                    if trading_pair in self._trading_pairs:
+                        # Saved until the order book snapshot arrives.
+                        self._saved_messages[trading_pair].append(ob_message)
+                    else:
+                        messages_rejected += 1
                     continue
                 message_queue: asyncio.Queue = self._tracking_message_queues[trading_pair]
                 # Check the order book's initial update ID. If it's larger, don't bother.
@@ -227,12 +403,13 @@ class OrderBookTracker(ABC):
         """
         Route the real-time order book snapshot messages to the correct order book.
         """
-        await self._order_books_initialized.wait()
         while True:
             try:
                 ob_message: OrderBookMessage = await self._order_book_snapshot_stream.get()
                 trading_pair: str = ob_message.trading_pair
                 if trading_pair not in self._tracking_message_queues:
+                    if trading_pair in self._trading_pairs:
+                        self._saved_messages[trading_pair].append(ob_message)
                     continue
                 message_queue: asyncio.Queue = self._tracking_message_queues[trading_pair]
                 await message_queue.put(ob_message)
@@ -242,6 +419,147 @@ class OrderBookTracker(ABC):
                 self.logger().error("Unknown error. Retrying after 5 seconds.", exc_info=True)
                 await asyncio.sleep(5.0)
 
+    def _drain_diff_messages(self,
+                             message_queue: asyncio.Queue,
+                             diff_message: OrderBookMessage
+                             ) -> Tuple[List[OrderBookMessage], Optional[OrderBookMessage]]:
+        """
+        Takes the diff messages already queued behind `diff_message`, without waiting for new ones. Stops at the first
+        message that is not a diff, which is returned along with the diff messages so it can be processed after them.
+        """
+        diff_messages: List[OrderBookMessage] = [diff_message]
+        while len(diff_messages) < self.MAX_DIFF_BATCH_SIZE:
+            try:
+                message: OrderBookMessage = message_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if message.type is not OrderBookMessageType.DIFF:
+                return diff_messages, message
+            diff_messages.append(message)
+        return diff_messages, None
+
+    def _apply_diff_messages(self,
+                             trading_pair: str,
+                             order_book: OrderBook,
+                             diff_messages: List[OrderBookMessage],
+                             past_diffs_window: Deque[OrderBookMessage]):
+        """
+        Applies a batch of diff messages to the order book in a single update, merged by price level.
+        """
+        bids_arrays: List[np.ndarray] = [message.bids_array for message in diff_messages]
+        asks_arrays: List[np.ndarray] = [message.asks_array for message in diff_messages]
+        if self._recorder is not None:
+            for message, bids_array, asks_array in zip(diff_messages, bids_arrays, asks_arrays):
+                self._recorder.record_diff(trading_pair, message.update_id, bids_array, asks_array)
+        if len(diff_messages) == 1:
+            order_book.apply_numpy_diffs(bids_arrays[0], asks_arrays[0], diff_messages[0].update_id)
+        else:
+            order_book.apply_numpy_diffs(merge_numpy_diffs(bids_arrays),
+                                         merge_numpy_diffs(asks_arrays),
+                                         max(message.update_id for message in diff_messages))
+            self._diff_messages_coalesced[trading_pair] += len(diff_messages) - 1
+        self._diff_batches_applied[trading_pair] += 1
+        self._metrics[trading_pair].record_diffs([message.timestamp for message in diff_messages])
+        past_diffs_window.extend(diff_messages)
+        while len(past_diffs_window) > self.PAST_DIFF_WINDOW_SIZE:
+            past_diffs_window.popleft()
+
+    @staticmethod
+    def _find_sequence_gap(last_update_id: int, diff_messages: List[OrderBookMessage]) -> int:
+        """
+        Returns the index of the first diff message that does not follow on from `last_update_id` or from the diff
+        messages before it, or -1 if there is no gap. Only diffs with a first update ID can be checked.
+        """
+        for index, message in enumerate(diff_messages):
+            if message.has_first_update_id and message.first_update_id > last_update_id + 1:
+                return index
+            last_update_id = max(last_update_id, message.update_id)
+        return -1
+
+    def _process_diff_messages(self,
+                               trading_pair: str,
+                               order_book: OrderBook,
+                               diff_messages: List[OrderBookMessage],
+                               past_diffs_window: Deque[OrderBookMessage]):
+        """
+        Applies diff messages to the order book, up to the first gap in update IDs. On a gap, fetches a new snapshot
+        for this trading pair only, and buffers the diff messages in the past diffs window until the snapshot arrives
+        and they can be replayed over it. If the snapshot takes so long that more than MAX_PAST_DIFFS_DURING_RESYNC
+        diff messages are buffered, drops them and fetches a new snapshot.
+        """
+        if trading_pair in self._resync_tasks:
+            past_diffs_window.extend(diff_messages)
+            if len(past_diffs_window) > self.MAX_PAST_DIFFS_DURING_RESYNC:
+                self.logger().error(f"{len(past_diffs_window)} {trading_pair} order book diffs buffered while "
+                                    f"waiting for a snapshot. Dropping them and fetching a new snapshot.")
+                past_diffs_window.clear()
+                self._resync_tasks.pop(trading_pair).cancel()
+                self._resync_tasks[trading_pair] = safe_ensure_future(self._resync_order_book(trading_pair))
+            return
+        gap_index: int = self._find_sequence_gap(max(order_book.snapshot_uid, order_book.last_diff_uid),
+                                                 diff_messages)
+        if gap_index < 0:
+            self._apply_diff_messages(trading_pair, order_book, diff_messages, past_diffs_window)
+            return
+        if gap_index > 0:
+            self._apply_diff_messages(trading_pair, order_book, diff_messages[:gap_index], past_diffs_window)
+        self.logger().info(f"Gap in {trading_pair} order book diffs, from update ID "
+                           f"{max(order_book.snapshot_uid, order_book.last_diff_uid)} to "
+                           f"{diff_messages[gap_index].first_update_id}. Fetching a new snapshot.")
+        self._metrics[trading_pair].record_sequence_gap()
+        past_diffs_window.extend(diff_messages[gap_index:])
+        self._resync_tasks[trading_pair] = safe_ensure_future(self._resync_order_book(trading_pair))
+
+    def _process_snapshot_message(self,
+                                  trading_pair: str,
+                                  order_book: OrderBook,
+                                  snapshot_message: OrderBookMessage,
+                                  past_diffs_window: Deque[OrderBookMessage]):
+        past_diffs: List[OrderBookMessage] = list(past_diffs_window)
+        order_book.restore_from_snapshot_and_diffs(snapshot_message, past_diffs)
+        self._metrics[trading_pair].record_snapshot(snapshot_message.timestamp)
+        if self._recorder is not None:
+            self._recorder.record_order_book(trading_pair, order_book)
+        resync_task: Optional[asyncio.Task] = self._resync_tasks.pop(trading_pair, None)
+        if resync_task is not None:
+            # No-op if this is the snapshot it fetched.
+            resync_task.cancel()
+        while len(past_diffs_window) > self.PAST_DIFF_WINDOW_SIZE:
+            past_diffs_window.popleft()
+
+        # The diffs replayed over the snapshot must follow on from it, or the snapshot is too old to close the gap.
+        replayed_diffs: List[OrderBookMessage] = past_diffs[bisect.bisect_right(past_diffs, snapshot_message):]
+        gap_index: int = self._find_sequence_gap(snapshot_message.update_id, replayed_diffs)
+        if gap_index >= 0:
+            self.logger().info(f"Gap in {trading_pair} order book diffs after snapshot update ID "
+                               f"{snapshot_message.update_id}. Fetching a new snapshot.")
+            self._metrics[trading_pair].record_sequence_gap()
+            self._resync_tasks[trading_pair] = safe_ensure_future(self._resync_order_book(trading_pair))
+
+    async def _resync_order_book(self, trading_pair: str):
+        """
+        Fetches a snapshot for one order book, and queues it behind the diff messages buffered since the gap.
+        """
+        if self._data_source is None:
+            self.logger().error(f"No data source to fetch a new {trading_pair} order book snapshot from.")
+            return
+        while True:
+            try:
+                snapshot_message: OrderBookMessage = await self._data_source.get_order_book_snapshot_message(
+                    trading_pair
+                )
+                await self._tracking_message_queues[trading_pair].put(snapshot_message)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger().network(
+                    f"Unexpected error fetching order book snapshot for {trading_pair}.",
+                    exc_info=True,
+                    app_warning_msg="Unexpected error fetching order book snapshot. Retrying after 5 seconds."
+                )
+                await asyncio.sleep(5.0)
+
     async def _track_single_book(self, trading_pair: str):
         past_diffs_window: Deque[OrderBookMessage] = deque()
         self._past_diffs_windows[trading_pair] = past_diffs_window
@@ -250,26 +568,32 @@ class OrderBookTracker(ABC):
         order_book: OrderBook = self._order_books[trading_pair]
         last_message_timestamp: float = time.time()
         diff_messages_accepted: int = 0
+        diff_messages_coalesced: int = 0
+        pending_message: Optional[OrderBookMessage] = None
 
         while True:
             try:
-                message: OrderBookMessage = await message_queue.get()
+                message: OrderBookMessage
+                if pending_message is not None:
+                    message, pending_message = pending_message, None
+                else:
+                    message = await message_queue.get()
                 if message.type is OrderBookMessageType.DIFF:
-                    order_book.apply_diffs(message.bids, message.asks, message.update_id)
-                    past_diffs_window.append(message)
-                    while len(past_diffs_window) > self.PAST_DIFF_WINDOW_SIZE:
-                        past_diffs_window.popleft()
-                    diff_messages_accepted += 1
+                    diff_messages, pending_message = self._drain_diff_messages(message_queue, message)
+                    self._process_diff_messages(trading_pair, order_book, diff_messages, past_diffs_window)
+                    diff_messages_accepted += len(diff_messages)
+                    diff_messages_coalesced += len(diff_messages) - 1
 
                     # Output some statistics periodically.
                     now: float = time.time()
                     if int(now / 60.0) > int(last_message_timestamp / 60.0):
-                        self.logger().debug(f"Processed {diff_messages_accepted} order book diffs for {trading_pair}.")
+                        self.logger().debug(f"Processed {diff_messages_accepted} order book diffs for {trading_pair}, "
+                                            f"{diff_messages_coalesced} of them coalesced.")
                         diff_messages_accepted = 0
+                        diff_messages_coalesced = 0
                     last_message_timestamp = now
                 elif message.type is OrderBookMessageType.SNAPSHOT:
-                    past_diffs: List[OrderBookMessage] = list(past_diffs_window)
-                    order_book.restore_from_snapshot_and_diffs(message, past_diffs)
+                    self._process_snapshot_message(trading_pair, order_book, message, past_diffs_window)
                     self.logger().debug(f"Processed order book snapshot for {trading_pair}.")
             except asyncio.CancelledError:
                 raise
@@ -281,7 +605,6 @@ class OrderBookTracker(ABC):
         last_message_timestamp: float = time.time()
         messages_accepted: int = 0
         messages_rejected: int = 0
-        await self._order_books_initialized.wait()
         while True:
             try:
                 trade_message: OrderBookMessage = await self._order_book_trade_stream.get()
@@ -292,14 +615,17 @@ class OrderBookTracker(ABC):
                     continue
 
                 order_book: OrderBook = self._order_books[trading_pair]
-                order_book.apply_trade(OrderBookTradeEvent(
+                trade_event: OrderBookTradeEvent = OrderBookTradeEvent(
                     trading_pair=trade_message.trading_pair,
                     timestamp=trade_message.timestamp,
                     price=float(trade_message.content["price"]),
                     amount=float(trade_message.content["amount"]),
                     type=TradeType.SELL if
                     trade_message.content["trade_type"] == float(TradeType.SELL.value) else TradeType.BUY
-                ))
+                )
+                if self._recorder is not None:
+                    self._recorder.record_trade(trading_pair, trade_event.type, trade_event.price, trade_event.amount)
+                order_book.apply_trade(trade_event)
 
                 messages_accepted += 1
 
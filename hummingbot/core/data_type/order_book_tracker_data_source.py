@@ -5,12 +5,17 @@ from abc import (
     abstractmethod
 )
 import asyncio
+import time
 from typing import (
     Callable,
     Dict,
     List,
 )
 from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import (
+    OrderBookMessage,
+    OrderBookMessageType,
+)
 
 
 class OrderBookTrackerDataSource(metaclass=ABCMeta):
@@ -51,6 +56,20 @@ class OrderBookTrackerDataSource(metaclass=ABCMeta):
     async def get_new_order_book(self, trading_pair: str) -> OrderBook:
         raise NotImplementedError
 
+    async def get_order_book_snapshot_message(self, trading_pair: str) -> OrderBookMessage:
+        """
+        Fetches a fresh order book snapshot, used by the order book tracker to resync a single order book after a gap
+        in its diff stream. Builds the message from get_new_order_book() by default.
+        """
+        order_book: OrderBook = await self.get_new_order_book(trading_pair)
+        bids, asks = order_book.numpy_snapshot()
+        return OrderBookMessage(OrderBookMessageType.SNAPSHOT, {
+            "trading_pair": trading_pair,
+            "update_id": order_book.snapshot_uid,
+            "bids": bids,
+            "asks": asks,
+        }, timestamp=time.time())
+
     @abstractmethod
     async def listen_for_order_book_diffs(self, ev_loop: asyncio.BaseEventLoop, output: asyncio.Queue):
         """
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+from bisect import bisect_left
+from collections import deque
+import math
+import time
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    List,
+    Optional,
+)
+
+# Upper bounds, in seconds, of the message latency histogram buckets. Latencies above the last bound are counted in
+# an extra overflow bucket.
+LATENCY_BUCKETS: List[float] = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0]
+
+
+class OrderBookPairMetrics:
+    """
+    Update statistics of one order book: message latency (from the message timestamp, i.e. the exchange event time
+    where the connector provides it, to the time it is applied), diff rates, sequence gaps, snapshot resyncs and time since the last
+    update.
+    """
+    RATE_WINDOW: int = 60
+
+    def __init__(self):
+        self._latency_counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._latency_sum: float = 0
+        self._latency_max: float = 0
+        self._messages_timed: int = 0
+        self._diff_messages: int = 0
+        self._snapshot_resyncs: int = 0
+        self._sequence_gaps: int = 0
+        self._last_update_time: float = math.nan
+        self._last_message_timestamp: float = math.nan
+        # [second, diff messages applied in that second], for the last RATE_WINDOW seconds.
+        self._diff_rate_window: Deque[List[int]] = deque()
+
+    @property
+    def diff_messages(self) -> int:
+        return self._diff_messages
+
+    @property
+    def snapshot_resyncs(self) -> int:
+        return self._snapshot_resyncs
+
+    @property
+    def sequence_gaps(self) -> int:
+        return self._sequence_gaps
+
+    @property
+    def last_update_time(self) -> float:
+        return self._last_update_time
+
+    def record_latency(self, message_timestamp: Optional[float], now: float):
+        if message_timestamp is None or math.isnan(message_timestamp):
+            return
+        # Clamp negative latencies, caused by clock skew with the exchange.
+        latency: float = max(0.0, now - message_timestamp)
+        self._latency_counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self._latency_sum += latency
+        self._latency_max = max(self._latency_max, latency)
+        self._messages_timed += 1
+        if math.isnan(self._last_message_timestamp) or message_timestamp > self._last_message_timestamp:
+            self._last_message_timestamp = message_timestamp
+
+    def record_diffs(self, message_timestamps: List[Optional[float]], now: Optional[float] = None):
+        now = now or time.time()
+        for message_timestamp in message_timestamps:
+            self.record_latency(message_timestamp, now)
+        self._diff_messages += len(message_timestamps)
+        self._last_update_time = now
+        second: int = int(now)
+        if len(self._diff_rate_window) > 0 and self._diff_rate_window[-1][0] == second:
+            self._diff_rate_window[-1][1] += len(message_timestamps)
+        else:
+            self._diff_rate_window.append([second, len(message_timestamps)])
+        while self._diff_rate_window[0][0] <= second - self.RATE_WINDOW:
+            self._diff_rate_window.popleft()
+
+    def record_snapshot(self, message_timestamp: Optional[float], now: Optional[float] = None, resync: bool = True):
+        """
+        Records a full order book update. `resync` is False for the initial snapshot, or for the periodic copies of the
+        sharded tracker.
+        """
+        now = now or time.time()
+        self.record_latency(message_timestamp, now)
+        if resync:
+            self._snapshot_resyncs += 1
+        self._last_update_time = now
+
+    def record_sequence_gap(self):
+        self._sequence_gaps += 1
+
+    def diffs_per_second(self, now: Optional[float] = None) -> float:
+        """
+        Average rate of diff messages applied over the last RATE_WINDOW seconds.
+        """
+        now = now or time.time()
+        window_start: int = int(now) - self.RATE_WINDOW
+        return sum(count for second, count in self._diff_rate_window if second > window_start) / self.RATE_WINDOW
+
+    def latency_percentile(self, percentile: float) -> float:
+        """
+        Upper bound of the histogram bucket holding the given latency percentile (0 - 100), or the maximum latency
+        seen if it falls in the overflow bucket.
+        """
+        if self._messages_timed == 0:
+            return math.nan
+        rank: float = self._messages_timed * percentile / 100.0
+        cumulative_count: int = 0
+        for index, count in enumerate(self._latency_counts):
+            cumulative_count += count
+            if cumulative_count >= rank and count > 0:
+                return min(LATENCY_BUCKETS[index], self._latency_max) if index < len(LATENCY_BUCKETS) \
+                    else self._latency_max
+        return self._latency_max
+
+    def seconds_since_update(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self._last_update_time
+
+    def to_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = now or time.time()
+        seconds_since_update: float = self.seconds_since_update(now)
+        return {
+            "diff_messages": self._diff_messages,
+            "diffs_per_second": self.diffs_per_second(now),
+            "snapshot_resyncs": self._snapshot_resyncs,
+            "sequence_gaps": self._sequence_gaps,
+            "seconds_since_update": None if math.isnan(seconds_since_update) else seconds_since_update,
+            "last_message_timestamp": None if math.isnan(self._last_message_timestamp)
+            else self._last_message_timestamp,
+            "latency": {
+                "count": self._messages_timed,
+                "mean": self._latency_sum / self._messages_timed if self._messages_timed > 0 else None,
+                "p50": self.latency_percentile(50) if self._messages_timed > 0 else None,
+                "p99": self.latency_percentile(99) if self._messages_timed > 0 else None,
+                "max": self._latency_max if self._messages_timed > 0 else None,
+                "buckets": LATENCY_BUCKETS + [None],
+                "counts": list(self._latency_counts),
+            },
+        }
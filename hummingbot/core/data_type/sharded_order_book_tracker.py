@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import queue
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import numpy as np
+
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_shared_memory import OrderBookSharedMemory
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.event.event_forwarder import EventForwarder
+from hummingbot.core.event.events import (
+    OrderBookEvent,
+    OrderBookTradeEvent,
+    TradeType,
+)
+from hummingbot.core.utils.async_utils import safe_ensure_future
+from hummingbot.logger import HummingbotLogger
+
+
+class ShardedOrderBookTracker(OrderBookTracker):
+    """
+    Spreads the trading pairs of an exchange over worker processes. Each worker runs its own instance of the exchange
+    order book tracker (websocket parsing and order book updates included) on its own event loop, and publishes the
+    top `depth` levels of its order books to shared memory.
+
+    The main process keeps a plain `OrderBook` per trading pair, which is refreshed from shared memory every
+    `sync_interval` seconds and receives the trades forwarded by the workers, so strategies read the order books and
+    listen for trade events as they do with a regular tracker.
+
+    The main process order books only hold the top `depth` price levels of each side (set with the
+    order_book_tracker_shard_depth global config), and lag the workers by up to `sync_interval` seconds. Strategies
+    that query volumes deeper than `depth` levels see a truncated book, and should raise it.
+
+    The main process has no exchange data source: snapshots, diffs and trades are all handled by the workers. A
+    recorder records the order books as synced by the main process, i.e. each sync as one diff of the top `depth`
+    levels, and the trades forwarded by the workers.
+    """
+    DEFAULT_DEPTH: int = 200
+    DEFAULT_SYNC_INTERVAL: float = 0.05
+    DEFAULT_PUBLISH_INTERVAL: float = 0.05
+    WORKER_JOIN_TIMEOUT: float = 5.0
+    _sobt_logger: Optional[HummingbotLogger] = None
+
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        if cls._sobt_logger is None:
+            cls._sobt_logger = logging.getLogger(__name__)
+        return cls._sobt_logger
+
+    def __init__(self,
+                 tracker_class: Type[OrderBookTracker],
+                 trading_pairs: List[str],
+                 num_shards: int,
+                 tracker_kwargs: Optional[Dict[str, Any]] = None,
+                 depth: int = DEFAULT_DEPTH,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL):
+        if depth <= 0:
+            raise ValueError(f"Order book depth must be positive, got {depth}.")
+        super().__init__(data_source=None, trading_pairs=trading_pairs, domain=(tracker_kwargs or {}).get("domain"))
+        self._tracker_class: Type[OrderBookTracker] = tracker_class
+        self._tracker_kwargs: Dict[str, Any] = tracker_kwargs or {}
+        self._depth: int = depth
+        self._sync_interval: float = sync_interval
+        # No workers are started without trading pairs.
+        num_shards = min(max(1, num_shards), len(trading_pairs))
+        # Round robin, so that each worker gets a similar share of busy and quiet markets.
+        self._shards: List[List[str]] = [trading_pairs[i::num_shards] for i in range(num_shards)]
+        self._slots: Dict[str, int] = {}
+        for shard in self._shards:
+            for trading_pair in shard:
+                self._slots[trading_pair] = len(self._slots)
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._shared_memory: Optional[OrderBookSharedMemory] = None
+        self._trade_queue: Optional[multiprocessing.Queue] = None
+        self._stop_event: Optional[multiprocessing.Event] = None
+        self._workers: List[Optional[multiprocessing.Process]] = [None] * num_shards
+        self._synced_sequences: Dict[str, int] = {}
+        self._sync_order_books_task: Optional[asyncio.Task] = None
+
+    @property
+    def shards(self) -> List[List[str]]:
+        return self._shards
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def sync_interval(self) -> float:
+        return self._sync_interval
+
+    def start(self):
+        self.stop()
+        for trading_pair in self._trading_pairs:
+            if trading_pair not in self._order_books:
+                self._order_books[trading_pair] = OrderBook()
+        self._synced_sequences.clear()
+        self._shared_memory = OrderBookSharedMemory.create(len(self._slots), self._depth)
+        self._trade_queue = self._mp_context.Queue()
+        self._stop_event = self._mp_context.Event()
+        for shard_index in range(len(self._shards)):
+            self._start_worker(shard_index)
+        self._sync_order_books_task = safe_ensure_future(self._sync_order_books_loop())
+        self.logger().info(f"Tracking {len(self._slots)} order books in {len(self._shards)} worker processes, "
+                           f"synced to the top {self._depth} price levels every {self._sync_interval} seconds.")
+
+    def stop(self):
+        if self._sync_order_books_task is not None:
+            self._sync_order_books_task.cancel()
+            self._sync_order_books_task = None
+        if self._stop_event is not None:
+            self._stop_event.set()
+        for shard_index, worker in enumerate(self._workers):
+            if worker is None:
+                continue
+            worker.join(self.WORKER_JOIN_TIMEOUT)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+            self._workers[shard_index] = None
+        if self._trade_queue is not None:
+            self._trade_queue.close()
+            self._trade_queue = None
+        self._stop_event = None
+        if self._shared_memory is not None:
+            self._shared_memory.close()
+            self._shared_memory = None
+        super().stop()
+
+    def _start_worker(self, shard_index: int):
+        shard: List[str] = self._shards[shard_index]
+        worker = self._mp_context.Process(
+            target=run_order_book_shard,
+            name=f"{self._tracker_class.__name__}-shard-{shard_index}",
+            args=(self._tracker_class,
+                  self._tracker_kwargs,
+                  shard,
+                  self._slots[shard[0]],
+                  self._shared_memory.name,
+                  self._shared_memory.num_slots,
+                  self._depth,
+                  self._trade_queue,
+                  self._stop_event),
+            daemon=True
+        )
+        worker.start()
+        self._workers[shard_index] = worker
+
+    def _sync_order_books(self):
+        """
+        Copies the order books that changed since the last call from shared memory.
+        """
+        for trading_pair, slot in self._slots.items():
+            sequence: int = self._shared_memory.sequence(slot)
+            if sequence == self._synced_sequences.get(trading_pair):
+                continue
+            content = self._shared_memory.read(slot)
+            if content is None:
+                # Never published or being written to, retried on the next sync.
+                continue
+            order_book: OrderBook = self._order_books[trading_pair]
+            first_sync: bool = trading_pair not in self._synced_sequences
+            if self._recorder is not None and not first_sync:
+                # Recorded as the diff from the previous sync, so that the recording replays the order book as synced.
+                bids, asks = order_book.numpy_snapshot(self._depth)
+                self._recorder.record_diff(trading_pair,
+                                           content.update_id,
+                                           numpy_snapshot_diff(bids, content.bids, content.update_id),
+                                           numpy_snapshot_diff(asks, content.asks, content.update_id))
+            order_book.apply_numpy_snapshot(content.bids, content.asks, content.update_id)
+            if self._recorder is not None and first_sync:
+                self._recorder.record_order_book(trading_pair, order_book)
+            if not math.isnan(content.last_trade_price):
+                order_book.last_trade_price = content.last_trade_price
+            self._synced_sequences[trading_pair] = content.sequence
+            self._order_book_ready_events[trading_pair].set()
+            # Latency from the worker publishing the order book to the main process applying it.
+            self._metrics[trading_pair].record_snapshot(content.timestamp, resync=False)
+
+        if not self._order_books_initialized.is_set() and len(self._synced_sequences) == len(self._slots):
+            self._order_books_initialized.set()
+            self.logger().info(f"Initialized {len(self._slots)} order books in {len(self._shards)} worker processes.")
+
+    def _apply_trades(self):
+        while True:
+            try:
+                trading_pair, timestamp, price, amount, trade_type = self._trade_queue.get_nowait()
+            except queue.Empty:
+                return
+            order_book: Optional[OrderBook] = self._order_books.get(trading_pair)
+            if order_book is not None:
+                if self._recorder is not None:
+                    self._recorder.record_trade(trading_pair, TradeType(trade_type), price, amount)
+                order_book.apply_trade(OrderBookTradeEvent(trading_pair=trading_pair,
+                                                           timestamp=timestamp,
+                                                           price=price,
+                                                           amount=amount,
+                                                           type=TradeType(trade_type)))
+
+    def _check_workers(self):
+        for shard_index, worker in enumerate(self._workers):
+            if worker is not None and not worker.is_alive():
+                self.logger().error(f"Order book worker {worker.name} exited with code {worker.exitcode}. "
+                                    f"Restarting.")
+                self._start_worker(shard_index)
+
+    async def _sync_order_books_loop(self):
+        last_check: float = 0
+        while True:
+            try:
+                self._sync_order_books()
+                self._apply_trades()
+                now: float = time.time()
+                if now - last_check >= 1.0:
+                    self._check_workers()
+                    last_check = now
+                await asyncio.sleep(self._sync_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger().network(
+                    "Unexpected error syncing order books from worker processes.",
+                    exc_info=True,
+                    app_warning_msg="Unexpected error syncing order books. Retrying after 5 seconds."
+                )
+                await asyncio.sleep(5.0)
+
+
+def numpy_snapshot_diff(old: np.ndarray, new: np.ndarray, update_id: int) -> np.ndarray:
+    """
+    Returns the [price, amount, update_id] diff rows that turn one side of a numpy snapshot into another: the price
+    levels that are new or changed, and the ones that are gone with 0 amount.
+    """
+    old_amounts: Dict[float, float] = dict(zip(old[:, 0].tolist(), old[:, 1].tolist()))
+    changed: np.ndarray = new[[old_amounts.get(price) != amount for price, amount in new[:, :2].tolist()]]
+    removed: np.ndarray = np.setdiff1d(old[:, 0], new[:, 0])
+    rows: np.ndarray = np.zeros((len(changed) + len(removed), 3), dtype=np.float64)
+    rows[:len(changed), :2] = changed[:, :2]
+    rows[len(changed):, 0] = removed
+    rows[:, 2] = update_id
+    return rows
+
+
+def run_order_book_shard(tracker_class: Type[OrderBookTracker],
+                         tracker_kwargs: Dict[str, Any],
+                         trading_pairs: List[str],
+                         first_slot: int,
+                         shared_memory_name: str,
+                         num_slots: int,
+                         depth: int,
+                         trade_queue: multiprocessing.Queue,
+                         stop_event: multiprocessing.Event,
+                         publish_interval: float = ShardedOrderBookTracker.DEFAULT_PUBLISH_INTERVAL):
+    """
+    Worker process entry point. Runs the tracker for one shard of trading pairs until `stop_event` is set.
+    """
+    ev_loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+    asyncio.set_event_loop(ev_loop)
+    shared_memory: OrderBookSharedMemory = OrderBookSharedMemory.attach(shared_memory_name, num_slots, depth)
+    try:
+        ev_loop.run_until_complete(_publish_order_books(tracker_class(trading_pairs=trading_pairs, **tracker_kwargs),
+                                                        trading_pairs,
+                                                        first_slot,
+                                                        shared_memory,
+                                                        trade_queue,
+                                                        stop_event,
+                                                        publish_interval))
+    finally:
+        shared_memory.close()
+        ev_loop.close()
+
+
+async def _publish_order_books(tracker: OrderBookTracker,
+                               trading_pairs: List[str],
+                               first_slot: int,
+                               shared_memory: OrderBookSharedMemory,
+                               trade_queue: multiprocessing.Queue,
+                               stop_event: multiprocessing.Event,
+                               publish_interval: float):
+    published_states: Dict[str, Tuple[int, int, Optional[float]]] = {}
+    # Order books only hold weak references to their listeners.
+    trade_forwarders: Dict[str, EventForwarder] = {}
+
+    def forward_trade(event: OrderBookTradeEvent):
+        trade_queue.put_nowait((event.trading_pair, event.timestamp, event.price, event.amount, event.type.value))
+
+    tracker.start()
+    try:
+        while not stop_event.is_set():
+            for index, trading_pair in enumerate(trading_pairs):
+                order_book: Optional[OrderBook] = tracker.order_books.get(trading_pair)
+                if order_book is None:
+                    continue
+                if trading_pair not in trade_forwarders:
+                    trade_forwarders[trading_pair] = EventForwarder(forward_trade)
+                    order_book.add_listener(OrderBookEvent.TradeEvent, trade_forwarders[trading_pair])
+                last_trade_price: float = order_book.last_trade_price
+                state: Tuple[int, int, Optional[float]] = (order_book.snapshot_uid,
+                                                           order_book.last_diff_uid,
+                                                           None if math.isnan(last_trade_price) else last_trade_price)
+                if state == published_states.get(trading_pair):
+                    continue
+                bids, asks = order_book.numpy_snapshot(shared_memory.depth)
+                shared_memory.write(first_slot + index,
+                                    bids,
+                                    asks,
+                                    max(order_book.snapshot_uid, order_book.last_diff_uid),
+                                    time.time(),
+                                    last_trade_price)
+                published_states[trading_pair] = state
+            await asyncio.sleep(publish_interval)
+    finally:
+        tracker.stop()
@@ -5,6 +5,7 @@ import logging
 from os.path import join
 from sqlalchemy import (
     create_engine,
+    event,
     inspect,
     MetaData,
 )
@@ -15,7 +16,11 @@ from sqlalchemy.orm import (
     Query
 )
 from sqlalchemy.schema import DropConstraint, ForeignKeyConstraint, Table
-from typing import Optional
+from typing import (
+    Any,
+    Dict,
+    Optional,
+)
 from hummingbot.client.config.global_config_map import global_config_map
 from hummingbot import data_path
 from hummingbot.logger.logger import HummingbotLogger
@@ -37,6 +42,10 @@ class SQLSessionWrapper:
             self._session.rollback()
 
 
+class ReadOnlySessionError(Exception):
+    pass
+
+
 class SQLConnectionType(Enum):
     TRADE_FILLS = 1
 
@@ -45,6 +54,11 @@ class SQLConnectionManager:
     _scm_logger: Optional[HummingbotLogger] = None
     _scm_trade_fills_instance: Optional["SQLConnectionManager"] = None
 
+    DEFAULT_SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+    DEFAULT_SQLITE_CACHE_SIZE = 64 * 1024
+    DEFAULT_POOL_SIZE = 5
+    DEFAULT_MAX_OVERFLOW = 10
+
     LOCAL_DB_VERSION_KEY = "local_db_version"
     LOCAL_DB_VERSION_VALUE = "20210119"
 
@@ -76,18 +90,53 @@ class SQLConnectionManager:
         else:
             return join(data_path(), "hummingbot_trades.sqlite")
 
+    @staticmethod
+    def _get_param(params: dict, key: str, default: int) -> int:
+        value = params.get(key)
+        return default if value is None else int(value)
+
     @classmethod
     def get_db_engine(cls,
                       dialect: str,
-                      params: dict) -> Engine:
+                      params: dict,
+                      read_only: bool = False) -> Engine:
+        """
+        Creates the database engine. With `db_tuned` set in params, SQLite connections use write-ahead logging, so
+        that readers do not block the writer, synchronous=NORMAL, which skips the fsync on each commit in WAL mode,
+        and the `db_sqlite_mmap_size` and `db_sqlite_cache_size` (in KiB) settings. Other databases get a connection
+        pool of `db_pool_size` connections and up to `db_max_overflow` more, checked before use.
+        A read only SQLite engine opens the database file in read only mode.
+        """
         # Fallback to `sqlite` if dialect is None
         if dialect is None:
             dialect = "sqlite"
+        tuned: bool = bool(params.get("db_tuned"))
 
         if "sqlite" in dialect:
             db_path = params.get("db_path")
 
-            return create_engine(f"{dialect}:///{db_path}")
+            if read_only:
+                engine: Engine = create_engine(f"{dialect}:///file:{db_path}?mode=ro&uri=true")
+            else:
+                engine: Engine = create_engine(f"{dialect}:///{db_path}")
+            if tuned:
+                pragmas: Dict[str, Any] = {
+                    "synchronous": "NORMAL",
+                    "mmap_size": cls._get_param(params, "db_sqlite_mmap_size", cls.DEFAULT_SQLITE_MMAP_SIZE),
+                    # Negative values are in KiB, positive ones in pages.
+                    "cache_size": -cls._get_param(params, "db_sqlite_cache_size", cls.DEFAULT_SQLITE_CACHE_SIZE)
+                }
+                if not read_only:
+                    # The journal mode is stored in the database file, so it only needs to be set by the writer.
+                    pragmas = {"journal_mode": "WAL", **pragmas}
+
+                @event.listens_for(engine, "connect")
+                def set_sqlite_pragmas(dbapi_connection, connection_record):
+                    cursor = dbapi_connection.cursor()
+                    for name, value in pragmas.items():
+                        cursor.execute(f"PRAGMA {name}={value}")
+                    cursor.close()
+            return engine
         else:
             username = params.get("db_username")
             password = params.get("db_password")
@@ -95,7 +144,13 @@ class SQLConnectionManager:
             port = params.get("db_port")
             db_name = params.get("db_name")
 
-            return create_engine(f"{dialect}://{username}:{password}@{host}:{port}/{db_name}")
+            engine_kwargs: Dict[str, Any] = {}
+            if tuned:
+                engine_kwargs = {"pool_size": cls._get_param(params, "db_pool_size", cls.DEFAULT_POOL_SIZE),
+                                 "max_overflow": cls._get_param(params, "db_max_overflow", cls.DEFAULT_MAX_OVERFLOW),
+                                 "pool_pre_ping": True,
+                                 "pool_recycle": 3600}
+            return create_engine(f"{dialect}://{username}:{password}@{host}:{port}/{db_name}", **engine_kwargs)
 
     def __init__(self,
                  connection_type: SQLConnectionType,
@@ -112,8 +167,15 @@ class SQLConnectionManager:
             "db_username": global_config_map.get("db_username").value,
             "db_password": global_config_map.get("db_password").value,
             "db_name": global_config_map.get("db_name").value,
+            "db_tuned": global_config_map.get("db_tuned").value,
+            "db_sqlite_mmap_size": global_config_map.get("db_sqlite_mmap_size").value,
+            "db_sqlite_cache_size": global_config_map.get("db_sqlite_cache_size").value,
+            "db_pool_size": global_config_map.get("db_pool_size").value,
+            "db_max_overflow": global_config_map.get("db_max_overflow").value,
             "db_path": db_path
         }
+        self._engine_options: Dict[str, Any] = engine_options
+        self._read_only_session_cls: Optional[sessionmaker] = None
 
         if connection_type is SQLConnectionType.TRADE_FILLS:
             self._engine: Engine = self.get_db_engine(
@@ -150,6 +212,33 @@ class SQLConnectionManager:
     def get_shared_session(self) -> Session:
         return self._shared_session
 
+    def create_session(self, **kwargs) -> Session:
+        """
+        Returns a new session, for use outside of the main thread. The caller is responsible for closing it.
+        """
+        return self._session_cls(**kwargs)
+
+    def create_read_only_session(self) -> Session:
+        """
+        Returns a new session for reporting, on its own connection, which fails to flush any change. With SQLite in
+        WAL mode, reads from it do not wait for, nor block, the recording of trades. The caller is responsible for
+        closing it.
+        """
+        if self._read_only_session_cls is None:
+            if "sqlite" in (self._engine_options.get("db_engine") or "sqlite") and self.db_path != ":memory:":
+                engine: Engine = self.get_db_engine(self._engine_options.get("db_engine"),
+                                                    self._engine_options,
+                                                    read_only=True)
+            else:
+                engine: Engine = self._engine
+            self._read_only_session_cls = sessionmaker(bind=engine, autoflush=False)
+
+            @event.listens_for(self._read_only_session_cls, "before_flush")
+            def prevent_flush(session, flush_context, instances):
+                raise ReadOnlySessionError("Cannot write to the database from a read only session.")
+
+        return self._read_only_session_cls()
+
     def get_local_db_version(self):
         query: Query = (self._shared_session.query(LocalMetadata)
                         .filter(LocalMetadata.key == self.LOCAL_DB_VERSION_KEY))
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import numpy as np
 import pandas as pd
 from typing import (
     Any,
@@ -7,6 +8,8 @@ from typing import (
     Optional
 )
 from sqlalchemy import (
+    and_,
+    select,
     Column,
     ForeignKey,
     Text,
@@ -20,6 +23,7 @@ from sqlalchemy.orm import (
     Session
 )
 from datetime import datetime
+import json
 
 from . import HummingbotBase
 
@@ -101,6 +105,74 @@ class TradeFill(HummingbotBase):
                                              .all())
         return trades
 
+    @staticmethod
+    def get_new_trades(sql_session: Session,
+                       config_file_path: str,
+                       last_trade_id: int = 0,
+                       start_time: int = None,
+                       limit: int = None) -> List["TradeFill"]:
+        """
+        Returns the trade fills of a config file with an ID above `last_trade_id`, in ID order, so callers can fetch
+        only the trades recorded since their last query. Filtering on the exact config file path and on the timestamp
+        uses the tf_config_timestamp_index index.
+        """
+        filters = [TradeFill.config_file_path == config_file_path,
+                   TradeFill.id > last_trade_id]
+        if start_time is not None:
+            filters.append(TradeFill.timestamp >= start_time)
+        query = (sql_session
+                 .query(TradeFill)
+                 .filter(*filters)
+                 .order_by(TradeFill.id.asc()))
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def get_trades_columns(sql_session: Session,
+                           config_file_path: str = None,
+                           market: str = None,
+                           trading_pair: str = None,
+                           start_time: int = None,
+                           end_time: int = None) -> pd.DataFrame:
+        """
+        Reads trade fills with a single SELECT, without creating TradeFill objects, into a data frame with a typed
+        column per field, in timestamp order. Prices and amounts are parsed to float64, the trade fee is split into
+        fee_percent and flat_fees (a JSON list), and the columns with few distinct values are categorical.
+        """
+        table = TradeFill.__table__
+        filters = []
+        if config_file_path is not None:
+            filters.append(table.c.config_file_path == config_file_path)
+        if market is not None:
+            filters.append(table.c.market == market)
+        if trading_pair is not None:
+            filters.append(table.c.symbol == trading_pair)
+        if start_time is not None:
+            filters.append(table.c.timestamp >= start_time)
+        if end_time is not None:
+            filters.append(table.c.timestamp <= end_time)
+        column_names: List[str] = [column.key for column in table.columns]
+        query = select(list(table.columns)).where(and_(*filters)).order_by(table.c.timestamp.asc())
+        rows = sql_session.execute(query).fetchall()
+        values: Dict[str, tuple] = dict(zip(column_names, zip(*rows))) if len(rows) > 0 \
+            else {name: () for name in column_names}
+
+        trade_fees: tuple = values.pop("trade_fee")
+        data: Dict[str, Any] = {}
+        for name, column_values in values.items():
+            if name in ("id", "timestamp", "leverage"):
+                data[name] = np.array(column_values, dtype=np.int64)
+            elif name in ("price", "amount"):
+                data[name] = np.array(column_values, dtype=np.float64)
+            elif name in ("order_id", "exchange_trade_id"):
+                data[name] = np.array(column_values, dtype=object)
+            else:
+                data[name] = pd.Categorical(column_values)
+        data["fee_percent"] = np.array([float(fee.get("percent") or 0) for fee in trade_fees], dtype=np.float64)
+        data["flat_fees"] = np.array([json.dumps(fee.get("flat_fees", [])) for fee in trade_fees], dtype=object)
+        return pd.DataFrame(data)
+
     @classmethod
     def to_pandas(cls, trades: List):
         columns: List[str] = ["Index",
@@ -9,13 +9,25 @@ cdef class RingBuffer:
         int64_t _stop_index
         int64_t _length
         bint _is_full
+        double _shift
+        double _sum
+        double _sum_compensation
+        double _sum_sq
+        double _sum_sq_compensation
+        int64_t _evictions
 
-    cdef void c_add_value(self, float val)
+    cdef void c_add_value(self, double val)
     cdef void c_increment_index(self)
     cdef double c_get_last_value(self)
+    cdef double c_get_first_value(self)
     cdef bint c_is_full(self)
     cdef bint c_is_empty(self)
+    cdef int64_t c_size(self)
+    cdef double c_sum_value(self)
     cdef double c_mean_value(self)
     cdef double c_variance(self)
     cdef double c_std_dev(self)
+    cdef void c_add_to_sums(self, double val, double val_sq)
+    cdef void c_recompute_sums(self)
+    cdef tuple c_get_ordered_views(self)
     cdef np.ndarray[np.double_t, ndim=1] c_get_as_numpy_array(self)
@@ -1,11 +1,21 @@
 import numpy as np
 import logging
 cimport numpy as np
+from libc.math cimport sqrt
+from libc.stdint cimport int64_t
 
 
 pmm_logger = None
 
 cdef class RingBuffer:
+    """
+    A fixed length buffer of the last values added, with their sum, and the mean, variance and standard deviation of
+    a full buffer, in O(1).
+    Running sums of the values and of their squares are updated with Kahan compensation as values are added and
+    evicted. The values are shifted by one of them, so that the variance of values far from zero does not lose
+    precision, and the sums are recomputed from the buffer every `length` evictions, so that rounding errors do not
+    accumulate.
+    """
     @classmethod
     def logger(cls):
         global pmm_logger
@@ -13,19 +23,65 @@ cdef class RingBuffer:
             pmm_logger = logging.getLogger(__name__)
         return pmm_logger
 
-    def __cinit__(self, int length):
+    def __cinit__(self, int64_t length):
         self._length = length
         self._buffer = np.zeros(length, dtype=np.float64)
         self._start_index = 0
         self._stop_index = 0
         self._is_full = False
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sum_compensation = 0.0
+        self._sum_sq = 0.0
+        self._sum_sq_compensation = 0.0
+        self._evictions = 0
 
     def __dealloc__(self):
         self._buffer = None
 
-    cdef void c_add_value(self, float val):
+    cdef void c_add_value(self, double val):
+        cdef:
+            double evicted
+        if self.c_is_empty():
+            self._shift = val
+        if self._is_full:
+            evicted = self._buffer[self._stop_index] - self._shift
+            self.c_add_to_sums(-evicted, -evicted * evicted)
         self._buffer[self._stop_index] = val
+        self.c_add_to_sums(val - self._shift, (val - self._shift) * (val - self._shift))
         self.c_increment_index()
+        if self._is_full:
+            self._evictions += 1
+            if self._evictions >= self._length:
+                self.c_recompute_sums()
+
+    cdef void c_add_to_sums(self, double val, double val_sq):
+        cdef:
+            double y
+            double t
+        y = val - self._sum_compensation
+        t = self._sum + y
+        self._sum_compensation = (t - self._sum) - y
+        self._sum = t
+        y = val_sq - self._sum_sq_compensation
+        t = self._sum_sq + y
+        self._sum_sq_compensation = (t - self._sum_sq) - y
+        self._sum_sq = t
+
+    cdef void c_recompute_sums(self):
+        cdef:
+            int64_t i
+            double shifted
+        self._shift = self._buffer[self._stop_index]
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        for i in range(self._length):
+            shifted = self._buffer[i] - self._shift
+            self._sum += shifted
+            self._sum_sq += shifted * shifted
+        self._sum_compensation = 0.0
+        self._sum_sq_compensation = 0.0
+        self._evictions = 0
 
     cdef void c_increment_index(self):
         self._stop_index = (self._stop_index + 1) % self._length
@@ -41,43 +97,64 @@ cdef class RingBuffer:
             return np.nan
         return self._buffer[self._stop_index-1]
 
+    cdef double c_get_first_value(self):
+        if self.c_is_empty():
+            return np.nan
+        if self._is_full:
+            return self._buffer[self._stop_index]
+        return self._buffer[self._start_index]
+
     cdef bint c_is_full(self):
         return self._is_full
 
-    cdef double c_mean_value(self):
-        result = np.nan
+    cdef int64_t c_size(self):
         if self._is_full:
-            result=np.mean(self.c_get_as_numpy_array())
-        return result
+            return self._length
+        return self._stop_index - self._start_index
+
+    cdef double c_sum_value(self):
+        return self._shift * self.c_size() + self._sum
+
+    cdef double c_mean_value(self):
+        if not self._is_full:
+            return np.nan
+        return self._shift + self._sum / self._length
 
     cdef double c_variance(self):
-        result = np.nan
-        if self._is_full:
-            result = np.var(self.c_get_as_numpy_array())
-        return result
+        cdef:
+            double mean
+            double variance
+        if not self._is_full:
+            return np.nan
+        mean = self._sum / self._length
+        variance = self._sum_sq / self._length - mean * mean
+        return variance if variance > 0 else 0.0
 
     cdef double c_std_dev(self):
-        result = np.nan
-        if self._is_full:
-            result = np.std(self.c_get_as_numpy_array())
-        return result
+        cdef:
+            double variance = self.c_variance()
+        if variance != variance:
+            return np.nan
+        return sqrt(variance)
 
-    cdef np.ndarray[np.double_t, ndim=1] c_get_as_numpy_array(self):
-        cdef np.ndarray[np.int16_t, ndim=1] indexes
+    cdef tuple c_get_ordered_views(self):
+        # The values from oldest to newest, as two views of the buffer, without copying. Once the buffer is full, the
+        # oldest value is the next one to be overwritten.
+        cdef:
+            np.ndarray[np.double_t, ndim=1] buffer = np.asarray(self._buffer)
+        if not self._is_full:
+            return buffer[self._start_index:self._stop_index], buffer[:0]
+        return buffer[self._stop_index:], buffer[:self._stop_index]
 
+    cdef np.ndarray[np.double_t, ndim=1] c_get_as_numpy_array(self):
+        cdef:
+            np.ndarray[np.double_t, ndim=1] buffer = np.asarray(self._buffer)
         if not self._is_full:
-            indexes = np.arange(self._start_index, stop=self._stop_index, dtype=np.int16)
-        else:
-            indexes = np.arange(self._start_index, stop=self._start_index + self._length,
-                                dtype=np.int16) % self._length
-        return np.asarray(self._buffer)[indexes]
+            return buffer[self._start_index:self._stop_index].copy()
+        return np.concatenate((buffer[self._stop_index:], buffer[:self._stop_index]))
 
     def __init__(self, length):
-        self._length = length
-        self._buffer = np.zeros(length, dtype=np.double)
-        self._start_index = 0
-        self._stop_index = 0
-        self._is_full = False
+        pass
 
     def add_value(self, val):
         self.c_add_value(val)
@@ -85,13 +162,34 @@ cdef class RingBuffer:
     def get_as_numpy_array(self):
         return self.c_get_as_numpy_array()
 
+    def get_ordered_views(self):
+        """
+        Returns the values from oldest to newest as two views of the buffer, to be read before the next value is added.
+        """
+        return self.c_get_ordered_views()
+
     def get_last_value(self):
         return self.c_get_last_value()
 
+    def get_first_value(self):
+        return self.c_get_first_value()
+
+    @property
+    def length(self):
+        return self._length
+
+    @property
+    def size(self):
+        return self.c_size()
+
     @property
     def is_full(self):
         return self.c_is_full()
 
+    @property
+    def sum_value(self):
+        return self.c_sum_value()
+
     @property
     def mean_value(self):
         return self.c_mean_value()
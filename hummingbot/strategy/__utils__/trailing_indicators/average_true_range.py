@@ -0,0 +1,24 @@
+from typing import Optional
+
+from .base_incremental_indicator import BaseBarIndicator
+
+
+class AverageTrueRangeIndicator(BaseBarIndicator):
+    """
+    The average true range of the last `sampling_length` bars. With `relative`, the range of each bar is divided by
+    its low. Without `true_range`, the range of a bar is its high less its low, leaving out the gap from the previous
+    close, as the volatility of the liquidity mining strategy.
+    """
+
+    def __init__(self, bar_length: int = 1, sampling_length: int = 30, processing_length: int = 1,
+                 relative: bool = False, true_range: bool = True):
+        super().__init__(bar_length, sampling_length, processing_length)
+        self._relative = relative
+        self._true_range = true_range
+
+    def _bar_term(self, open_price: float, high: float, low: float, close: float,
+                  previous_close: Optional[float]) -> float:
+        if self._true_range and previous_close is not None:
+            high = max(high, previous_close)
+            low = min(low, previous_close)
+        return (high - low) / low if self._relative else high - low
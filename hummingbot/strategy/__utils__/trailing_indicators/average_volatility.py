@@ -7,8 +7,9 @@ class AverageVolatilityIndicator(BaseTrailingIndicator):
         super().__init__(sampling_length, processing_length)
 
     def _indicator_calculation(self) -> float:
+        if self._sampling_buffer.is_full:
+            return self._sampling_buffer.variance
         return np.var(self._sampling_buffer.get_as_numpy_array())
 
     def _processing_calculation(self) -> float:
-        processing_array = self._processing_buffer.get_as_numpy_array()
-        return np.sqrt(np.mean(processing_array))
+        return np.sqrt(super()._processing_calculation())
@@ -0,0 +1,67 @@
+from abc import abstractmethod
+import math
+from typing import Optional
+
+from .base_trailing_indicator import BaseTrailingIndicator
+
+
+class BaseIncrementalIndicator(BaseTrailingIndicator):
+    """
+    A trailing indicator updated with constant work per sample. _update() gets each new sample, with the sample it
+    evicts from the sampling buffer once the buffer is full, and returns the new indicator value.
+    """
+
+    def add_sample(self, value: float):
+        evicted: Optional[float] = self._sampling_buffer.get_first_value() if self._sampling_buffer.is_full else None
+        self._sampling_buffer.add_value(value)
+        self._processing_buffer.add_value(self._update(value, evicted))
+
+    @abstractmethod
+    def _update(self, value: float, evicted: Optional[float]) -> float:
+        raise NotImplementedError
+
+    def _indicator_calculation(self) -> float:
+        return self._processing_buffer.get_last_value()
+
+
+class BaseBarIndicator(BaseIncrementalIndicator):
+    """
+    A trailing indicator over the last `sampling_length` bars. Samples, e.g. mid prices, are aggregated into bars of
+    `bar_length` samples, or bars can be added with add_bar(). The sampling buffer holds a term per bar, from
+    _bar_term(), and the indicator value is _bar_value() of their mean, over the complete bars until there are
+    sampling_length of them.
+    """
+
+    def __init__(self, bar_length: int = 1, sampling_length: int = 30, processing_length: int = 1):
+        super().__init__(sampling_length, processing_length)
+        self._bar_length = bar_length
+        self._bar_samples = 0
+        self._bar_open = self._bar_high = self._bar_low = math.nan
+        self._previous_close: Optional[float] = None
+
+    def add_sample(self, value: float):
+        if self._bar_samples == 0:
+            self._bar_open = self._bar_high = self._bar_low = value
+        else:
+            self._bar_high = max(self._bar_high, value)
+            self._bar_low = min(self._bar_low, value)
+        self._bar_samples += 1
+        if self._bar_samples == self._bar_length:
+            self._bar_samples = 0
+            self.add_bar(self._bar_open, self._bar_high, self._bar_low, value)
+
+    def add_bar(self, open_price: float, high: float, low: float, close: float):
+        self._sampling_buffer.add_value(self._bar_term(open_price, high, low, close, self._previous_close))
+        self._previous_close = close
+        self._processing_buffer.add_value(self._update(close, None))
+
+    def _update(self, value: float, evicted: Optional[float]) -> float:
+        return self._bar_value(self._sampling_buffer.sum_value / self._sampling_buffer.size)
+
+    @abstractmethod
+    def _bar_term(self, open_price: float, high: float, low: float, close: float,
+                  previous_close: Optional[float]) -> float:
+        raise NotImplementedError
+
+    def _bar_value(self, mean_term: float) -> float:
+        return mean_term
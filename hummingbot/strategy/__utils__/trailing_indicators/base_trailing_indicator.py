@@ -34,6 +34,8 @@ class BaseTrailingIndicator(ABC):
         Processing of the processing buffer to return final value.
         Default behavior is buffer average
         """
+        if self._processing_buffer.is_full:
+            return self._processing_buffer.mean_value
         return np.mean(self._processing_buffer.get_as_numpy_array())
 
     @property
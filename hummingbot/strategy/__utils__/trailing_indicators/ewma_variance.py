@@ -0,0 +1,35 @@
+import math
+from typing import Optional
+
+from .base_incremental_indicator import BaseIncrementalIndicator
+
+
+class EWMAVarianceIndicator(BaseIncrementalIndicator):
+    """
+    The exponentially weighted moving variance of the samples, with span `sampling_length`, updated in constant time.
+    is_sampling_buffer_full tells when sampling_length samples have been added.
+    """
+
+    def __init__(self, sampling_length: int = 30, processing_length: int = 1):
+        super().__init__(sampling_length, processing_length)
+        self._alpha = 2 / (sampling_length + 1)
+        self._mean = math.nan
+        self._variance = 0.0
+
+    def _update(self, value: float, evicted: Optional[float]) -> float:
+        if math.isnan(self._mean):
+            self._mean = value
+            return self._variance
+        diff = value - self._mean
+        increment = self._alpha * diff
+        self._mean += increment
+        self._variance = (1 - self._alpha) * (self._variance + diff * increment)
+        return self._variance
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.current_value)
@@ -0,0 +1,21 @@
+import numpy as np
+from typing import Optional
+
+from .base_incremental_indicator import BaseIncrementalIndicator
+
+
+class IncrementalAverageVolatilityIndicator(BaseIncrementalIndicator):
+    """
+    The standard deviation of the last `sampling_length` samples, averaged as AverageVolatilityIndicator over the
+    processing buffer, updated in constant time from the running sums of the sampling buffer. It is NaN until the
+    sampling buffer is full.
+    """
+
+    def __init__(self, sampling_length: int = 30, processing_length: int = 15):
+        super().__init__(sampling_length, processing_length)
+
+    def _update(self, value: float, evicted: Optional[float]) -> float:
+        return self._sampling_buffer.variance
+
+    def _processing_calculation(self) -> float:
+        return np.sqrt(super()._processing_calculation())
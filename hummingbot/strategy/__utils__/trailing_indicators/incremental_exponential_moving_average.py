@@ -0,0 +1,31 @@
+from typing import Optional
+
+from .base_incremental_indicator import BaseIncrementalIndicator
+
+
+class IncrementalExponentialMovingAverageIndicator(BaseIncrementalIndicator):
+    """
+    The exponential moving average of the last `sampling_length` samples, with span `sampling_length` and adjusted
+    weights, as ExponentialMovingAverageIndicator, updated in constant time: the weighted sum of the samples and the
+    sum of their weights decay with each sample, and lose the weight of the sample leaving the window.
+    """
+
+    def __init__(self, sampling_length: int = 30, processing_length: int = 1):
+        if processing_length != 1:
+            raise Exception("Exponential moving average processing_length should be 1")
+        super().__init__(sampling_length, processing_length)
+        self._decay = 1 - 2 / (sampling_length + 1)
+        self._evicted_weight = self._decay ** sampling_length
+        self._weighted_sum = 0.0
+        self._weights = 0.0
+
+    def _update(self, value: float, evicted: Optional[float]) -> float:
+        self._weighted_sum = value + self._decay * self._weighted_sum
+        self._weights = 1 + self._decay * self._weights
+        if evicted is not None:
+            self._weighted_sum -= self._evicted_weight * evicted
+            self._weights -= self._evicted_weight
+        return self._weighted_sum / self._weights
+
+    def _processing_calculation(self) -> float:
+        return self._processing_buffer.get_last_value()
@@ -0,0 +1,31 @@
+import math
+from typing import Optional
+
+from .base_incremental_indicator import BaseBarIndicator
+
+
+class ParkinsonVolatilityIndicator(BaseBarIndicator):
+    """
+    The Parkinson volatility estimate, per bar, of the high and low of the last `sampling_length` bars.
+    """
+
+    def _bar_term(self, open_price: float, high: float, low: float, close: float,
+                  previous_close: Optional[float]) -> float:
+        return math.log(high / low) ** 2
+
+    def _bar_value(self, mean_term: float) -> float:
+        return math.sqrt(mean_term / (4 * math.log(2)))
+
+
+class GarmanKlassVolatilityIndicator(BaseBarIndicator):
+    """
+    The Garman-Klass volatility estimate, per bar, of the open, high, low and close of the last `sampling_length`
+    bars.
+    """
+
+    def _bar_term(self, open_price: float, high: float, low: float, close: float,
+                  previous_close: Optional[float]) -> float:
+        return 0.5 * math.log(high / low) ** 2 - (2 * math.log(2) - 1) * math.log(close / open_price) ** 2
+
+    def _bar_value(self, mean_term: float) -> float:
+        return math.sqrt(max(mean_term, 0))
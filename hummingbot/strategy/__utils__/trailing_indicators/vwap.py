@@ -0,0 +1,26 @@
+from typing import Optional
+
+from ..ring_buffer import RingBuffer
+from .base_incremental_indicator import BaseIncrementalIndicator
+
+
+class VWAPIndicator(BaseIncrementalIndicator):
+    """
+    The volume weighted average price of the last `sampling_length` samples, updated in constant time from the
+    running sums of the ring buffers of the volumes and of the price times volume, which do not drift.
+    """
+
+    def __init__(self, sampling_length: int = 30, processing_length: int = 1):
+        super().__init__(sampling_length, processing_length)
+        self._volume_buffer = RingBuffer(sampling_length)
+
+    def add_sample(self, value: float, volume: float = 1.0):
+        self._volume_buffer.add_value(volume)
+        super().add_sample(value * volume)
+
+    def _update(self, value: float, evicted: Optional[float]) -> float:
+        volume: float = self._volume_buffer.sum_value
+        return self._sampling_buffer.sum_value / volume if volume > 0 else float("nan")
+
+    def _processing_calculation(self) -> float:
+        return self._processing_buffer.get_last_value()
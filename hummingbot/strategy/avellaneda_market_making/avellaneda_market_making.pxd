@@ -41,14 +41,22 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
         object _kappa
         object _gamma
         object _eta
-        object _closing_time
-        object _time_left
-        object _q_adjustment_factor
-        object _reserved_price
-        object _optimal_spread
-        object _optimal_bid
-        object _optimal_ask
-        object _latest_parameter_calculation_vol
+        double _closing_time
+        double _time_left
+        double _q_adjustment_factor
+        double _reserved_price
+        double _optimal_spread
+        double _optimal_bid
+        double _optimal_ask
+        double _latest_parameter_calculation_vol
+        object _price
+        double _price_float
+        object _base_balance
+        double _base_balance_float
+        object _quote_balance
+        double _quote_balance_float
+        object _target_inventory
+        double _target_inventory_float
         str _debug_csv_path
         object _avg_vol
 
@@ -67,6 +75,7 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
     cdef c_execute_orders_proposal(self, object proposal)
     cdef set_timers(self)
     cdef double c_get_spread(self)
+    cdef double c_get_volatility(self)
     cdef c_collect_market_variables(self, double timestamp)
     cdef bint c_is_algorithm_ready(self)
     cdef c_calculate_reserved_price_and_optimal_spread(self)
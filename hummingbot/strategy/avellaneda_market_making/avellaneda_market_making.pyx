@@ -9,6 +9,7 @@ from typing import (
 from math import (
     floor,
     ceil,
+    exp,
     isnan
 )
 import time
@@ -32,7 +33,12 @@ from .data_types import (
     PriceSize
 )
 from ..order_tracker cimport OrderTracker
-from ..__utils__.trailing_indicators.average_volatility import AverageVolatilityIndicator
+from .avellaneda_model cimport (
+    c_calculate_parameters,
+    c_calculate_reserved_price_and_optimal_spread,
+    c_calculate_optimal_bid_ask,
+)
+from ..__utils__.trailing_indicators.incremental_average_volatility import IncrementalAverageVolatilityIndicator
 
 
 NaN = float("nan")
@@ -117,18 +123,27 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
         self._vol_to_spread_multiplier = vol_to_spread_multiplier
         self._volatility_sensibility = volatility_sensibility
         self._inventory_risk_aversion = inventory_risk_aversion
-        self._avg_vol = AverageVolatilityIndicator(volatility_buffer_size, 1)
+        self._avg_vol = IncrementalAverageVolatilityIndicator(volatility_buffer_size, 1)
         self._last_sampling_timestamp = 0
-        self._kappa = order_book_depth_factor
-        self._gamma = risk_factor
-        self._eta = order_amount_shape_factor
+        # gamma, kappa and eta are floats, or None until calculated from the spread settings.
+        self._kappa = None if order_book_depth_factor is None else float(order_book_depth_factor)
+        self._gamma = None if risk_factor is None else float(risk_factor)
+        self._eta = None if order_amount_shape_factor is None else float(order_amount_shape_factor)
         self._time_left = closing_time
         self._closing_time = closing_time
-        self._latest_parameter_calculation_vol = s_decimal_zero
-        self._reserved_price = s_decimal_zero
-        self._optimal_spread = s_decimal_zero
-        self._optimal_ask = s_decimal_zero
-        self._optimal_bid = s_decimal_zero
+        self._latest_parameter_calculation_vol = 0
+        self._reserved_price = 0
+        self._optimal_spread = 0
+        self._optimal_ask = 0
+        self._optimal_bid = 0
+        self._price = s_decimal_zero
+        self._price_float = 0
+        self._base_balance = s_decimal_zero
+        self._base_balance_float = 0
+        self._quote_balance = s_decimal_zero
+        self._quote_balance_float = 0
+        self._target_inventory = s_decimal_zero
+        self._target_inventory_float = 0
         self._debug_csv_path = debug_csv_path
         self._is_debug = is_debug
         try:
@@ -138,7 +153,9 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
             pass
 
     def all_markets_ready(self):
-        return all([market.ready for market in self._sb_markets])
+        # Only the strategy's trading pair needs to be ready, not the order books of the other trading pairs of the
+        # market.
+        return self._market_info.market.trading_pair_ready(self._market_info.trading_pair)
 
     @property
     def market_info(self) -> MarketTradingPairTuple:
@@ -363,7 +380,7 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
                           f"    risk_factor(\u03B3)= {self._gamma:.5E}",
                           f"    order_book_depth_factor(\u03BA)= {self._kappa:.5E}",
                           f"    volatility= {volatility_pct:.3f}%",
-                          f"    time until end of trading cycle= {str(datetime.timedelta(seconds=float(self._time_left)//1e3))}"])
+                          f"    time until end of trading cycle= {str(datetime.timedelta(seconds=self._time_left//1e3))}"])
 
         warning_lines.extend(self.balance_warning([self._market_info]))
 
@@ -399,7 +416,7 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
             cdef object proposal
         try:
             if not self._all_markets_ready:
-                self._all_markets_ready = all([mkt.ready for mkt in self._sb_markets])
+                self._all_markets_ready = self.all_markets_ready()
                 if not self._all_markets_ready:
                     # Markets not ready yet. Don't do anything.
                     if should_report_warnings:
@@ -420,7 +437,7 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
                     # so parameters need to be recalculated.
                     if (self._gamma is None) or (self._kappa is None) or \
                             (self._parameters_based_on_spread and
-                             self.volatility_diff_from_last_parameter_calculation(self.get_volatility()) >
+                             self.volatility_diff_from_last_parameter_calculation(self.c_get_volatility()) >
                              self._volatility_sensibility):
                         self.c_recalculate_parameters()
                     self.c_calculate_reserved_price_and_optimal_spread()
@@ -451,17 +468,25 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
             self._last_timestamp = timestamp
 
     cdef c_collect_market_variables(self, double timestamp):
+        """
+        Samples the mid price and caches it, the balances and the target inventory for the rest of the tick. The
+        model is calculated on their float values, and prices are converted back to Decimal on quantization only.
+        """
         market, trading_pair, base_asset, quote_asset = self._market_info
         self._last_sampling_timestamp = timestamp
-        self._time_left = max(self._time_left - Decimal(timestamp - self._last_timestamp) * 1000, 0)
-        price = self.get_price()
-        self._avg_vol.add_sample(price)
+        self._time_left = max(self._time_left - (timestamp - self._last_timestamp) * 1000, 0)
+        self._price = self.get_price()
+        self._price_float = float(self._price)
+        self._avg_vol.add_sample(self._price_float)
+        self._base_balance = market.get_balance(base_asset)
+        self._base_balance_float = float(self._base_balance)
+        self._quote_balance = market.get_balance(quote_asset)
+        self._quote_balance_float = float(self._quote_balance)
+        self._target_inventory = self.c_calculate_target_inventory()
+        self._target_inventory_float = float(self._target_inventory)
         # Calculate adjustment factor to have 0.01% of inventory resolution
-        base_balance = market.get_balance(base_asset)
-        quote_balance = market.get_balance(quote_asset)
-        inventory_in_base = quote_balance / price + base_balance
-        self._q_adjustment_factor = Decimal(
-            "1e5") / inventory_in_base
+        inventory_in_base = self._quote_balance_float / self._price_float + self._base_balance_float
+        self._q_adjustment_factor = 1e5 / inventory_in_base
         if self._time_left == 0:
             # Re-cycle algorithm
             self._time_left = self._closing_time
@@ -471,8 +496,9 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
 
     def volatility_diff_from_last_parameter_calculation(self, current_vol):
         if self._latest_parameter_calculation_vol == 0:
-            return s_decimal_zero
-        return abs(self._latest_parameter_calculation_vol - Decimal(str(current_vol))) / self._latest_parameter_calculation_vol
+            return 0
+        return (abs(self._latest_parameter_calculation_vol - float(current_vol)) /
+                self._latest_parameter_calculation_vol)
 
     cdef double c_get_spread(self):
         cdef:
@@ -481,49 +507,40 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
 
         return market.c_get_price(trading_pair, True) - market.c_get_price(trading_pair, False)
 
-    def get_volatility(self):
-        vol = Decimal(str(self._avg_vol.current_value))
-        if vol == s_decimal_zero:
-            if self._latest_parameter_calculation_vol != s_decimal_zero:
-                vol = Decimal(str(self._latest_parameter_calculation_vol))
+    cdef double c_get_volatility(self):
+        cdef:
+            double vol = self._avg_vol.current_value
+        if vol == 0:
+            if self._latest_parameter_calculation_vol != 0:
+                vol = self._latest_parameter_calculation_vol
             else:
                 # Default value at start time if price has no activity
-                vol = Decimal(str(self.c_get_spread()/2))
+                vol = self.c_get_spread() / 2
         return vol
 
+    def get_volatility(self):
+        return self.c_get_volatility()
+
     cdef c_calculate_reserved_price_and_optimal_spread(self):
         cdef:
-            ExchangeBase market = self._market_info.market
-
-        time_left_fraction = Decimal(str(self._time_left / self._closing_time))
-
-        price = self.get_price()
-        q = (market.get_balance(self.base_asset) - Decimal(str(self.c_calculate_target_inventory()))) * self._q_adjustment_factor
-        vol = self.get_volatility()
-        mid_price_variance = vol ** 2
-
-        self._reserved_price = price - (q * self._gamma * mid_price_variance * time_left_fraction)
-        self._optimal_spread = self._gamma * mid_price_variance * time_left_fraction + 2 * Decimal(
-            1 + self._gamma / self._kappa).ln() / self._gamma
-
-        spread_inflation_due_to_volatility = max(self._vol_to_spread_multiplier * vol, price * self._min_spread)/(price * self._min_spread)
+            double price = self._price_float
+            double q = (self._base_balance_float - self._target_inventory_float) * self._q_adjustment_factor
+            double vol = self.c_get_volatility()
+            double min_spread = 0
+            double max_spread = 0
+            double vol_to_spread_multiplier = 0
 
         if self._parameters_based_on_spread:
-            min_limit_bid = price * (1 - self._max_spread * spread_inflation_due_to_volatility)
-            max_limit_bid = price * (1 - self._min_spread * spread_inflation_due_to_volatility)
-            min_limit_ask = price * (1 + self._min_spread * spread_inflation_due_to_volatility)
-            max_limit_ask = price * (1 + self._max_spread * spread_inflation_due_to_volatility)
-        else:
-            min_limit_bid = s_decimal_zero
-            max_limit_bid = min_limit_ask = price
-            max_limit_ask = Decimal("Inf")
-
-        self._optimal_ask = min(max(self._reserved_price + self._optimal_spread / 2,
-                                    min_limit_ask),
-                                max_limit_ask)
-        self._optimal_bid = min(max(self._reserved_price - self._optimal_spread / 2,
-                                    min_limit_bid),
-                                max_limit_bid)
+            min_spread = self._min_spread
+            max_spread = self._max_spread
+            vol_to_spread_multiplier = self._vol_to_spread_multiplier
+
+        c_calculate_reserved_price_and_optimal_spread(price, q, vol, self._gamma, self._kappa,
+                                                      self._time_left / self._closing_time,
+                                                      &self._reserved_price, &self._optimal_spread)
+        c_calculate_optimal_bid_ask(price, vol, self._reserved_price, self._optimal_spread,
+                                    self._parameters_based_on_spread, min_spread, max_spread,
+                                    vol_to_spread_multiplier, &self._optimal_bid, &self._optimal_ask)
         # This is not what the algorithm will use as proposed bid and ask. This is just the raw output.
         # Optimal bid and optimal ask prices will be used
         if self._is_debug:
@@ -536,58 +553,29 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
         cdef:
             ExchangeBase market = self._market_info.market
             str trading_pair = self._market_info.trading_pair
-            str base_asset = self._market_info.base_asset
-            str quote_asset = self._market_info.quote_asset
-            object mid_price
             object base_value
             object inventory_value
             object target_inventory_value
 
-        price = self.get_price()
-        base_asset_amount = market.get_balance(base_asset)
-        quote_asset_amount = market.get_balance(quote_asset)
-        base_value = base_asset_amount * price
-        inventory_value = base_value + quote_asset_amount
+        base_value = self._base_balance * self._price
+        inventory_value = base_value + self._quote_balance
         target_inventory_value = inventory_value * self._inventory_target_base_pct
-        return market.c_quantize_order_amount(trading_pair, Decimal(str(target_inventory_value / price)))
+        return market.c_quantize_order_amount(trading_pair, Decimal(str(target_inventory_value / self._price)))
 
     cdef c_recalculate_parameters(self):
         cdef:
-            ExchangeBase market = self._market_info.market
-
-        q = (market.get_balance(self.base_asset) - self.c_calculate_target_inventory()) * self._q_adjustment_factor
-        vol = self.get_volatility()
-        price=self.get_price()
-
-        if q != 0:
-            # min_spread will be the expected, unless volatility times the multiplier exceeds it
-            min_spread = max(self._min_spread * price, self._vol_to_spread_multiplier * vol)
-            # If min_spread got inflated due to the multiplier, we apply the same inflation to max_spread
-            max_spread = (self._max_spread * price) * (min_spread / (self._min_spread * price))
-
-            # GAMMA
-            # If q or vol are close to 0, gamma will -> Inf. Is this desirable?
-            max_possible_gamma = min(
-                                    (max_spread - min_spread) / (2 * abs(q) * (vol ** 2)),
-                                    (max_spread * (2-self._inventory_risk_aversion) /
-                                     self._inventory_risk_aversion + min_spread) / (vol ** 2))
-            self._gamma = self._inventory_risk_aversion * max_possible_gamma
-
-            # KAPPA
-            # Want the maximum possible spread but with restrictions to avoid negative kappa or division by 0
-            max_spread_around_reserved_price = max_spread * (2-self._inventory_risk_aversion) + min_spread * self._inventory_risk_aversion
-            if (max_spread_around_reserved_price * self._gamma - (vol * self._gamma) **2) <= s_decimal_zero:
-                self._kappa = Decimal('1e100')  # Cap to kappa -> Infinity
-            else:
-                self._kappa = self._gamma / (Decimal.exp((max_spread_around_reserved_price * self._gamma - (vol * self._gamma) **2) / 2) - 1)
-
-            # ETA
-            # Want order_amount to be 10% of the original number if q is in the opposite extreme from target inventory
-            q_where_to_decay_order_amount = self.c_calculate_target_inventory() / (self._inventory_risk_aversion * Decimal.ln(Decimal("10")))
-            self._eta = s_decimal_one
-            if q_where_to_decay_order_amount != s_decimal_zero:
-                self._eta = self._eta / q_where_to_decay_order_amount
-
+            double q = (self._base_balance_float - self._target_inventory_float) * self._q_adjustment_factor
+            double vol = self.c_get_volatility()
+            double gamma
+            double kappa
+            double eta
+
+        if c_calculate_parameters(self._price_float, q, vol, self._target_inventory_float,
+                                  self._min_spread, self._max_spread, self._vol_to_spread_multiplier,
+                                  self._inventory_risk_aversion, &gamma, &kappa, &eta):
+            self._gamma = gamma
+            self._kappa = kappa
+            self._eta = eta
             self._latest_parameter_calculation_vol = vol
 
     cdef bint c_is_algorithm_ready(self):
@@ -735,18 +723,19 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
 
         # eta parameter is described in the paper as the shape parameter for having exponentially decreasing order amount
         # for orders that go against inventory target (i.e. Want to buy when excess inventory or sell when deficit inventory)
-        q = market.get_balance(self.base_asset) - self.c_calculate_target_inventory()
+        q = self._base_balance_float - self._target_inventory_float
         if len(proposal.buys) > 0:
             if q > 0:
+                amount_factor = Decimal(str(exp(-self._eta * q)))
                 for i, proposed in enumerate(proposal.buys):
-
-                    proposal.buys[i].size = market.c_quantize_order_amount(trading_pair, proposal.buys[i].size * Decimal.exp(-self._eta * q))
+                    proposal.buys[i].size = market.c_quantize_order_amount(trading_pair, proposal.buys[i].size * amount_factor)
                 proposal.buys = [o for o in proposal.buys if o.size > 0]
 
         if len(proposal.sells) > 0:
             if q < 0:
+                amount_factor = Decimal(str(exp(self._eta * q)))
                 for i, proposed in enumerate(proposal.sells):
-                    proposal.sells[i].size = market.c_quantize_order_amount(trading_pair, proposal.sells[i].size * Decimal.exp(self._eta * q))
+                    proposal.sells[i].size = market.c_quantize_order_amount(trading_pair, proposal.sells[i].size * amount_factor)
                 proposal.sells = [o for o in proposal.sells if o.size > 0]
 
     cdef object c_apply_add_transaction_costs(self, object proposal):
@@ -978,8 +967,8 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
 
     def dump_debug_variables(self):
         market = self._market_info.market
-        mid_price = self.get_price()
-        spread = Decimal(str(self.c_get_spread()))
+        mid_price = self._price_float
+        spread = self.c_get_spread()
 
         best_ask = mid_price + spread / 2
         new_ask = self._reserved_price + self._optimal_spread / 2
@@ -1015,14 +1004,14 @@ cdef class AvellanedaMarketMakingStrategy(StrategyBase):
                             self._optimal_ask,
                             (mid_price - (self._reserved_price - self._optimal_spread / 2)) / mid_price,
                             ((self._reserved_price + self._optimal_spread / 2) - mid_price) / mid_price,
-                            market.get_balance(self.base_asset),
-                            self.c_calculate_target_inventory(),
+                            self._base_balance,
+                            self._target_inventory,
                             self._time_left / self._closing_time,
                             self._avg_vol.current_value,
                             self._gamma,
                             self._kappa,
                             self._eta,
-                            self.volatility_diff_from_last_parameter_calculation(self.get_volatility()),
+                            self.volatility_diff_from_last_parameter_calculation(self.c_get_volatility()),
                             self.inventory_target_base_pct,
                             self._min_spread,
                             self._max_spread,
@@ -0,0 +1,31 @@
+# distutils: language=c++
+
+cdef bint c_calculate_parameters(double price,
+                                 double q,
+                                 double vol,
+                                 double target_inventory,
+                                 double min_spread,
+                                 double max_spread,
+                                 double vol_to_spread_multiplier,
+                                 double inventory_risk_aversion,
+                                 double *gamma,
+                                 double *kappa,
+                                 double *eta)
+cdef void c_calculate_reserved_price_and_optimal_spread(double price,
+                                                        double q,
+                                                        double vol,
+                                                        double gamma,
+                                                        double kappa,
+                                                        double time_left_fraction,
+                                                        double *reserved_price,
+                                                        double *optimal_spread)
+cdef void c_calculate_optimal_bid_ask(double price,
+                                      double vol,
+                                      double reserved_price,
+                                      double optimal_spread,
+                                      bint parameters_based_on_spread,
+                                      double min_spread,
+                                      double max_spread,
+                                      double vol_to_spread_multiplier,
+                                      double *optimal_bid,
+                                      double *optimal_ask)
@@ -0,0 +1,170 @@
+# distutils: language=c++
+
+"""
+The Avellaneda-Stoikov model calculations of AvellanedaMarketMakingStrategy, in double precision. Prices, spreads
+and volatility are in quote currency, q is the inventory deviation from target scaled by the strategy's q adjustment
+factor, and the strategy converts the results to Decimal when quantizing order prices.
+"""
+
+from libc.math cimport exp, fabs, log, log1p, INFINITY
+
+# The kappa used when the spread around the reserved price cannot be reached, i.e. kappa -> Inf.
+cdef double MAX_KAPPA = 1e100
+
+
+cdef bint c_calculate_parameters(double price,
+                                 double q,
+                                 double vol,
+                                 double target_inventory,
+                                 double min_spread,
+                                 double max_spread,
+                                 double vol_to_spread_multiplier,
+                                 double inventory_risk_aversion,
+                                 double *gamma,
+                                 double *kappa,
+                                 double *eta):
+    """
+    Calculates gamma (risk factor), kappa (order book depth factor) and eta (order amount shape factor) so that the
+    optimal spread stays between min_spread and max_spread (fractions of price), inflated when vol_to_spread_multiplier
+    times the volatility exceeds the min spread. Leaves them unchanged when q is 0.
+    :return: whether the parameters were calculated
+    """
+    cdef:
+        double min_spread_value
+        double max_spread_value
+        double max_spread_around_reserved_price
+        double exponent
+        double q_where_to_decay_order_amount
+        double variance = vol * vol
+
+    if q == 0:
+        return False
+    # min_spread will be the expected, unless volatility times the multiplier exceeds it
+    min_spread_value = max(min_spread * price, vol_to_spread_multiplier * vol)
+    # If min_spread got inflated due to the multiplier, we apply the same inflation to max_spread
+    max_spread_value = (max_spread * price) * (min_spread_value / (min_spread * price))
+
+    # GAMMA
+    gamma[0] = inventory_risk_aversion * min(
+        (max_spread_value - min_spread_value) / (2 * fabs(q) * variance),
+        (max_spread_value * (2 - inventory_risk_aversion) / inventory_risk_aversion + min_spread_value) / variance)
+
+    # KAPPA
+    # Want the maximum possible spread but with restrictions to avoid negative kappa or division by 0
+    max_spread_around_reserved_price = (max_spread_value * (2 - inventory_risk_aversion) +
+                                        min_spread_value * inventory_risk_aversion)
+    exponent = max_spread_around_reserved_price * gamma[0] - (vol * gamma[0]) ** 2
+    if exponent <= 0:
+        kappa[0] = MAX_KAPPA
+    else:
+        kappa[0] = gamma[0] / (exp(exponent / 2) - 1)
+
+    # ETA
+    # Want order_amount to be 10% of the original number if q is in the opposite extreme from target inventory
+    q_where_to_decay_order_amount = target_inventory / (inventory_risk_aversion * log(10))
+    eta[0] = 1
+    if q_where_to_decay_order_amount != 0:
+        eta[0] = 1 / q_where_to_decay_order_amount
+    return True
+
+
+cdef void c_calculate_reserved_price_and_optimal_spread(double price,
+                                                        double q,
+                                                        double vol,
+                                                        double gamma,
+                                                        double kappa,
+                                                        double time_left_fraction,
+                                                        double *reserved_price,
+                                                        double *optimal_spread):
+    cdef:
+        double variance = vol * vol
+    reserved_price[0] = price - (q * gamma * variance * time_left_fraction)
+    optimal_spread[0] = gamma * variance * time_left_fraction + 2 * log1p(gamma / kappa) / gamma
+
+
+cdef void c_calculate_optimal_bid_ask(double price,
+                                      double vol,
+                                      double reserved_price,
+                                      double optimal_spread,
+                                      bint parameters_based_on_spread,
+                                      double min_spread,
+                                      double max_spread,
+                                      double vol_to_spread_multiplier,
+                                      double *optimal_bid,
+                                      double *optimal_ask):
+    """
+    Calculates the bid and ask around the reserved price, limited to the spread settings when the parameters are
+    based on them, or else to the side of the mid price they are on.
+    """
+    cdef:
+        double spread_inflation_due_to_volatility
+        double min_limit_bid
+        double max_limit_bid
+        double min_limit_ask
+        double max_limit_ask
+
+    if parameters_based_on_spread:
+        spread_inflation_due_to_volatility = (max(vol_to_spread_multiplier * vol, price * min_spread) /
+                                              (price * min_spread))
+        min_limit_bid = price * (1 - max_spread * spread_inflation_due_to_volatility)
+        max_limit_bid = price * (1 - min_spread * spread_inflation_due_to_volatility)
+        min_limit_ask = price * (1 + min_spread * spread_inflation_due_to_volatility)
+        max_limit_ask = price * (1 + max_spread * spread_inflation_due_to_volatility)
+    else:
+        min_limit_bid = 0
+        max_limit_bid = min_limit_ask = price
+        max_limit_ask = INFINITY
+
+    optimal_ask[0] = min(max(reserved_price + optimal_spread / 2, min_limit_ask), max_limit_ask)
+    optimal_bid[0] = min(max(reserved_price - optimal_spread / 2, min_limit_bid), max_limit_bid)
+
+
+def calculate_parameters(double price,
+                         double q,
+                         double vol,
+                         double target_inventory,
+                         double min_spread,
+                         double max_spread,
+                         double vol_to_spread_multiplier,
+                         double inventory_risk_aversion):
+    """
+    :return: (gamma, kappa, eta), or None when q is 0
+    """
+    cdef:
+        double gamma
+        double kappa
+        double eta
+    if not c_calculate_parameters(price, q, vol, target_inventory, min_spread, max_spread, vol_to_spread_multiplier,
+                                  inventory_risk_aversion, &gamma, &kappa, &eta):
+        return None
+    return gamma, kappa, eta
+
+
+def calculate_reserved_price_and_optimal_spread(double price,
+                                                double q,
+                                                double vol,
+                                                double gamma,
+                                                double kappa,
+                                                double time_left_fraction):
+    cdef:
+        double reserved_price
+        double optimal_spread
+    c_calculate_reserved_price_and_optimal_spread(price, q, vol, gamma, kappa, time_left_fraction,
+                                                  &reserved_price, &optimal_spread)
+    return reserved_price, optimal_spread
+
+
+def calculate_optimal_bid_ask(double price,
+                              double vol,
+                              double reserved_price,
+                              double optimal_spread,
+                              bint parameters_based_on_spread,
+                              double min_spread,
+                              double max_spread,
+                              double vol_to_spread_multiplier):
+    cdef:
+        double optimal_bid
+        double optimal_ask
+    c_calculate_optimal_bid_ask(price, vol, reserved_price, optimal_spread, parameters_based_on_spread, min_spread,
+                                max_spread, vol_to_spread_multiplier, &optimal_bid, &optimal_ask)
+    return optimal_bid, optimal_ask
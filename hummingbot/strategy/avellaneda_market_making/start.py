@@ -1,4 +1,6 @@
 from typing import (
+    Any,
+    Dict,
     List,
     Tuple,
 )
@@ -15,18 +17,52 @@ from decimal import Decimal
 import pandas as pd
 
 
+def strategy_parameters(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the AvellanedaMarketMakingStrategy arguments from the values of the config map, other than the market, the
+    debug options and the logging options. Also used to build the strategy of backtests.
+    """
+    inventory_target_base_pct = config["inventory_target_base_pct"]
+    parameters_based_on_spread = config["parameters_based_on_spread"]
+    if parameters_based_on_spread:
+        risk_factor = order_book_depth_factor = order_amount_shape_factor = None
+        min_spread = config["min_spread"] / Decimal(100)
+        max_spread = config["max_spread"] / Decimal(100)
+        vol_to_spread_multiplier = config["vol_to_spread_multiplier"]
+        volatility_sensibility = config["volatility_sensibility"] / Decimal('100')
+        inventory_risk_aversion = config["inventory_risk_aversion"]
+    else:
+        min_spread = max_spread = vol_to_spread_multiplier = inventory_risk_aversion = volatility_sensibility = None
+        order_book_depth_factor = config["order_book_depth_factor"]
+        risk_factor = config["risk_factor"]
+        order_amount_shape_factor = config["order_amount_shape_factor"]
+    return dict(
+        order_amount=config["order_amount"],
+        order_optimization_enabled=config["order_optimization_enabled"],
+        inventory_target_base_pct=0 if inventory_target_base_pct is None else
+        inventory_target_base_pct / Decimal('100'),
+        order_refresh_time=config["order_refresh_time"],
+        order_refresh_tolerance_pct=config["order_refresh_tolerance_pct"] / Decimal('100'),
+        filled_order_delay=config["filled_order_delay"],
+        add_transaction_costs_to_orders=config["add_transaction_costs"],
+        parameters_based_on_spread=parameters_based_on_spread,
+        min_spread=min_spread,
+        max_spread=max_spread,
+        vol_to_spread_multiplier=vol_to_spread_multiplier,
+        volatility_sensibility=volatility_sensibility,
+        inventory_risk_aversion=inventory_risk_aversion,
+        order_book_depth_factor=order_book_depth_factor,
+        risk_factor=risk_factor,
+        order_amount_shape_factor=order_amount_shape_factor,
+        closing_time=config["closing_time"] * Decimal(3600 * 24 * 1e3),
+        volatility_buffer_size=config["volatility_buffer_size"],
+    )
+
+
 def start(self):
     try:
-        order_amount = c_map.get("order_amount").value
-        order_optimization_enabled = c_map.get("order_optimization_enabled").value
-        order_refresh_time = c_map.get("order_refresh_time").value
         exchange = c_map.get("exchange").value.lower()
         raw_trading_pair = c_map.get("market").value
-        inventory_target_base_pct = 0 if c_map.get("inventory_target_base_pct").value is None else \
-            c_map.get("inventory_target_base_pct").value / Decimal('100')
-        filled_order_delay = c_map.get("filled_order_delay").value
-        order_refresh_tolerance_pct = c_map.get("order_refresh_tolerance_pct").value / Decimal('100')
-        add_transaction_costs_to_orders = c_map.get("add_transaction_costs").value
 
         trading_pair: str = raw_trading_pair
         maker_assets: Tuple[str, str] = self._initialize_market_assets(exchange, [trading_pair])[0]
@@ -38,49 +74,17 @@ def start(self):
         self.market_trading_pair_tuples = [MarketTradingPairTuple(*maker_data)]
 
         strategy_logging_options = AvellanedaMarketMakingStrategy.OPTION_LOG_ALL
-        parameters_based_on_spread = c_map.get("parameters_based_on_spread").value
-        if parameters_based_on_spread:
-            risk_factor = order_book_depth_factor = order_amount_shape_factor = None
-            min_spread = c_map.get("min_spread").value / Decimal(100)
-            max_spread = c_map.get("max_spread").value / Decimal(100)
-            vol_to_spread_multiplier = c_map.get("vol_to_spread_multiplier").value
-            volatility_sensibility = c_map.get("volatility_sensibility").value / Decimal('100')
-            inventory_risk_aversion = c_map.get("inventory_risk_aversion").value
-        else:
-            min_spread = max_spread = vol_to_spread_multiplier = inventory_risk_aversion = volatility_sensibility = None
-            order_book_depth_factor = c_map.get("order_book_depth_factor").value
-            risk_factor = c_map.get("risk_factor").value
-            order_amount_shape_factor = c_map.get("order_amount_shape_factor").value
-        closing_time = c_map.get("closing_time").value * Decimal(3600 * 24 * 1e3)
-        volatility_buffer_size = c_map.get("volatility_buffer_size").value
         debug_csv_path = os.path.join(data_path(),
                                       HummingbotApplication.main_application().strategy_file_name.rsplit('.', 1)[0] +
                                       f"_{pd.Timestamp.now().strftime('%Y-%m-%d_%H-%M-%S')}.csv")
 
         self.strategy = AvellanedaMarketMakingStrategy(
             market_info=MarketTradingPairTuple(*maker_data),
-            order_amount=order_amount,
-            order_optimization_enabled=order_optimization_enabled,
-            inventory_target_base_pct=inventory_target_base_pct,
-            order_refresh_time=order_refresh_time,
-            order_refresh_tolerance_pct=order_refresh_tolerance_pct,
-            filled_order_delay=filled_order_delay,
-            add_transaction_costs_to_orders=add_transaction_costs_to_orders,
             logging_options=strategy_logging_options,
             hb_app_notification=True,
-            parameters_based_on_spread=parameters_based_on_spread,
-            min_spread=min_spread,
-            max_spread=max_spread,
-            vol_to_spread_multiplier=vol_to_spread_multiplier,
-            volatility_sensibility=volatility_sensibility,
-            inventory_risk_aversion=inventory_risk_aversion,
-            order_book_depth_factor=order_book_depth_factor,
-            risk_factor=risk_factor,
-            order_amount_shape_factor=order_amount_shape_factor,
-            closing_time=closing_time,
             debug_csv_path=debug_csv_path,
-            volatility_buffer_size=volatility_buffer_size,
-            is_debug=False
+            is_debug=False,
+            **strategy_parameters({key: cvar.value for key, cvar in c_map.items()})
         )
     except Exception as e:
         self._notify(str(e))
@@ -4,11 +4,11 @@ import asyncio
 from typing import Dict, List, Set
 import pandas as pd
 import numpy as np
-from statistics import mean
 import time
 from hummingbot.core.clock import Clock
 from hummingbot.logger import HummingbotLogger
 from hummingbot.strategy.strategy_py_base import StrategyPyBase
+from hummingbot.strategy.__utils__.trailing_indicators.average_true_range import AverageTrueRangeIndicator
 from hummingbot.connector.exchange_base import ExchangeBase
 from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
 from .data_types import Proposal, PriceSize
@@ -49,6 +49,7 @@ class LiquidityMiningStrategy(StrategyPyBase):
                  inventory_range_multiplier: Decimal = Decimal("1"),
                  volatility_interval: int = 60 * 5,
                  avg_volatility_period: int = 10,
+                 volatility_update_interval: float = 1.,
                  volatility_to_spread_multiplier: Decimal = Decimal("1"),
                  max_spread: Decimal = Decimal("-1"),
                  max_order_age: float = 60. * 60.,
@@ -67,6 +68,7 @@ class LiquidityMiningStrategy(StrategyPyBase):
         self._inventory_range_multiplier = inventory_range_multiplier
         self._volatility_interval = volatility_interval
         self._avg_volatility_period = avg_volatility_period
+        self._volatility_update_interval = volatility_update_interval
         self._volatility_to_spread_multiplier = volatility_to_spread_multiplier
         self._max_spread = max_spread
         self._max_order_age = max_order_age
@@ -78,8 +80,17 @@ class LiquidityMiningStrategy(StrategyPyBase):
         self._token_balances = {}
         self._sell_budgets = {}
         self._buy_budgets = {}
-        self._mid_prices = {market: [] for market in market_infos}
+        # The mid prices of the current volatility interval, a row per market in market_infos order, written at
+        # _mid_price_index. Each complete interval is a bar of the market's volatility indicator.
+        self._mid_prices = np.full((len(market_infos), volatility_interval), np.nan)
+        self._mid_price_index = 0
+        self._volatility_indicators = {market: AverageTrueRangeIndicator(bar_length=volatility_interval,
+                                                                         sampling_length=avg_volatility_period,
+                                                                         relative=True,
+                                                                         true_range=False)
+                                       for market in market_infos}
         self._volatility = {market: s_decimal_nan for market in self._market_infos}
+        self._last_vol_update = 0.
         self._last_vol_reported = 0.
         self._hb_app_notification = hb_app_notification
 
@@ -465,27 +476,31 @@ class LiquidityMiningStrategy(StrategyPyBase):
                 self._buy_budgets[market_info.trading_pair] += (event.amount * event.price)
 
     def update_mid_prices(self):
-        for market in self._market_infos:
-            mid_price = self._market_infos[market].get_mid_price()
-            self._mid_prices[market].append(mid_price)
-            # To avoid memory leak, we store only the last part of the list needed for volatility calculation
-            max_len = self._volatility_interval * self._avg_volatility_period
-            self._mid_prices[market] = self._mid_prices[market][-1 * max_len:]
+        self._mid_prices[:, self._mid_price_index] = [float(market_info.get_mid_price())
+                                                      for market_info in self._market_infos.values()]
+        self._mid_price_index = (self._mid_price_index + 1) % self._mid_prices.shape[1]
+        if self._mid_price_index == 0:
+            # The interval is complete, its bars are added to the indicators of the markets that had mid prices.
+            highs = self._mid_prices.max(axis=1)
+            lows = self._mid_prices.min(axis=1)
+            for indicator, open_price, high, low, close in zip(self._volatility_indicators.values(),
+                                                               self._mid_prices[:, 0],
+                                                               highs,
+                                                               lows,
+                                                               self._mid_prices[:, -1]):
+                if not np.isnan(low):
+                    indicator.add_bar(open_price, high, low, close)
 
     def update_volatility(self):
-        self._volatility = {market: s_decimal_nan for market in self._market_infos}
-        for market, mid_prices in self._mid_prices.items():
-            last_index = len(mid_prices) - 1
-            atr = []
-            first_index = last_index - (self._volatility_interval * self._avg_volatility_period)
-            first_index = max(first_index, 0)
-            for i in range(last_index, first_index, self._volatility_interval * -1):
-                prices = mid_prices[i - self._volatility_interval + 1: i + 1]
-                if not prices:
-                    break
-                atr.append((max(prices) - min(prices)) / min(prices))
-            if atr:
-                self._volatility[market] = mean(atr)
+        """
+        Updates the volatility of each market, every volatility_update_interval seconds, as the average over the last
+        avg_volatility_period complete intervals of the mid price range over the interval, relative to its low.
+        """
+        if self._last_vol_update > self.current_timestamp - self._volatility_update_interval:
+            return
+        self._last_vol_update = self.current_timestamp
+        self._volatility = {market: Decimal(str(indicator.current_value))
+                            for market, indicator in self._volatility_indicators.items()}
         if self._last_vol_reported < self.current_timestamp - self._volatility_interval:
             for market, vol in self._volatility.items():
                 if not vol.is_nan():
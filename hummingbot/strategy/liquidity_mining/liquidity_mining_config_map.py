@@ -112,6 +112,14 @@ liquidity_mining_config_map = {
                   type_str="int",
                   validator=lambda v: validate_int(v, min_value=1, inclusive=False),
                   default=10),
+    "volatility_update_interval":
+        ConfigVar(key="volatility_update_interval",
+                  prompt="How often, in seconds, would you like to update market volatility (enter 1 to update it on "
+                         "every tick)? >>> ",
+                  type_str="float",
+                  required_if=lambda: False,
+                  validator=lambda v: validate_decimal(v, min_value=0, inclusive=False),
+                  default=1.),
     "volatility_to_spread_multiplier":
         ConfigVar(key="volatility_to_spread_multiplier",
                   prompt="Enter a multiplier used to convert average volatility to spread "
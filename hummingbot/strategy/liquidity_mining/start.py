@@ -21,6 +21,7 @@ def start(self):
     inventory_range_multiplier = c_map.get("inventory_range_multiplier").value
     volatility_interval = c_map.get("volatility_interval").value
     avg_volatility_period = c_map.get("avg_volatility_period").value
+    volatility_update_interval = c_map.get("volatility_update_interval").value
     volatility_to_spread_multiplier = c_map.get("volatility_to_spread_multiplier").value
     max_spread = c_map.get("max_spread").value / Decimal("100")
     max_order_age = c_map.get("max_order_age").value
@@ -44,6 +45,7 @@ def start(self):
         inventory_range_multiplier=inventory_range_multiplier,
         volatility_interval=volatility_interval,
         avg_volatility_period=avg_volatility_period,
+        volatility_update_interval=volatility_update_interval,
         volatility_to_spread_multiplier=volatility_to_spread_multiplier,
         max_spread=max_spread,
         max_order_age=max_order_age,
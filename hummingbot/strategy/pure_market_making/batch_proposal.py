@@ -0,0 +1,181 @@
+from decimal import Decimal
+from typing import (
+    Callable,
+    List,
+    Optional,
+)
+
+import numpy as np
+
+from .data_types import (
+    PriceSize,
+    Proposal,
+)
+
+s_decimal_zero = Decimal(0)
+
+
+def to_decimal(value: float) -> Decimal:
+    """
+    Converts a calculated float to Decimal for quantization, rounded to 12 significant digits so that float noise,
+    e.g. 98.99999999999999 for 99, does not move it to a lower quantum.
+    """
+    return Decimal(f"{value:.12g}")
+
+
+def to_decimals(values: np.ndarray) -> List[Decimal]:
+    """
+    Converts an array of calculated floats to Decimal, as to_decimal does.
+    """
+    return [Decimal(f"{value:.12g}") for value in values.tolist()]
+
+
+class BatchProposal:
+    """
+    The order levels of a proposal as float arrays, buys from the highest price and sells from the lowest, so that
+    the strategy's level, price and size modifiers apply to all levels at once. Prices and sizes are converted to
+    Decimal and quantized in one pass per side by to_proposal.
+    """
+    def __init__(self,
+                 buy_prices: np.ndarray,
+                 buy_sizes: np.ndarray,
+                 sell_prices: np.ndarray,
+                 sell_sizes: np.ndarray):
+        self.buy_prices: np.ndarray = buy_prices
+        self.buy_sizes: np.ndarray = buy_sizes
+        self.sell_prices: np.ndarray = sell_prices
+        self.sell_sizes: np.ndarray = sell_sizes
+
+    @classmethod
+    def from_levels(cls,
+                    buy_reference_price: float,
+                    sell_reference_price: float,
+                    bid_spread: float,
+                    ask_spread: float,
+                    order_level_spread: float,
+                    order_amount: float,
+                    order_level_amount: float,
+                    buy_levels: int,
+                    sell_levels: int) -> "BatchProposal":
+        buy_levels_range = np.arange(buy_levels, dtype=np.float64)
+        sell_levels_range = np.arange(sell_levels, dtype=np.float64)
+        return cls(buy_reference_price * (1. - bid_spread - buy_levels_range * order_level_spread),
+                   order_amount + order_level_amount * buy_levels_range,
+                   sell_reference_price * (1. + ask_spread + sell_levels_range * order_level_spread),
+                   order_amount + order_level_amount * sell_levels_range)
+
+    def __len__(self):
+        return len(self.buy_prices) + len(self.sell_prices)
+
+    def apply_price_band(self, price: float, price_ceiling: float, price_floor: float):
+        if price_ceiling > 0 and price >= price_ceiling:
+            self.buy_prices = self.buy_prices[:0]
+            self.buy_sizes = self.buy_sizes[:0]
+        if price_floor > 0 and price <= price_floor:
+            self.sell_prices = self.sell_prices[:0]
+            self.sell_sizes = self.sell_sizes[:0]
+
+    def remove_top_levels(self, buy_levels: int, sell_levels: int):
+        """
+        Removes the given number of levels closest to the mid price from each side, e.g. for ping pong.
+        """
+        self.buy_prices = self.buy_prices[buy_levels:]
+        self.buy_sizes = self.buy_sizes[buy_levels:]
+        self.sell_prices = self.sell_prices[sell_levels:]
+        self.sell_sizes = self.sell_sizes[sell_levels:]
+
+    def apply_order_optimization(self,
+                                 price_above_bid: Optional[float],
+                                 price_below_ask: Optional[float],
+                                 order_level_spread: float):
+        """
+        Moves the top level of a side to just above the top bid or below the top ask, if it is further away, and
+        re-spaces the next levels from it by order_level_spread. A side is left unchanged when its price is None.
+        """
+        if price_above_bid is not None and len(self.buy_prices) > 0:
+            top_buy_price = min(self.buy_prices[0], price_above_bid)
+            self.buy_prices = top_buy_price * (1. - order_level_spread * np.arange(len(self.buy_prices)))
+        if price_below_ask is not None and len(self.sell_prices) > 0:
+            top_sell_price = max(self.sell_prices[0], price_below_ask)
+            self.sell_prices = top_sell_price * (1. + order_level_spread * np.arange(len(self.sell_prices)))
+
+    def apply_transaction_costs(self, buy_fee_percent: float, sell_fee_percent: float):
+        self.buy_prices = self.buy_prices * (1. - buy_fee_percent)
+        self.sell_prices = self.sell_prices * (1. + sell_fee_percent)
+
+    def apply_inventory_skew(self, bid_ratio: float, ask_ratio: float):
+        self.buy_sizes = self.buy_sizes * bid_ratio
+        self.sell_sizes = self.sell_sizes * ask_ratio
+
+    def to_proposal(self,
+                    quantize_price: Callable[[Decimal], Decimal],
+                    quantize_amount: Callable[[Decimal, Decimal], Decimal]) -> Proposal:
+        """
+        Quantizes the levels into a Proposal, leaving out levels quantized to a 0 size.
+        :param quantize_price: quantizes a price
+        :param quantize_amount: quantizes an amount at a given price
+        """
+        return Proposal(self._quantize_side(self.buy_prices, self.buy_sizes, quantize_price, quantize_amount),
+                        self._quantize_side(self.sell_prices, self.sell_sizes, quantize_price, quantize_amount))
+
+    @staticmethod
+    def _quantize_side(prices: np.ndarray,
+                       sizes: np.ndarray,
+                       quantize_price: Callable[[Decimal], Decimal],
+                       quantize_amount: Callable[[Decimal, Decimal], Decimal]) -> List[PriceSize]:
+        quantized_prices: List[Decimal] = list(map(quantize_price, to_decimals(prices)))
+        quantized_sizes: List[Decimal] = list(map(quantize_amount, to_decimals(sizes), quantized_prices))
+        return [PriceSize(price, size) for price, size in zip(quantized_prices, quantized_sizes)
+                if size > s_decimal_zero]
+
+
+def budget_constrained_sizes(costs: np.ndarray, budget: float) -> np.ndarray:
+    """
+    Spends a budget on orders in sequence, each at its cost, until the budget runs out.
+    :return: the fraction of each order covered by the budget: 1 for fully covered orders, the fraction of the first
+    order that is not, and 0 for the orders after it
+    """
+    cumulative_costs: np.ndarray = np.cumsum(costs)
+    remaining_budgets: np.ndarray = budget - (cumulative_costs - costs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fractions: np.ndarray = np.where(costs > 0, remaining_budgets / costs, 0.)
+    return np.clip(fractions, 0., 1.)
+
+
+def apply_budget_constraint(proposal: Proposal,
+                            base_balance: Decimal,
+                            quote_balance: Decimal,
+                            buy_fee_percent: Decimal,
+                            quantize_amount: Callable[[Decimal, Decimal], Decimal]):
+    """
+    Adjusts the order sizes of a proposal so that buys, fees included, do not spend more than the quote balance and
+    sells do not spend more than the base balance. Orders are funded in sequence, the first order which cannot be
+    fully funded is reduced to the remaining balance and the orders after it are removed.
+    """
+    if len(proposal.buys) > 0:
+        fee_factor: Decimal = Decimal(1) + buy_fee_percent
+        quote_sizes: np.ndarray = np.array([float(buy.size * buy.price * fee_factor) for buy in proposal.buys])
+        fractions: np.ndarray = budget_constrained_sizes(quote_sizes, float(quote_balance))
+        partial = np.flatnonzero(fractions < 1.)
+        if len(partial) > 0:
+            index: int = int(partial[0])
+            if fractions[index] > 0:
+                spent: Decimal = sum((buy.size * buy.price * fee_factor for buy in proposal.buys[:index]),
+                                     s_decimal_zero)
+                buy = proposal.buys[index]
+                buy.size = quantize_amount((quote_balance - spent) / (buy.price * fee_factor), buy.price)
+                index += 1
+            proposal.buys = [buy for buy in proposal.buys[:index] if buy.size > 0]
+
+    if len(proposal.sells) > 0:
+        fractions: np.ndarray = budget_constrained_sizes(np.array([float(sell.size) for sell in proposal.sells]),
+                                                         float(base_balance))
+        partial = np.flatnonzero(fractions < 1.)
+        if len(partial) > 0:
+            index: int = int(partial[0])
+            if fractions[index] > 0:
+                spent: Decimal = sum((sell.size for sell in proposal.sells[:index]), s_decimal_zero)
+                sell = proposal.sells[index]
+                sell.size = quantize_amount(base_balance - spent, sell.price)
+                index += 1
+            proposal.sells = [sell for sell in proposal.sells[:index] if sell.size > 0]
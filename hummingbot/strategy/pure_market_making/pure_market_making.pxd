@@ -40,6 +40,7 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         list _ping_pong_warning_lines
         bint _hb_app_notification
         object _order_override
+        bint _batched_proposals
 
         double _cancel_timestamp
         double _create_timestamp
@@ -55,17 +56,23 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         list _hanging_aged_order_prices
 
     cdef object c_get_mid_price(self)
+    cdef tuple c_get_reference_prices(self)
     cdef object c_create_base_proposal(self)
+    cdef object c_create_batched_proposal(self)
+    cdef object c_get_level_fee_percent(self, object trade_type, object prices, object sizes)
     cdef tuple c_get_adjusted_available_balance(self, list orders)
     cdef c_apply_order_levels_modifiers(self, object proposal)
     cdef c_apply_price_band(self, object proposal)
+    cdef tuple c_get_ping_pong_removed_levels(self)
     cdef c_apply_ping_pong(self, object proposal)
     cdef c_apply_order_price_modifiers(self, object proposal)
     cdef c_apply_order_size_modifiers(self, object proposal)
+    cdef object c_get_inventory_skew_ratios(self)
     cdef c_apply_inventory_skew(self, object proposal)
     cdef c_apply_budget_constraint(self, object proposal)
 
     cdef c_filter_out_takers(self, object proposal)
+    cdef object c_get_order_optimization_price(self, bint is_buy)
     cdef c_apply_order_optimization(self, object proposal)
     cdef c_apply_add_transaction_costs(self, object proposal)
     cdef bint c_is_within_tolerance(self, list current_prices, list proposal_prices)
@@ -29,6 +29,10 @@ from .data_types import (
     Proposal,
     PriceSize
 )
+from .batch_proposal import (
+    BatchProposal,
+    apply_budget_constraint,
+)
 from .pure_market_making_order_tracker import PureMarketMakingOrderTracker
 
 from .asset_price_delegate cimport AssetPriceDelegate
@@ -94,6 +98,7 @@ cdef class PureMarketMakingStrategy(StrategyBase):
                  minimum_spread: Decimal = Decimal(0),
                  hb_app_notification: bool = False,
                  order_override: Dict[str, List[str]] = {},
+                 batched_proposals: bool = False,
                  ):
 
         if price_ceiling != s_decimal_neg_one and price_ceiling < price_floor:
@@ -134,6 +139,7 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         self._ping_pong_warning_lines = []
         self._hb_app_notification = hb_app_notification
         self._order_override = order_override
+        self._batched_proposals = batched_proposals
 
         self._cancel_timestamp = 0
         self._create_timestamp = 0
@@ -153,7 +159,9 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         self.c_add_markets([market_info.market])
 
     def all_markets_ready(self):
-        return all([market.ready for market in self._sb_markets])
+        # Only the strategy's trading pair needs to be ready, not the order books of the other trading pairs of the
+        # market.
+        return self._market_info.market.trading_pair_ready(self._market_info.trading_pair)
 
     @property
     def market_info(self) -> MarketTradingPairTuple:
@@ -349,6 +357,14 @@ cdef class PureMarketMakingStrategy(StrategyBase):
     def order_override(self, value: Dict[str, List[str]]):
         self._order_override = value
 
+    @property
+    def batched_proposals(self) -> bool:
+        return self._batched_proposals
+
+    @batched_proposals.setter
+    def batched_proposals(self, value: bool):
+        self._batched_proposals = value
+
     def get_price(self) -> float:
         price_provider = self._asset_price_delegate or self._market_info
         if self._price_type is PriceType.LastOwnTrade:
@@ -650,7 +666,7 @@ cdef class PureMarketMakingStrategy(StrategyBase):
             cdef object proposal
         try:
             if not self._all_markets_ready:
-                self._all_markets_ready = all([market.ready for market in self._sb_markets])
+                self._all_markets_ready = self.all_markets_ready()
                 if self._asset_price_delegate is not None and self._all_markets_ready:
                     self._all_markets_ready = self._asset_price_delegate.ready
                 if not self._all_markets_ready:
@@ -668,16 +684,20 @@ cdef class PureMarketMakingStrategy(StrategyBase):
             asset_mid_price = Decimal("0")
             # asset_mid_price = self.c_set_mid_price(market_info)
             if self._create_timestamp <= self._current_timestamp:
-                # 1. Create base order proposals
-                proposal = self.c_create_base_proposal()
-                # 2. Apply functions that limit numbers of buys and sells proposal
-                self.c_apply_order_levels_modifiers(proposal)
-                # 3. Apply functions that modify orders price
-                self.c_apply_order_price_modifiers(proposal)
-                # 4. Apply functions that modify orders size
-                self.c_apply_order_size_modifiers(proposal)
-                # 5. Apply budget constraint, i.e. can't buy/sell more than what you have.
-                self.c_apply_budget_constraint(proposal)
+                if self._batched_proposals and not self._order_override:
+                    # Steps 1 to 5 below, over all order levels at once
+                    proposal = self.c_create_batched_proposal()
+                else:
+                    # 1. Create base order proposals
+                    proposal = self.c_create_base_proposal()
+                    # 2. Apply functions that limit numbers of buys and sells proposal
+                    self.c_apply_order_levels_modifiers(proposal)
+                    # 3. Apply functions that modify orders price
+                    self.c_apply_order_price_modifiers(proposal)
+                    # 4. Apply functions that modify orders size
+                    self.c_apply_order_size_modifiers(proposal)
+                    # 5. Apply budget constraint, i.e. can't buy/sell more than what you have.
+                    self.c_apply_budget_constraint(proposal)
 
                 if not self._take_if_crossed:
                     self.c_filter_out_takers(proposal)
@@ -693,11 +713,12 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         finally:
             self._last_timestamp = timestamp
 
-    cdef object c_create_base_proposal(self):
+    cdef tuple c_get_reference_prices(self):
+        """
+        :return: (buy reference price, sell reference price) of the order levels
+        """
         cdef:
             ExchangeBase market = self._market_info.market
-            list buys = []
-            list sells = []
 
         buy_reference_price = sell_reference_price = self.get_price()
 
@@ -710,6 +731,15 @@ cdef class PureMarketMakingStrategy(StrategyBase):
                 base_balance = float(market.get_balance(self._market_info.base_asset))
                 if base_balance > 0:
                     raise RuntimeError("Initial inventory price is not set while inventory_cost feature is active.")
+        return buy_reference_price, sell_reference_price
+
+    cdef object c_create_base_proposal(self):
+        cdef:
+            ExchangeBase market = self._market_info.market
+            list buys = []
+            list sells = []
+
+        buy_reference_price, sell_reference_price = self.c_get_reference_prices()
 
         # First to check if a customized order override is configured, otherwise the proposal will be created according
         # to order spread, amount, and levels setting.
@@ -749,6 +779,73 @@ cdef class PureMarketMakingStrategy(StrategyBase):
 
         return Proposal(buys, sells)
 
+    cdef object c_create_batched_proposal(self):
+        """
+        Creates the order levels proposal and applies the price band, ping pong, order price modifiers, inventory skew
+        and budget constraint to all levels at once. Level prices and sizes are calculated in floats and quantized in
+        one pass, after the price and size modifiers, so they can differ by a quantum from c_create_base_proposal
+        followed by the modifiers, which quantize after each step. Fees are taken as the same for all levels of a
+        side.
+        """
+        cdef:
+            ExchangeBase market = self._market_info.market
+            str trading_pair = self._market_info.trading_pair
+            object batch
+            object proposal
+            object price_above_bid = None
+            object price_below_ask = None
+
+        buy_reference_price, sell_reference_price = self.c_get_reference_prices()
+        batch = BatchProposal.from_levels(float(buy_reference_price),
+                                          float(sell_reference_price),
+                                          float(self._bid_spread),
+                                          float(self._ask_spread),
+                                          float(self._order_level_spread),
+                                          float(self._order_amount),
+                                          float(self._order_level_amount),
+                                          self._buy_levels,
+                                          self._sell_levels)
+        batch.apply_price_band(float(self.get_price()), float(self._price_ceiling), float(self._price_floor))
+        if self._ping_pong_enabled:
+            batch.remove_top_levels(*self.c_get_ping_pong_removed_levels())
+
+        if self._order_optimization_enabled:
+            if len(batch.buy_prices) > 0:
+                price_above_bid = float(self.c_get_order_optimization_price(True))
+            if len(batch.sell_prices) > 0:
+                price_below_ask = float(self.c_get_order_optimization_price(False))
+            batch.apply_order_optimization(price_above_bid, price_below_ask, float(self._order_level_spread))
+        if self._add_transaction_costs_to_orders and len(batch) > 0:
+            batch.apply_transaction_costs(
+                float(self.c_get_level_fee_percent(TradeType.BUY, batch.buy_prices, batch.buy_sizes)),
+                float(self.c_get_level_fee_percent(TradeType.SELL, batch.sell_prices, batch.sell_sizes)))
+        if self._inventory_skew_enabled:
+            bid_ask_ratios = self.c_get_inventory_skew_ratios()
+            batch.apply_inventory_skew(bid_ask_ratios.bid_ratio, bid_ask_ratios.ask_ratio)
+
+        quantize_amount = lambda amount, price: market.c_quantize_order_amount(trading_pair, amount, price)
+        proposal = batch.to_proposal(lambda price: market.c_quantize_order_price(trading_pair, price),
+                                     quantize_amount)
+
+        base_balance, quote_balance = self.c_get_adjusted_available_balance(self.active_non_hanging_orders)
+        buy_fee_percent = s_decimal_zero
+        if len(proposal.buys) > 0:
+            buy_fee_percent = market.c_get_fee(self.base_asset, self.quote_asset, OrderType.LIMIT, TradeType.BUY,
+                                               proposal.buys[0].size, proposal.buys[0].price).percent
+        apply_budget_constraint(proposal, base_balance, quote_balance, buy_fee_percent, quantize_amount)
+        return proposal
+
+    cdef object c_get_level_fee_percent(self, object trade_type, object prices, object sizes):
+        """
+        :return: the fee percent of the top order level of a side, 0 if the side has no levels
+        """
+        cdef:
+            ExchangeBase market = self._market_info.market
+        if len(prices) == 0:
+            return s_decimal_zero
+        return market.c_get_fee(self.base_asset, self.quote_asset, self._limit_order_type, trade_type,
+                                Decimal(str(sizes[0])), Decimal(str(prices[0]))).percent
+
     cdef tuple c_get_adjusted_available_balance(self, list orders):
         """
         Calculates the available balance, plus the amount attributed to orders.
@@ -778,20 +875,30 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         if self._price_floor > 0 and self.get_price() <= self._price_floor:
             proposal.sells = []
 
-    cdef c_apply_ping_pong(self, object proposal):
+    cdef tuple c_get_ping_pong_removed_levels(self):
+        """
+        Resets the filled balances once buys and sells are even.
+        :return: (number of buy levels, number of sell levels) that ping pong removes
+        """
         self._ping_pong_warning_lines = []
         if self._filled_buys_balance == self._filled_sells_balance:
             self._filled_buys_balance = self._filled_sells_balance = 0
         if self._filled_buys_balance > 0:
-            proposal.buys = proposal.buys[self._filled_buys_balance:]
             self._ping_pong_warning_lines.extend(
                 [f"  Ping-pong removed {self._filled_buys_balance} buy orders."]
             )
         if self._filled_sells_balance > 0:
-            proposal.sells = proposal.sells[self._filled_sells_balance:]
             self._ping_pong_warning_lines.extend(
                 [f"  Ping-pong removed {self._filled_sells_balance} sell orders."]
             )
+        return self._filled_buys_balance, self._filled_sells_balance
+
+    cdef c_apply_ping_pong(self, object proposal):
+        buy_levels, sell_levels = self.c_get_ping_pong_removed_levels()
+        if buy_levels > 0:
+            proposal.buys = proposal.buys[buy_levels:]
+        if sell_levels > 0:
+            proposal.sells = proposal.sells[sell_levels:]
 
     cdef c_apply_order_price_modifiers(self, object proposal):
         if self._order_optimization_enabled:
@@ -804,23 +911,26 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         if self._inventory_skew_enabled:
             self.c_apply_inventory_skew(proposal)
 
-    cdef c_apply_inventory_skew(self, object proposal):
-        cdef:
-            ExchangeBase market = self._market_info.market
-            object bid_adj_ratio
-            object ask_adj_ratio
-            object size
-
+    cdef object c_get_inventory_skew_ratios(self):
         base_balance, quote_balance = self.c_get_adjusted_available_balance(self.active_orders)
 
         total_order_size = calculate_total_order_size(self._order_amount, self._order_level_amount, self._order_levels)
-        bid_ask_ratios = c_calculate_bid_ask_ratios_from_base_asset_ratio(
+        return c_calculate_bid_ask_ratios_from_base_asset_ratio(
             float(base_balance),
             float(quote_balance),
             float(self.get_price()),
             float(self._inventory_target_base_pct),
             float(total_order_size * self._inventory_range_multiplier)
         )
+
+    cdef c_apply_inventory_skew(self, object proposal):
+        cdef:
+            ExchangeBase market = self._market_info.market
+            object bid_adj_ratio
+            object ask_adj_ratio
+            object size
+
+        bid_ask_ratios = self.c_get_inventory_skew_ratios()
         bid_adj_ratio = Decimal(bid_ask_ratios.bid_ratio)
         ask_adj_ratio = Decimal(bid_ask_ratios.ask_ratio)
 
@@ -892,29 +1002,47 @@ cdef class PureMarketMakingStrategy(StrategyBase):
         if not top_bid.is_nan():
             proposal.sells = [sell for sell in proposal.sells if sell.price > top_bid]
 
-    # Compare the market price with the top bid and top ask price
-    cdef c_apply_order_optimization(self, object proposal):
+    cdef object c_get_order_optimization_price(self, bint is_buy):
+        """
+        :return: the price one quantum above the top bid for buys, or below the top ask for sells, taken at the
+        optimization depth plus own order volume
+        """
         cdef:
             ExchangeBase market = self._market_info.market
-            object own_buy_size = s_decimal_zero
-            object own_sell_size = s_decimal_zero
+            object own_size = s_decimal_zero
 
         for order in self.active_orders:
-            if order.is_buy:
-                own_buy_size = order.quantity
-            else:
-                own_sell_size = order.quantity
+            if order.is_buy == is_buy:
+                own_size = order.quantity
 
-        if len(proposal.buys) > 0:
+        if is_buy:
             # Get the top bid price in the market using order_optimization_depth and your buy order volume
             top_bid_price = self._market_info.get_price_for_volume(
-                False, self._bid_order_optimization_depth + own_buy_size).result_price
+                False, self._bid_order_optimization_depth + own_size).result_price
             price_quantum = market.c_get_order_price_quantum(
                 self.trading_pair,
                 top_bid_price
             )
             # Get the price above the top bid
-            price_above_bid = (ceil(top_bid_price / price_quantum) + 1) * price_quantum
+            return (ceil(top_bid_price / price_quantum) + 1) * price_quantum
+
+        # Get the top ask price in the market using order_optimization_depth and your sell order volume
+        top_ask_price = self._market_info.get_price_for_volume(
+            True, self._ask_order_optimization_depth + own_size).result_price
+        price_quantum = market.c_get_order_price_quantum(
+            self.trading_pair,
+            top_ask_price
+        )
+        # Get the price below the top ask
+        return (floor(top_ask_price / price_quantum) - 1) * price_quantum
+
+    # Compare the market price with the top bid and top ask price
+    cdef c_apply_order_optimization(self, object proposal):
+        cdef:
+            ExchangeBase market = self._market_info.market
+
+        if len(proposal.buys) > 0:
+            price_above_bid = self.c_get_order_optimization_price(True)
 
             # If the price_above_bid is lower than the price suggested by the top pricing proposal,
             # lower the price and from there apply the order_level_spread to each order in the next levels
@@ -924,15 +1052,7 @@ cdef class PureMarketMakingStrategy(StrategyBase):
                 proposal.buys[i].price = market.c_quantize_order_price(self.trading_pair, lower_buy_price) * (1 - self.order_level_spread * i)
 
         if len(proposal.sells) > 0:
-            # Get the top ask price in the market using order_optimization_depth and your sell order volume
-            top_ask_price = self._market_info.get_price_for_volume(
-                True, self._ask_order_optimization_depth + own_sell_size).result_price
-            price_quantum = market.c_get_order_price_quantum(
-                self.trading_pair,
-                top_ask_price
-            )
-            # Get the price below the top ask
-            price_below_ask = (floor(top_ask_price / price_quantum) - 1) * price_quantum
+            price_below_ask = self.c_get_order_optimization_price(False)
 
             # If the price_below_ask is higher than the price suggested by the pricing proposal,
             # increase your price and from there apply the order_level_spread to each order in the next levels
@@ -354,4 +354,11 @@ pure_market_making_config_map = {
                   required_if=lambda: False,
                   default=None,
                   type_str="json"),
+    "batched_proposals":
+        ConfigVar(key="batched_proposals",
+                  prompt="Do you want to create order level proposals in one batch? (Yes/No) >>> ",
+                  type_str="bool",
+                  required_if=lambda: False,
+                  default=False,
+                  validator=validate_bool),
 }
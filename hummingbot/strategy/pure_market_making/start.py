@@ -1,4 +1,6 @@
 from typing import (
+    Any,
+    Dict,
     List,
     Tuple,
 )
@@ -17,40 +19,54 @@ from hummingbot.connector.exchange_base import ExchangeBase
 from decimal import Decimal
 
 
+def strategy_parameters(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the PureMarketMakingStrategy arguments from the values of the config map, other than the market, the price
+    delegates and the logging options. Also used to build the strategy of backtests.
+    """
+    inventory_target_base_pct = config["inventory_target_base_pct"]
+    order_override = config["order_override"]
+    return dict(
+        bid_spread=config["bid_spread"] / Decimal('100'),
+        ask_spread=config["ask_spread"] / Decimal('100'),
+        order_levels=config["order_levels"],
+        order_amount=config["order_amount"],
+        order_level_spread=config["order_level_spread"] / Decimal('100'),
+        order_level_amount=config["order_level_amount"],
+        inventory_skew_enabled=config["inventory_skew_enabled"],
+        inventory_target_base_pct=0 if inventory_target_base_pct is None else
+        inventory_target_base_pct / Decimal('100'),
+        inventory_range_multiplier=config["inventory_range_multiplier"],
+        filled_order_delay=config["filled_order_delay"],
+        hanging_orders_enabled=config["hanging_orders_enabled"],
+        order_refresh_time=config["order_refresh_time"],
+        max_order_age=config["max_order_age"],
+        order_optimization_enabled=config["order_optimization_enabled"],
+        ask_order_optimization_depth=config["ask_order_optimization_depth"],
+        bid_order_optimization_depth=config["bid_order_optimization_depth"],
+        add_transaction_costs_to_orders=config["add_transaction_costs"],
+        price_type=config["price_type"],
+        take_if_crossed=config["take_if_crossed"],
+        price_ceiling=config["price_ceiling"],
+        price_floor=config["price_floor"],
+        ping_pong_enabled=config["ping_pong_enabled"],
+        hanging_orders_cancel_pct=config["hanging_orders_cancel_pct"] / Decimal('100'),
+        order_refresh_tolerance_pct=config["order_refresh_tolerance_pct"] / Decimal('100'),
+        minimum_spread=config["minimum_spread"] / Decimal('100'),
+        order_override={} if order_override is None else order_override,
+        batched_proposals=config["batched_proposals"],
+    )
+
+
 def start(self):
     try:
-        order_amount = c_map.get("order_amount").value
-        order_refresh_time = c_map.get("order_refresh_time").value
-        max_order_age = c_map.get("max_order_age").value
-        bid_spread = c_map.get("bid_spread").value / Decimal('100')
-        ask_spread = c_map.get("ask_spread").value / Decimal('100')
-        minimum_spread = c_map.get("minimum_spread").value / Decimal('100')
-        price_ceiling = c_map.get("price_ceiling").value
-        price_floor = c_map.get("price_floor").value
-        ping_pong_enabled = c_map.get("ping_pong_enabled").value
-        order_levels = c_map.get("order_levels").value
-        order_level_amount = c_map.get("order_level_amount").value
-        order_level_spread = c_map.get("order_level_spread").value / Decimal('100')
         exchange = c_map.get("exchange").value.lower()
         raw_trading_pair = c_map.get("market").value
-        inventory_skew_enabled = c_map.get("inventory_skew_enabled").value
-        inventory_target_base_pct = 0 if c_map.get("inventory_target_base_pct").value is None else \
-            c_map.get("inventory_target_base_pct").value / Decimal('100')
-        inventory_range_multiplier = c_map.get("inventory_range_multiplier").value
-        filled_order_delay = c_map.get("filled_order_delay").value
-        hanging_orders_enabled = c_map.get("hanging_orders_enabled").value
-        hanging_orders_cancel_pct = c_map.get("hanging_orders_cancel_pct").value / Decimal('100')
-        order_optimization_enabled = c_map.get("order_optimization_enabled").value
-        ask_order_optimization_depth = c_map.get("ask_order_optimization_depth").value
-        bid_order_optimization_depth = c_map.get("bid_order_optimization_depth").value
-        add_transaction_costs_to_orders = c_map.get("add_transaction_costs").value
         price_source = c_map.get("price_source").value
         price_type = c_map.get("price_type").value
         price_source_exchange = c_map.get("price_source_exchange").value
         price_source_market = c_map.get("price_source_market").value
         price_source_custom_api = c_map.get("price_source_custom_api").value
-        order_refresh_tolerance_pct = c_map.get("order_refresh_tolerance_pct").value / Decimal('100')
-        order_override = c_map.get("order_override").value
 
         trading_pair: str = raw_trading_pair
         maker_assets: Tuple[str, str] = self._initialize_market_assets(exchange, [trading_pair])[0]
@@ -72,42 +88,16 @@ def start(self):
         if price_type == "inventory_cost":
             db = HummingbotApplication.main_application().trade_fill_db
             inventory_cost_price_delegate = InventoryCostPriceDelegate(db, trading_pair)
-        take_if_crossed = c_map.get("take_if_crossed").value
 
         strategy_logging_options = PureMarketMakingStrategy.OPTION_LOG_ALL
 
         self.strategy = PureMarketMakingStrategy(
             market_info=MarketTradingPairTuple(*maker_data),
-            bid_spread=bid_spread,
-            ask_spread=ask_spread,
-            order_levels=order_levels,
-            order_amount=order_amount,
-            order_level_spread=order_level_spread,
-            order_level_amount=order_level_amount,
-            inventory_skew_enabled=inventory_skew_enabled,
-            inventory_target_base_pct=inventory_target_base_pct,
-            inventory_range_multiplier=inventory_range_multiplier,
-            filled_order_delay=filled_order_delay,
-            hanging_orders_enabled=hanging_orders_enabled,
-            order_refresh_time=order_refresh_time,
-            max_order_age = max_order_age,
-            order_optimization_enabled=order_optimization_enabled,
-            ask_order_optimization_depth=ask_order_optimization_depth,
-            bid_order_optimization_depth=bid_order_optimization_depth,
-            add_transaction_costs_to_orders=add_transaction_costs_to_orders,
             logging_options=strategy_logging_options,
             asset_price_delegate=asset_price_delegate,
             inventory_cost_price_delegate=inventory_cost_price_delegate,
-            price_type=price_type,
-            take_if_crossed=take_if_crossed,
-            price_ceiling=price_ceiling,
-            price_floor=price_floor,
-            ping_pong_enabled=ping_pong_enabled,
-            hanging_orders_cancel_pct=hanging_orders_cancel_pct,
-            order_refresh_tolerance_pct=order_refresh_tolerance_pct,
-            minimum_spread=minimum_spread,
             hb_app_notification=True,
-            order_override={} if order_override is None else order_override,
+            **strategy_parameters({key: cvar.value for key, cvar in c_map.items()})
         )
     except Exception as e:
         self._notify(str(e))
@@ -33,6 +33,7 @@ def main():
     version = "20210518"
     packages = [
         "hummingbot",
+        "hummingbot.backtest",
         "hummingbot.client",
         "hummingbot.client.command",
         "hummingbot.client.config",
@@ -137,6 +138,7 @@ def main():
         "multidict",
         "numpy",
         "pandas",
+        "pyarrow",
         "pytz",
         "pyyaml",
         "python-binance==0.7.5",
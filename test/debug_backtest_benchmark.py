@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""
+Benchmark for the backtest subsystem.
+
+Generates a day of 100ms market data, replays it through a backtest market alone, and then through a backtest market
+traded by the pure market making strategy, reporting the throughput in ticks and market data events per second.
+"""
+
+from os.path import join, realpath
+import sys; sys.path.insert(0, realpath(join(__file__, "../../")))
+
+import time
+from decimal import Decimal
+from typing import List
+
+from hummingbot.backtest.backtest_market import BacktestMarket
+from hummingbot.backtest.backtest_runner import (
+    BacktestResult,
+    BacktestRunner,
+)
+from hummingbot.backtest.market_data import generate_market_data
+from hummingbot.core.time_iterator import TimeIterator
+from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
+from hummingbot.strategy.pure_market_making import PureMarketMakingStrategy
+
+TRADING_PAIR = "HBOT-USDT"
+DURATION = 24 * 60 * 60
+TICK_SIZE = 0.1
+
+
+def make_market(data) -> BacktestMarket:
+    market = BacktestMarket(latency=0.05)
+    market.add_data(TRADING_PAIR, "HBOT", "USDT", data, Decimal("0.01"), Decimal("0.001"))
+    market.set_balance("HBOT", Decimal(1000))
+    market.set_balance("USDT", Decimal(100000))
+    return market
+
+
+def run(label: str, market: BacktestMarket, strategies: List[TimeIterator]) -> BacktestResult:
+    result = BacktestRunner(market, strategies, tick_size=TICK_SIZE).run()
+    print(f"  {label:<28} {result.wall_time:>8.2f} s {result.ticks_per_second:>12,.0f} ticks/s "
+          f"{result.events_per_second:>12,.0f} events/s {result.fill_count:>8} fills")
+    return result
+
+
+def main():
+    start = time.perf_counter()
+    data = generate_market_data(0, DURATION, interval=TICK_SIZE)
+    print(f"Generated {len(data):,} market data events over {DURATION}s in {time.perf_counter() - start:.2f}s.")
+
+    print(f"Backtest of {DURATION}s at a {TICK_SIZE}s tick:")
+    run("market only", make_market(data), [])
+    market = make_market(data)
+    strategy = PureMarketMakingStrategy(MarketTradingPairTuple(market, TRADING_PAIR, "HBOT", "USDT"),
+                                        bid_spread=Decimal("0.0005"),
+                                        ask_spread=Decimal("0.0005"),
+                                        order_amount=Decimal("1"),
+                                        order_levels=3,
+                                        order_level_spread=Decimal("0.001"),
+                                        order_refresh_time=10,
+                                        logging_options=0)
+    result = run("pure market making", market, [strategy])
+    print(f"  real time speedup: {DURATION / result.wall_time:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
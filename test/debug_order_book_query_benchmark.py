@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+
+"""
+Microbenchmark for the order book depth queries.
+
+Compares the C++ set traversal used by `OrderBook.c_get_*`, and the optional cumulative depth index, against the
+previous implementation, which walked the `OrderBookRow` generators returned by `bid_entries()` / `ask_entries()`.
+"""
+
+from os.path import join, realpath
+import sys; sys.path.insert(0, realpath(join(__file__, "../../")))
+
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import (
+    OrderBookMessage,
+    OrderBookMessageType,
+    entries_to_numpy,
+)
+from hummingbot.core.data_type.order_book_row import OrderBookRow
+
+NaN = float("nan")
+LEVELS = 5000
+ITERATIONS = 200
+
+
+def make_order_book(levels: int = LEVELS, depth_index: bool = False) -> OrderBook:
+    rng = np.random.RandomState(42)
+    mid_price = 100.0
+    tick = 0.01
+    bids = np.zeros((levels, 3), dtype=np.float64)
+    asks = np.zeros((levels, 3), dtype=np.float64)
+    bids[:, 0] = mid_price - tick * np.arange(1, levels + 1)
+    asks[:, 0] = mid_price + tick * np.arange(1, levels + 1)
+    bids[:, 1] = rng.uniform(0.1, 10, levels)
+    asks[:, 1] = rng.uniform(0.1, 10, levels)
+    bids[:, 2] = asks[:, 2] = 1
+    order_book = OrderBook(depth_index=depth_index)
+    order_book.apply_numpy_snapshot(bids, asks)
+    return order_book
+
+
+def entries_vwap_for_volume(order_book: OrderBook, is_buy: bool, volume: float) -> float:
+    total_cost = 0
+    total_volume = 0
+    for row in (order_book.ask_entries() if is_buy else order_book.bid_entries()):
+        if total_volume + row.amount >= volume:
+            total_cost += (volume - total_volume) * row.price
+            return total_cost / volume
+        total_cost += row.amount * row.price
+        total_volume += row.amount
+    return NaN
+
+
+def entries_volume_for_price(order_book: OrderBook, is_buy: bool, price: float) -> float:
+    cumulative_volume = 0
+    for row in (order_book.ask_entries() if is_buy else order_book.bid_entries()):
+        if (row.price > price) if is_buy else (row.price < price):
+            break
+        cumulative_volume += row.amount
+    return cumulative_volume
+
+
+def entries_snapshot(order_book: OrderBook):
+    bids_df = pd.DataFrame(data=list(order_book.bid_entries()), columns=OrderBookRow._fields, dtype="float64")
+    asks_df = pd.DataFrame(data=list(order_book.ask_entries()), columns=OrderBookRow._fields, dtype="float64")
+    return bids_df, asks_df
+
+
+def make_diff_contents(count: int = 1000, entries: int = 20):
+    rng = np.random.RandomState(42)
+    return [{
+        "trading_pair": "BTC-USDT",
+        "update_id": update_id,
+        "bids": [[f"{100 - rng.randint(1, 500) * 0.01:.2f}", f"{rng.uniform(0, 5):.8f}"] for _ in range(entries)],
+        "asks": [[f"{100 + rng.randint(1, 500) * 0.01:.2f}", f"{rng.uniform(0, 5):.8f}"] for _ in range(entries)],
+    } for update_id in range(2, count + 2)]
+
+
+def apply_row_diffs(order_book: OrderBook, contents):
+    for content in contents:
+        message = OrderBookMessage(OrderBookMessageType.DIFF, content)
+        order_book.apply_diffs(message.bids, message.asks, message.update_id)
+
+
+def apply_array_diffs(order_book: OrderBook, contents):
+    for content in contents:
+        # As created by e.g. BinanceOrderBook.diff_message_from_exchange()
+        message = OrderBookMessage(OrderBookMessageType.DIFF, dict(
+            content,
+            bids=entries_to_numpy(content["bids"], content["update_id"]),
+            asks=entries_to_numpy(content["asks"], content["update_id"])))
+        order_book.apply_numpy_diffs(message.bids_array, message.asks_array, message.update_id)
+
+
+def new_level_queries(order_book: OrderBook, volume: float, count: int = 1000):
+    empty = np.zeros((0, 3), dtype=np.float64)
+    for i in range(count):
+        # Half a tick off the existing levels, at a different rank each time.
+        price = 100.0 + 0.01 * (i * 7 % LEVELS) + 0.005
+        order_book.apply_numpy_diffs(empty, np.array([[price, 1.0, 3 + i]], dtype=np.float64))
+        order_book.get_vwap_for_volume(True, volume)
+        order_book.apply_numpy_diffs(empty, np.array([[price, 0.0, 3 + i]], dtype=np.float64))
+
+
+def timed(label: str, func: Callable[[], object], iterations: int = ITERATIONS) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"  {label:<40} {elapsed * 1e6:>12.1f} us/call")
+    return elapsed
+
+
+def main():
+    order_book = make_order_book()
+    indexed_order_book = make_order_book(depth_index=True)
+    # Query deep enough to walk roughly 90% of each side.
+    deep_volume = float(sum(row.amount for row in order_book.ask_entries())) * 0.9
+    deep_price = 100.0 - 0.01 * LEVELS * 0.9
+
+    print(f"Order book depth queries over {LEVELS} levels per side:")
+    old = timed("vwap_for_volume (OrderBookRow entries)",
+                lambda: entries_vwap_for_volume(order_book, True, deep_volume))
+    new = timed("vwap_for_volume (C++ set traversal)",
+                lambda: order_book.get_vwap_for_volume(True, deep_volume))
+    print(f"  speedup: {old / new:.1f}x")
+    new = timed("vwap_for_volume (depth index)",
+                lambda: indexed_order_book.get_vwap_for_volume(True, deep_volume))
+    print(f"  speedup: {old / new:.1f}x")
+    old = timed("volume_for_price (OrderBookRow entries)",
+                lambda: entries_volume_for_price(order_book, False, deep_price))
+    new = timed("volume_for_price (C++ set traversal)",
+                lambda: order_book.get_volume_for_price(False, deep_price))
+    print(f"  speedup: {old / new:.1f}x")
+    new = timed("volume_for_price (depth index)",
+                lambda: indexed_order_book.get_volume_for_price(False, deep_price))
+    print(f"  speedup: {old / new:.1f}x")
+
+    # Diffs that only change amounts on existing levels are point updates on the index.
+    diff = np.array([[100.0 - 0.01 * 10, 5.0, 2.0]], dtype=np.float64)
+    empty = np.zeros((0, 3), dtype=np.float64)
+    timed("apply_numpy_diffs (no depth index)", lambda: order_book.apply_numpy_diffs(diff, empty), 10000)
+    timed("apply_numpy_diffs (depth index)", lambda: indexed_order_book.apply_numpy_diffs(diff, empty), 10000)
+
+    # Live diffs add and remove price levels all the time, in between the queries.
+    print("A new ask level added, queried and removed (per 1000 diffs):")
+    old = timed("vwap_for_volume (C++ set traversal)",
+                lambda: new_level_queries(order_book, deep_volume), 5)
+    new = timed("vwap_for_volume (depth index)",
+                lambda: new_level_queries(indexed_order_book, deep_volume), 5)
+    print(f"  speedup: {old / new:.1f}x")
+
+    print("Diff messages with 20 bids and 20 asks, parsed and applied (per 1000 messages):")
+    contents = make_diff_contents()
+    old = timed("OrderBookRow lists", lambda: apply_row_diffs(order_book, contents), 5)
+    new = timed("float64 arrays", lambda: apply_array_diffs(order_book, contents), 5)
+    print(f"  speedup: {old / new:.1f}x")
+
+    print("Order book export:")
+    old = timed("snapshot (OrderBookRow entries)", lambda: entries_snapshot(order_book), 20)
+    new = timed("snapshot (numpy_snapshot)", lambda: order_book.snapshot, 20)
+    print(f"  speedup: {old / new:.1f}x")
+    timed("numpy_snapshot(20)", lambda: order_book.numpy_snapshot(20))
+
+
+if __name__ == "__main__":
+    main()
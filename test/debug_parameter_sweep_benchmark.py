@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""
+Benchmark for the parallel parameter sweep.
+
+Sweeps the bid spread and the number of order levels of the pure market making strategy over an hour of 100ms market
+data, with an increasing number of processes, reporting the wall time and the speedup over a single process.
+"""
+
+from os.path import join, realpath
+import sys; sys.path.insert(0, realpath(join(__file__, "../../")))
+
+import os
+import tempfile
+import time
+from decimal import Decimal
+
+from hummingbot.backtest.market_data import (
+    generate_market_data,
+    save_market_data,
+)
+from hummingbot.backtest.parameter_sweep import ParameterSweep
+from hummingbot.client.config.config_helpers import get_strategy_config_map
+
+DURATION = 60 * 60
+PARAMETERS = {
+    "bid_spread": [Decimal("0.05"), Decimal("0.1"), Decimal("0.2"), Decimal("0.5")],
+    "order_levels": [1, 3],
+}
+
+
+def main():
+    config = {key: cvar.default for key, cvar in get_strategy_config_map("pure_market_making").items()}
+    config.update(strategy="pure_market_making",
+                  market="HBOT-USDT",
+                  bid_spread=Decimal("0.1"),
+                  ask_spread=Decimal("0.1"),
+                  order_amount=Decimal("1"),
+                  order_refresh_time=10.0)
+    balances = {"HBOT": Decimal(1000), "USDT": Decimal(100000)}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_path = join(temp_dir, "market_data.npy")
+        save_market_data(data_path, generate_market_data(0, DURATION))
+        print(f"Sweep of {len(ParameterSweep(config, data_path, PARAMETERS, balances).combinations)} backtests of "
+              f"{DURATION}s of 100ms market data, at a 100ms tick:")
+        workers = 1
+        single_process_time = None
+        while workers <= (os.cpu_count() or 1):
+            sweep = ParameterSweep(config, data_path, PARAMETERS, balances, tick_size=0.1, max_workers=workers)
+            start = time.perf_counter()
+            results = sweep.run()
+            elapsed = time.perf_counter() - start
+            single_process_time = single_process_time or elapsed
+            print(f"  {workers:>3} processes {elapsed:>8.2f} s   speedup: {single_process_time / elapsed:.1f}x")
+            workers *= 2
+        print(results.drop(columns=["inventory"]).to_string(float_format=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+Microbenchmark for the trailing indicators, per sample added, with the current value read after each sample as the
+strategies do.
+
+Compares the incremental indicators against ExponentialMovingAverageIndicator, which runs pandas ewm() over the
+whole window, and against the window recomputations they replace: np.var over the sampling buffer, as
+AverageVolatilityIndicator did before its buffer kept running sums, and the max/min over list slices of the
+liquidity mining volatility.
+"""
+
+from os.path import join, realpath
+import sys; sys.path.insert(0, realpath(join(__file__, "../../")))
+
+import time
+from typing import Callable
+
+import numpy as np
+
+from hummingbot.strategy.__utils__.ring_buffer import RingBuffer
+from hummingbot.strategy.__utils__.trailing_indicators.average_true_range import AverageTrueRangeIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.average_volatility import AverageVolatilityIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.ewma_variance import EWMAVarianceIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.exponential_moving_average import \
+    ExponentialMovingAverageIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.incremental_average_volatility import \
+    IncrementalAverageVolatilityIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.incremental_exponential_moving_average import \
+    IncrementalExponentialMovingAverageIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.range_volatility import (
+    GarmanKlassVolatilityIndicator,
+    ParkinsonVolatilityIndicator,
+)
+from hummingbot.strategy.__utils__.trailing_indicators.vwap import VWAPIndicator
+
+SAMPLES = 5000
+WINDOW = 600
+
+
+def make_prices(count: int = SAMPLES) -> np.ndarray:
+    rng = np.random.RandomState(42)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+
+
+def run_indicator(indicator, prices: np.ndarray):
+    for price in prices:
+        indicator.add_sample(price)
+        indicator.current_value
+
+
+def run_window_variance(prices: np.ndarray):
+    buffer = RingBuffer(WINDOW)
+    for price in prices:
+        buffer.add_value(price)
+        np.var(buffer.get_as_numpy_array())
+
+
+def run_list_atr(prices: np.ndarray, interval: int = 60, periods: int = 10):
+    mid_prices = []
+    for price in prices:
+        mid_prices.append(price)
+        mid_prices = mid_prices[-interval * periods:]
+        atr = []
+        for i in range(len(mid_prices) - 1, max(len(mid_prices) - 1 - interval * periods, 0), -interval):
+            window = mid_prices[i - interval + 1: i + 1]
+            if not window:
+                break
+            atr.append((max(window) - min(window)) / min(window))
+        if atr:
+            np.mean(atr)
+
+
+def timed(label: str, func: Callable[[], object], samples: int = SAMPLES) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - start) / samples
+    print(f"  {label:<50} {elapsed * 1e6:>10.2f} us/sample")
+    return elapsed
+
+
+def main():
+    prices = make_prices()
+    print(f"Trailing indicators over {WINDOW} samples, {SAMPLES} samples added:")
+    old = timed("ExponentialMovingAverageIndicator (pandas ewm)",
+                lambda: run_indicator(ExponentialMovingAverageIndicator(WINDOW), prices))
+    new = timed("IncrementalExponentialMovingAverageIndicator",
+                lambda: run_indicator(IncrementalExponentialMovingAverageIndicator(WINDOW), prices))
+    print(f"  speedup: {old / new:.1f}x")
+    old = timed("np.var over the window", lambda: run_window_variance(prices))
+    new = timed("AverageVolatilityIndicator (running sums)",
+                lambda: run_indicator(AverageVolatilityIndicator(WINDOW, 1), prices))
+    print(f"  speedup: {old / new:.1f}x")
+    new = timed("IncrementalAverageVolatilityIndicator",
+                lambda: run_indicator(IncrementalAverageVolatilityIndicator(WINDOW, 1), prices))
+    print(f"  speedup: {old / new:.1f}x")
+    new = timed("EWMAVarianceIndicator", lambda: run_indicator(EWMAVarianceIndicator(WINDOW), prices))
+    print(f"  speedup: {old / new:.1f}x")
+    old = timed("max/min over list slices (liquidity mining)", lambda: run_list_atr(prices))
+    new = timed("AverageTrueRangeIndicator (relative)",
+                lambda: run_indicator(AverageTrueRangeIndicator(60, 10, relative=True, true_range=False), prices))
+    print(f"  speedup: {old / new:.1f}x")
+    timed("ParkinsonVolatilityIndicator", lambda: run_indicator(ParkinsonVolatilityIndicator(60, 10), prices))
+    timed("GarmanKlassVolatilityIndicator", lambda: run_indicator(GarmanKlassVolatilityIndicator(60, 10), prices))
+    timed("VWAPIndicator", lambda: run_indicator(VWAPIndicator(WINDOW), prices))
+
+
+if __name__ == "__main__":
+    main()
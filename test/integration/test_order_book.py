@@ -53,6 +53,94 @@ class OrderBookUnitTest(unittest.TestCase):
         self.assertEqual(best_bid, [50., 0.01, 6.])
         self.assertEqual(best_ask, 0)
 
+    def test_depth_queries(self):
+        order_book = OrderBook()
+        bids_array = np.array([[9, 1, 1], [8, 2, 1], [7, 3, 1]], dtype=np.float64)
+        asks_array = np.array([[10, 1, 1], [11, 2, 1], [12, 3, 1]], dtype=np.float64)
+        order_book.apply_numpy_snapshot(bids_array, asks_array)
+
+        self.assertEqual(11, order_book.get_price_for_volume(True, 2).result_price)
+        self.assertEqual(8, order_book.get_price_for_volume(False, 3).result_price)
+        self.assertTrue(np.isnan(order_book.get_price_for_volume(True, 7).result_price))
+        self.assertEqual(6, order_book.get_price_for_volume(True, 7).result_volume)
+
+        self.assertAlmostEqual((10 + 11 * 2 + 12) / 4, order_book.get_vwap_for_volume(True, 4).result_price)
+        self.assertAlmostEqual((9 + 8 * 0.5) / 1.5, order_book.get_vwap_for_volume(False, 1.5).result_price)
+        self.assertTrue(np.isnan(order_book.get_vwap_for_volume(False, 10).result_price))
+
+        self.assertEqual(11, order_book.get_price_for_quote_volume(True, 30).result_price)
+        self.assertEqual(9, order_book.get_price_for_quote_volume(False, 9).result_price)
+
+        self.assertEqual(10 + 11 * 2 + 12, order_book.get_quote_volume_for_base_amount(True, 4).result_volume)
+        self.assertEqual(9 + 8 * 2 + 7 * 3, order_book.get_quote_volume_for_base_amount(False, 10).result_volume)
+
+        result = order_book.get_volume_for_price(True, 11.5)
+        self.assertEqual(3, result.result_volume)
+        self.assertEqual(11, result.result_price)
+        result = order_book.get_volume_for_price(False, 8)
+        self.assertEqual(3, result.result_volume)
+        self.assertEqual(8, result.result_price)
+
+        self.assertEqual(10 + 22, order_book.get_quote_volume_for_price(True, 11).result_volume)
+        self.assertEqual(9 + 16 + 21, order_book.get_quote_volume_for_price(False, 1).result_volume)
+
+    def test_numpy_snapshot(self):
+        order_book = OrderBook()
+        bids_array = np.array([[7, 3, 1], [9, 1, 2], [8, 2, 3]], dtype=np.float64)
+        asks_array = np.array([[12, 3, 1], [10, 1, 2], [11, 2, 3]], dtype=np.float64)
+        order_book.apply_numpy_snapshot(bids_array, asks_array)
+
+        bids, asks = order_book.numpy_snapshot()
+        self.assertEqual(np.float64, bids.dtype)
+        self.assertTrue(bids.flags["C_CONTIGUOUS"])
+        self.assertEqual([[9, 1, 2], [8, 2, 3], [7, 3, 1]], bids.tolist())
+        self.assertEqual([[10, 1, 2], [11, 2, 3], [12, 3, 1]], asks.tolist())
+        self.assertEqual([list(row) for row in order_book.bid_entries()], bids.tolist())
+        self.assertEqual([list(row) for row in order_book.ask_entries()], asks.tolist())
+
+        bids, asks = order_book.numpy_snapshot(2)
+        self.assertEqual([[9, 1, 2], [8, 2, 3]], bids.tolist())
+        self.assertEqual([[10, 1, 2], [11, 2, 3]], asks.tolist())
+        bids, asks = order_book.numpy_snapshot(0)
+        self.assertEqual((0, 3), bids.shape)
+        self.assertEqual((0, 3), asks.shape)
+
+        bids_df, asks_df = order_book.snapshot
+        self.assertEqual(["price", "amount", "update_id"], list(bids_df.columns))
+        self.assertEqual([9., 1., 2.], bids_df.iloc[0].tolist())
+        self.assertEqual([12., 3., 1.], asks_df.iloc[-1].tolist())
+
+    def test_depth_index_matches_scan(self):
+        rng = np.random.RandomState(42)
+        levels = np.arange(1, 101, dtype=np.float64)
+        bids_array = np.column_stack([100 - levels, rng.randint(1, 10, 100), np.ones(100)]).astype(np.float64)
+        asks_array = np.column_stack([100 + levels, rng.randint(1, 10, 100), np.ones(100)]).astype(np.float64)
+        scan_order_book = OrderBook()
+        indexed_order_book = OrderBook(depth_index=True)
+        scan_order_book.apply_numpy_snapshot(bids_array, asks_array)
+        indexed_order_book.apply_numpy_snapshot(bids_array, asks_array)
+
+        for update_id in range(2, 500):
+            # Diffs add, update and remove (0 amount) levels, and may cross the book.
+            bids_diff = np.column_stack([100 - rng.randint(-2, 100, 3), rng.randint(0, 10, 3), np.full(3, update_id)])
+            asks_diff = np.column_stack([100 + rng.randint(-2, 100, 3), rng.randint(0, 10, 3), np.full(3, update_id)])
+            scan_order_book.apply_numpy_diffs(bids_diff.astype(np.float64), asks_diff.astype(np.float64))
+            indexed_order_book.apply_numpy_diffs(bids_diff.astype(np.float64), asks_diff.astype(np.float64))
+
+            for is_buy in (True, False):
+                volume = float(rng.randint(0, 600))
+                price = 100 + (1 if is_buy else -1) * float(rng.randint(0, 120))
+                for query, arg in ((OrderBook.get_price_for_volume, volume),
+                                   (OrderBook.get_vwap_for_volume, volume + 0.5),
+                                   (OrderBook.get_price_for_quote_volume, volume * 100),
+                                   (OrderBook.get_quote_volume_for_base_amount, volume),
+                                   (OrderBook.get_volume_for_price, price),
+                                   (OrderBook.get_quote_volume_for_price, price)):
+                    expected = query(scan_order_book, is_buy, arg)
+                    actual = query(indexed_order_book, is_buy, arg)
+                    np.testing.assert_allclose([expected.result_price, expected.result_volume],
+                                               [actual.result_price, actual.result_volume])
+
 
 def main():
     logging.basicConfig(level=logging.INFO)
@@ -4,6 +4,7 @@ from hummingbot.core.data_type.order_book_row import OrderBookRow
 from hummingbot.connector.exchange.binance.binance_exchange import BinanceExchange
 import asyncio
 import contextlib
+from decimal import Decimal
 import unittest
 import os
 import time
@@ -202,23 +203,20 @@ class PaperTradeExchangeTest(unittest.TestCase):
         return self.ev_loop.run_until_complete(self.run_parallel_async(*tasks))
 
     def test_place_market_orders(self):
-        self.market.sell("ETH-USDT", 30, OrderType.MARKET)
-        list_queued_orders: List[QueuedOrder] = self.market.queued_orders
-        first_queued_order: QueuedOrder = list_queued_orders[0]
-        self.assertFalse(first_queued_order.is_buy, msg="Market order is not sell")
-        self.assertEqual(first_queued_order.trading_pair, "ETH-USDT", msg="Trading pair is incorrect")
-        self.assertEqual(first_queued_order.amount, 30, msg="Quantity is incorrect")
-        self.assertEqual(len(list_queued_orders), 1, msg="First market order did not get added")
-
-        # Figure out why this test is failing
-        self.market.buy("BTC-USDT", 30, OrderType.MARKET)
+        self.market.set_balance("ETH", 30)
+        self.market.set_balance("USDT", 10000)
+        self.market.sell("ETH-USDT", Decimal(30), OrderType.MARKET)
+        self.market.buy("BTC-USDT", Decimal("0.01"), OrderType.MARKET)
+
+        # Market orders wait in the matching engine for the order latency, until the next tick.
         list_queued_orders: List[QueuedOrder] = self.market.queued_orders
-        second_queued_order: QueuedOrder = list_queued_orders[1]
-        self.assertTrue(second_queued_order.is_buy, msg="Market order is not buy")
-        self.assertEqual(second_queued_order.trading_pair, "BTC-USDT", msg="Trading pair is incorrect")
-        self.assertEqual(second_queued_order.amount, 30, msg="Quantity is incorrect")
-        self.assertEqual(second_queued_order.amount, 30, msg="Quantity is incorrect")
-        self.assertEqual(len(list_queued_orders), 2, msg="Second market order did not get added")
+        self.assertEqual([(False, "ETH-USDT", Decimal(30)), (True, "BTC-USDT", Decimal("0.01"))],
+                         [(o.is_buy, o.trading_pair, o.amount) for o in list_queued_orders])
+
+        # They are then immediate or cancel, against the order book.
+        self.run_parallel(self.market_logger.wait_for(SellOrderCompletedEvent),
+                          self.market_logger.wait_for(BuyOrderCompletedEvent))
+        self.assertEqual([], self.market.queued_orders)
 
     def test_market_order_simulation(self):
         self.market.set_balance("ETH", 20)
@@ -257,21 +255,28 @@ class PaperTradeExchangeTest(unittest.TestCase):
 
     def test_limit_order_crossed(self):
         starting_base_balance = 20
-        starting_quote_balance = 1000
+        starting_quote_balance = 10000
         self.market.set_balance("ETH", starting_base_balance)
         self.market.set_balance("USDT", starting_quote_balance)
-        self.market.sell("ETH-USDT", 10, OrderType.LIMIT, 100)
+        order_book = self.market.order_books["ETH-USDT"]
+
+        # A crossing limit order takes the opposite side of the order book at the book prices, as a taker.
+        sell_price = Decimal(str(order_book.get_price(False))) * Decimal("0.9")
+        self.market.sell("ETH-USDT", Decimal(1), OrderType.LIMIT, sell_price)
         self.run_parallel(self.market_logger.wait_for(SellOrderCompletedEvent))
-        self.assertEquals(starting_base_balance - 10, self.market.get_balance("ETH"),
-                          msg="ETH Balance was not updated.")
-        self.assertEquals(starting_quote_balance + 1000, self.market.get_balance("USDT"),
-                          msg="USDT Balance was not updated.")
-        self.market.buy("ETH-USDT", 1, OrderType.LIMIT, 500)
+        fills = [e for e in self.market_logger.event_log if isinstance(e, OrderFilledEvent)]
+        self.assertEqual(Decimal(1), sum(fill.amount for fill in fills))
+        self.assertTrue(all(fill.price > sell_price for fill in fills))
+        self.assertEqual(starting_base_balance - 1, self.market.get_balance("ETH"))
+        self.assertGreater(self.market.get_balance("USDT"), starting_quote_balance)
+
+        buy_price = Decimal(str(order_book.get_price(True))) * Decimal("1.1")
+        self.market.buy("ETH-USDT", Decimal(1), OrderType.LIMIT, buy_price)
         self.run_parallel(self.market_logger.wait_for(BuyOrderCompletedEvent))
-        self.assertEquals(11, self.market.get_balance("ETH"),
-                          msg="ETH Balance was not updated.")
-        self.assertEquals(1500, self.market.get_balance("USDT"),
-                          msg="USDT Balance was not updated.")
+        fills = [e for e in self.market_logger.event_log
+                 if isinstance(e, OrderFilledEvent) and e.trade_type is TradeType.BUY]
+        self.assertEqual(Decimal(1), sum(fill.amount for fill in fills))
+        self.assertTrue(all(fill.price < buy_price for fill in fills))
 
     def test_bid_limit_order_trade_match(self):
         """
@@ -315,11 +320,12 @@ class PaperTradeExchangeTest(unittest.TestCase):
         # Market should emit BuyOrderCreatedEvent
         self.assertEqual(1, len(matched_order_create_events))
 
+        # The order is at the back of the queue at the best bid, so it only fills when a trade goes through its price.
         async def delay_trigger_event1():
             await asyncio.sleep(1)
             trade_event1 = OrderBookTradeEvent(
-                trading_pair="ETH-USDT", timestamp=time.time(), type=TradeType.SELL, price=best_bid_price + 1,
-                amount=1.0)
+                trading_pair="ETH-USDT", timestamp=time.time(), type=TradeType.SELL, price=best_bid_price - 1,
+                amount=base_quantity)
             self.market.order_books['ETH-USDT'].apply_trade(trade_event1)
 
         safe_ensure_future(delay_trigger_event1())
@@ -399,7 +405,7 @@ class PaperTradeExchangeTest(unittest.TestCase):
             await asyncio.sleep(1)
             trade_event = OrderBookTradeEvent(
                 trading_pair=trading_pair.trading_pair, timestamp=time.time(), type=TradeType.BUY,
-                price=best_ask_price - 1, amount=base_quantity)
+                price=best_ask_price + 1, amount=base_quantity)
             self.market.order_books[trading_pair.trading_pair].apply_trade(trade_event)
 
         safe_ensure_future(delay_trigger_event2())
@@ -0,0 +1,102 @@
+import random
+import unittest
+from decimal import Decimal
+
+from hummingbot.strategy.avellaneda_market_making.avellaneda_model import (
+    calculate_optimal_bid_ask,
+    calculate_parameters,
+    calculate_reserved_price_and_optimal_spread,
+)
+
+PRICE_QUANTUM = Decimal("0.01")
+
+
+def decimal_parameters(price, q, vol, target_inventory, min_spread, max_spread, vol_to_spread_multiplier,
+                       inventory_risk_aversion):
+    # The Decimal calculation the strategy used before the float model
+    min_spread_value = max(min_spread * price, vol_to_spread_multiplier * vol)
+    max_spread_value = (max_spread * price) * (min_spread_value / (min_spread * price))
+    max_possible_gamma = min((max_spread_value - min_spread_value) / (2 * abs(q) * (vol ** 2)),
+                             (max_spread_value * (2 - inventory_risk_aversion) /
+                              inventory_risk_aversion + min_spread_value) / (vol ** 2))
+    gamma = inventory_risk_aversion * max_possible_gamma
+    max_spread_around_reserved_price = (max_spread_value * (2 - inventory_risk_aversion) +
+                                        min_spread_value * inventory_risk_aversion)
+    if (max_spread_around_reserved_price * gamma - (vol * gamma) ** 2) <= 0:
+        kappa = Decimal("1e100")
+    else:
+        kappa = gamma / (Decimal.exp((max_spread_around_reserved_price * gamma - (vol * gamma) ** 2) / 2) - 1)
+    q_where_to_decay_order_amount = target_inventory / (inventory_risk_aversion * Decimal.ln(Decimal("10")))
+    eta = Decimal(1)
+    if q_where_to_decay_order_amount != 0:
+        eta = eta / q_where_to_decay_order_amount
+    return gamma, kappa, eta
+
+
+def decimal_bid_ask(price, q, vol, gamma, kappa, time_left_fraction, min_spread, max_spread,
+                    vol_to_spread_multiplier):
+    reserved_price = price - (q * gamma * vol ** 2 * time_left_fraction)
+    optimal_spread = gamma * vol ** 2 * time_left_fraction + 2 * Decimal(1 + gamma / kappa).ln() / gamma
+    spread_inflation_due_to_volatility = (max(vol_to_spread_multiplier * vol, price * min_spread) /
+                                          (price * min_spread))
+    min_limit_bid = price * (1 - max_spread * spread_inflation_due_to_volatility)
+    max_limit_bid = price * (1 - min_spread * spread_inflation_due_to_volatility)
+    min_limit_ask = price * (1 + min_spread * spread_inflation_due_to_volatility)
+    max_limit_ask = price * (1 + max_spread * spread_inflation_due_to_volatility)
+    optimal_ask = min(max(reserved_price + optimal_spread / 2, min_limit_ask), max_limit_ask)
+    optimal_bid = min(max(reserved_price - optimal_spread / 2, min_limit_bid), max_limit_bid)
+    return optimal_bid, optimal_ask
+
+
+def quantize(price) -> Decimal:
+    return (Decimal(str(price)) // PRICE_QUANTUM) * PRICE_QUANTUM
+
+
+class AvellanedaModelTest(unittest.TestCase):
+    def assert_within_quantum(self, expected: Decimal, actual: float):
+        self.assertLessEqual(abs(quantize(expected) - quantize(actual)), PRICE_QUANTUM)
+
+    def test_parameters_parity(self):
+        rng = random.Random(42)
+        for _ in range(500):
+            price = Decimal(str(round(rng.uniform(1, 50000), 2)))
+            q = Decimal(str(round(rng.uniform(-1e5, 1e5), 3)))
+            vol = price * Decimal(str(round(rng.uniform(1e-4, 1e-2), 6)))
+            target_inventory = Decimal(str(round(rng.uniform(0, 10), 4)))
+            min_spread = Decimal(str(round(rng.uniform(0.0005, 0.005), 4)))
+            max_spread = min_spread * Decimal(str(round(rng.uniform(2, 10), 2)))
+            multiplier = Decimal(str(round(rng.uniform(0.5, 3), 2)))
+            risk_aversion = Decimal(str(round(rng.uniform(0.05, 0.95), 2)))
+            time_left_fraction = Decimal(str(round(rng.uniform(0, 1), 4)))
+
+            expected_gamma, expected_kappa, expected_eta = decimal_parameters(
+                price, q, vol, target_inventory, min_spread, max_spread, multiplier, risk_aversion)
+            gamma, kappa, eta = calculate_parameters(
+                float(price), float(q), float(vol), float(target_inventory), float(min_spread), float(max_spread),
+                float(multiplier), float(risk_aversion))
+            self.assertAlmostEqual(1, gamma / float(expected_gamma), places=9)
+            self.assertAlmostEqual(1, kappa / float(expected_kappa), places=6)
+            self.assertAlmostEqual(1, eta / float(expected_eta), places=9)
+
+            expected_bid, expected_ask = decimal_bid_ask(price, q, vol, expected_gamma, expected_kappa,
+                                                         time_left_fraction, min_spread, max_spread, multiplier)
+            reserved_price, optimal_spread = calculate_reserved_price_and_optimal_spread(
+                float(price), float(q), float(vol), gamma, kappa, float(time_left_fraction))
+            bid, ask = calculate_optimal_bid_ask(float(price), float(vol), reserved_price, optimal_spread, True,
+                                                 float(min_spread), float(max_spread), float(multiplier))
+            self.assert_within_quantum(expected_bid, bid)
+            self.assert_within_quantum(expected_ask, ask)
+            self.assertLess(bid, float(price))
+            self.assertGreater(ask, float(price))
+
+    def test_no_parameters_without_inventory_deviation(self):
+        self.assertIsNone(calculate_parameters(100., 0., 0.1, 1., 0.001, 0.01, 1.3, 0.5))
+
+    def test_bid_ask_without_spread_limits(self):
+        reserved_price, optimal_spread = calculate_reserved_price_and_optimal_spread(100., 1000., 0.1, 0.5, 0.1, 1.)
+        self.assertAlmostEqual(100. - 1000. * 0.5 * 0.01, reserved_price)
+        bid, ask = calculate_optimal_bid_ask(100., 0.1, reserved_price, optimal_spread, False, 0., 0., 0.)
+        # The ask is kept above the mid price
+        self.assertEqual(100., ask)
+        expected_bid = Decimal("95") - (Decimal("0.005") + 2 * Decimal(6).ln() / Decimal("0.5")) / 2
+        self.assertAlmostEqual(float(expected_bid), bid)
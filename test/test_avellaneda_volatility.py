@@ -0,0 +1,50 @@
+import unittest
+from decimal import Decimal
+from typing import List
+
+import numpy as np
+
+from hummingbot.backtest.backtest_market import BacktestMarket
+from hummingbot.backtest.market_data import generate_market_data
+from hummingbot.core.clock import (
+    Clock,
+    ClockMode,
+)
+from hummingbot.strategy.avellaneda_market_making import AvellanedaMarketMakingStrategy
+from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
+
+TRADING_PAIR = "HBOT-USDT"
+
+
+class AvellanedaVolatilityTest(unittest.TestCase):
+    def test_volatility(self):
+        buffer_size = 30
+        market = BacktestMarket()
+        market.add_data(TRADING_PAIR, "HBOT", "USDT", generate_market_data(0, 200, interval=1),
+                        Decimal("0.01"), Decimal("0.001"))
+        market.set_balance("HBOT", Decimal(100))
+        market.set_balance("USDT", Decimal(10000))
+        strategy = AvellanedaMarketMakingStrategy(MarketTradingPairTuple(market, TRADING_PAIR, "HBOT", "USDT"),
+                                                  order_amount=Decimal(1),
+                                                  inventory_target_base_pct=Decimal("0.5"),
+                                                  logging_options=0,
+                                                  parameters_based_on_spread=False,
+                                                  risk_factor=Decimal(1),
+                                                  order_book_depth_factor=Decimal(1),
+                                                  order_amount_shape_factor=Decimal(0),
+                                                  volatility_buffer_size=buffer_size,
+                                                  is_debug=False)
+        clock = Clock(ClockMode.BACKTEST, 1.0, 0, 200)
+        clock.add_iterator(market)
+        clock.add_iterator(strategy)
+
+        mid_prices: List[float] = []
+        for tick in range(1, 200):
+            clock.backtest_til(tick)
+            mid_prices.append(float(strategy.get_price()))
+            if len(mid_prices) < buffer_size:
+                self.assertTrue(np.isnan(strategy.get_volatility()))
+            else:
+                # The standard deviation of the last mid prices, as computed over the whole buffer before.
+                self.assertAlmostEqual(np.std(mid_prices[-buffer_size:]), strategy.get_volatility(), 9)
+        self.assertGreater(strategy.get_volatility(), 0)
@@ -0,0 +1,330 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from hummingbot.backtest.backtest_market import BacktestMarket
+from hummingbot.backtest.backtest_runner import BacktestRunner
+from hummingbot.backtest.market_data import (
+    MARKET_DATA_DTYPE,
+    diff_rows,
+    generate_market_data,
+    load_market_data,
+    merge_market_data,
+    save_market_data,
+    snapshot_rows,
+    trade_rows,
+)
+from hummingbot.backtest.order_book_replay import OrderBookReplay
+from hummingbot.core.clock import (
+    Clock,
+    ClockMode,
+)
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.event.event_logger import EventLogger
+from hummingbot.core.event.events import (
+    MarketEvent,
+    OrderBookEvent,
+    OrderBookTradeEvent,
+    OrderType,
+    TradeType,
+)
+from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
+from hummingbot.strategy.pure_market_making import PureMarketMakingStrategy
+
+TRADING_PAIR = "HBOT-USDT"
+
+
+def book_data() -> np.ndarray:
+    return merge_market_data(
+        snapshot_rows(0, 1, [[99.9, 10], [99.8, 10]], [[100.1, 10], [100.2, 10]]),
+        diff_rows(1, 2, [[99.9, 2], [100.0, 5]], []),
+        trade_rows(2, TradeType.SELL, 100.0, 1),
+        diff_rows(3, 3, [], [[100.1, 0]]),
+    )
+
+
+class MarketDataTest(unittest.TestCase):
+    def test_save_and_load(self):
+        data = generate_market_data(0, 60)
+        self.assertTrue(np.all(np.diff(data["timestamp"]) >= 0))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.npy")
+            save_market_data(path, data)
+            loaded = load_market_data(path)
+            self.assertIsInstance(loaded, np.memmap)
+            self.assertFalse(loaded.flags.writeable)
+            self.assertEqual(MARKET_DATA_DTYPE, loaded.dtype)
+            np.testing.assert_array_equal(data, loaded)
+            del loaded
+
+    def test_replay(self):
+        order_book = OrderBook()
+        trade_logger = EventLogger()
+        order_book.add_listener(OrderBookEvent.TradeEvent, trade_logger)
+        replay = OrderBookReplay(TRADING_PAIR, order_book, book_data())
+
+        replay.replay_until(1.5)
+        self.assertEqual(100.0, order_book.get_price(False))
+        self.assertEqual(100.1, order_book.get_price(True))
+        self.assertEqual(2, list(order_book.bid_entries())[1].amount)
+        self.assertEqual(6, replay.events_replayed)
+        self.assertEqual(0, len(trade_logger.event_log))
+
+        replay.replay_until(3)
+        self.assertTrue(replay.done)
+        self.assertEqual(100.2, order_book.get_price(True))
+        self.assertEqual(3, order_book.last_diff_uid)
+        self.assertEqual(100.0, order_book.last_trade_price)
+        self.assertEqual(TradeType.SELL, trade_logger.event_log[0].type)
+
+    def test_replay_mmap(self):
+        data = generate_market_data(0, 60, seed=1)
+        order_book = OrderBook()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.npy")
+            save_market_data(path, data)
+            loaded = load_market_data(path)
+            replay = OrderBookReplay(TRADING_PAIR, order_book, loaded)
+            replay.replay_until(replay.end_timestamp)
+            self.assertEqual(len(data), replay.events_replayed)
+            del replay, loaded
+        self.assertLess(order_book.get_price(False), order_book.get_price(True))
+
+
+class BacktestMatchingTest(unittest.TestCase):
+    """
+    Order matching of the backtest market against the order book, driven directly instead of by market data.
+    """
+    def create_market(self, latency: float = 0.0, queue_position: bool = True) -> BacktestMarket:
+        market = BacktestMarket(latency=latency, queue_position=queue_position, maker_fee_percent=Decimal("0.001"))
+        market.add_data(TRADING_PAIR, "HBOT", "USDT",
+                        snapshot_rows(0, 1, [[99.9, 10], [99.8, 10]], [[100.1, 10], [100.2, 10]]),
+                        Decimal("0.01"), Decimal("0.1"))
+        market.set_balance("HBOT", Decimal(100))
+        market.set_balance("USDT", Decimal(10000))
+        self.fill_logger = EventLogger()
+        self.cancel_logger = EventLogger()
+        market.add_listener(MarketEvent.OrderFilled, self.fill_logger)
+        market.add_listener(MarketEvent.OrderCancelled, self.cancel_logger)
+        self.clock = Clock(ClockMode.BACKTEST, 0.5, 0, 10)
+        self.clock.add_iterator(market)
+        self.clock.backtest_til(0)
+        self.order_book = market.order_books[TRADING_PAIR]
+        return market
+
+    def trade(self, trade_type: TradeType, price: float, amount: float):
+        self.order_book.apply_trade(OrderBookTradeEvent(TRADING_PAIR, 0, trade_type, price, amount))
+
+    def fills(self):
+        fills = [(fill.order_id, fill.amount, fill.price, fill.trade_fee.percent > 0)
+                 for fill in self.fill_logger.event_log]
+        self.fill_logger.clear()
+        return fills
+
+    def test_latency(self):
+        market = self.create_market(latency=1)
+        order_id = market.buy(TRADING_PAIR, Decimal(5), OrderType.LIMIT, Decimal("99.9"))
+        self.clock.backtest_til(0.5)
+        self.trade(TradeType.SELL, 99.8, 100)
+        self.clock.backtest_til(1)
+        self.assertEqual([], self.fills())
+
+        # A cancel takes effect after the latency, the order can fill in the meantime.
+        market.cancel(TRADING_PAIR, order_id)
+        self.trade(TradeType.SELL, 99.8, 100)
+        self.clock.backtest_til(1.5)
+        self.assertEqual([(order_id, Decimal(5), Decimal("99.9"), True)], self.fills())
+        self.clock.backtest_til(2)
+        self.assertEqual([], self.cancel_logger.event_log)
+
+    def test_queue_position(self):
+        market = self.create_market()
+        order_id = market.buy(TRADING_PAIR, Decimal(5), OrderType.LIMIT, Decimal("99.9"))
+        self.clock.backtest_til(0.5)
+
+        # The order joins the back of the 10 queue at its price level.
+        self.trade(TradeType.SELL, 99.9, 6)
+        self.clock.backtest_til(1)
+        self.assertEqual([], self.fills())
+
+        # The level shrinks below the queue ahead of the order.
+        self.order_book.apply_numpy_diffs(np.array([[99.9, 1, 2]]), np.zeros((0, 3)))
+        self.trade(TradeType.SELL, 99.9, 3)
+        self.clock.backtest_til(1.5)
+        self.assertEqual([(order_id, Decimal(2), Decimal("99.9"), True)], self.fills())
+
+        # Trades at a better price for the order fill it up to the trade amount.
+        self.trade(TradeType.SELL, 99.8, 10)
+        self.clock.backtest_til(2)
+        self.assertEqual([(order_id, Decimal(3), Decimal("99.9"), True)], self.fills())
+        self.assertEqual([], market.limit_orders)
+
+    def test_no_queue_position(self):
+        market = self.create_market(queue_position=False)
+        order_id = market.sell(TRADING_PAIR, Decimal(5), OrderType.LIMIT, Decimal("100.1"))
+        self.clock.backtest_til(0.5)
+        self.trade(TradeType.BUY, 100.1, 2)
+        self.clock.backtest_til(1)
+        self.assertEqual([(order_id, Decimal(2), Decimal("100.1"), True)], self.fills())
+
+    def test_crossed_orders(self):
+        market = self.create_market()
+        # Crosses the book on arrival: a taker fill, or a cancel for post only orders.
+        taker_id = market.buy(TRADING_PAIR, Decimal(1), OrderType.LIMIT, Decimal("100.1"))
+        post_only_id = market.buy(TRADING_PAIR, Decimal(1), OrderType.LIMIT_MAKER, Decimal("100.1"))
+        maker_id = market.sell(TRADING_PAIR, Decimal(1), OrderType.LIMIT, Decimal("100.1"))
+        self.clock.backtest_til(0.5)
+        self.assertEqual([(taker_id, Decimal(1), Decimal("100.1"), False)], self.fills())
+        self.assertEqual([post_only_id], [event.order_id for event in self.cancel_logger.event_log])
+
+        # The bids move through the resting sell order.
+        self.order_book.apply_numpy_diffs(np.array([[100.15, 1, 2]]), np.zeros((0, 3)))
+        self.clock.backtest_til(1)
+        self.assertEqual([(maker_id, Decimal(1), Decimal("100.1"), True)], self.fills())
+
+    def test_crossing_order_takes_book_liquidity(self):
+        market = self.create_market()
+        order_id = market.buy(TRADING_PAIR, Decimal(50), OrderType.LIMIT, Decimal(101))
+        self.clock.backtest_til(0.5)
+        self.assertEqual([(order_id, Decimal(10), Decimal("100.1"), False),
+                          (order_id, Decimal(10), Decimal("100.2"), False)], self.fills())
+        self.assertEqual([Decimal(30)], [order.quantity for order in market.limit_orders])
+
+        # The liquidity the order took isn't there for other orders to fill against again.
+        other_id = market.buy(TRADING_PAIR, Decimal(1), OrderType.LIMIT, Decimal("100.2"))
+        self.clock.backtest_til(1)
+        self.assertEqual([], self.fills())
+
+        # Until the book updates the level.
+        self.order_book.apply_numpy_diffs(np.zeros((0, 3)), np.array([[100.2, 5, 2]]))
+        self.clock.backtest_til(1.5)
+        self.assertEqual([(order_id, Decimal(5), Decimal(101), True)], self.fills())
+        self.assertEqual(other_id, market.limit_orders[-1].client_order_id)
+
+
+class BacktestMarketTest(unittest.TestCase):
+    def setUp(self):
+        self.market = BacktestMarket(latency=0.5, maker_fee_percent=Decimal("0.001"))
+        self.market.add_data(TRADING_PAIR, "HBOT", "USDT", book_data(), Decimal("0.01"), Decimal("0.1"))
+        self.market.set_balance("HBOT", Decimal(10))
+        self.market.set_balance("USDT", Decimal(1000))
+        self.clock = Clock(ClockMode.BACKTEST, 0.5, 0, 10)
+        self.clock.add_iterator(self.market)
+        self.loggers = {event: EventLogger() for event in (MarketEvent.OrderFilled, MarketEvent.BuyOrderCompleted,
+                                                           MarketEvent.OrderCancelled, MarketEvent.OrderFailure)}
+        for event, logger in self.loggers.items():
+            self.market.add_listener(event, logger)
+
+    def events(self, event: MarketEvent):
+        return self.loggers[event].event_log
+
+    def test_limit_order_fill(self):
+        self.clock.backtest_til(0.5)
+        order_id = self.market.buy(TRADING_PAIR, Decimal("2"), OrderType.LIMIT, Decimal("100"))
+        self.assertEqual(Decimal(800), self.market.get_available_balance("USDT"))
+        self.assertEqual(1, len(self.market.limit_orders))
+
+        # The order is at the front of the new 100 bid level, and is partially filled by the trade of 1 at 100.
+        self.clock.backtest_til(2)
+        fill = self.events(MarketEvent.OrderFilled)[0]
+        self.assertEqual((order_id, Decimal("100"), Decimal("1")), (fill.order_id, fill.price, fill.amount))
+        self.assertEqual(Decimal("0.001"), fill.trade_fee.percent)
+        self.assertEqual(Decimal("899.9"), self.market.get_balance("USDT"))
+        self.assertEqual(Decimal("799.9"), self.market.get_available_balance("USDT"))
+
+        # The asks move through the order at 3s.
+        self.market.order_books[TRADING_PAIR].apply_numpy_diffs(np.zeros((0, 3)), np.array([[100.0, 1, 4]]))
+        self.clock.backtest_til(3)
+        self.assertEqual(2, len(self.events(MarketEvent.OrderFilled)))
+        completed = self.events(MarketEvent.BuyOrderCompleted)[0]
+        self.assertEqual((Decimal(2), Decimal(200), Decimal("0.2")),
+                         (completed.base_asset_amount, completed.quote_asset_amount, completed.fee_amount))
+        self.assertEqual(Decimal("799.8"), self.market.get_balance("USDT"))
+        self.assertEqual(Decimal(12), self.market.get_balance("HBOT"))
+        self.assertEqual(self.market.get_balance("USDT"), self.market.get_available_balance("USDT"))
+        self.assertEqual([], self.market.limit_orders)
+
+    def test_crossing_limit_order(self):
+        self.market.set_balance("USDT", Decimal(2000))
+        self.clock.backtest_til(0.5)
+        order_id = self.market.buy(TRADING_PAIR, Decimal("15"), OrderType.LIMIT, Decimal("100.15"))
+
+        # The order takes the 100.1 asks as a taker, and the rest rests at its price.
+        self.clock.backtest_til(1)
+        fill = self.events(MarketEvent.OrderFilled)[0]
+        self.assertEqual((order_id, Decimal("100.1"), Decimal(10), Decimal(0)),
+                         (fill.order_id, fill.price, fill.amount, fill.trade_fee.percent))
+        self.assertEqual(Decimal(999), self.market.get_balance("USDT"))
+        self.assertEqual(Decimal("498.25"), self.market.get_available_balance("USDT"))
+        self.assertEqual([Decimal(5)], [order.quantity for order in self.market.limit_orders])
+
+        # The sell trade at 100 goes through the resting order as a maker.
+        self.clock.backtest_til(3)
+        fill = self.events(MarketEvent.OrderFilled)[1]
+        self.assertEqual((Decimal("100.15"), Decimal(1), Decimal("0.001")),
+                         (fill.price, fill.amount, fill.trade_fee.percent))
+        self.assertEqual([Decimal(4)], [order.quantity for order in self.market.limit_orders])
+
+    def test_cancel_and_failure(self):
+        self.clock.backtest_til(0.5)
+        order_id = self.market.sell(TRADING_PAIR, Decimal("5"), OrderType.LIMIT, Decimal("101"))
+        self.assertEqual(Decimal(5), self.market.get_available_balance("HBOT"))
+        self.market.cancel(TRADING_PAIR, order_id)
+        self.clock.backtest_til(1)
+        self.assertEqual(order_id, self.events(MarketEvent.OrderCancelled)[0].order_id)
+        self.assertEqual(Decimal(10), self.market.get_available_balance("HBOT"))
+
+        failed_id = self.market.sell(TRADING_PAIR, Decimal("11"), OrderType.LIMIT, Decimal("101"))
+        self.assertEqual([], self.events(MarketEvent.OrderFailure))
+        self.clock.backtest_til(1.5)
+        self.assertEqual(failed_id, self.events(MarketEvent.OrderFailure)[0].order_id)
+
+    def test_market_order(self):
+        self.market.set_balance("USDT", Decimal(2000))
+        self.clock.backtest_til(0.5)
+        self.market.buy(TRADING_PAIR, Decimal("12"), OrderType.MARKET)
+        self.assertEqual([], self.events(MarketEvent.OrderFilled))
+        self.clock.backtest_til(1)
+        fills = self.events(MarketEvent.OrderFilled)
+        self.assertEqual([(Decimal("100.1"), Decimal(10)), (Decimal("100.2"), Decimal(2))],
+                         [(fill.price, fill.amount) for fill in fills])
+        self.assertEqual(Decimal(22), self.market.get_balance("HBOT"))
+        self.assertEqual(Decimal("798.6"), self.market.get_balance("USDT"))
+
+        self.market.buy(TRADING_PAIR, Decimal("10"), OrderType.MARKET)
+        self.clock.backtest_til(2)
+        self.assertEqual(1, len(self.events(MarketEvent.OrderFailure)))
+
+
+class BacktestRunnerTest(unittest.TestCase):
+    def test_pure_market_making(self):
+        market = BacktestMarket(latency=0.1)
+        market.add_data(TRADING_PAIR, "HBOT", "USDT", generate_market_data(0, 600), Decimal("0.01"), Decimal("0.001"))
+        market.set_balance("HBOT", Decimal(100))
+        market.set_balance("USDT", Decimal(10000))
+        fill_logger = EventLogger()
+        market.add_listener(MarketEvent.OrderFilled, fill_logger)
+        strategy = PureMarketMakingStrategy(MarketTradingPairTuple(market, TRADING_PAIR, "HBOT", "USDT"),
+                                            bid_spread=Decimal("0.0005"),
+                                            ask_spread=Decimal("0.0005"),
+                                            order_amount=Decimal("1"),
+                                            order_levels=2,
+                                            order_level_spread=Decimal("0.001"),
+                                            order_refresh_time=10,
+                                            filled_order_delay=5,
+                                            logging_options=0)
+        result = BacktestRunner(market, [strategy], tick_size=0.1).run()
+
+        self.assertGreaterEqual(result.ticks, 6000)
+        self.assertGreater(result.ticks_per_second, 0)
+        self.assertEqual(market.events_replayed, result.events_replayed)
+        self.assertGreater(result.fill_count, 0)
+        self.assertEqual(len(fill_logger.event_log), result.fill_count)
+        base_traded = sum(f.amount if f.trade_type is TradeType.BUY else -f.amount for f in fill_logger.event_log)
+        quote_traded = sum(f.amount * f.price if f.trade_type is TradeType.SELL else -f.amount * f.price
+                           for f in fill_logger.event_log)
+        self.assertEqual(Decimal(100) + base_traded, result.balances["HBOT"])
+        self.assertEqual(Decimal(10000) + quote_traded, result.balances["USDT"])
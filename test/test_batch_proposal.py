@@ -0,0 +1,152 @@
+import random
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from hummingbot.strategy.pure_market_making.batch_proposal import (
+    BatchProposal,
+    apply_budget_constraint,
+    budget_constrained_sizes,
+)
+from hummingbot.strategy.pure_market_making.data_types import PriceSize, Proposal
+
+PRICE_QUANTUM = Decimal("0.01")
+SIZE_QUANTUM = Decimal("0.001")
+
+
+def quantize_price(price: Decimal) -> Decimal:
+    return (price // PRICE_QUANTUM) * PRICE_QUANTUM
+
+
+def quantize_amount(amount: Decimal, price: Decimal = Decimal("NaN")) -> Decimal:
+    return (amount // SIZE_QUANTUM) * SIZE_QUANTUM
+
+
+def sequential_budget_constraint(proposal: Proposal, base_balance: Decimal, quote_balance: Decimal,
+                                 fee_percent: Decimal):
+    # PureMarketMakingStrategy.c_apply_budget_constraint
+    for buy in proposal.buys:
+        quote_size = buy.size * buy.price * (Decimal(1) + fee_percent)
+        if quote_balance < quote_size:
+            buy.size = quantize_amount(quote_balance / (buy.price * (Decimal(1) + fee_percent)))
+            quote_balance = Decimal(0)
+        elif quote_balance == 0:
+            buy.size = Decimal(0)
+        else:
+            quote_balance -= quote_size
+    proposal.buys = [o for o in proposal.buys if o.size > 0]
+    for sell in proposal.sells:
+        if base_balance < sell.size:
+            sell.size = quantize_amount(base_balance)
+            base_balance = Decimal(0)
+        elif base_balance == 0:
+            sell.size = Decimal(0)
+        else:
+            base_balance -= sell.size
+    proposal.sells = [o for o in proposal.sells if o.size > 0]
+
+
+def proposal_values(proposal: Proposal):
+    return ([(o.price, o.size) for o in proposal.buys], [(o.price, o.size) for o in proposal.sells])
+
+
+class BatchProposalTest(unittest.TestCase):
+    def levels(self, levels: int = 5) -> BatchProposal:
+        return BatchProposal.from_levels(100., 101., 0.01, 0.02, 0.005, 1., 0.5, levels, levels)
+
+    def test_from_levels(self):
+        proposal = self.levels().to_proposal(quantize_price, quantize_amount)
+        self.assertEqual([(Decimal("99.00"), Decimal("1.000")),
+                          (Decimal("98.50"), Decimal("1.500")),
+                          (Decimal("98.00"), Decimal("2.000")),
+                          (Decimal("97.50"), Decimal("2.500")),
+                          (Decimal("97.00"), Decimal("3.000"))],
+                         proposal_values(proposal)[0])
+        self.assertEqual([Decimal("103.02"), Decimal("103.52"), Decimal("104.03"), Decimal("104.53"),
+                          Decimal("105.04")],
+                         [o.price for o in proposal.sells])
+
+    def test_levels_parity(self):
+        # Matches the Decimal level calculation of PureMarketMakingStrategy.c_create_base_proposal
+        rng = random.Random(7)
+        for _ in range(200):
+            reference_price = Decimal(str(round(rng.uniform(0.01, 60000), 4)))
+            bid_spread = Decimal(str(round(rng.uniform(0, 0.05), 4)))
+            ask_spread = Decimal(str(round(rng.uniform(0, 0.05), 4)))
+            level_spread = Decimal(str(round(rng.uniform(0, 0.01), 4)))
+            order_amount = Decimal(str(round(rng.uniform(0.001, 100), 3)))
+            level_amount = Decimal(str(round(rng.uniform(0, 10), 3)))
+            batch = BatchProposal.from_levels(float(reference_price), float(reference_price), float(bid_spread),
+                                              float(ask_spread), float(level_spread), float(order_amount),
+                                              float(level_amount), 20, 20)
+            proposal = batch.to_proposal(quantize_price, quantize_amount)
+            for level, buy in enumerate(proposal.buys):
+                self.assertEqual(quantize_price(reference_price * (1 - bid_spread - level * level_spread)),
+                                 buy.price)
+                self.assertEqual(quantize_amount(order_amount + level_amount * level), buy.size)
+            for level, sell in enumerate(proposal.sells):
+                self.assertEqual(quantize_price(reference_price * (1 + ask_spread + level * level_spread)),
+                                 sell.price)
+
+    def test_price_band_and_ping_pong(self):
+        batch = self.levels()
+        batch.apply_price_band(100., 99., -1.)
+        self.assertEqual(0, len(batch.buy_prices))
+        self.assertEqual(5, len(batch.sell_prices))
+        batch.apply_price_band(100., -1., 100.)
+        self.assertEqual(0, len(batch))
+
+        batch = self.levels()
+        batch.remove_top_levels(2, 0)
+        proposal = batch.to_proposal(quantize_price, quantize_amount)
+        self.assertEqual(Decimal("98.00"), proposal.buys[0].price)
+        self.assertEqual(5, len(proposal.sells))
+
+    def test_order_optimization_and_transaction_costs(self):
+        batch = self.levels(3)
+        # Buys move down to the top bid, sells already are above the top ask.
+        batch.apply_order_optimization(98.5, 102., 0.005)
+        np.testing.assert_allclose([98.5, 98.0075, 97.515], batch.buy_prices)
+        self.assertAlmostEqual(103.02, batch.sell_prices[0])
+        batch.apply_order_optimization(None, 103.5, 0.005)
+        self.assertAlmostEqual(98.5, batch.buy_prices[0])
+        self.assertAlmostEqual(103.5, batch.sell_prices[0])
+        batch.apply_transaction_costs(0.001, 0.002)
+        self.assertAlmostEqual(98.5 * 0.999, batch.buy_prices[0])
+        self.assertAlmostEqual(103.5 * 1.002, batch.sell_prices[0])
+
+    def test_inventory_skew(self):
+        batch = self.levels(2)
+        batch.apply_inventory_skew(0.5, 0.)
+        proposal = batch.to_proposal(quantize_price, quantize_amount)
+        self.assertEqual([Decimal("0.500"), Decimal("0.750")], [o.size for o in proposal.buys])
+        # Sells quantized to 0 are left out.
+        self.assertEqual([], proposal.sells)
+
+    def test_budget_constrained_sizes(self):
+        np.testing.assert_allclose([1., 1., 0.5, 0.], budget_constrained_sizes(np.array([1., 2., 2., 1.]), 4.))
+        np.testing.assert_allclose([1., 1.], budget_constrained_sizes(np.array([1., 2.]), 4.))
+        np.testing.assert_allclose([0., 0.], budget_constrained_sizes(np.array([1., 2.]), 0.))
+
+    def test_budget_constraint_parity(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            batch = BatchProposal.from_levels(100., 100., 0.001, 0.001, 0.002, rng.uniform(0.01, 2),
+                                              rng.uniform(0, 1), 10, 10)
+            base_balance = Decimal(str(round(rng.uniform(0, 30), 3)))
+            quote_balance = Decimal(str(round(rng.uniform(0, 3000), 2)))
+            fee_percent = Decimal(rng.choice(["0", "0.001", "0.0025"]))
+            proposal = batch.to_proposal(quantize_price, quantize_amount)
+            expected = batch.to_proposal(quantize_price, quantize_amount)
+            apply_budget_constraint(proposal, base_balance, quote_balance, fee_percent, quantize_amount)
+            sequential_budget_constraint(expected, base_balance, quote_balance, fee_percent)
+            self.assertEqual(proposal_values(expected), proposal_values(proposal))
+
+    def test_budget_constraint_exact_balance(self):
+        proposal = Proposal([PriceSize(Decimal("100"), Decimal("1")), PriceSize(Decimal("99"), Decimal("1"))],
+                            [PriceSize(Decimal("101"), Decimal("1")), PriceSize(Decimal("102"), Decimal("1"))])
+        apply_budget_constraint(proposal, Decimal("2"), Decimal("100"), Decimal(0), quantize_amount)
+        self.assertEqual(([(Decimal("100"), Decimal("1"))],
+                          [(Decimal("101"), Decimal("1")), (Decimal("102"), Decimal("1"))]),
+                         proposal_values(proposal))
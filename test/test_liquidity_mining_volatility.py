@@ -0,0 +1,76 @@
+import unittest
+from decimal import Decimal
+from statistics import mean
+from typing import (
+    Dict,
+    List,
+)
+
+from hummingbot.backtest.backtest_market import BacktestMarket
+from hummingbot.backtest.market_data import generate_market_data
+from hummingbot.core.clock import (
+    Clock,
+    ClockMode,
+)
+from hummingbot.strategy.liquidity_mining.liquidity_mining import LiquidityMiningStrategy
+from hummingbot.strategy.market_trading_pair_tuple import MarketTradingPairTuple
+
+
+def list_volatility(mid_prices: List[Decimal], interval: int, periods: int) -> Decimal:
+    # The calculation over the list of the last mid prices the volatility indicators replace.
+    last_index = len(mid_prices) - 1
+    atr = []
+    first_index = max(last_index - (interval * periods), 0)
+    for i in range(last_index, first_index, interval * -1):
+        prices = mid_prices[i - interval + 1: i + 1]
+        if not prices:
+            break
+        atr.append((max(prices) - min(prices)) / min(prices))
+    return mean(atr) if atr else Decimal("NaN")
+
+
+class LiquidityMiningVolatilityTest(unittest.TestCase):
+    def test_volatility(self):
+        interval, periods = 5, 4
+        market = BacktestMarket()
+        market_infos: Dict[str, MarketTradingPairTuple] = {}
+        for seed, trading_pair in enumerate(["HBOT-USDT", "ETH-USDT"]):
+            base, quote = trading_pair.split("-")
+            market.add_data(trading_pair, base, quote, generate_market_data(0, 200, interval=1, seed=seed),
+                            Decimal("0.01"), Decimal("0.001"))
+            market_infos[trading_pair] = MarketTradingPairTuple(market, trading_pair, base, quote)
+        market.set_balance("HBOT", Decimal(100))
+        market.set_balance("ETH", Decimal(100))
+        market.set_balance("USDT", Decimal(20000))
+        strategy = LiquidityMiningStrategy(exchange=market,
+                                           market_infos=market_infos,
+                                           token="USDT",
+                                           order_amount=Decimal(1),
+                                           spread=Decimal("0.01"),
+                                           inventory_skew_enabled=False,
+                                           target_base_pct=Decimal("0.5"),
+                                           order_refresh_time=10,
+                                           order_refresh_tolerance_pct=Decimal("0.001"),
+                                           volatility_interval=interval,
+                                           avg_volatility_period=periods,
+                                           volatility_update_interval=1)
+        clock = Clock(ClockMode.BACKTEST, 1.0, 0, 200)
+        clock.add_iterator(market)
+        clock.add_iterator(strategy)
+
+        history: Dict[str, List[Decimal]] = {trading_pair: [] for trading_pair in market_infos}
+        expected: Dict[str, Decimal] = {trading_pair: Decimal("NaN") for trading_pair in market_infos}
+        for tick in range(1, 200):
+            clock.backtest_til(tick)
+            for trading_pair, market_info in market_infos.items():
+                history[trading_pair].append(market_info.get_mid_price())
+                # The volatility is updated with each complete interval, as the average over the last intervals.
+                if len(history[trading_pair]) % interval == 0:
+                    expected[trading_pair] = list_volatility(history[trading_pair][-interval * periods:],
+                                                             interval, periods)
+                if expected[trading_pair].is_nan():
+                    self.assertTrue(strategy._volatility[trading_pair].is_nan())
+                else:
+                    self.assertAlmostEqual(float(expected[trading_pair]), float(strategy._volatility[trading_pair]),
+                                           12)
+        self.assertGreater(strategy._volatility["HBOT-USDT"], 0)
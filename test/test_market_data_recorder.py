@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from hummingbot.backtest.market_data import (
+    MARKET_DATA_DTYPE,
+    MarketDataType,
+    generate_market_data,
+)
+from hummingbot.backtest.market_data_recorder import (
+    MarketDataRecorder,
+    find_checkpoint,
+    load_market_data_file,
+    load_recorded_market_data,
+    market_data_files,
+    order_book_messages,
+)
+from hummingbot.backtest.order_book_replay import OrderBookReplay
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.event.events import TradeType
+
+TRADING_PAIR = "HBOT-USDT"
+# 2021-05-18 09:59:00 UTC
+START_TIMESTAMP = 1621331940.0
+
+
+def assert_same_order_book(test_case: unittest.TestCase, expected: OrderBook, actual: OrderBook):
+    for expected_side, actual_side in zip(expected.numpy_snapshot(), actual.numpy_snapshot()):
+        np.testing.assert_array_equal(expected_side[:, :2], actual_side[:, :2])
+
+
+class MarketDataRecorderTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.temp_dir.name
+        # Recorded from the replay of generated market data, over an hour boundary.
+        self.source_data = generate_market_data(START_TIMESTAMP, START_TIMESTAMP + 120)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def record(self, recorder: MarketDataRecorder, data: np.ndarray) -> OrderBook:
+        order_book = OrderBook()
+        replay = OrderBookReplay(TRADING_PAIR, order_book, data)
+        first_diff = int(np.argmax(data["type"] != MarketDataType.SNAPSHOT))
+        replay.replay_until(data["timestamp"][first_diff - 1])
+        recorder.record_order_book(TRADING_PAIR, order_book, data["timestamp"][0])
+        for row in data[first_diff:]:
+            if row["type"] == MarketDataType.TRADE:
+                recorder.record_trade(TRADING_PAIR, TradeType(row["side"]), row["price"], row["amount"],
+                                      row["timestamp"])
+            else:
+                entry = np.array([[row["price"], row["amount"], row["update_id"]]])
+                empty = np.zeros((0, 3))
+                is_bid = row["side"] == TradeType.BUY.value
+                recorder.record_diff(TRADING_PAIR, row["update_id"], entry if is_bid else empty,
+                                     empty if is_bid else entry, row["timestamp"])
+                order_book.apply_numpy_diffs(entry if is_bid else empty, empty if is_bid else entry,
+                                             row["update_id"])
+        return order_book
+
+    def test_record_and_replay(self):
+        # Checkpoints are larger than the buffer, and written directly.
+        recorder = MarketDataRecorder(self.data_dir, checkpoint_interval=30, buffer_size=16, compress=False)
+        order_book = self.record(recorder, self.source_data)
+        recorder.close()
+
+        files = market_data_files(self.data_dir, TRADING_PAIR)
+        self.assertEqual(["20210518-09.bin", "20210518-10.bin"], [os.path.basename(path) for path in files])
+        data = load_recorded_market_data(self.data_dir, TRADING_PAIR)
+        self.assertEqual(MARKET_DATA_DTYPE, data.dtype)
+        self.assertTrue(np.all(np.diff(data["timestamp"]) >= 0))
+        # Every source row, plus the checkpoints: at the start, every 30s, and at the start of the new hour.
+        checkpoint_times = np.unique(data["timestamp"][data["type"] == MarketDataType.SNAPSHOT])
+        self.assertEqual([0, 30, 60, 90, 120], list(np.round(checkpoint_times - START_TIMESTAMP)))
+        self.assertAlmostEqual(START_TIMESTAMP + 60, load_market_data_file(files[1])["timestamp"][0], delta=0.1)
+        source_rows = np.sum(data["type"] != MarketDataType.SNAPSHOT)
+        self.assertEqual(np.sum(self.source_data["type"] != MarketDataType.SNAPSHOT), source_rows)
+
+        replayed_order_book = OrderBook()
+        OrderBookReplay(TRADING_PAIR, replayed_order_book, data).replay_until(data["timestamp"][-1])
+        assert_same_order_book(self, order_book, replayed_order_book)
+
+        # The last hour can be replayed on its own.
+        last_hour = load_recorded_market_data(self.data_dir, TRADING_PAIR, START_TIMESTAMP + 60)
+        self.assertIsInstance(last_hour, np.memmap)
+        replayed_order_book = OrderBook()
+        OrderBookReplay(TRADING_PAIR, replayed_order_book, last_hour).replay_until(last_hour["timestamp"][-1])
+        assert_same_order_book(self, order_book, replayed_order_book)
+        del data, last_hour
+
+    def test_compress_past_files(self):
+        recorder = MarketDataRecorder(self.data_dir, compress=True)
+        self.record(recorder, self.source_data)
+        recorder.close()
+
+        files = market_data_files(self.data_dir, TRADING_PAIR)
+        self.assertEqual(["20210518-09.npz", "20210518-10.bin"], [os.path.basename(path) for path in files])
+        compressed = load_market_data_file(files[0])
+        self.assertEqual(MARKET_DATA_DTYPE, compressed.dtype)
+        self.assertEqual(START_TIMESTAMP, compressed["timestamp"][0])
+        self.assertTrue(np.all(compressed["timestamp"] < START_TIMESTAMP + 60))
+        self.assertLess(os.path.getsize(files[0]), len(compressed) * MARKET_DATA_DTYPE.itemsize / 4)
+
+    def test_flush_and_partial_rows(self):
+        recorder = MarketDataRecorder(self.data_dir, flush_interval=10, compress=False)
+        self.record(recorder, self.source_data[self.source_data["timestamp"] <= START_TIMESTAMP + 20])
+        path = market_data_files(self.data_dir, TRADING_PAIR)[0]
+        flushed_rows = len(load_market_data_file(path))
+        self.assertGreater(flushed_rows, 0)
+        self.assertLess(flushed_rows, recorder.rows_written[TRADING_PAIR])
+        recorder.close()
+
+        # A partially written last row is left out, and dropped when the file is appended to.
+        with open(path, "ab") as fd:
+            fd.write(b"\0" * 7)
+        rows = len(load_market_data_file(path))
+        recorder = MarketDataRecorder(self.data_dir, compress=False)
+        recorder.record_trade(TRADING_PAIR, TradeType.BUY, 100, 1, START_TIMESTAMP + 30)
+        recorder.close()
+        data = load_market_data_file(path)
+        self.assertEqual(rows + 1, len(data))
+        self.assertEqual(START_TIMESTAMP + 30, data["timestamp"][-1])
+
+    def test_restore_from_snapshot_and_diffs(self):
+        recorder = MarketDataRecorder(self.data_dir, checkpoint_interval=10, compress=False)
+        data = self.source_data[self.source_data["timestamp"] <= START_TIMESTAMP + 25]
+        order_book = self.record(recorder, data)
+        recorder.close()
+
+        recorded = load_recorded_market_data(self.data_dir, TRADING_PAIR)
+        self.assertEqual(-1, find_checkpoint(recorded, START_TIMESTAMP - 1))
+        checkpoint = find_checkpoint(recorded, START_TIMESTAMP + 25)
+        self.assertAlmostEqual(START_TIMESTAMP + 20, recorded["timestamp"][checkpoint], delta=0.1)
+        self.assertNotEqual(recorded["timestamp"][checkpoint - 1], recorded["timestamp"][checkpoint])
+
+        snapshot, diffs = order_book_messages(TRADING_PAIR, recorded, START_TIMESTAMP + 25)
+        self.assertEqual(recorded["timestamp"][checkpoint], snapshot.timestamp)
+        is_diff = (data["type"] == MarketDataType.DIFF) & (data["timestamp"] >= snapshot.timestamp)
+        self.assertEqual(len(np.unique(data["update_id"][is_diff])), len(diffs))
+        restored_order_book = OrderBook()
+        restored_order_book.restore_from_snapshot_and_diffs(snapshot, diffs)
+        assert_same_order_book(self, order_book, restored_order_book)
+        del recorded
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from hummingbot import data_path
+from hummingbot.connector.markets_recorder import MarketsRecorder
+from hummingbot.core.event.events import (
+    BuyOrderCreatedEvent,
+    MarketEvent,
+    OrderCancelledEvent,
+    OrderFilledEvent,
+    OrderType,
+    TradeFee,
+    TradeType,
+)
+from hummingbot.model.market_state import MarketState
+from hummingbot.model.order import Order
+from hummingbot.model.order_status import OrderStatus
+from hummingbot.model.sql_connection_manager import (
+    SQLConnectionManager,
+    SQLConnectionType,
+)
+from hummingbot.model.trade_fill import TradeFill
+
+
+class MockConnector:
+    display_name: str = "mock_exchange"
+
+    def __init__(self):
+        self.states: Dict[str, Any] = {}
+        self.tracking_states_reads: int = 0
+
+    @property
+    def tracking_states(self) -> Dict[str, Any]:
+        self.tracking_states_reads += 1
+        return dict(self.states)
+
+    def add_listener(self, *args):
+        pass
+
+    def remove_listener(self, *args):
+        pass
+
+    def add_trade_fills_from_market_recorder(self, *args):
+        pass
+
+    def add_exchange_order_ids_from_market_recorder(self, *args):
+        pass
+
+
+class MarketsRecorderTest(unittest.TestCase):
+    config_file_path: str = "test_markets_recorder.yml"
+
+    def setUp(self) -> None:
+        self.ev_loop: asyncio.BaseEventLoop = asyncio.get_event_loop()
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.sql = SQLConnectionManager(SQLConnectionType.TRADE_FILLS,
+                                        db_path=os.path.join(self.db_dir.name, "trades.sqlite"))
+        self.market: MockConnector = MockConnector()
+        self.csv_path: str = os.path.join(data_path(), "trades_test_markets_recorder.csv")
+
+    def tearDown(self) -> None:
+        self.sql.get_shared_session().close()
+        self.db_dir.cleanup()
+        if os.path.exists(self.csv_path):
+            os.remove(self.csv_path)
+
+    def record_events(self, recorder: MarketsRecorder, num_orders: int):
+        for i in range(num_orders):
+            order_id: str = f"buy-BTC-USDT-{1620000000000000 + i}"
+            self.market.states[order_id] = {"amount": "1"}
+            recorder._did_create_order(MarketEvent.BuyOrderCreated.value, self.market, BuyOrderCreatedEvent(
+                1620000000, OrderType.LIMIT, "BTC-USDT", Decimal("1"), Decimal("100"), order_id, f"ex-{i}"
+            ))
+            recorder._did_fill_order(MarketEvent.OrderFilled.value, self.market, OrderFilledEvent(
+                1620000000, order_id, "BTC-USDT", TradeType.BUY, OrderType.LIMIT, Decimal("100"), Decimal("1"),
+                TradeFee(Decimal("0.001")), f"trade-{i}"
+            ))
+            recorder._did_cancel_order(MarketEvent.OrderCancelled.value, self.market,
+                                       OrderCancelledEvent(1620000000, order_id))
+        # Unknown orders are not recorded.
+        recorder._did_cancel_order(MarketEvent.OrderCancelled.value, self.market,
+                                   OrderCancelledEvent(1620000000, "unknown"))
+
+    def assert_recorded(self, num_orders: int):
+        session = self.sql.get_shared_session()
+        self.assertEqual(num_orders, session.query(Order).count())
+        self.assertEqual(num_orders, session.query(TradeFill).count())
+        self.assertEqual(num_orders * 3, session.query(OrderStatus).count())
+        self.assertEqual({"OrderCancelled"}, {order.last_status for order in session.query(Order)})
+        market_state: MarketState = session.query(MarketState).one()
+        self.assertEqual(num_orders, len(market_state.saved_state))
+        session.commit()
+
+    def test_record_events(self):
+        recorder = MarketsRecorder(self.sql, [self.market], self.config_file_path, "pure_market_making")
+        recorder.start()
+        self.record_events(recorder, 3)
+        self.assert_recorded(3)
+        self.assertEqual(9, self.market.tracking_states_reads)
+        recorder.stop()
+
+    def test_write_behind(self):
+        recorder = MarketsRecorder(self.sql, [self.market], self.config_file_path, "pure_market_making",
+                                   write_behind=True, flush_interval=0.1, max_batch_size=1000)
+        recorder.start()
+        self.record_events(recorder, 3)
+        self.assertEqual(0, self.sql.get_shared_session().query(Order).count())
+        self.sql.get_shared_session().commit()
+
+        self.ev_loop.run_until_complete(asyncio.sleep(0.2))
+        recorder.stop()
+        self.assert_recorded(3)
+        # One market states snapshot for the whole batch.
+        self.assertEqual(1, self.market.tracking_states_reads)
+        with open(self.csv_path) as csv_file:
+            self.assertEqual(4, len(csv_file.readlines()))
+
+    def test_write_behind_batch_size(self):
+        recorder = MarketsRecorder(self.sql, [self.market], self.config_file_path, "pure_market_making",
+                                   write_behind=True, flush_interval=60, max_batch_size=4)
+        recorder.start()
+        self.record_events(recorder, 3)
+        self.assertEqual(2, self.market.tracking_states_reads)
+        self.assertEqual(2, len(recorder._pending_writes))
+        # Stopping commits everything still queued.
+        recorder.stop()
+        self.assert_recorded(3)
+        self.assertEqual(3, self.market.tracking_states_reads)
+
+    def test_write_behind_retry(self):
+        recorder = MarketsRecorder(self.sql, [self.market], self.config_file_path, "pure_market_making",
+                                   write_behind=True, flush_interval=0.1, max_batch_size=1000, retry_interval=0.05)
+        sessions: List[Session] = []
+        create_session = self.sql.create_session
+
+        def create_failing_session(**kwargs) -> Session:
+            # The first commit fails, e.g. on a locked database.
+            session: Session = create_session(**kwargs)
+            if len(sessions) == 0:
+                def commit():
+                    raise OperationalError("COMMIT", {}, Exception("database is locked"))
+                session.commit = commit
+            sessions.append(session)
+            return session
+
+        self.sql.create_session = create_failing_session
+        recorder.start()
+        self.record_events(recorder, 3)
+        self.ev_loop.run_until_complete(asyncio.sleep(0.3))
+        recorder.stop()
+        self.assertEqual(2, len(sessions))
+        self.assert_recorded(3)
+        with open(self.csv_path) as csv_file:
+            self.assertEqual(4, len(csv_file.readlines()))
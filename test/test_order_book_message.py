@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import (
+    OrderBookMessage,
+    OrderBookMessageType,
+    entries_to_numpy,
+    merge_numpy_diffs,
+)
+from hummingbot.core.data_type.order_book_row import OrderBookRow
+
+
+class OrderBookMessageTest(unittest.TestCase):
+    def test_entries_to_numpy(self):
+        result = entries_to_numpy([["0.1", "2"], ["0.2", "0.00000000"]], 7)
+        self.assertEqual(np.float64, result.dtype)
+        self.assertEqual([[0.1, 2, 7], [0.2, 0, 7]], result.tolist())
+
+        # Trailing fields, e.g. timestamps or flags, are dropped.
+        result = entries_to_numpy([["0.1", "2", "1622547060.123", "r"], ["0.2", "3", "1622547060.456"]], 8)
+        self.assertEqual([[0.1, 2, 8], [0.2, 3, 8]], result.tolist())
+
+        self.assertEqual((0, 3), entries_to_numpy([], 1).shape)
+
+        pre_parsed = np.array([[1, 2, 3]], dtype=np.float64)
+        self.assertIs(pre_parsed, entries_to_numpy(pre_parsed, 3))
+
+    def test_message_arrays(self):
+        message = OrderBookMessage(OrderBookMessageType.DIFF, {
+            "trading_pair": "BTC-USDT",
+            "update_id": 5,
+            "bids": [["100.5", "1"]],
+            "asks": [["101", "2"], ["102", "0"]],
+        }, timestamp=1.0)
+        self.assertEqual([[100.5, 1, 5]], message.bids_array.tolist())
+        self.assertEqual([[101, 2, 5], [102, 0, 5]], message.asks_array.tolist())
+
+        parsed_message = OrderBookMessage(OrderBookMessageType.DIFF, {
+            "trading_pair": "BTC-USDT",
+            "update_id": 5,
+            "bids": message.bids_array,
+            "asks": message.asks_array,
+        }, timestamp=1.0)
+        self.assertEqual(message.bids, parsed_message.bids)
+        self.assertEqual([OrderBookRow(101, 2, 5), OrderBookRow(102, 0, 5)], parsed_message.asks)
+
+    def test_apply_numpy_diffs_from_message(self):
+        order_book = OrderBook()
+        snapshot = OrderBookMessage(OrderBookMessageType.SNAPSHOT, {
+            "trading_pair": "BTC-USDT",
+            "update_id": 10,
+            "bids": [["99", "1"], ["98", "1"]],
+            "asks": [["101", "1"], ["102", "1"]],
+        }, timestamp=1.0)
+        order_book.apply_numpy_snapshot(snapshot.bids_array, snapshot.asks_array, snapshot.update_id)
+        self.assertEqual(10, order_book.snapshot_uid)
+
+        diff = OrderBookMessage(OrderBookMessageType.DIFF, {
+            "trading_pair": "BTC-USDT",
+            "update_id": 11,
+            "bids": [["99", "0"], ["99.5", "3"]],
+            "asks": [],
+        }, timestamp=2.0)
+        order_book.apply_numpy_diffs(diff.bids_array, diff.asks_array, diff.update_id)
+        self.assertEqual(11, order_book.last_diff_uid)
+        self.assertEqual([[99.5, 3, 11], [98, 1, 10]], order_book.numpy_snapshot()[0].tolist())
+        self.assertEqual(99.5, order_book.get_price(False))
+
+        # Diffs without any entries still move the last diff update ID forward.
+        empty = OrderBookMessage(OrderBookMessageType.DIFF, {
+            "trading_pair": "BTC-USDT", "update_id": 12, "bids": [], "asks": []
+        }, timestamp=3.0)
+        order_book.apply_numpy_diffs(empty.bids_array, empty.asks_array, empty.update_id)
+        self.assertEqual(12, order_book.last_diff_uid)
+
+    def test_merge_numpy_diffs(self):
+        first = np.array([[1, 1, 1], [2, 1, 1]], dtype=np.float64)
+        second = np.array([[1, 0, 2], [3, 5, 2]], dtype=np.float64)
+        third = np.array([[2, 4, 3]], dtype=np.float64)
+        merged = merge_numpy_diffs([first, second, third])
+        self.assertEqual([[1, 0, 2], [2, 4, 3], [3, 5, 2]], merged.tolist())
+        self.assertIs(first, merge_numpy_diffs([first]))
+        self.assertEqual((0, 3), merge_numpy_diffs([np.zeros((0, 3)), np.zeros((0, 3))]).shape)
+
+        rng = np.random.RandomState(42)
+        sequential_order_book = OrderBook()
+        merged_order_book = OrderBook()
+        diffs = [np.column_stack([rng.randint(90, 100, 5), rng.randint(0, 3, 5), np.full(5, update_id)])
+                 .astype(np.float64) for update_id in range(1, 50)]
+        for diff in diffs:
+            sequential_order_book.apply_numpy_diffs(diff, np.zeros((0, 3)))
+        merged_order_book.apply_numpy_diffs(merge_numpy_diffs(diffs), np.zeros((0, 3)))
+        self.assertEqual(sequential_order_book.numpy_snapshot()[0].tolist(),
+                         merged_order_book.numpy_snapshot()[0].tolist())
+
+    def test_subclass_arrays(self):
+        class ChangesOrderBookMessage(OrderBookMessage):
+            @property
+            def bids(self):
+                return [OrderBookRow(float(price), float(amount), self.update_id)
+                        for price, amount in self.content["changes"]["bids"]]
+
+        message = ChangesOrderBookMessage(OrderBookMessageType.DIFF, {
+            "trading_pair": "BTC-USDT",
+            "update_id": 5,
+            "changes": {"bids": [["100.5", "1"]]},
+            "asks": [],
+        }, timestamp=1.0)
+        self.assertEqual([[100.5, 1, 5]], message.bids_array.tolist())
+        self.assertEqual((0, 3), message.asks_array.shape)
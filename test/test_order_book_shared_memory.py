@@ -0,0 +1,181 @@
+import queue
+import unittest
+
+import numpy as np
+
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_shared_memory import (
+    OrderBookSharedMemory,
+    SEQUENCE,
+)
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.data_type.sharded_order_book_tracker import (
+    ShardedOrderBookTracker,
+    numpy_snapshot_diff,
+)
+from hummingbot.core.event.event_logger import EventLogger
+from hummingbot.core.event.events import (
+    OrderBookEvent,
+    TradeType,
+)
+
+
+class RecorderStub:
+    def __init__(self):
+        self.records = []
+
+    def record_order_book(self, trading_pair, order_book):
+        self.records.append(("order_book", trading_pair, order_book.snapshot_uid))
+
+    def record_diff(self, trading_pair, update_id, bids, asks):
+        self.records.append(("diff", trading_pair, update_id, bids.tolist(), asks.tolist()))
+
+    def record_trade(self, trading_pair, trade_type, price, amount):
+        self.records.append(("trade", trading_pair, trade_type, price, amount))
+
+    def flush(self):
+        pass
+
+
+class OrderBookSharedMemoryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.shared_memory = OrderBookSharedMemory.create(num_slots=2, depth=2)
+
+    def tearDown(self) -> None:
+        self.shared_memory.close()
+
+    def test_read_unwritten_slot(self):
+        self.assertIsNone(self.shared_memory.read(0))
+
+    def test_write_and_read(self):
+        bids = np.array([[9, 1, 1], [8, 2, 1], [7, 3, 1]], dtype=np.float64)
+        asks = np.array([[10, 1, 1]], dtype=np.float64)
+        self.shared_memory.write(1, bids, asks, 5, 1000.0, 9.5)
+
+        self.assertIsNone(self.shared_memory.read(0))
+        content = self.shared_memory.read(1)
+        self.assertEqual(2, content.sequence)
+        self.assertEqual(5, content.update_id)
+        self.assertEqual(1000.0, content.timestamp)
+        self.assertEqual(9.5, content.last_trade_price)
+        # Truncated to the slot depth
+        self.assertEqual([[9, 1, 1], [8, 2, 1]], content.bids.tolist())
+        self.assertEqual([[10, 1, 1]], content.asks.tolist())
+
+        self.shared_memory.write(1, bids[:1], asks[:0], 6, 1001.0, 9.5)
+        content = self.shared_memory.read(1)
+        self.assertEqual(4, content.sequence)
+        self.assertEqual([[9, 1, 1]], content.bids.tolist())
+        self.assertEqual((0, 3), content.asks.shape)
+
+    def test_read_during_write(self):
+        bids = np.array([[9, 1, 1]], dtype=np.float64)
+        self.shared_memory.write(0, bids, bids, 1, 1000.0, float("nan"))
+        self.shared_memory._slots[0, SEQUENCE] += 1
+        self.assertIsNone(self.shared_memory.read(0))
+
+    def test_write_after_interrupted_write(self):
+        bids = np.array([[9, 1, 1]], dtype=np.float64)
+        self.shared_memory.write(0, bids, bids, 1, 1000.0, float("nan"))
+        # The writer died mid-write, and another one takes over the slot.
+        self.shared_memory._slots[0, SEQUENCE] += 1
+        self.shared_memory.write(0, bids, bids, 2, 1001.0, float("nan"))
+        content = self.shared_memory.read(0)
+        self.assertEqual(4, content.sequence)
+        self.assertEqual(2, content.update_id)
+
+    def test_attach(self):
+        bids = np.array([[9, 1, 1]], dtype=np.float64)
+        asks = np.array([[10, 1, 1]], dtype=np.float64)
+        attached = OrderBookSharedMemory.attach(self.shared_memory.name, num_slots=2, depth=2)
+        try:
+            attached.write(0, bids, asks, 1, 1000.0, float("nan"))
+            content = self.shared_memory.read(0)
+            self.assertEqual([[9, 1, 1]], content.bids.tolist())
+            self.assertTrue(np.isnan(content.last_trade_price))
+        finally:
+            attached.close()
+
+
+class ShardedOrderBookTrackerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tracker = ShardedOrderBookTracker(OrderBookTracker, ["A-B", "C-D", "E-F"], num_shards=2, depth=5)
+        # Set up the main process side of the tracker only, without starting the workers.
+        self.tracker._shared_memory = OrderBookSharedMemory.create(3, 5)
+        self.tracker._trade_queue = queue.Queue()
+        for trading_pair in ["A-B", "C-D", "E-F"]:
+            self.tracker._order_books[trading_pair] = OrderBook()
+
+    def tearDown(self) -> None:
+        self.tracker._trade_queue = None
+        self.tracker.stop()
+
+    def test_shards(self):
+        self.assertEqual([["A-B", "E-F"], ["C-D"]], self.tracker.shards)
+        self.assertEqual({"A-B": 0, "E-F": 1, "C-D": 2}, self.tracker._slots)
+
+    def test_no_trading_pairs(self):
+        tracker = ShardedOrderBookTracker(OrderBookTracker, [], num_shards=2)
+        self.assertEqual([], tracker.shards)
+        tracker._sync_order_books()
+        self.assertTrue(tracker.ready)
+
+    def test_depth(self):
+        self.assertEqual(5, self.tracker.depth)
+        with self.assertRaises(ValueError):
+            ShardedOrderBookTracker(OrderBookTracker, ["A-B"], num_shards=1, depth=0)
+
+    def test_sync_order_books(self):
+        bids = np.array([[9, 1, 3], [8, 2, 3]], dtype=np.float64)
+        asks = np.array([[10, 1, 3]], dtype=np.float64)
+        self.tracker._shared_memory.write(0, bids, asks, 3, 1000.0, 9.5)
+        self.tracker._shared_memory.write(1, bids, asks, 3, 1000.0, float("nan"))
+        self.tracker._sync_order_books()
+
+        order_book = self.tracker.order_books["A-B"]
+        self.assertEqual(3, order_book.snapshot_uid)
+        self.assertEqual(9, order_book.get_price(False))
+        self.assertEqual(10, order_book.get_price(True))
+        self.assertEqual(9.5, order_book.last_trade_price)
+        self.assertTrue(np.isnan(self.tracker.order_books["E-F"].last_trade_price))
+        self.assertEqual(["A-B", "E-F"], self.tracker.ready_trading_pairs)
+        self.assertFalse(self.tracker.ready)
+
+        self.tracker._shared_memory.write(2, bids[:1], asks, 4, 1000.0, float("nan"))
+        self.tracker._sync_order_books()
+        self.assertTrue(self.tracker.ready)
+        self.assertEqual(9, self.tracker.order_books["C-D"].get_price(False))
+
+    def test_apply_trades(self):
+        event_logger = EventLogger()
+        self.tracker.order_books["C-D"].add_listener(OrderBookEvent.TradeEvent, event_logger)
+        self.tracker._trade_queue.put(("C-D", 1000.0, 9.5, 2.0, 1))
+        self.tracker._trade_queue.put(("X-Y", 1000.0, 9.5, 2.0, 1))
+        self.tracker._apply_trades()
+        self.assertEqual(1, len(event_logger.event_log))
+        self.assertEqual(9.5, self.tracker.order_books["C-D"].last_trade_price)
+
+    def test_numpy_snapshot_diff(self):
+        old = np.array([[9, 1, 1], [8, 2, 1], [7, 3, 1]], dtype=np.float64)
+        new = np.array([[9, 1, 2], [8, 5, 2], [6, 1, 2]], dtype=np.float64)
+        self.assertEqual([[8, 5, 3], [6, 1, 3], [7, 0, 3]], numpy_snapshot_diff(old, new, 3).tolist())
+        self.assertEqual((0, 3), numpy_snapshot_diff(old, old, 3).shape)
+
+    def test_recorder(self):
+        recorder = RecorderStub()
+        self.tracker.recorder = recorder
+        recorder.records.clear()
+        bids = np.array([[9, 1, 3], [8, 2, 3]], dtype=np.float64)
+        asks = np.array([[10, 1, 3]], dtype=np.float64)
+        self.tracker._shared_memory.write(0, bids, asks, 3, 1000.0, float("nan"))
+        self.tracker._sync_order_books()
+        self.tracker._shared_memory.write(0, bids[:1], asks, 4, 1001.0, float("nan"))
+        self.tracker._sync_order_books()
+        self.tracker._trade_queue.put(("A-B", 1000.0, 9.5, 2.0, 1))
+        self.tracker._apply_trades()
+
+        # The first sync is checkpointed, the next ones are diffs from the previous one.
+        self.assertEqual([("order_book", "A-B", 3),
+                          ("diff", "A-B", 4, [[8, 0, 4]], []),
+                          ("trade", "A-B", TradeType.BUY, 9.5, 2.0)],
+                         recorder.records)
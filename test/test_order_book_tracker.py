@@ -0,0 +1,394 @@
+import asyncio
+from collections import deque
+import tempfile
+import unittest
+from typing import (
+    Deque,
+    List,
+    Optional,
+)
+
+import numpy as np
+
+from hummingbot.backtest.market_data import MarketDataType
+from hummingbot.backtest.market_data_recorder import (
+    MarketDataRecorder,
+    load_recorded_market_data,
+)
+from hummingbot.backtest.order_book_replay import OrderBookReplay
+from hummingbot.connector.exchange_base import ExchangeBase
+from hummingbot.core.data_type.order_book import OrderBook
+from hummingbot.core.data_type.order_book_message import (
+    OrderBookMessage,
+    OrderBookMessageType,
+)
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.data_type.order_book_tracker_metrics import (
+    LATENCY_BUCKETS,
+    OrderBookPairMetrics,
+)
+
+
+def diff_message(update_id: int,
+                 bids: List[List[float]],
+                 asks: List[List[float]],
+                 first_update_id: Optional[int] = None) -> OrderBookMessage:
+    content = {
+        "trading_pair": "BTC-USDT",
+        "update_id": update_id,
+        "bids": bids,
+        "asks": asks,
+    }
+    if first_update_id is not None:
+        content["first_update_id"] = first_update_id
+    return OrderBookMessage(OrderBookMessageType.DIFF, content, timestamp=float(update_id))
+
+
+def snapshot_message(update_id: int, bids: List[List[float]], asks: List[List[float]]) -> OrderBookMessage:
+    return OrderBookMessage(OrderBookMessageType.SNAPSHOT, {
+        "trading_pair": "BTC-USDT",
+        "update_id": update_id,
+        "bids": bids,
+        "asks": asks,
+    }, timestamp=float(update_id))
+
+
+class MockDataSource:
+    def __init__(self):
+        self.snapshots: List[OrderBookMessage] = []
+        self.snapshot_requests: int = 0
+
+    async def get_order_book_snapshot_message(self, trading_pair: str) -> OrderBookMessage:
+        self.snapshot_requests += 1
+        return self.snapshots.pop(0)
+
+
+class OrderBookTrackerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ev_loop: asyncio.BaseEventLoop = asyncio.get_event_loop()
+        self.data_source: MockDataSource = MockDataSource()
+        self.tracker: OrderBookTracker = OrderBookTracker(data_source=self.data_source, trading_pairs=["BTC-USDT"])
+        self.order_book: OrderBook = OrderBook()
+        self.order_book.apply_numpy_snapshot(np.array([[99, 1, 1], [98, 1, 1]], dtype=np.float64),
+                                             np.array([[101, 1, 1], [102, 1, 1]], dtype=np.float64),
+                                             1)
+        self.tracker._order_books["BTC-USDT"] = self.order_book
+        self.tracker._tracking_message_queues["BTC-USDT"] = asyncio.Queue()
+
+    def run_tracking(self, messages: List[OrderBookMessage]):
+        message_queue: asyncio.Queue = self.tracker._tracking_message_queues["BTC-USDT"]
+        for message in messages:
+            message_queue.put_nowait(message)
+
+        async def track():
+            task = asyncio.ensure_future(self.tracker._track_single_book("BTC-USDT"))
+            while not message_queue.empty() or len(self.tracker._resync_tasks) > 0:
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            task.cancel()
+        self.ev_loop.run_until_complete(track())
+
+    def test_coalesce_queued_diffs(self):
+        self.run_tracking([
+            diff_message(2, [["99", "2"]], [["101", "0"]]),
+            diff_message(3, [["99", "3"], ["97", "1"]], []),
+            diff_message(4, [["98", "0"]], [["101.5", "1"]]),
+        ])
+        self.assertEqual([[99, 3, 3], [97, 1, 3]], self.order_book.numpy_snapshot()[0].tolist())
+        self.assertEqual([[101.5, 1, 4], [102, 1, 1]], self.order_book.numpy_snapshot()[1].tolist())
+        self.assertEqual(4, self.order_book.last_diff_uid)
+        self.assertEqual(3, self.tracker.diff_messages_applied["BTC-USDT"])
+        self.assertEqual(2, self.tracker.diff_messages_coalesced["BTC-USDT"])
+        self.assertEqual(1, self.tracker.diff_batches_applied["BTC-USDT"])
+        self.assertEqual(3, len(self.tracker._past_diffs_windows["BTC-USDT"]))
+
+        metrics = self.tracker.get_metrics()["BTC-USDT"]
+        self.assertEqual(0, metrics["queue_depth"])
+        self.assertEqual(3, metrics["diff_messages"])
+        self.assertEqual(2, metrics["diff_messages_coalesced"])
+        self.assertEqual(0, metrics["snapshot_resyncs"])
+        self.assertEqual(3, metrics["latency"]["count"])
+        self.assertEqual(4, metrics["last_message_timestamp"])
+        self.assertLess(metrics["seconds_since_update"], 60)
+
+    def test_snapshot_ends_diff_batch(self):
+        self.run_tracking([
+            diff_message(2, [["99", "2"]], []),
+            snapshot_message(3, [["95", "1"]], [["105", "1"]]),
+            diff_message(4, [["96", "2"]], []),
+            diff_message(5, [["96", "3"]], []),
+        ])
+        # The diff older than the snapshot is not replayed over it.
+        self.assertEqual([[96, 3, 5], [95, 1, 3]], self.order_book.numpy_snapshot()[0].tolist())
+        self.assertEqual(3, self.tracker.diff_messages_applied["BTC-USDT"])
+        self.assertEqual(1, self.tracker.diff_messages_coalesced["BTC-USDT"])
+        self.assertEqual(2, self.tracker.diff_batches_applied["BTC-USDT"])
+        self.assertEqual(1, self.tracker.metrics["BTC-USDT"].snapshot_resyncs)
+
+    def test_recorder(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            recorder = MarketDataRecorder(data_dir)
+            self.tracker.recorder = recorder
+            self.data_source.snapshots.append(snapshot_message(5, [["99", "5"]], [["101", "5"]]))
+            self.run_tracking([
+                diff_message(2, [["99", "2"]], [["101", "0"]]),
+                diff_message(3, [["97", "1"]], [], first_update_id=3),
+                diff_message(6, [["98", "6"]], [], first_update_id=5),
+            ])
+            recorder.close()
+
+            # The checkpoints when the recorder is set and after the resync, and the diffs applied in between.
+            data = load_recorded_market_data(data_dir, "BTC-USDT")
+            self.assertEqual([MarketDataType.SNAPSHOT] * 4 + [MarketDataType.DIFF] * 3 + [MarketDataType.SNAPSHOT] * 3,
+                             data["type"].tolist())
+            self.assertEqual([1, 1, 1, 1, 2, 2, 3, 6, 6, 6], data["update_id"].tolist())
+            replayed_order_book = OrderBook()
+            OrderBookReplay("BTC-USDT", replayed_order_book, data).replay_until(data["timestamp"][-1])
+            self.assertEqual(self.order_book.numpy_snapshot()[0][:, :2].tolist(),
+                             replayed_order_book.numpy_snapshot()[0][:, :2].tolist())
+            del data
+
+    def test_sequence_gap_resync(self):
+        self.data_source.snapshots.append(snapshot_message(5, [["99", "5"]], [["101", "5"]]))
+        self.run_tracking([
+            diff_message(2, [["99", "2"]], [], first_update_id=2),
+            # Update IDs 3 and 4 are missing.
+            diff_message(6, [["98", "6"]], [], first_update_id=5),
+            diff_message(7, [["97", "7"]], [], first_update_id=7),
+        ])
+        self.assertEqual(1, self.data_source.snapshot_requests)
+        # The diffs received while the snapshot was fetched are replayed over it.
+        self.assertEqual([[99, 5, 5], [98, 6, 6], [97, 7, 7]], self.order_book.numpy_snapshot()[0].tolist())
+        self.assertEqual(7, self.order_book.last_diff_uid)
+        metrics = self.tracker.get_metrics()["BTC-USDT"]
+        self.assertEqual(1, metrics["sequence_gaps"])
+        self.assertEqual(1, metrics["snapshot_resyncs"])
+        self.assertFalse(metrics["resyncing"])
+
+    def test_snapshot_older_than_gap(self):
+        self.data_source.snapshots.append(snapshot_message(3, [["99", "3"]], [["101", "3"]]))
+        self.data_source.snapshots.append(snapshot_message(6, [["99", "6"]], [["101", "6"]]))
+        self.run_tracking([
+            diff_message(6, [["98", "6"]], [], first_update_id=5),
+            diff_message(7, [["97", "7"]], [], first_update_id=7),
+        ])
+        self.assertEqual(2, self.data_source.snapshot_requests)
+        self.assertEqual([[99, 6, 6], [97, 7, 7]], self.order_book.numpy_snapshot()[0].tolist())
+        self.assertEqual(2, self.tracker.metrics["BTC-USDT"].sequence_gaps)
+
+    def test_resync_buffer_limit(self):
+        self.tracker.MAX_PAST_DIFFS_DURING_RESYNC = 3
+        self.data_source.snapshots.append(snapshot_message(7, [["99", "7"]], [["101", "7"]]))
+        past_diffs_window: Deque[OrderBookMessage] = deque()
+
+        async def process():
+            stalled_resync = asyncio.ensure_future(asyncio.sleep(60))
+            self.tracker._resync_tasks["BTC-USDT"] = stalled_resync
+            self.tracker._process_diff_messages("BTC-USDT", self.order_book,
+                                                [diff_message(3, [["98", "3"]], [], first_update_id=3),
+                                                 diff_message(4, [["98", "4"]], [], first_update_id=4)],
+                                                past_diffs_window)
+            self.assertEqual(2, len(past_diffs_window))
+            self.assertIs(stalled_resync, self.tracker._resync_tasks["BTC-USDT"])
+            self.tracker._process_diff_messages("BTC-USDT", self.order_book,
+                                                [diff_message(5, [["98", "5"]], [], first_update_id=5),
+                                                 diff_message(6, [["98", "6"]], [], first_update_id=6)],
+                                                past_diffs_window)
+            # The buffered diffs are dropped, and a new snapshot fetched in place of the stalled one.
+            self.assertEqual(0, len(past_diffs_window))
+            self.assertIsNot(stalled_resync, self.tracker._resync_tasks["BTC-USDT"])
+            await asyncio.sleep(0)
+            self.assertTrue(stalled_resync.cancelled())
+            await self.tracker._resync_tasks["BTC-USDT"]
+
+        self.ev_loop.run_until_complete(process())
+        self.assertEqual(1, self.data_source.snapshot_requests)
+        self.assertEqual(7, self.tracker._tracking_message_queues["BTC-USDT"].get_nowait().update_id)
+
+    def test_diffs_without_first_update_id(self):
+        self.run_tracking([
+            diff_message(2, [["99", "2"]], []),
+            diff_message(10, [["98", "10"]], []),
+        ])
+        self.assertEqual(0, self.data_source.snapshot_requests)
+        self.assertEqual(10, self.order_book.last_diff_uid)
+
+
+class InitOrderBooksDataSource:
+    def __init__(self):
+        self.requested: List[str] = []
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.release: asyncio.Event = asyncio.Event()
+
+    async def get_new_order_book(self, trading_pair: str) -> OrderBook:
+        self.requested.append(trading_pair)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if trading_pair != "A-B":
+                await self.release.wait()
+            order_book: OrderBook = OrderBook()
+            order_book.apply_numpy_snapshot(np.array([[99, 1, 5]], dtype=np.float64),
+                                            np.array([[101, 1, 5]], dtype=np.float64),
+                                            5)
+            return order_book
+        finally:
+            self.in_flight -= 1
+
+
+class InitOrderBooksExchange(ExchangeBase):
+    def __init__(self, order_book_tracker: OrderBookTracker):
+        super().__init__()
+        self._tracker = order_book_tracker
+        self.account_balance = True
+
+    @property
+    def order_book_tracker(self):
+        return self._tracker
+
+    @property
+    def status_dict(self):
+        return {
+            "order_books_initialized": self._tracker.ready,
+            "account_balance": self.account_balance,
+        }
+
+    @property
+    def ready(self):
+        return all(self.status_dict.values())
+
+
+class InitOrderBooksTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ev_loop: asyncio.BaseEventLoop = asyncio.get_event_loop()
+        self.data_source: InitOrderBooksDataSource = InitOrderBooksDataSource()
+        self.tracker: OrderBookTracker = OrderBookTracker(data_source=self.data_source,
+                                                          trading_pairs=["A-B", "C-D", "E-F", "G-H"])
+        self.tracker.INIT_ORDER_BOOKS_CONCURRENCY = 2
+        self.tracker.REST_RATE_LIMIT = (100.0, 1.0)
+
+    def tearDown(self) -> None:
+        self.tracker.stop()
+
+    def test_init_order_books(self):
+        async def init():
+            task = asyncio.ensure_future(self.tracker._init_order_books())
+            await asyncio.wait_for(self.tracker.wait_for_order_book("A-B"), 1)
+            # Ready on its own, before the other snapshots arrive.
+            self.assertTrue(self.tracker.order_book_ready("A-B"))
+            self.assertFalse(self.tracker.order_book_ready("E-F"))
+            self.assertEqual(["A-B"], self.tracker.ready_trading_pairs)
+            self.assertFalse(self.tracker.ready)
+            while self.data_source.in_flight < 2:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            self.data_source.release.set()
+            await asyncio.wait_for(task, 1)
+
+        self.ev_loop.run_until_complete(init())
+        self.assertTrue(self.tracker.ready)
+        self.assertEqual(["A-B", "C-D", "E-F", "G-H"], self.tracker.ready_trading_pairs)
+        self.assertEqual(2, self.data_source.max_in_flight)
+        self.assertEqual(4, len(self.tracker._tracking_tasks))
+
+    def test_trading_pair_ready(self):
+        exchange = InitOrderBooksExchange(self.tracker)
+
+        async def init():
+            task = asyncio.ensure_future(self.tracker._init_order_books())
+            await asyncio.wait_for(self.tracker.wait_for_order_book("A-B"), 1)
+            self.assertFalse(exchange.ready)
+            self.assertTrue(exchange.trading_pair_ready("A-B"))
+            self.assertFalse(exchange.trading_pair_ready("E-F"))
+            exchange.account_balance = False
+            self.assertFalse(exchange.trading_pair_ready("A-B"))
+            exchange.account_balance = True
+            self.data_source.release.set()
+            await asyncio.wait_for(task, 1)
+
+        self.ev_loop.run_until_complete(init())
+        self.assertTrue(exchange.ready)
+        self.assertTrue(exchange.trading_pair_ready("E-F"))
+
+    def test_no_data_source(self):
+        tracker: OrderBookTracker = OrderBookTracker(data_source=None, trading_pairs=["A-B"])
+        tracker.start()
+        try:
+            # The tasks that need a data source are not started.
+            self.assertIsNone(tracker._init_order_books_task)
+            self.assertIsNone(tracker._order_book_diff_listener_task)
+            self.assertIsNone(tracker._update_last_trade_prices_task)
+            self.assertIsNotNone(tracker._order_book_diff_router_task)
+            self.ev_loop.run_until_complete(tracker._init_order_books())
+            self.ev_loop.run_until_complete(tracker._resync_order_book("A-B"))
+            self.assertFalse(tracker.order_book_ready("A-B"))
+        finally:
+            tracker.stop()
+
+    def test_rate_limit(self):
+        self.tracker.INIT_ORDER_BOOKS_CONCURRENCY = 4
+        # A 1200 weight per 0.1 seconds rate limit, of which a snapshot weighs 400 and initialization may use half.
+        self.tracker.REST_RATE_LIMIT = (1200.0, 0.1)
+        self.tracker.SNAPSHOT_REQUEST_WEIGHT = 400.0
+        self.tracker.INIT_ORDER_BOOKS_RATE_LIMIT_SHARE = 0.5
+        self.assertEqual((1, 0.1), self.tracker.init_order_books_budget)
+        self.tracker.INIT_ORDER_BOOKS_RATE_LIMIT_SHARE = 0.75
+        self.assertEqual((2, 0.1), self.tracker.init_order_books_budget)
+        self.data_source.release.set()
+        start = self.ev_loop.time()
+        self.ev_loop.run_until_complete(self.tracker._init_order_books())
+        # The first 2 requests start right away, the next 2 once they leave the 0.1 second window.
+        elapsed = self.ev_loop.time() - start
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertLess(elapsed, 0.19)
+        self.assertTrue(self.tracker.ready)
+
+    def test_messages_saved_until_ready(self):
+        async def init():
+            task = asyncio.ensure_future(self.tracker._init_order_books())
+            diff_router = asyncio.ensure_future(self.tracker._order_book_diff_router())
+            for update_id in [4, 6]:
+                message = diff_message(update_id, [["98", str(update_id)]], [])
+                message.content["trading_pair"] = "E-F"
+                self.tracker._order_book_diff_stream.put_nowait(message)
+            await asyncio.sleep(0.05)
+            self.assertEqual(2, len(self.tracker._saved_messages["E-F"]))
+            self.data_source.release.set()
+            await asyncio.wait_for(task, 1)
+            await asyncio.sleep(0.05)
+            diff_router.cancel()
+
+        self.ev_loop.run_until_complete(init())
+        # The diff already covered by the snapshot is dropped.
+        self.assertEqual([[99, 1, 5], [98, 6, 6]], self.tracker.order_books["E-F"].numpy_snapshot()[0].tolist())
+        self.assertEqual(1, self.tracker.diff_messages_applied["E-F"])
+
+
+class OrderBookPairMetricsTest(unittest.TestCase):
+    def test_latency(self):
+        metrics = OrderBookPairMetrics()
+        self.assertIsNone(metrics.to_dict(1000.0)["latency"]["p50"])
+        metrics.record_diffs([999.9995, 999.997, 999.997, 999.7, None], now=1000.0)
+        # Clock skew with the exchange
+        metrics.record_diffs([1000.5], now=1000.0)
+        latency = metrics.to_dict(1000.0)["latency"]
+        self.assertEqual(5, latency["count"])
+        self.assertEqual(LATENCY_BUCKETS[2], latency["p50"])
+        self.assertAlmostEqual(0.3, latency["p99"])
+        self.assertAlmostEqual(0.3, latency["max"])
+        self.assertEqual([2, 0, 2], latency["counts"][:3])
+        self.assertEqual(6, metrics.diff_messages)
+
+    def test_rates_and_staleness(self):
+        metrics = OrderBookPairMetrics()
+        self.assertIsNone(metrics.to_dict(1000.0)["seconds_since_update"])
+        for second in range(1000, 1120):
+            metrics.record_diffs([None, None], now=second + 0.5)
+        self.assertEqual(2, metrics.diffs_per_second(1119.9))
+        self.assertEqual(1, metrics.diffs_per_second(1149.9))
+        metrics.record_snapshot(None, now=1130.0)
+        metrics.record_snapshot(None, now=1140.0, resync=False)
+        stats = metrics.to_dict(1145.0)
+        self.assertEqual(1, stats["snapshot_resyncs"])
+        self.assertEqual(5, stats["seconds_since_update"])
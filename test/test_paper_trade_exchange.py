@@ -0,0 +1,253 @@
+import asyncio
+import unittest
+from decimal import Decimal
+from typing import (
+    List,
+    Tuple,
+)
+
+import numpy as np
+
+from hummingbot.connector.exchange.paper_trade.market_config import MarketConfig
+from hummingbot.core.clock import (
+    Clock,
+    ClockMode,
+)
+from hummingbot.connector.exchange.paper_trade.paper_trade_exchange import PaperTradeExchange
+from hummingbot.core.data_type.composite_order_book import CompositeOrderBook
+from hummingbot.core.data_type.order_book_tracker import OrderBookTracker
+from hummingbot.core.event.event_logger import EventLogger
+from hummingbot.core.event.events import (
+    MarketEvent,
+    MarketOrderFailureEvent,
+    OrderBookTradeEvent,
+    OrderFilledEvent,
+    OrderType,
+    TradeType,
+)
+
+
+class MockDataSource:
+    order_book_create_function = None
+
+
+class MockOrderBookTracker(OrderBookTracker):
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    @property
+    def exchange_name(self) -> str:
+        return "binance"
+
+
+class MockTargetMarket:
+    @staticmethod
+    def split_trading_pair(trading_pair: str) -> Tuple[str, str]:
+        return tuple(trading_pair.split("-"))
+
+    @staticmethod
+    def convert_from_exchange_trading_pair(trading_pair: str) -> str:
+        return trading_pair
+
+    @staticmethod
+    def convert_to_exchange_trading_pair(trading_pair: str) -> str:
+        return trading_pair
+
+
+class PaperTradeExchangeTest(unittest.TestCase):
+    def setUp(self):
+        self.ev_loop: asyncio.BaseEventLoop = asyncio.get_event_loop()
+        tracker: MockOrderBookTracker = MockOrderBookTracker(MockDataSource(), ["ETH-USDT", "BTC-USDT"])
+        for trading_pair, mid_price in [("ETH-USDT", 100), ("BTC-USDT", 1000)]:
+            order_book: CompositeOrderBook = CompositeOrderBook()
+            order_book.apply_numpy_snapshot(np.array([[mid_price - 1, 10, 1], [mid_price - 2, 10, 1]],
+                                                     dtype=np.float64),
+                                            np.array([[mid_price + 1, 10, 1], [mid_price + 2, 10, 1]],
+                                                     dtype=np.float64),
+                                            1)
+            tracker._order_books[trading_pair] = order_book
+        PaperTradeExchange.reset_paper_trade_account_balance()
+        self.tracker: MockOrderBookTracker = tracker
+        self.market: PaperTradeExchange = self.create_market(MarketConfig.default_config())
+
+    def create_market(self, config: MarketConfig) -> PaperTradeExchange:
+        market: PaperTradeExchange = PaperTradeExchange(self.tracker, config, MockTargetMarket)
+        market.init_paper_trade_market()
+        market.set_balance("ETH", Decimal(10))
+        market.set_balance("BTC", Decimal(1))
+        market.set_balance("USDT", Decimal(10000))
+        self.market_logger: EventLogger = EventLogger()
+        for event_tag in (MarketEvent.OrderFilled, MarketEvent.OrderFailure):
+            market.add_listener(event_tag, self.market_logger)
+        self.clock: Clock = Clock(ClockMode.BACKTEST, 1.0, 0, 100)
+        self.clock.add_iterator(market)
+        return market
+
+    def tearDown(self):
+        # Let the order created events scheduled by the market fire.
+        self.ev_loop.run_until_complete(asyncio.sleep(0.02))
+
+    def test_on_hold_balances(self):
+        bid_ids = [self.market.buy("ETH-USDT", Decimal(1), OrderType.LIMIT, Decimal(price)) for price in (98, 97)]
+        self.market.buy("BTC-USDT", Decimal("0.5"), OrderType.LIMIT, Decimal(990))
+        ask_id = self.market.sell("ETH-USDT", Decimal(2), OrderType.LIMIT, Decimal(102))
+        self.market.sell("BTC-USDT", Decimal("0.25"), OrderType.LIMIT, Decimal(1010))
+
+        self.assertEqual({"USDT": Decimal(98 + 97 + 495), "ETH": Decimal(2), "BTC": Decimal("0.25")},
+                         dict(self.market.on_hold_balances))
+        self.assertEqual(Decimal(10000 - 98 - 97 - 495), self.market.get_available_balance("USDT"))
+        self.assertEqual(Decimal(8), self.market.get_available_balance("ETH"))
+        self.assertEqual(Decimal("0.75"), self.market.get_available_balance("BTC"))
+        self.assertEqual(Decimal(0), self.market.get_available_balance("XRP"))
+        self.assertEqual({"USDT": Decimal(9310), "ETH": Decimal(8), "BTC": Decimal("0.75")},
+                         self.market.available_balances)
+
+        # The hold of a cancelled order is released.
+        self.market.cancel("ETH-USDT", bid_ids[1])
+        self.assertEqual(Decimal(10000 - 98 - 495), self.market.get_available_balance("USDT"))
+
+        # The hold of a filled order is released, and the balances are updated by the fill.
+        self.clock.backtest_til(1)
+        self.market.order_books["ETH-USDT"].apply_trade(OrderBookTradeEvent("ETH-USDT", 1, TradeType.BUY, 103, 5))
+        self.assertEqual(1, len(self.market_logger.event_log))
+        self.assertEqual(Decimal(8), self.market.get_balance("ETH"))
+        self.assertEqual(Decimal(8), self.market.get_available_balance("ETH"))
+        self.assertGreater(self.market.get_balance("USDT"), Decimal(10000))
+        self.assertEqual(self.market.get_balance("USDT") - 98 - 495, self.market.get_available_balance("USDT"))
+        self.assertNotIn(ask_id, [o.client_order_id for o in self.market.limit_orders])
+
+        self.ev_loop.run_until_complete(self.market.cancel_all(1))
+        self.assertEqual({}, dict(self.market.on_hold_balances))
+        self.assertEqual(self.market.get_all_balances(), self.market.available_balances)
+
+    def fills(self) -> List[OrderFilledEvent]:
+        return [e for e in self.market_logger.event_log if isinstance(e, OrderFilledEvent)]
+
+    def bought_amount(self) -> Decimal:
+        return sum(e.amount * (1 - e.trade_fee.percent) for e in self.fills())
+
+    def test_limit_order_queue_position(self):
+        order_book: CompositeOrderBook = self.market.order_books["ETH-USDT"]
+        order_id = self.market.buy("ETH-USDT", Decimal(4), OrderType.LIMIT, Decimal(99))
+        self.clock.backtest_til(1)
+
+        # The order joins the back of the 10 ETH queue at its price level.
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 1, TradeType.SELL, 99, 6))
+        self.assertEqual([], self.fills())
+
+        # Cancels are assumed to come from behind, until the price level is smaller than the volume ahead.
+        order_book.apply_numpy_diffs(np.array([[99, 2, 2]], dtype=np.float64), np.zeros((0, 3)), 2)
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 2, TradeType.SELL, 99, 5))
+        self.assertEqual([(order_id, Decimal(3), Decimal(99))],
+                         [(e.order_id, e.amount, e.price) for e in self.fills()])
+        self.assertEqual(Decimal(1), self.market.limit_orders[0].quantity)
+
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 3, TradeType.SELL, 99, 5))
+        self.assertEqual([Decimal(3), Decimal(1)], [e.amount for e in self.fills()])
+        self.assertEqual(10 + self.bought_amount(), self.market.get_balance("ETH"))
+        self.assertEqual([], self.market.limit_orders)
+
+    def test_limit_order_traded_through(self):
+        order_book: CompositeOrderBook = self.market.order_books["ETH-USDT"]
+        self.market.sell("ETH-USDT", Decimal(3), OrderType.LIMIT, Decimal(101))
+        self.clock.backtest_til(1)
+
+        # A trade at a worse price fills the order regardless of its queue position, up to the trade amount.
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 1, TradeType.BUY, 102, 1))
+        self.assertEqual([(Decimal(1), Decimal(101))], [(e.amount, e.price) for e in self.fills()])
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 2, TradeType.BUY, 102, 5))
+        self.assertEqual([Decimal(1), Decimal(2)], [e.amount for e in self.fills()])
+        self.assertEqual(Decimal(7), self.market.get_balance("ETH"))
+
+    def test_order_latency(self):
+        self.market = self.create_market(MarketConfig.default_config()._replace(order_latency=2.0))
+        order_book: CompositeOrderBook = self.market.order_books["ETH-USDT"]
+        self.clock.backtest_til(1)
+        self.market.sell("ETH-USDT", Decimal(1), OrderType.LIMIT, Decimal(101))
+
+        # The order isn't in the order book yet, so the trade passes it by.
+        self.clock.backtest_til(2)
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 2, TradeType.BUY, 102, 1))
+        self.assertEqual([], self.fills())
+
+        self.clock.backtest_til(3)
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 3, TradeType.BUY, 102, 1))
+        self.assertEqual(1, len(self.fills()))
+
+    def test_crossing_limit_order(self):
+        self.market.buy("ETH-USDT", Decimal(15), OrderType.LIMIT, Decimal(102))
+        self.clock.backtest_til(1)
+
+        # The order takes the asks it crosses, and rests at its price with the rest.
+        self.assertEqual([(Decimal(10), Decimal(101)), (Decimal(5), Decimal(102))],
+                         [(e.amount, e.price) for e in self.fills()])
+        self.assertEqual(10 + self.bought_amount(), self.market.get_balance("ETH"))
+        self.assertEqual(Decimal(10000 - 1010 - 510), self.market.get_balance("USDT"))
+
+    def test_market_order(self):
+        order_id = self.market.buy("ETH-USDT", Decimal(25), OrderType.MARKET)
+        self.assertEqual(Decimal(10), self.market.get_balance("ETH"))
+        self.clock.backtest_til(1)
+
+        # Market orders are immediate or cancel.
+        self.assertEqual(Decimal(20), sum(e.amount for e in self.fills()))
+        self.assertEqual(10 + self.bought_amount(), self.market.get_balance("ETH"))
+        self.assertEqual([order_id, order_id], [e.order_id for e in self.fills()])
+        self.assertEqual([], self.market.queued_orders)
+
+        # The liquidity taken is gone until the order book updates the price levels.
+        self.market.buy("ETH-USDT", Decimal(1), OrderType.MARKET)
+        self.clock.backtest_til(2)
+        self.assertEqual(2, len(self.fills()))
+        self.assertIsInstance(self.market_logger.event_log[-1], MarketOrderFailureEvent)
+
+    def test_volume_queries_use_depth_index(self):
+        order_book: CompositeOrderBook = self.market.order_books["ETH-USDT"]
+        self.assertFalse(order_book.depth_index_enabled)
+        self.assertAlmostEqual(Decimal(1010 + 510) / 15,
+                               self.market.get_vwap_for_volume("ETH-USDT", True, Decimal(15)).result_price,
+                               places=3)
+
+        # Only the queried order book keeps a depth index, and the index follows the order book updates.
+        self.assertTrue(order_book.depth_index_enabled)
+        self.assertFalse(self.market.order_books["BTC-USDT"].depth_index_enabled)
+        order_book.apply_numpy_diffs(np.array([[99, 0, 2]], dtype=np.float64),
+                                     np.array([[101, 0, 2], [103, 10, 2]], dtype=np.float64),
+                                     2)
+        self.assertAlmostEqual(Decimal(1020 + 515) / 15,
+                               self.market.get_vwap_for_volume("ETH-USDT", True, Decimal(15)).result_price,
+                               places=3)
+        self.assertEqual(Decimal(98), self.market.get_price_for_volume("ETH-USDT", False, Decimal(5)).result_price)
+        self.assertEqual(Decimal(10), self.market.get_volume_for_price("ETH-USDT", True, Decimal(102)).result_volume)
+
+    def test_shared_order_books(self):
+        market, market_logger, clock = self.market, self.market_logger, self.clock
+        other_market = self.create_market(MarketConfig.default_config())
+        other_logger, other_clock = self.market_logger, self.clock
+        self.market_logger, self.clock = market_logger, clock
+        order_book: CompositeOrderBook = market.order_books["ETH-USDT"]
+        order_id = market.sell("ETH-USDT", Decimal(1), OrderType.LIMIT, Decimal(101))
+        other_order_id = other_market.sell("ETH-USDT", Decimal(1), OrderType.LIMIT, Decimal(101))
+        clock.backtest_til(1)
+        other_clock.backtest_til(1)
+
+        # Each market gets the fills of its own orders.
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 1, TradeType.BUY, 102, 2))
+        self.assertEqual([order_id], [e.order_id for e in market_logger.event_log])
+        self.assertEqual([other_order_id], [e.order_id for e in other_logger.event_log])
+
+        # A stopped market doesn't listen to the order book anymore. Its orders still take their part of the trades.
+        other_market.sell("ETH-USDT", Decimal(1), OrderType.LIMIT, Decimal(101))
+        other_clock.backtest_til(2)
+        order_id = market.sell("ETH-USDT", Decimal(1), OrderType.LIMIT, Decimal(101))
+        clock.backtest_til(2)
+        other_market.stop(other_clock)
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 2, TradeType.BUY, 102, 1))
+        self.assertEqual(1, len(other_logger.event_log))
+        self.assertEqual(1, len(market_logger.event_log))
+        order_book.apply_trade(OrderBookTradeEvent("ETH-USDT", 3, TradeType.BUY, 102, 1))
+        self.assertEqual(order_id, market_logger.event_log[-1].order_id)
+        self.assertEqual(1, len(other_logger.event_log))
@@ -0,0 +1,150 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from hummingbot.backtest.market_data import (
+    generate_market_data,
+    save_market_data,
+)
+from hummingbot.backtest.parameter_sweep import (
+    ParameterSweep,
+    load_strategy_config,
+)
+
+PMM_CONFIG = """
+template_version: 20
+strategy: pure_market_making
+exchange: binance
+market: HBOT-USDT
+bid_spread: 0.05
+ask_spread: 0.05
+order_refresh_time: 10
+order_amount: 1
+"""
+
+AVELLANEDA_CONFIG = """
+template_version: 2
+strategy: avellaneda_market_making
+exchange: binance
+market: HBOT-USDT
+order_refresh_time: 10
+order_amount: 1
+inventory_target_base_pct: 50
+parameters_based_on_spread: false
+risk_factor: 1
+order_book_depth_factor: 1
+order_amount_shape_factor: 0
+closing_time: 1
+volatility_buffer_size: 30
+"""
+
+
+class ParameterSweepTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.config_path = os.path.join(cls.temp_dir.name, "conf_pure_market_making_1.yml")
+        with open(cls.config_path, "w") as fd:
+            fd.write(PMM_CONFIG)
+        cls.avellaneda_config_path = os.path.join(cls.temp_dir.name, "conf_avellaneda_market_making_1.yml")
+        with open(cls.avellaneda_config_path, "w") as fd:
+            fd.write(AVELLANEDA_CONFIG)
+        cls.data_path = os.path.join(cls.temp_dir.name, "market_data.npy")
+        save_market_data(cls.data_path, generate_market_data(0, 900))
+        cls.balances = {"HBOT": Decimal(100), "USDT": Decimal(10000)}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_load_strategy_config(self):
+        config = load_strategy_config(self.config_path)
+        self.assertEqual("pure_market_making", config["strategy"])
+        self.assertEqual("HBOT-USDT", config["market"])
+        self.assertEqual(Decimal("0.05"), config["bid_spread"])
+        self.assertEqual(10.0, config["order_refresh_time"])
+        # Defaults of the config map.
+        self.assertEqual(1, config["order_levels"])
+        self.assertFalse(config["inventory_skew_enabled"])
+
+    def test_invalid_parameters(self):
+        config = load_strategy_config(self.config_path)
+        with self.assertRaises(ValueError):
+            ParameterSweep(config, self.data_path, {"bid_spreads": [1]}, self.balances)
+        with self.assertRaises(ValueError):
+            ParameterSweep({**config, "strategy": "arbitrage"}, self.data_path, {"bid_spread": [1]}, self.balances)
+        with self.assertRaises(ValueError):
+            ParameterSweep(config, self.data_path, {"bid_spread": []}, self.balances)
+
+    def test_parameter_values_parsed(self):
+        config = load_strategy_config(self.config_path)
+        sweep = ParameterSweep(config, self.data_path, {"bid_spread": [0.05, "0.1"], "order_levels": ["2"]},
+                               self.balances, max_workers=1)
+        self.assertEqual([(Decimal("0.05"), 2), (Decimal("0.1"), 2)],
+                         [(c["bid_spread"], c["order_levels"]) for c in sweep.combinations])
+        results = sweep.run()
+        self.assertTrue(np.all(results.fill_count > 0))
+
+    def test_sweep(self):
+        sweep = ParameterSweep.from_config_file(self.config_path,
+                                                self.data_path,
+                                                {"bid_spread": [Decimal("0.05"), Decimal("0.1")],
+                                                 "inventory_skew_enabled": [False, True]},
+                                                balances=self.balances,
+                                                max_workers=1)
+        self.assertEqual([(Decimal("0.05"), False), (Decimal("0.05"), True), (Decimal("0.1"), False),
+                          (Decimal("0.1"), True)],
+                         [(c["bid_spread"], c["inventory_skew_enabled"]) for c in sweep.combinations])
+        results = sweep.run()
+
+        self.assertEqual(4, len(results))
+        self.assertEqual(["bid_spread", "inventory_skew_enabled"], list(results.columns[:2]))
+        self.assertTrue(np.all(results.ticks == 900))
+        self.assertTrue(np.all(results.fill_count > 0))
+        self.assertTrue(np.all(results.fill_count == results.num_buys + results.num_sells))
+        for _, row in results.iterrows():
+            self.assertEqual(self.balances["HBOT"] + row.b_vol_base + row.s_vol_base, row.base_balance)
+            # Samples every 60s, from the start to the end of the data.
+            np.testing.assert_array_equal(np.arange(0, 901, 60), row.inventory[:, 0])
+            self.assertEqual(float(self.balances["HBOT"]), row.inventory[0, 1])
+            self.assertEqual(float(row.base_balance), row.inventory[-1, 1])
+        # The results differ by parameters.
+        self.assertEqual(4, len(set(results.total_pnl)))
+
+        # The same results from a process pool.
+        pool_results = ParameterSweep.from_config_file(self.config_path,
+                                                       self.data_path,
+                                                       {"bid_spread": [Decimal("0.05"), Decimal("0.1")],
+                                                        "inventory_skew_enabled": [False, True]},
+                                                       balances=self.balances,
+                                                       max_workers=2).run()
+        columns = ["fill_count", "total_pnl", "base_balance", "quote_balance"]
+        self.assertEqual(results[columns].values.tolist(), pool_results[columns].values.tolist())
+
+    def test_sweep_avellaneda(self):
+        results = ParameterSweep.from_config_file(self.avellaneda_config_path,
+                                                  self.data_path,
+                                                  {"risk_factor": [Decimal("5"), Decimal("50")]},
+                                                  balances=self.balances,
+                                                  max_workers=1).run()
+        self.assertEqual([Decimal("5"), Decimal("50")], results.risk_factor.tolist())
+        self.assertTrue(np.all(results.ticks == 900))
+        self.assertTrue(np.all(results.fill_count > 0))
+        # Higher risk aversion quotes closer to the reservation price, and trades more.
+        self.assertLess(results.fill_count[0], results.fill_count[1])
+        self.assertNotEqual(results.total_pnl[0], results.total_pnl[1])
+
+    def test_quantization(self):
+        config = load_strategy_config(self.config_path)
+        results = ParameterSweep({**config, "order_amount": Decimal("1.37")},
+                                 self.data_path,
+                                 {"bid_spread": [Decimal("0.05")]},
+                                 balances=self.balances,
+                                 size_quantum=Decimal("0.5"),
+                                 max_workers=1).run()
+        # Orders of 1.37 are rounded down to the size quantum.
+        self.assertGreater(results.fill_count[0], 0)
+        self.assertEqual(0, (results.b_vol_base[0] + results.s_vol_base[0]) % Decimal("0.5"))
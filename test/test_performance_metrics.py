@@ -6,14 +6,44 @@ import unittest
 import asyncio
 from unittest.mock import patch
 
-from hummingbot.client.performance import calculate_performance_metrics
+from hummingbot.client.performance import PerformanceMetricsAccumulator, calculate_performance_metrics
 from hummingbot.core.data_type.trade import Trade, TradeType, TradeFee
+from hummingbot.core.event.events import OrderFilledEvent, OrderType
+from hummingbot.model.sql_connection_manager import SQLConnectionManager
+from hummingbot.model.trade_fill import TradeFill
 
 trading_pair = "HBOT-USDT"
 base, quote = trading_pair.split("-")
 
 
+async def no_last_price(*args):
+    return None
+
+
+def trade_fill(order_id: str, trade_type: str, position: str, price: float, amount: float) -> TradeFill:
+    return TradeFill(config_file_path="conf_perpetual_mm_1.yml",
+                     strategy="perpetual_market_making",
+                     market="binance_perpetual",
+                     symbol=trading_pair,
+                     base_asset=base,
+                     quote_asset=quote,
+                     timestamp=1620000000000,
+                     order_id=order_id,
+                     trade_type=trade_type,
+                     order_type="LIMIT",
+                     price=price,
+                     amount=amount,
+                     leverage=1,
+                     trade_fee={"percent": 0.001, "flat_fees": []},
+                     exchange_trade_id=order_id,
+                     position=position)
+
+
 class PerformanceMetricsUnitTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Loads the models that TradeFill has relationships with.
+        SQLConnectionManager.get_declarative_base()
 
     def setUp(self):
         pass
@@ -33,3 +63,84 @@ class PerformanceMetricsUnitTest(unittest.TestCase):
             calculate_performance_metrics("hbot_exchange", trading_pair, trades, cur_bals))
         self.assertEqual(Decimal("250"), metrics.trade_pnl)
         print(metrics)
+
+    def calculate(self, accumulator: PerformanceMetricsAccumulator, cur_bals):
+        return asyncio.get_event_loop().run_until_complete(accumulator.calculate(cur_bals))
+
+    @patch('hummingbot.client.performance.get_last_price', no_last_price)
+    def test_accumulator(self):
+        trades: List[Trade] = [
+            Trade(trading_pair, TradeType.BUY, 100, 10, None, trading_pair, 1, TradeFee(0.0, [(quote, 1)])),
+            Trade(trading_pair, TradeType.SELL, 120, 15, None, trading_pair, 2, TradeFee(0.0, [(quote, 2)])),
+            Trade(trading_pair, TradeType.BUY, 110.5, 2.5, None, trading_pair, 3, TradeFee(0.0, [("BNB", 1)])),
+        ]
+        # The metrics after each trade, as calculated from scratch by the batch algorithm the accumulator replaced.
+        expected = [
+            {"avg_b_price": Decimal("100"), "avg_s_price": Decimal("0"), "avg_tot_price": Decimal("100"),
+             "start_base_bal": Decimal("90"), "start_quote_bal": Decimal("11001"), "cur_price": Decimal("100"),
+             "hold_value": Decimal("20001"), "cur_value": Decimal("20000"), "total_pnl": Decimal("-1"),
+             "trade_pnl": Decimal("0"), "fees": {quote: Decimal("1")}},
+            {"avg_b_price": Decimal("100"), "avg_s_price": Decimal("120"), "avg_tot_price": Decimal("112"),
+             "start_base_bal": Decimal("105"), "start_quote_bal": Decimal("9203"), "cur_price": Decimal("120"),
+             "hold_value": Decimal("21803"), "cur_value": Decimal("22000"), "total_pnl": Decimal("197"),
+             "trade_pnl": Decimal("200"), "fees": {quote: Decimal("3")}},
+            {"avg_b_price": Decimal("102.1"), "avg_s_price": Decimal("120"),
+             "avg_tot_price": Decimal("111.8636363636363636363636364"),
+             "start_base_bal": Decimal("102.5"), "start_quote_bal": Decimal("9479.25"), "cur_price": Decimal("110.5"),
+             "hold_value": Decimal("20805.50"), "cur_value": Decimal("21050.0"), "total_pnl": Decimal("244.50"),
+             "trade_pnl": Decimal("247.50"), "fees": {quote: Decimal("3"), "BNB": Decimal("1")}},
+        ]
+        cur_bals = {base: 100, quote: 10000}
+        accumulator = PerformanceMetricsAccumulator("hbot_exchange", trading_pair)
+        for i, trade in enumerate(trades):
+            accumulator.add_trade(trade)
+            self.assertEqual(i + 1, accumulator.num_trades)
+            metrics = self.calculate(accumulator, cur_bals)
+            self.assertEqual(expected[i], {key: getattr(metrics, key) for key in expected[i]})
+        self.assertEqual(2, metrics.num_buys)
+        self.assertEqual(Decimal("-2.5"), metrics.tot_vol_base)
+        self.assertEqual(Decimal("523.75"), metrics.tot_vol_quote)
+        self.assertEqual(Decimal("0.011751700271562807911369590"), metrics.return_pct)
+        self.assertEqual(Decimal("100"), metrics.start_price)
+
+    @patch('hummingbot.client.performance.get_last_price', no_last_price)
+    def test_accumulator_fill_events(self):
+        accumulator = PerformanceMetricsAccumulator("hbot_exchange", trading_pair)
+        accumulator.add_fill_event(OrderFilledEvent(1, "buy-1", trading_pair, TradeType.BUY, OrderType.LIMIT,
+                                                    Decimal("100"), Decimal("1"), TradeFee(Decimal("0"))))
+        accumulator.add_fill_event(OrderFilledEvent(2, "sell-1", trading_pair, TradeType.SELL, OrderType.LIMIT,
+                                                    Decimal("101"), Decimal("1"), TradeFee(Decimal("0"))))
+        metrics = self.calculate(accumulator, {base: Decimal("1"), quote: Decimal("100")})
+        self.assertEqual(1, metrics.num_buys)
+        self.assertEqual(1, metrics.num_sells)
+        self.assertEqual(Decimal("1"), metrics.s_vol_quote - abs(metrics.b_vol_quote))
+
+    @patch('hummingbot.client.performance.get_last_price', no_last_price)
+    def test_accumulator_derivative_positions(self):
+        trades: List[TradeFill] = [
+            trade_fill("buy-1", "BUY", "OPEN", 100, 1),
+            trade_fill("buy-1", "BUY", "OPEN", 102, 1),
+            trade_fill("sell-2", "SELL", "OPEN", 105, 1),
+            trade_fill("sell-3", "SELL", "CLOSE", 110, 2),
+            trade_fill("buy-4", "BUY", "CLOSE", 100, 1),
+            # Not closed yet.
+            trade_fill("buy-5", "BUY", "OPEN", 90, 1),
+        ]
+        accumulator = PerformanceMetricsAccumulator("binance_perpetual", trading_pair)
+        trade_pnls = []
+        for trade in trades:
+            accumulator.add_trade(trade)
+            trade_pnls.append(self.calculate(accumulator, {base: 0, quote: 1000}).trade_pnl)
+        # Closing the long: (110 - 101) * 2, then the short: (105 - 100) * 1
+        self.assertEqual([Decimal("0"), Decimal("0"), Decimal("0"), Decimal("18.0"), Decimal("23.0"), Decimal("23.0")],
+                         trade_pnls)
+        metrics = self.calculate(accumulator, {base: 0, quote: 1000})
+        # The trades are left unchanged.
+        self.assertEqual([100, 102], [trade.price for trade in trades[:2]])
+        self.assertEqual(Decimal("0.004"), round(metrics.fees[base], 6))
+
+        # Fills loaded from the database have text prices and amounts.
+        accumulator = PerformanceMetricsAccumulator("binance_perpetual", trading_pair)
+        accumulator.add_trades([trade_fill("buy-1", "BUY", "OPEN", "100", "1"),
+                                trade_fill("sell-2", "SELL", "CLOSE", "110", "1")])
+        self.assertEqual(Decimal("10"), self.calculate(accumulator, {base: 0, quote: 1000}).trade_pnl)
@@ -95,3 +95,47 @@ class RingBufferTest(unittest.TestCase):
         value = Decimal(3.141592653)
         self.buffer.add_value(value)
         self.assertAlmostEqual(float(value), self.buffer.get_last_value(), 6)
+
+    def test_statistics_match_numpy(self):
+        values = np.random.RandomState(1).normal(50000, 10, self.BUFFER_LENGTH * 100)
+        for i, value in enumerate(values):
+            self.buffer.add_value(value)
+            if self.buffer.is_full:
+                window = values[i + 1 - self.BUFFER_LENGTH:i + 1]
+                self.assertAlmostEqual(np.mean(window), self.buffer.mean_value, 8)
+                self.assertAlmostEqual(np.var(window), self.buffer.variance, 6)
+                self.assertAlmostEqual(np.std(window), self.buffer.std_dev, 6)
+
+    def test_sum(self):
+        self.assertEqual(0, self.buffer.sum_value)
+        values = np.random.RandomState(1).normal(50000, 10, self.BUFFER_LENGTH * 100)
+        for i, value in enumerate(values):
+            self.buffer.add_value(value)
+            window = values[max(0, i + 1 - self.BUFFER_LENGTH):i + 1]
+            self.assertAlmostEqual(np.sum(window), self.buffer.sum_value, 6)
+
+    def test_ordered_views(self):
+        for i in range(self.BUFFER_LENGTH + 5):
+            self.buffer.add_value(i)
+        older, newer = self.buffer.get_ordered_views()
+        self.assertEqual(list(range(5, self.BUFFER_LENGTH + 5)), np.concatenate((older, newer)).tolist())
+        self.assertEqual(self.buffer.get_as_numpy_array().tolist(), np.concatenate((older, newer)).tolist())
+        # The views share the buffer memory, the value added overwrites the oldest one.
+        self.buffer.add_value(-1)
+        self.assertEqual(-1, older[0])
+
+    def test_large_buffer(self):
+        length = 100000
+        buffer = RingBuffer(length)
+        for i in range(length + 10):
+            buffer.add_value(i)
+        self.assertEqual(length, buffer.size)
+        self.assertEqual(10, buffer.get_as_numpy_array()[0])
+        self.assertEqual(length + 9, buffer.get_as_numpy_array()[-1])
+        self.assertAlmostEqual(np.mean(np.arange(10, length + 10)), buffer.mean_value)
+
+    def test_get_first_value(self):
+        self.assertTrue(np.isnan(self.buffer.get_first_value()))
+        for i in range(self.BUFFER_LENGTH + 3):
+            self.buffer.add_value(i)
+            self.assertEqual(self.buffer.get_as_numpy_array()[0], self.buffer.get_first_value())
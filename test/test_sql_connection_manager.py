@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import text
+
+from hummingbot.client.config.global_config_map import global_config_map
+from hummingbot.model.metadata import Metadata
+from hummingbot.model.sql_connection_manager import (
+    ReadOnlySessionError,
+    SQLConnectionManager,
+    SQLConnectionType,
+)
+
+
+class SQLConnectionManagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.db_path: str = os.path.join(self.db_dir.name, "trades.sqlite")
+
+    def tearDown(self) -> None:
+        global_config_map["db_tuned"].value = None
+        self.db_dir.cleanup()
+
+    def pragma(self, session, name: str):
+        return session.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_default_mode(self):
+        sql = SQLConnectionManager(SQLConnectionType.TRADE_FILLS, db_path=self.db_path)
+        session = sql.get_shared_session()
+        self.assertEqual("delete", self.pragma(session, "journal_mode"))
+        session.close()
+
+    def test_tuned_mode(self):
+        global_config_map["db_tuned"].value = True
+        sql = SQLConnectionManager(SQLConnectionType.TRADE_FILLS, db_path=self.db_path)
+        session = sql.get_shared_session()
+        self.assertEqual("wal", self.pragma(session, "journal_mode"))
+        # NORMAL
+        self.assertEqual(1, self.pragma(session, "synchronous"))
+        self.assertEqual(-65536, self.pragma(session, "cache_size"))
+        session.close()
+
+    def test_read_only_session(self):
+        global_config_map["db_tuned"].value = True
+        sql = SQLConnectionManager(SQLConnectionType.TRADE_FILLS, db_path=self.db_path)
+        session = sql.get_shared_session()
+        session.add(Metadata(key="test_key", value="1"))
+        session.commit()
+
+        # Uncommitted writes neither block nor show in the read only session.
+        session.query(Metadata).filter(Metadata.key == "test_key").one().value = "2"
+        session.flush()
+        read_only_session = sql.create_read_only_session()
+        self.assertEqual("1", read_only_session.query(Metadata).filter(Metadata.key == "test_key").one().value)
+        session.commit()
+        read_only_session.close()
+
+        read_only_session = sql.create_read_only_session()
+        read_only_session.add(Metadata(key="other_key", value="1"))
+        with self.assertRaises(ReadOnlySessionError):
+            read_only_session.commit()
+        read_only_session.close()
+        session.close()
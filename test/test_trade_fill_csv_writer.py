@@ -0,0 +1,113 @@
+import csv
+import datetime
+import os
+import tempfile
+import time
+import unittest
+from typing import List
+
+from hummingbot.connector.trade_fill_csv_writer import TradeFillCsvWriter
+from hummingbot.model.sql_connection_manager import SQLConnectionManager
+from hummingbot.model.trade_fill import TradeFill
+
+
+def trade_fill(trade_id: int) -> TradeFill:
+    return TradeFill(id=trade_id,
+                     config_file_path="conf_pure_mm_1.yml",
+                     strategy="pure_market_making",
+                     market="binance",
+                     symbol="BTC-USDT",
+                     base_asset="BTC",
+                     quote_asset="USDT",
+                     timestamp=1620000060000,
+                     order_id="buy-BTC-USDT-1620000000000000",
+                     trade_type="BUY",
+                     order_type="LIMIT",
+                     price=50000.5,
+                     amount=0.1,
+                     leverage=1,
+                     trade_fee={"percent": "0.001", "flat_fees": []},
+                     exchange_trade_id=str(trade_id),
+                     position="NILL")
+
+
+class TradeFillCsvWriterTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Loads the models that TradeFill has relationships with.
+        SQLConnectionManager.get_declarative_base()
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.csv_path: str = os.path.join(self.data_dir.name, "trades_conf_pure_mm_1.csv")
+
+    def tearDown(self) -> None:
+        self.data_dir.cleanup()
+
+    def read_rows(self, path: str = None) -> List[List[str]]:
+        with open(path or self.csv_path, newline="") as csv_file:
+            return list(csv.reader(csv_file))
+
+    def test_field_names(self):
+        self.assertEqual(("id", "amount", "base_asset", "config_file_path", "exchange_trade_id", "leverage", "market",
+                          "order_id", "order_type", "position", "price", "quote_asset", "strategy", "symbol",
+                          "timestamp", "trade_fee", "trade_type", "age"),
+                         TradeFillCsvWriter.get_field_names())
+
+    def test_append(self):
+        writer = TradeFillCsvWriter(self.csv_path, flush_interval=0.05)
+        writer.append(trade_fill(1))
+        writer.append(trade_fill(2))
+        time.sleep(0.2)
+        rows = self.read_rows()
+        self.assertEqual(3, len(rows))
+        self.assertEqual(list(writer.field_names), rows[0])
+        self.assertEqual(["1", "0.1", "BTC"], rows[1][:3])
+        self.assertEqual("50000.5", rows[1][10])
+        self.assertEqual("00:01:00", rows[1][-1])
+        writer.close()
+
+        # The header of an existing file is kept.
+        writer = TradeFillCsvWriter(self.csv_path)
+        writer.append(trade_fill(3))
+        writer.close()
+        rows = self.read_rows()
+        self.assertEqual(4, len(rows))
+        self.assertEqual(["1", "2", "3"], [row[0] for row in rows[1:]])
+
+    def test_mismatched_header(self):
+        with open(self.csv_path, "w") as csv_file:
+            csv_file.write("id,amount\n1,0.1\n")
+        writer = TradeFillCsvWriter(self.csv_path)
+        writer.append(trade_fill(2))
+        writer.close()
+        self.assertEqual(2, len(self.read_rows()))
+        old_files = [name for name in os.listdir(self.data_dir.name) if "_old_" in name]
+        self.assertEqual(1, len(old_files))
+        self.assertEqual([["id", "amount"], ["1", "0.1"]], self.read_rows(os.path.join(self.data_dir.name,
+                                                                                       old_files[0])))
+
+    def test_rotate_by_size(self):
+        writer = TradeFillCsvWriter(self.csv_path, max_file_size=500)
+        for trade_id in range(10):
+            writer.append(trade_fill(trade_id))
+        writer.close()
+        file_names = sorted(os.listdir(self.data_dir.name))
+        self.assertGreater(len(file_names), 1)
+        trade_ids: List[str] = []
+        for file_name in file_names:
+            rows = self.read_rows(os.path.join(self.data_dir.name, file_name))
+            self.assertEqual(list(writer.field_names), rows[0])
+            trade_ids.extend(row[0] for row in rows[1:])
+        self.assertEqual(sorted(str(trade_id) for trade_id in range(10)), sorted(trade_ids))
+
+    def test_rotate_daily(self):
+        writer = TradeFillCsvWriter(self.csv_path)
+        writer.append(trade_fill(1))
+        writer.flush()
+        # Rows of the next day go to a new file.
+        writer._file_date -= datetime.timedelta(days=1)
+        writer.append(trade_fill(2))
+        writer.close()
+        self.assertEqual(2, len(os.listdir(self.data_dir.name)))
+        self.assertEqual([["id"], ["2"]], [row[:1] for row in self.read_rows()])
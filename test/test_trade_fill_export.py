@@ -0,0 +1,141 @@
+import asyncio
+import importlib.util
+import os
+import tempfile
+import unittest
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from hummingbot.client.command.export_command import ExportCommand
+from hummingbot.client.config.global_config_map import global_config_map
+from hummingbot.client.trade_fill_export import export_trade_fills, get_export_format
+from hummingbot.model.sql_connection_manager import (
+    SQLConnectionManager,
+    SQLConnectionType,
+)
+from hummingbot.model.trade_fill import TradeFill
+
+# 2021-05-01 00:00:00 UTC, in milliseconds
+DAY_START = 1619827200000
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class ExportApp(ExportCommand):
+    class App:
+        def __init__(self, file_name: str):
+            self.file_name = file_name
+            self.hide_input = False
+
+        async def prompt(self, prompt: str) -> str:
+            return self.file_name
+
+        def change_prompt(self, prompt: str):
+            pass
+
+    def __init__(self, trade_fill_db: SQLConnectionManager, init_time: float, file_name: str):
+        self.trade_fill_db = trade_fill_db
+        self.init_time = init_time
+        self.app = self.App(file_name)
+        self.placeholder_mode = False
+        self.notifications: List[str] = []
+
+    def _notify(self, msg: str):
+        self.notifications.append(msg)
+
+
+class TradeFillExportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.sql = SQLConnectionManager(SQLConnectionType.TRADE_FILLS,
+                                        db_path=os.path.join(self.data_dir.name, "trades.sqlite"))
+        self.session = self.sql.get_shared_session()
+        self.add_trade(1, "binance", DAY_START + 1000, "100.5", "0.1")
+        self.add_trade(2, "kucoin", DAY_START + 2000, "101", "0.2")
+        self.add_trade(3, "binance", DAY_START + DAY_MS + 1000, "99.25", "0.3", flat_fees=[{"asset": "BNB",
+                                                                                           "amount": "0.01"}])
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.data_dir.cleanup()
+        global_config_map["log_file_path"].value = None
+
+    def add_trade(self, trade_id: int, market: str, timestamp: int, price: str, amount: str, flat_fees=()):
+        self.session.add(TradeFill(id=trade_id,
+                                   config_file_path="conf_pure_mm_1.yml",
+                                   strategy="pure_market_making",
+                                   market=market,
+                                   symbol="BTC-USDT",
+                                   base_asset="BTC",
+                                   quote_asset="USDT",
+                                   timestamp=timestamp,
+                                   order_id=f"buy-BTC-USDT-{trade_id}",
+                                   trade_type="BUY",
+                                   order_type="LIMIT",
+                                   price=price,
+                                   amount=amount,
+                                   leverage=1,
+                                   trade_fee={"percent": "0.001", "flat_fees": list(flat_fees)},
+                                   exchange_trade_id=str(trade_id),
+                                   position="NILL"))
+        self.session.commit()
+
+    def test_get_trades_columns(self):
+        df: pd.DataFrame = TradeFill.get_trades_columns(self.session)
+        self.assertEqual([1, 2, 3], df["id"].tolist())
+        self.assertEqual(np.float64, df["price"].dtype)
+        self.assertEqual([100.5, 101.0, 99.25], df["price"].tolist())
+        self.assertEqual(np.int64, df["timestamp"].dtype)
+        self.assertEqual("category", df["market"].dtype.name)
+        self.assertEqual([0.001] * 3, df["fee_percent"].tolist())
+        self.assertEqual('[{"asset": "BNB", "amount": "0.01"}]', df["flat_fees"].iloc[2])
+        self.assertNotIn("trade_fee", df.columns)
+
+        df = TradeFill.get_trades_columns(self.session, market="binance", start_time=DAY_START + 1500)
+        self.assertEqual([3], df["id"].tolist())
+        df = TradeFill.get_trades_columns(self.session, config_file_path="other.yml")
+        self.assertEqual(0, len(df))
+        self.assertEqual(np.float64, df["amount"].dtype)
+
+    def test_export_partitioned(self):
+        df: pd.DataFrame = TradeFill.get_trades_columns(self.session)
+        export_dir: str = os.path.join(self.data_dir.name, "trades")
+        file_paths = export_trade_fills(df, export_dir, "csv", partition_cols=("date", "market"))
+        self.assertEqual([os.path.join(export_dir, "date=2021-05-01", "market=binance", "trades.csv"),
+                          os.path.join(export_dir, "date=2021-05-01", "market=kucoin", "trades.csv"),
+                          os.path.join(export_dir, "date=2021-05-02", "market=binance", "trades.csv")],
+                         file_paths)
+        partition: pd.DataFrame = pd.read_csv(file_paths[2])
+        self.assertEqual([3], partition["id"].tolist())
+        self.assertNotIn("market", partition.columns)
+
+    def test_export_command(self):
+        global_config_map["log_file_path"].value = self.data_dir.name
+        app = ExportApp(self.sql, (DAY_START + 2500) / 1e3, "trades.csv")
+        app.export("trades", partition_cols=["day"])
+        self.assertIn("Invalid partition columns: day.", app.notifications[-1])
+
+        asyncio.get_event_loop().run_until_complete(app.export_trades(partition_cols=["market"]))
+        export_dir: str = os.path.join(self.data_dir.name, "trades.csv")
+        self.assertEqual(f"Successfully exported trades to {export_dir}", app.notifications[-1])
+        partition: pd.DataFrame = pd.read_csv(os.path.join(export_dir, "market=binance", "trades.csv"))
+        self.assertEqual([3], partition["id"].tolist())
+        self.assertFalse(os.path.exists(os.path.join(export_dir, "market=kucoin")))
+
+        app = ExportApp(self.sql, (DAY_START + 2 * DAY_MS) / 1e3, "later.csv")
+        asyncio.get_event_loop().run_until_complete(app.export_trades())
+        self.assertEqual("No past trades to export.", app.notifications[-1])
+
+    def test_get_export_format(self):
+        self.assertEqual("csv", get_export_format("trades.csv"))
+        self.assertEqual("parquet", get_export_format("trades.PARQUET"))
+        self.assertEqual("arrow", get_export_format("trades.feather"))
+        self.assertIsNone(get_export_format("trades.xlsx"))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow") is not None, "pyarrow is not installed")
+    def test_export_parquet(self):
+        df: pd.DataFrame = TradeFill.get_trades_columns(self.session)
+        file_path: str = os.path.join(self.data_dir.name, "trades.parquet")
+        export_trade_fills(df, file_path, "parquet")
+        self.assertEqual(df["price"].tolist(), pd.read_parquet(file_path)["price"].tolist())
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from typing import List
+
+from sqlalchemy import event
+
+from hummingbot.client.trade_fill_tracker import TradeFillTracker
+from hummingbot.model.sql_connection_manager import (
+    SQLConnectionManager,
+    SQLConnectionType,
+)
+from hummingbot.model.trade_fill import TradeFill
+
+
+class TradeFillTrackerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.sql = SQLConnectionManager(SQLConnectionType.TRADE_FILLS,
+                                        db_path=os.path.join(self.db_dir.name, "trades.sqlite"))
+        self.session = self.sql.get_shared_session()
+        self.statements: List[str] = []
+        event.listen(self.sql.engine, "before_cursor_execute", self.record_statement)
+
+    def tearDown(self) -> None:
+        event.remove(self.sql.engine, "before_cursor_execute", self.record_statement)
+        self.session.close()
+        self.db_dir.cleanup()
+
+    def record_statement(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def add_trade(self, config_file_path: str, timestamp: int, market: str = "binance", symbol: str = "BTC-USDT"):
+        self.session.add(TradeFill(config_file_path=config_file_path,
+                                   strategy="pure_market_making",
+                                   market=market,
+                                   symbol=symbol,
+                                   base_asset=symbol.split("-")[0],
+                                   quote_asset=symbol.split("-")[1],
+                                   timestamp=timestamp,
+                                   order_id=f"buy-{symbol}-{timestamp}",
+                                   trade_type="BUY",
+                                   order_type="LIMIT",
+                                   price=100,
+                                   amount=1,
+                                   leverage=1,
+                                   trade_fee={"percent": 0.001, "flat_fees": []},
+                                   exchange_trade_id=str(timestamp),
+                                   position="NILL"))
+        self.session.commit()
+
+    def test_get_new_trades(self):
+        self.add_trade("conf_1.yml", 1000)
+        self.add_trade("conf_1.yml", 2000)
+        self.add_trade("old_conf_1.yml", 2000)
+        self.add_trade("conf_1.yml", 3000)
+        trades = TradeFill.get_new_trades(self.session, "conf_1.yml")
+        self.assertEqual([1000, 2000, 3000], [trade.timestamp for trade in trades])
+        trades = TradeFill.get_new_trades(self.session, "conf_1.yml", last_trade_id=trades[0].id, start_time=1500)
+        self.assertEqual([2000, 3000], [trade.timestamp for trade in trades])
+        self.assertEqual(1, len(TradeFill.get_new_trades(self.session, "conf_1.yml", limit=1)))
+
+    def test_update(self):
+        self.add_trade("conf_1.yml", 1000)
+        self.add_trade("conf_1.yml", 2000)
+        tracker = TradeFillTracker(self.sql, "conf_1.yml", 1500)
+        self.assertEqual([2000], [trade.timestamp for trade in tracker.update()])
+        self.assertEqual([], tracker.update())
+
+        self.add_trade("conf_1.yml", 3000, symbol="ETH-USDT")
+        self.add_trade("conf_2.yml", 3000)
+        new_trades = tracker.update()
+        self.assertEqual([3000], [trade.timestamp for trade in new_trades])
+        self.assertEqual(new_trades[0].id, tracker.last_trade_id)
+        self.assertEqual([2000, 3000], [trade.timestamp for trade in tracker.trades])
+        self.assertEqual([("binance", "BTC-USDT"), ("binance", "ETH-USDT")], list(tracker.trades_by_market.keys()))
+
+        # Commits do not expire the trades already fetched.
+        self.add_trade("conf_2.yml", 4000)
+        self.statements.clear()
+        self.assertEqual(["100", "100"], [trade.price for trade in tracker.trades])
+        self.assertEqual([], self.statements)
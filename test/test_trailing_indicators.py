@@ -0,0 +1,142 @@
+import math
+import unittest
+
+import numpy as np
+
+from hummingbot.strategy.__utils__.trailing_indicators.average_true_range import AverageTrueRangeIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.average_volatility import AverageVolatilityIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.ewma_variance import EWMAVarianceIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.exponential_moving_average import \
+    ExponentialMovingAverageIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.incremental_average_volatility import \
+    IncrementalAverageVolatilityIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.incremental_exponential_moving_average import \
+    IncrementalExponentialMovingAverageIndicator
+from hummingbot.strategy.__utils__.trailing_indicators.range_volatility import (
+    GarmanKlassVolatilityIndicator,
+    ParkinsonVolatilityIndicator,
+)
+from hummingbot.strategy.__utils__.trailing_indicators.vwap import VWAPIndicator
+
+
+class TrailingIndicatorsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.RandomState(1)
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, 500)))
+        self.volumes = rng.uniform(0.1, 10, 500)
+
+    def test_exponential_moving_average(self):
+        incremental = IncrementalExponentialMovingAverageIndicator(sampling_length=20)
+        batch = ExponentialMovingAverageIndicator(sampling_length=20)
+        for price in self.prices:
+            incremental.add_sample(price)
+            batch.add_sample(price)
+            self.assertAlmostEqual(batch.current_value, incremental.current_value, 9)
+
+    def test_ewma_variance(self):
+        indicator = EWMAVarianceIndicator(sampling_length=20)
+        alpha = 2 / 21
+        mean, variance = self.prices[0], 0.0
+        indicator.add_sample(self.prices[0])
+        for price in self.prices[1:]:
+            indicator.add_sample(price)
+            variance = (1 - alpha) * (variance + alpha * (price - mean) ** 2)
+            mean = alpha * price + (1 - alpha) * mean
+            self.assertAlmostEqual(variance, indicator.current_value, 9)
+            self.assertAlmostEqual(mean, indicator.mean, 9)
+        self.assertTrue(indicator.is_sampling_buffer_full)
+        self.assertAlmostEqual(math.sqrt(variance), indicator.std_dev)
+
+    def bars(self, bar_length: int):
+        return [self.prices[i:i + bar_length] for i in range(0, len(self.prices) - bar_length + 1, bar_length)]
+
+    def test_average_true_range(self):
+        indicator = AverageTrueRangeIndicator(bar_length=10, sampling_length=5)
+        relative = AverageTrueRangeIndicator(bar_length=10, sampling_length=5, relative=True)
+        for price in self.prices:
+            indicator.add_sample(price)
+            relative.add_sample(price)
+        bars = self.bars(10)[-6:]
+        ranges = [max(bar.max(), prev[-1]) - min(bar.min(), prev[-1]) for prev, bar in zip(bars, bars[1:])]
+        rel_ranges = [(max(bar.max(), prev[-1]) - min(bar.min(), prev[-1])) / min(bar.min(), prev[-1])
+                      for prev, bar in zip(bars, bars[1:])]
+        self.assertAlmostEqual(np.mean(ranges), indicator.current_value, 9)
+        self.assertAlmostEqual(np.mean(rel_ranges), relative.current_value, 9)
+
+        # No complete bar yet.
+        indicator = AverageTrueRangeIndicator(bar_length=10, sampling_length=5)
+        for price in self.prices[:9]:
+            indicator.add_sample(price)
+        self.assertTrue(math.isnan(indicator.current_value))
+
+        # Not enough bars yet, the average is over the complete bars.
+        for price in self.prices[9:49]:
+            indicator.add_sample(price)
+        self.assertFalse(indicator.is_sampling_buffer_full)
+        bars = self.bars(10)[:4]
+        ranges = [bars[0].max() - bars[0].min()] + [max(bar.max(), prev[-1]) - min(bar.min(), prev[-1])
+                                                    for prev, bar in zip(bars, bars[1:])]
+        self.assertAlmostEqual(np.mean(ranges), indicator.current_value, 9)
+
+        # Without the true range, the range of a bar leaves out the previous close.
+        indicator = AverageTrueRangeIndicator(bar_length=10, sampling_length=5, relative=True, true_range=False)
+        for price in self.prices:
+            indicator.add_sample(price)
+        bars = self.bars(10)[-5:]
+        self.assertAlmostEqual(np.mean([(bar.max() - bar.min()) / bar.min() for bar in bars]),
+                               indicator.current_value, 9)
+
+    def test_range_volatility(self):
+        parkinson = ParkinsonVolatilityIndicator(bar_length=10, sampling_length=5)
+        garman_klass = GarmanKlassVolatilityIndicator(bar_length=10, sampling_length=5)
+        for price in self.prices:
+            parkinson.add_sample(price)
+            garman_klass.add_sample(price)
+        bars = self.bars(10)[-5:]
+        hl = np.array([np.log(bar.max() / bar.min()) ** 2 for bar in bars])
+        co = np.array([np.log(bar[-1] / bar[0]) ** 2 for bar in bars])
+        self.assertAlmostEqual(np.sqrt(hl.mean() / (4 * np.log(2))), parkinson.current_value, 9)
+        self.assertAlmostEqual(np.sqrt((0.5 * hl - (2 * np.log(2) - 1) * co).mean()), garman_klass.current_value, 9)
+
+    def test_vwap(self):
+        indicator = VWAPIndicator(sampling_length=50)
+        for i, (price, volume) in enumerate(zip(self.prices, self.volumes)):
+            indicator.add_sample(price, volume)
+            window = slice(max(0, i - 49), i + 1)
+            self.assertAlmostEqual(np.average(self.prices[window], weights=self.volumes[window]),
+                                   indicator.current_value, 9)
+
+    def test_vwap_does_not_drift(self):
+        indicator = VWAPIndicator(sampling_length=10)
+        rng = np.random.RandomState(2)
+        # Large trades, then small ones: running sums that are only added to and subtracted from keep the rounding
+        # errors of the large values.
+        for _ in range(1000):
+            indicator.add_sample(rng.uniform(1e6, 2e6), rng.uniform(1e6, 1e7))
+        prices = rng.uniform(0.9, 1.1, 10000)
+        volumes = rng.uniform(1e-4, 1e-3, 10000)
+        for price, volume in zip(prices, volumes):
+            indicator.add_sample(price, volume)
+        self.assertAlmostEqual(np.average(prices[-10:], weights=volumes[-10:]), indicator.current_value, 9)
+
+    def test_incremental_average_volatility(self):
+        indicator = IncrementalAverageVolatilityIndicator(sampling_length=30, processing_length=1)
+        for i, price in enumerate(self.prices):
+            indicator.add_sample(price)
+            if i + 1 < 30:
+                self.assertTrue(math.isnan(indicator.current_value))
+            else:
+                self.assertAlmostEqual(np.std(self.prices[i - 29:i + 1]), indicator.current_value, 9)
+
+        averaged = IncrementalAverageVolatilityIndicator(sampling_length=30, processing_length=5)
+        batch = AverageVolatilityIndicator(sampling_length=30, processing_length=5)
+        for price in self.prices:
+            averaged.add_sample(price)
+            batch.add_sample(price)
+        self.assertAlmostEqual(batch.current_value, averaged.current_value, 9)
+
+    def test_average_volatility(self):
+        indicator = AverageVolatilityIndicator(sampling_length=30, processing_length=1)
+        for price in self.prices:
+            indicator.add_sample(price)
+        self.assertAlmostEqual(np.std(self.prices[-30:]), indicator.current_value, 9)